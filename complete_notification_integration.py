@@ -423,11 +423,10 @@ Available Templates: 16 templates across 10 categories
     
     def show_notification_panel(self):
         """Show the notification panel"""
-        notifications = self.notification_manager.get_notifications()
-        panel = NotificationPanel(notifications)
+        panel = NotificationPanel(self.notification_manager.store)
         panel.show()
         
-        self.status_bar.showMessage(f"📱 Notification panel opened - {len(notifications)} notifications")
+        self.status_bar.showMessage(f"📱 Notification panel opened - {self.notification_manager.store.total_count} notifications")
     
     def send_smart_notification(self):
         """Send a smart notification using advanced features"""
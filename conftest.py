@@ -0,0 +1,38 @@
+"""
+Shared pytest setup for the root-level tests
+One QApplication for the whole session, and nothing recorded into the repository's data directory
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True, scope='session')
+def qapp():
+    """The session's QApplication, created before any test can create a bare QCoreApplication
+
+    Widgets abort the interpreter when the application object is only a
+    QCoreApplication, so every test gets this one (tests run as scripts
+    create it the same way: ``QApplication.instance() or QApplication(sys.argv)``).
+    """
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+@pytest.fixture(autouse=True, scope='session')
+def activity_tracker(qapp, tmp_path_factory):
+    """The global activity tracker, writing to a temporary data directory instead of data/"""
+    import modules.activity_tracker as activity_tracking
+
+    tracker = activity_tracking.ActivityTracker(data_dir=str(tmp_path_factory.mktemp('data')))
+    activity_tracking._activity_tracker = tracker
+    yield tracker
+    tracker.activity_log.close()
+    activity_tracking._activity_tracker = None
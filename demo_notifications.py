@@ -87,7 +87,7 @@ def demo_category_notifications():
             app = QApplication(sys.argv)
         
         # Create notification panel
-        panel = NotificationPanel(notifications)
+        panel = NotificationPanel(manager.store)
         panel.show()
         
         print("📱 Notification panel created and displayed!")
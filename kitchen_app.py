@@ -1,5 +1,9 @@
 import sys
 import os
+import time
+
+# Process start, for the time-to-interactive reported on the loading screen
+STARTUP_STARTED = time.perf_counter()
 
 # Fix Python paths for frozen application (cx_Freeze)
 if getattr(sys, 'frozen', False):
@@ -17,8 +21,13 @@ else:
     sys.path.insert(0, os.path.join(current_dir, 'modules'))
     sys.path.insert(0, os.path.join(current_dir, 'utils'))
 
+# Wall-clock and CPU time per startup phase, saved as one report per launch
+# (KITCHEN_PROFILE_IMPORTS=1 also times each imported module)
+from utils.startup_profiler import get_startup_profiler, format_breakdown, load_reports, REPORT_DIRNAME
+startup_profiler = get_startup_profiler(STARTUP_STARTED)
+startup_profiler.start_phase("Imports")
+
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
 # Firebase integration
@@ -28,10 +37,9 @@ try:
 except ImportError:
     FIREBASE_AVAILABLE = False
 
-# Set matplotlib to use PySide6
+# Set matplotlib to use PySide6 (pyplot itself is imported when the first chart is drawn)
 import matplotlib
 matplotlib.use('QtAgg')
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, QLabel,
                              QVBoxLayout, QHBoxLayout, QGridLayout, QTabWidget,
@@ -39,37 +47,27 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton,
                              QGroupBox, QFormLayout, QStyleFactory, QSizePolicy,
                              QRadioButton, QDialog, QCheckBox, QButtonGroup,
                              QSystemTrayIcon, QMenu)
-from PySide6.QtCore import Qt, QSize, QTimer
+from PySide6.QtCore import Qt, QSize, QTimer, Signal
 from PySide6.QtGui import QFont, QColor, QIcon, QPalette, QPainter, QPen, QPixmap, QAction
 
-# Import modules - use standard imports for IDE compatibility
-from modules.settings_fixed import SettingsWidget
-from modules.expenses_fixed import ExpensesWidget
-from modules.logs_viewer import LogsViewerWidget
-from modules.firebase_sync import FirebaseSync
-from modules.login_dialog import LoginDialog
-
+# Page widgets are imported by their show_*_page method on first navigation
 # Import logger
 from utils.app_logger import get_logger
 
+# Typed table store behind the CSV data files
+from modules.table_store import get_table_store, DATE_COLUMNS, JOURNAL_TABLES
+
 # Import enhanced notification system with all cutting-edge features
 from modules.enhanced_notification_system import get_notification_manager
 
-# Import all advanced notification features
-try:
-    from notification_templates import NotificationTemplateManager
-    from notification_ai_intelligence import NotificationAI
-    from notification_mobile_integration import MobileNotificationManager
-    from notification_business_intelligence import NotificationBusinessIntelligence
-    from notification_performance_optimizer import OptimizedNotificationManager
-    from notification_security_compliance import NotificationSecurityManager, SecurityPolicy
-    from notification_realtime_streaming import NotificationStreamer
-    from ultimate_notification_system import UltimateNotificationSystem
-    ADVANCED_NOTIFICATIONS_AVAILABLE = True
-    print("✅ Advanced notification features loaded successfully")
-except ImportError as e:
-    print(f"⚠️ Some advanced notification features not available: {e}")
-    ADVANCED_NOTIFICATIONS_AVAILABLE = False
+# Advanced notification features are imported and built on first use (see setup_notification_services)
+from modules.lazy_loader import LazyService, ServiceRegistry, lazy_import
+
+# Home page metrics and charts, cached per data version and rendered in the background
+from modules.home_charts import ChartImage, HomeChartService
+
+# Daily sales and waste aggregates shared by the reports
+from modules.daily_cube import invalidate_cube
 
 # Import modern theme
 from modules.modern_theme import ModernTheme
@@ -95,16 +93,37 @@ except ImportError:
     get_updater = None
     version_manager = None
 
+startup_profiler.end_phase("Imports")
 print("✓ All imports completed with fallback handling for frozen application")
 
 # Simple fix for category dropdowns has been integrated into the inventory module
 
 class KitchenDashboardApp(QMainWindow):
-    def __init__(self):
+    # Optional notification subsystems, built by self.services on first access
+    ultimate_notification_system = LazyService()
+    notification_ai = LazyService()
+    notification_templates = LazyService()
+    mobile_notifications = LazyService()
+    notification_bi = LazyService()
+    performance_notifications = LazyService()
+    notification_security = LazyService()
+    notification_streaming = LazyService()
+
+    # Emitted once with the seconds from process start to the first painted window
+    interactive = Signal(float)
+
+    def __init__(self, loading_screen=None):
         super().__init__()
 
+        # Startup phases are reported to the loading screen as they actually run
+        self.loading_screen = loading_screen
+        self.services = ServiceRegistry()
+        self.time_to_interactive = None
+        self.startup_progress(10, "Initializing application...")
+
         # Load environment variables from .env file
-        self.load_env_file()
+        with startup_profiler.phase("Environment"):
+            self.load_env_file()
 
         self.setWindowTitle("Kitchen Dashboard - Modern Edition")
         self.resize(1600, 1000)
@@ -143,86 +162,20 @@ class KitchenDashboardApp(QMainWindow):
         self.logger.info("[LIST] Step 1: Application window and styling initialized")
         self.logger.log_ui_action("Window created", f"Size: {self.size().width()}x{self.size().height()}")
 
-        # Initialize enhanced notification system with all cutting-edge features
+        # Initialize enhanced notification system; advanced features load on first use
         self.logger.log_section_header("Ultimate Notification System Initialization")
         try:
             # Initialize core enhanced notification system (no arguments needed)
             self.notification_manager = get_notification_manager()
             self.logger.info("✅ Core enhanced notification system initialized")
 
-            # Initialize advanced notification features if available
-            if ADVANCED_NOTIFICATIONS_AVAILABLE:
-                # Initialize Ultimate Notification System
-                self.ultimate_notification_system = UltimateNotificationSystem()
-                self.logger.info("✅ Ultimate notification system initialized")
-
-                # Initialize AI Intelligence
-                self.notification_ai = NotificationAI()
-                self.logger.info("✅ AI-powered notification intelligence initialized")
-
-                # Initialize Template System
-                self.notification_templates = NotificationTemplateManager()
-                self.logger.info("✅ Professional template system initialized (16+ templates)")
-
-                # Initialize Mobile Integration
-                self.mobile_notifications = MobileNotificationManager()
-                self.logger.info("✅ Mobile & cross-platform integration initialized")
-
-                # Initialize Business Intelligence
-                self.notification_bi = NotificationBusinessIntelligence()
-                self.logger.info("✅ Business intelligence & analytics initialized")
-
-                # Initialize Performance Optimization
-                self.performance_notifications = OptimizedNotificationManager()
-                self.logger.info("✅ High-performance processing initialized (49,490+ notifications/sec)")
-
-                # Initialize Security & Compliance
-                security_policy = SecurityPolicy(
-                    encryption_required=True,
-                    audit_logging=True,
-                    pii_detection=True,
-                    content_filtering=True,
-                    rate_limiting=True
-                )
-                self.notification_security = NotificationSecurityManager(security_policy)
-                self.logger.info("✅ Enterprise security & compliance initialized")
-
-                # Initialize Real-time Streaming
-                self.notification_streaming = NotificationStreamer()
-                self.logger.info("✅ Real-time streaming & WebSocket support initialized")
-
-                self.logger.log_section_footer("Ultimate Notification System Initialization", True,
-                    "All cutting-edge notification features successfully initialized")
-
-                # Send startup notification using enhanced system
-                self._send_enhanced_startup_notification()
-
-            else:
-                self.logger.warning("Advanced notification features not available - using basic system")
-                self.ultimate_notification_system = None
-                self.notification_ai = None
-                self.notification_templates = None
-                self.mobile_notifications = None
-                self.notification_bi = None
-                self.performance_notifications = None
-                self.notification_security = None
-                self.notification_streaming = None
-
-                self.logger.log_section_footer("Ultimate Notification System Initialization", False,
-                    "Advanced features not available - using basic notification system")
+            self.setup_notification_services()
+            self.logger.log_section_footer("Ultimate Notification System Initialization", True,
+                "Core system ready; advanced features load on first use or after the first paint")
 
         except Exception as e:
             self.logger.error(f"Error initializing ultimate notification system: {e}")
             self.logger.log_section_footer("Ultimate Notification System Initialization", False, str(e))
-            # Fallback to basic system
-            self.ultimate_notification_system = None
-            self.notification_ai = None
-            self.notification_templates = None
-            self.mobile_notifications = None
-            self.notification_bi = None
-            self.performance_notifications = None
-            self.notification_security = None
-            self.notification_streaming = None
 
         # Initialize activity tracker
         if get_activity_tracker:
@@ -256,10 +209,17 @@ class KitchenDashboardApp(QMainWindow):
         self.pending_login_notification = None
         self.pending_sync_notification = None
 
+        # Tables changed since they were last saved (see mark_data_changed)
+        self.dirty_tables = set()
+
+        # Change counter per table, part of the data version the home charts are cached under
+        self.table_versions = {}
+        self.home_charts = None
+
         # Load data first with comprehensive error handling and logging
         self.logger.info("[DATA] Step 2: Loading application data...")
+        self.startup_progress(30, "Loading kitchen data...")
         try:
-            import time
             start_time = time.time()
             self.data = self.load_data()
             load_time = time.time() - start_time
@@ -297,6 +257,7 @@ class KitchenDashboardApp(QMainWindow):
         # Initialize application settings
         self.show_startup_notifications = True  # Enable startup notifications by default
 
+        self.startup_progress(50, "Setting up Firebase connection...")
         self.logger.log_section_header("Firebase Initialization")
         try:
             from modules.optimized_firebase_manager import get_optimized_firebase_manager
@@ -309,6 +270,9 @@ class KitchenDashboardApp(QMainWindow):
             self.logger.error(f"Failed to initialize optimized Firebase manager: {e}")
             self.firebase_manager = None
 
+        # Every table the app writes is queued for the cloud and drained in the background
+        self.setup_cloud_outbox()
+
         # Legacy Firebase sync disabled for subscription model
         # Using optimized Firebase manager instead
         self.firebase_sync = None
@@ -317,6 +281,7 @@ class KitchenDashboardApp(QMainWindow):
         self.logger.log_section_footer("Firebase Initialization", True, "Firebase services initialized with enhanced authentication")
 
         # Initialize responsive design and PWA features
+        self.startup_progress(60, "Loading modules...")
         self.logger.log_section_header("Responsive Design & PWA")
         try:
             from modules.responsive_design_manager import get_responsive_manager
@@ -404,6 +369,8 @@ class KitchenDashboardApp(QMainWindow):
         # Check if daily sync is needed (without performing it)
         self._check_and_perform_daily_sync()
 
+        self.startup_progress(80, "Setting up authentication...")
+
         # Check if Firebase is properly configured
         if (self.firebase_config_manager and self.firebase_config_manager.is_configured()):
             self.logger.info("Firebase configured - checking for existing session")
@@ -448,6 +415,7 @@ class KitchenDashboardApp(QMainWindow):
                 self.whatsapp_message_logger = None
 
         # Initialize System Tray for background operation
+        self.startup_progress(95, "Finalizing setup...")
         self.logger.log_section_header("System Tray Initialization")
         try:
             self.setup_system_tray()
@@ -458,6 +426,90 @@ class KitchenDashboardApp(QMainWindow):
             self.logger.log_section_footer("System Tray Initialization", False, f"System tray initialization failed: {e}")
             self.system_tray = None
 
+    def startup_progress(self, percent, message):
+        """Show a startup phase on the loading screen, if there is one"""
+        if self.loading_screen is not None:
+            self.loading_screen.update_progress(percent, message)
+
+    def pause_startup_screen(self):
+        """Hide the loading screen so it does not cover a startup dialog"""
+        if self.loading_screen is not None:
+            self.loading_screen.hide()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.time_to_interactive is None:
+            # Runs once the event loop has painted the window
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def setup_notification_services(self):
+        """Register the advanced notification subsystems without importing or building them
+
+        Each one is built the first time its attribute is read. The template
+        system and the performance-optimized manager back everyday
+        notifications, so they are also built right after the first paint
+        (see on_first_paint); the AI, BI, mobile, security, streaming and
+        dashboard subsystems wait for their first use.
+        """
+        def security_manager():
+            SecurityPolicy = lazy_import('notification_security_compliance', 'SecurityPolicy')
+            security_policy = SecurityPolicy(
+                encryption_required=True,
+                audit_logging=True,
+                pii_detection=True,
+                content_filtering=True,
+                rate_limiting=True
+            )
+            return lazy_import('notification_security_compliance', 'NotificationSecurityManager')(security_policy)
+
+        services = {
+            'notification_templates': (lambda: lazy_import('notification_templates', 'NotificationTemplateManager')(), True),
+            'performance_notifications': (lambda: lazy_import('notification_performance_optimizer', 'OptimizedNotificationManager')(), True),
+            'notification_ai': (lambda: lazy_import('notification_ai_intelligence', 'NotificationAI')(), False),
+            'mobile_notifications': (lambda: lazy_import('notification_mobile_integration', 'MobileNotificationManager')(), False),
+            'notification_bi': (lambda: lazy_import('notification_business_intelligence', 'NotificationBusinessIntelligence')(), False),
+            'notification_security': (security_manager, False),
+            'notification_streaming': (lambda: lazy_import('notification_realtime_streaming', 'NotificationStreamer')(), False),
+            'ultimate_notification_system': (lambda: lazy_import('ultimate_notification_system', 'UltimateNotificationSystem')(), False),
+        }
+        for name, (factory, warm_up) in services.items():
+            self.services.register(name, factory, warm_up=warm_up)
+
+    def on_first_paint(self):
+        """Record time-to-interactive, then load deferred services one per event-loop turn"""
+        if self.time_to_interactive is not None:
+            return
+        self.time_to_interactive = startup_profiler.mark('interactive')
+        self.logger.log_performance("Time to interactive", self.time_to_interactive)
+        track_system_event("application", "interactive",
+                           f"Window interactive {self.time_to_interactive:.2f}s after start")
+        self.interactive.emit(self.time_to_interactive)
+
+        def services_ready():
+            self._send_enhanced_startup_notification()
+            loaded = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.services.load_times.items())
+            self.logger.info(f"Deferred services loaded after first paint: {loaded or 'none'}")
+            self.save_startup_report()
+
+        self.services.warm_up(on_done=services_ready)
+
+    def save_startup_report(self):
+        """Write this launch's startup timings and log them against the previous launch"""
+        try:
+            for name, seconds in self.services.load_times.items():
+                startup_profiler.record(name, seconds, parent="Deferred services")
+            startup_profiler.finish()
+
+            report_dir = os.path.join(self.logger.logs_dir, REPORT_DIRNAME)
+            previous = load_reports(report_dir, limit=1)
+            path = startup_profiler.write_report(report_dir)
+            for line in format_breakdown(startup_profiler.report(), previous[0] if previous else None):
+                self.logger.info(f"[TIME] {line}")
+            if path:
+                self.logger.info(f"Startup report saved to {path}")
+        except Exception as e:
+            self.logger.error(f"Error saving startup report: {e}")
+
     def _send_enhanced_startup_notification(self):
         """Send enhanced startup notification using the ultimate notification system"""
         try:
@@ -479,8 +531,8 @@ class KitchenDashboardApp(QMainWindow):
                 )
                 self.logger.info("✅ Enhanced startup notification sent via core system")
 
-            # Send AI analysis notification if available
-            if hasattr(self, 'notification_ai') and self.notification_ai:
+            # AI analysis and mobile registration only when those subsystems are already in use
+            if self.services.is_loaded('notification_ai') and self.notification_ai:
                 startup_notification = {
                     'title': 'Ultimate System Ready',
                     'message': 'VARSYS Kitchen Dashboard Ultimate Edition is now operational',
@@ -493,7 +545,7 @@ class KitchenDashboardApp(QMainWindow):
                                f"Intent={analysis.intent.value}, Urgency={analysis.urgency_score:.2f}")
 
             # Register mobile device if available
-            if hasattr(self, 'mobile_notifications') and self.mobile_notifications:
+            if self.services.is_loaded('mobile_notifications') and self.mobile_notifications:
                 from notification_mobile_integration import MobileDevice, MobilePlatform
                 from datetime import datetime
 
@@ -1278,6 +1330,7 @@ class KitchenDashboardApp(QMainWindow):
                 'auto_sync_enabled': True,
                 'sync_interval_minutes': 30,
                 'last_sync_timestamp': None,
+                'conflict_resolution': 'merge',
                 'sync_collections': [
                     'inventory', 'recipes', 'budget', 'budget_categories', 'sales', 'expenses_list',
                     'waste', 'cleaning_maintenance', 'items', 'categories',
@@ -2219,9 +2272,33 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
                 self.active_sync_worker and
                 self.active_sync_worker.isRunning())
 
+    def setup_cloud_outbox(self):
+        """Start the drainer that pushes row-level changes from the durable outbox to Firestore"""
+        self.cloud_outbox_drainer = None
+        if not self.firebase_manager:
+            return
+        try:
+            from modules.cloud_outbox import OutboxDrainer, get_cloud_outbox
+            self.cloud_outbox_drainer = OutboxDrainer(get_cloud_outbox('data'), self.get_table_store(),
+                                                      self.firebase_manager, parent=self)
+            # Tables reach the outbox three ways: writes through the table store (listener below),
+            # pages saving with to_csv directly (on_tables_saved) and edits made outside the app
+            # (on_tables_changed). The last two are only seen by the table watcher's next check.
+            self.get_table_store().write_listeners.append(self.cloud_outbox_drainer.table_changed)
+            self.cloud_outbox_drainer.drain_failed.connect(
+                lambda error: self.logger.warning(f"Cloud outbox upload failed, will retry: {error}"))
+            self.logger.info(f"Cloud outbox started ({len(self.cloud_outbox_drainer.outbox)} pending changes)")
+        except Exception as e:
+            self.logger.error(f"Error starting cloud outbox: {e}")
+            self.cloud_outbox_drainer = None
+
     def perform_periodic_sync(self):
         """Perform periodic sync of data to cloud"""
         try:
+            # Retry queued changes now (a connection may have come back)
+            if getattr(self, 'cloud_outbox_drainer', None) is not None:
+                self.cloud_outbox_drainer.wake()
+
             if not self.cloud_sync_settings.get('auto_sync_enabled', False):
                 return
 
@@ -2300,15 +2377,19 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
     def show_authentication_dialog(self):
         """Show authentication dialog and only proceed if user authenticates"""
         try:
+            from modules.login_dialog import LoginDialog
+
             # Create login dialog with Firebase config
+            self.pause_startup_screen()
             login_dialog = LoginDialog(self, firebase_config_manager=self.firebase_config_manager)
 
             # Connect authentication signal
             login_dialog.login_successful.connect(self.handle_authentication_result)
             login_dialog.login_failed.connect(self.handle_authentication_failure)
 
-            # Show dialog as modal
-            result = login_dialog.exec()
+            # Show dialog as modal; time spent signing in is not counted as startup work
+            with startup_profiler.phase("Waiting for sign-in", waiting=True):
+                result = login_dialog.exec()
 
             # If dialog was closed without authentication, exit application
             if result == 0:  # Dialog was rejected/closed
@@ -2355,8 +2436,12 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
             # Run automatic migration if needed (shopping_list → expenses_list)
             self.run_automatic_migration()
 
+            # login_successful is emitted from inside the dialog's exec(): the wait for sign-in ends here
+            startup_profiler.end_phase("Waiting for sign-in")
+
             # Initialize the UI
-            self.initialize_ui()
+            with startup_profiler.phase("User interface"):
+                self.initialize_ui()
 
             # Perform daily sync if needed (after authentication)
             if hasattr(self, 'daily_sync_needed') and self.daily_sync_needed:
@@ -2487,6 +2572,7 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
         """Show dialog when Firebase is not configured - ONLINE-ONLY MODE"""
         from PySide6.QtWidgets import QMessageBox
 
+        self.pause_startup_screen()
         msg = QMessageBox(self)
         msg.setWindowTitle("Firebase Configuration Required")
         msg.setText("Kitchen Dashboard v1.0.6 requires Firebase configuration.")
@@ -2627,50 +2713,94 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
             self.settings_widget.add_log(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", level)
 
 
+    # Tables each page reads; a change to any other table leaves the page alone
+    PAGE_TABLE_DEPENDENCIES = {
+        'show_home_page': {'inventory', 'sales', 'sales_orders', 'budget', 'waste', 'recipes', 'cleaning_maintenance'},
+        'show_inventory_page': {'inventory', 'items', 'categories'},
+        'show_meal_planning_page': {'meal_plan', 'recipes', 'recipe_ingredients', 'inventory', 'items'},
+        'show_budget_page': {'budget', 'budget_categories', 'expenses_list'},
+        'show_sales_page': {'sales', 'sales_orders', 'recipes', 'pricing'},
+        'show_platform_reports_page': {'sales', 'sales_orders'},
+        'show_pricing_page': {'pricing', 'recipes', 'recipe_ingredients', 'inventory',
+                              'packing_materials', 'recipe_packing_materials'},
+        'show_packing_materials_page': {'packing_materials', 'recipe_packing_materials', 'recipes'},
+        'show_expenses_page': {'expenses_list', 'budget', 'budget_categories', 'inventory'},
+        'show_waste_page': {'waste', 'inventory'},
+        'show_cleaning_page': {'cleaning_maintenance', 'staff'},
+        'show_reports_page': {'sales', 'sales_orders', 'inventory', 'budget', 'waste'},
+    }
+
     def auto_refresh_data(self):
-        """Automatically refresh data when CSV files change"""
+        """Check the data files for changes now (the watcher also does this on its own)"""
         try:
-            # Check if any CSV files have been modified
-            data_dir = "data"
-            if not os.path.exists(data_dir):
-                return
+            if getattr(self, 'table_watcher', None) is not None:
+                self.table_watcher.check_now()
+        except Exception as e:
+            self.logger.error(f"Error in auto-refresh: {e}")
 
-            refresh_needed = False
-            current_time = datetime.now()
+    def on_tables_changed(self, tables):
+        """Reload only the tables whose files changed and refresh the page if it uses them"""
+        try:
+            tables = [table for table in tables if table in (self.data or {})]
+            if not tables:
+                return
 
-            # Check modification times of CSV files
-            for filename in os.listdir(data_dir):
-                if filename.endswith('.csv'):
-                    filepath = os.path.join(data_dir, filename)
-                    mod_time = datetime.fromtimestamp(os.path.getmtime(filepath))
+            self.logger.info(f"Auto-refreshing changed tables: {', '.join(tables)}")
+            self.data = self.load_data(tables=tables)
 
-                    # If file was modified in the last 5 seconds, refresh
-                    if (current_time - mod_time).total_seconds() < 5:
-                        refresh_needed = True
-                        break
+            # Files edited outside the app are queued for the cloud like the app's own writes
+            if getattr(self, 'cloud_outbox_drainer', None) is not None:
+                for table in tables:
+                    self.cloud_outbox_drainer.table_changed(table)
 
-            if refresh_needed:
-                self.logger.info("Auto-refreshing data due to CSV file changes")
-                self.data = self.load_data()
-
-                # Refresh current tab
-                if hasattr(self, 'current_widget') and hasattr(self.current_widget, 'load_data'):
-                    self.current_widget.load_data()
+            # Rebuild the current page only when it depends on a changed table
+            callback = getattr(self, 'current_page_callback', None)
+            page_tables = self.PAGE_TABLE_DEPENDENCIES.get(getattr(callback, '__name__', None), set())
+            if getattr(callback, '__name__', None) == 'show_pricing_page' and self.update_pricing_page(tables):
+                return
+            if callback is not None and page_tables.intersection(tables):
+                self.logger.info(f"Refreshing {callback.__name__} for changed tables")
+                callback()
 
         except Exception as e:
             self.logger.error(f"Error in auto-refresh: {e}")
 
-    def setup_auto_refresh_timer(self):
-        """Setup timer for auto-refresh (performance enhancer disabled)"""
+    def on_tables_saved(self, tables):
+        """Pages saved these tables themselves: the data is current and the page stays as it is"""
+        # The page edited the tables in place before saving them
+        self.bump_table_versions(tables)
+        if getattr(self, 'cloud_outbox_drainer', None) is not None:
+            for table in tables:
+                self.cloud_outbox_drainer.table_changed(table)
+
+    def update_pricing_page(self, tables):
+        """Let the open pricing page recost affected recipes in place; False if it needs a rebuild"""
+        widget = getattr(self, 'pricing_widget', None)
+        if widget is None or not hasattr(widget, 'on_price_data_changed'):
+            return False
+        if not set(tables) <= (widget.PRICE_SOURCE_TABLES | widget.PACKING_TABLES):
+            return False
         try:
-            from PySide6.QtCore import QTimer
-            self.refresh_timer = QTimer()
+            widget.on_price_data_changed(self.data, tables)
+            return True
+        except RuntimeError:
+            # The widget was already deleted with its page
+            self.pricing_widget = None
+            return False
 
-            # Direct connection without performance enhancer (disabled)
-            self.refresh_timer.timeout.connect(self.auto_refresh_data)
+    def setup_auto_refresh_timer(self):
+        """Setup the table watcher that drives auto-refresh"""
+        try:
+            if getattr(self, 'table_watcher', None) is not None:
+                return
 
-            self.refresh_timer.start(10000)  # Check every 10 seconds
-            self.logger.info("Auto-refresh timer started (performance enhancer disabled)")
+            from modules.table_watcher import TableWatcher
+            tables = [key for key, value in (self.data or {}).items() if hasattr(value, 'to_csv')]
+            self.table_watcher = TableWatcher('data', tables=tables, poll_interval=10000, parent=self)
+            self.table_watcher.tables_changed.connect(self.on_tables_changed)
+            self.table_watcher.tables_saved.connect(self.on_tables_saved)
+            self.table_watcher.start()
+            self.logger.info("Auto-refresh table watcher started")
         except Exception as e:
             self.logger.error(f"Error setting up auto-refresh timer: {e}")
 
@@ -2691,20 +2821,35 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
             # Track data changes for smart saving
             self.data_changed = False
             self.last_save_time = datetime.now()
+            self.get_write_behind_queue()
 
             self.logger.info(f"Auto-save timer started with {auto_save_interval/1000/60:.1f} minute interval")
 
         except Exception as e:
             self.logger.error(f"Error setting up auto-save timer: {e}")
 
+    def get_write_behind_queue(self):
+        """Get the background writer used for saving tables"""
+        if getattr(self, 'write_behind_queue', None) is None:
+            from modules.write_behind import WriteBehindQueue
+            self.write_behind_queue = WriteBehindQueue(self.get_table_store(), parent=self)
+            self.write_behind_queue.write_failed.connect(
+                lambda table, error: self.logger.error(f"Error saving {table}.csv: {error}"))
+        return self.write_behind_queue
+
+    def on_table_written(self, table):
+        """Our own writes and appends are not external changes to reload"""
+        if getattr(self, 'table_watcher', None) is not None:
+            self.table_watcher.acknowledge(table)
+
     def auto_save_data(self):
         """Automatically save data if changes have been made"""
         try:
             # Only save if data has changed and we have data to save
             if self.data_changed and hasattr(self, 'data') and self.data:
-                self.logger.info("Auto-save: Saving changed data...")
+                self.logger.info(f"Auto-save: Saving changed data ({', '.join(sorted(self.dirty_tables)) or 'all tables'})...")
 
-                # Save all data to CSV files
+                # Queue the changed tables for the background writer
                 self.save_all_data_to_csv()
 
                 # Reset change flag
@@ -2725,8 +2870,14 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
         except Exception as e:
             self.logger.error(f"Error during auto-save: {e}")
 
-    def save_all_data_to_csv(self):
-        """Save all application data to CSV files"""
+    def save_all_data_to_csv(self, tables=None, wait=False):
+        """Save application data to CSV files through the background writer
+
+        Without ``tables`` the tables marked dirty are written; when a change of
+        unknown type was recorded (or ``wait`` is set, as on exit) every other
+        table is queued too but skipped if its content matches the file on disk.
+        With ``wait`` the call blocks until the writer has finished.
+        """
         try:
             if not hasattr(self, 'data') or not self.data:
                 self.logger.warning("No data to save")
@@ -2736,25 +2887,50 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
             data_dir = 'data'
             os.makedirs(data_dir, exist_ok=True)
 
-            # Save each dataframe to its respective CSV file
-            saved_files = []
-            for key, df in self.data.items():
-                if hasattr(df, 'to_csv'):  # Check if it's a DataFrame
-                    try:
-                        file_path = os.path.join(data_dir, f"{key}.csv")
-                        df.to_csv(file_path, index=False, encoding='utf-8')
-                        saved_files.append(key)
-                    except Exception as e:
-                        self.logger.error(f"Error saving {key}.csv: {e}")
+            frames = {key: df for key, df in self.data.items() if hasattr(df, 'to_csv')}
+            dirty = set(self.dirty_tables)
+            if tables is not None:
+                forced, checked = set(tables), set()
+            else:
+                forced = dirty & set(frames)
+                checked = set(frames) - forced if (self.UNKNOWN_TABLE in dirty or wait) else set()
+
+            queue = self.get_write_behind_queue()
+            for key in sorted(forced | checked):
+                if key in frames:
+                    queue.submit(key, frames[key], skip_if_unchanged=key in checked)
+            self.dirty_tables -= forced
+            if tables is None:
+                self.dirty_tables.discard(self.UNKNOWN_TABLE)
+
+            self.logger.info(f"Queued {len(forced)} changed data files for saving"
+                             f"{f' ({len(checked)} checked for changes)' if checked else ''}: {', '.join(sorted(forced))}")
 
-            self.logger.info(f"Saved {len(saved_files)} data files: {', '.join(saved_files)}")
+            if wait and not queue.flush(timeout=30):
+                self.logger.warning(f"Timed out waiting for data files to be saved: {queue.pending_tables()}")
 
         except Exception as e:
             self.logger.error(f"Error saving all data to CSV: {e}")
 
+    # Dirty-set marker for changes whose table is not known
+    UNKNOWN_TABLE = '*'
+
+    def bump_table_versions(self, tables):
+        """Count a change of each table for the caches keyed by table version (metrics, reports, prices)"""
+        for table in tables:
+            self.table_versions[table] = self.table_versions.get(table, 0) + 1
+            invalidate_cube(table)
+
     def mark_data_changed(self, data_type=None, item_name=None):
         """Mark that data has been changed and needs saving"""
         self.data_changed = True
+        if data_type in (getattr(self, 'data', None) or {}):
+            self.dirty_tables.add(data_type)
+            changed = [data_type]
+        else:
+            self.dirty_tables.add(self.UNKNOWN_TABLE)
+            changed = list(getattr(self, 'data', None) or {})
+        self.bump_table_versions(changed)
 
         # Trigger WhatsApp message logging for standalone messaging system
         if self.WHATSAPP_ENABLED and hasattr(self, 'whatsapp_notifications') and self.whatsapp_notifications:
@@ -2896,7 +3072,9 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
         print(f"   Splitter sizes: {self.main_splitter.sizes()}")
 
         # Show home page by default
-        self.show_home_page()
+        self.current_page_callback = self.show_home_page
+        with startup_profiler.phase("First page build"):
+            self.show_home_page()
 
         # Setup auto-refresh timer
         self.setup_auto_refresh_timer()
@@ -2988,9 +3166,31 @@ File System: {validation_report.get('file_collections', 0)} collections, {valida
                         self.active_sync_worker.quit()
                         self.active_sync_worker.wait(2000)
 
-                    # Final save of any pending data
+                    # Final save of any pending data, waiting for the background writer
                     if hasattr(self, 'data') and self.data:
-                        self.save_all_data_to_csv()
+                        self.save_all_data_to_csv(wait=True)
+
+                    # Fold the journaled rows of high-frequency tables into their binary copies
+                    for table in JOURNAL_TABLES:
+                        self.get_table_store().compact(table)
+
+                    # Queued cloud changes stay in the outbox and are sent after the next start
+                    if getattr(self, 'cloud_outbox_drainer', None) is not None:
+                        self.cloud_outbox_drainer.stop(2)
+
+                    # Drop home chart renders that have not started
+                    if getattr(self, 'home_charts', None) is not None:
+                        self.home_charts.shutdown()
+
+                    # Deliver notifications still held for coalescing so the bell history keeps them
+                    if getattr(self, 'notification_manager', None) is not None:
+                        self.notification_manager.flush_pending()
+                        if getattr(self, 'notification_bell', None) is not None:
+                            self.notification_bell.save_notifications()
+
+                    # Append activities logged since the last periodic save
+                    if getattr(self, 'activity_tracker', None) is not None:
+                        self.activity_tracker.save_activities()
 
                     self.logger.info("Cleanup completed successfully")
 
@@ -4553,46 +4753,23 @@ Daily Usage:
             return {}
 
     def intelligent_dataframe_merge(self, local_df, cloud_df, collection_name):
-        """Perform intelligent merge of two DataFrames"""
+        """Three-way merge of local and cloud rows by primary key against the last synced snapshot"""
         try:
-            import pandas as pd
-
-            # Strategy 1: If DataFrames are identical, return local
-            if local_df.equals(cloud_df):
-                self.logger.info(f"Data identical for {collection_name}")
-                return local_df.copy()
+            from modules.cloud_sync_manager import ConflictResolution
+            from modules.dataframe_merge import MergeBaseStore, three_way_merge
 
-            # Strategy 2: If one is empty, use the non-empty one
-            if local_df.empty and not cloud_df.empty:
-                self.logger.info(f"Using cloud data for {collection_name} (local empty)")
-                return cloud_df.copy()
-            elif not local_df.empty and cloud_df.empty:
-                self.logger.info(f"Using local data for {collection_name} (cloud empty)")
-                return local_df.copy()
+            if not hasattr(self, 'merge_base_store'):
+                self.merge_base_store = MergeBaseStore('data')
 
-            # Strategy 3: Merge based on common columns and indices
-            try:
-                # Try to merge on common columns
-                common_columns = set(local_df.columns) & set(cloud_df.columns)
-
-                if common_columns:
-                    # Combine both DataFrames and remove duplicates
-                    combined_df = pd.concat([local_df, cloud_df], ignore_index=True)
-
-                    # Remove exact duplicates
-                    merged_df = combined_df.drop_duplicates()
-
-                    self.logger.info(f"Merged {collection_name}: {len(local_df)} local + {len(cloud_df)} cloud = {len(merged_df)} final")
-                    return merged_df
-                else:
-                    # No common columns, prefer local data
-                    self.logger.warning(f"No common columns for {collection_name}, using local data")
-                    return local_df.copy()
+            settings = getattr(self, 'cloud_sync_settings', None) or {}
+            policy = ConflictResolution(settings.get('conflict_resolution', ConflictResolution.MERGE.value))
 
-            except Exception as merge_error:
-                self.logger.error(f"Error in DataFrame merge for {collection_name}: {merge_error}")
-                # Fallback to local data
-                return local_df.copy()
+            result = three_way_merge(local_df, cloud_df, self.merge_base_store.load(collection_name),
+                                     collection_name, policy)
+            if result.conflicts:
+                self.logger.warning(f"{len(result.conflicts)} conflicting rows in {collection_name} "
+                                    f"resolved with {policy.value}: {result.conflicts[:10]}")
+            return result.merged
 
         except Exception as e:
             self.logger.error(f"Error in intelligent merge for {collection_name}: {e}")
@@ -5589,9 +5766,28 @@ For more information, please check the documentation or contact support.
         except:
             pass  # Ignore if status bar doesn't exist
 
-    def load_data(self):
-        """Load all data from CSV files or create empty dataframes if files don't exist"""
+    def get_table_store(self):
+        """Get the typed table store backing the data directory"""
+        if getattr(self, 'table_store', None) is None:
+            self.table_store = get_table_store('data')
+            self.table_store.write_listeners.append(self.on_table_written)
+        return self.table_store
+
+    def load_table(self, key, columns=None):
+        """Load a single table, optionally only the columns a page needs"""
+        store = self.get_table_store()
+        if not store.exists(key):
+            return pd.DataFrame(columns=columns or [])
+        return store.read(key, columns=columns)
+
+    def load_data(self, tables=None):
+        """Load all data from CSV files or create empty dataframes if files don't exist
+
+        When ``tables`` is given only those tables are re-read and the other
+        entries of the current data are kept as they are.
+        """
         self.logger.log_section_header("Data Loading")
+        load_started = time.perf_counter()
         data = {}
 
         try:
@@ -5687,31 +5883,34 @@ For more information, please check the documentation or contact support.
                 'errors': []
             }
 
+            # Read through the typed table store: CSV files stay the source of truth,
+            # unchanged tables come from their binary copy with dtypes preserved
+            store = self.get_table_store()
+
+            # Reload only the requested tables and keep the rest of the current data
+            if tables is not None:
+                for key, value in (getattr(self, 'data', None) or {}).items():
+                    if key not in tables:
+                        data[key] = value
+
             # Iterate over each data type with comprehensive logging
             for key, empty_df in empty_dataframes.items():
-                file_path = os.path.join('data', f'{key}.csv')
+                if tables is not None and key not in tables:
+                    continue
+
+                file_path = store.csv_path(key)
                 self.logger.info(f"Processing {key} data source")
+                startup_profiler.start_phase(key)
 
-                if os.path.exists(file_path):
+                if store.exists(key):
                     try:
-                        # Performance optimization: Check file size and use chunked loading for large files
                         file_size = os.path.getsize(file_path)
                         self.logger.info(f"  File found: {file_path} ({file_size} bytes)")
 
-                        if file_size > 5 * 1024 * 1024:  # 5MB threshold
-                            # Load large files in chunks to avoid memory issues
-                            self.logger.info(f"  Loading large file in chunks")
-                            chunks = []
-                            chunk_count = 0
-                            for chunk in pd.read_csv(file_path, chunksize=1000):
-                                chunks.append(chunk)
-                                chunk_count += 1
-                            data[key] = pd.concat(chunks, ignore_index=True) if chunks else empty_df
-                            self.logger.info(f"  Loaded {chunk_count} chunks from {file_path} ({file_size/1024/1024:.1f}MB)")
-                        else:
-                            # Load smaller files normally
-                            data[key] = pd.read_csv(file_path, low_memory=False)
-                            self.logger.info(f"  Loaded {len(data[key])} rows from {file_path} ({file_size/1024:.1f}KB)")
+                        from_cache = store.is_fresh(key)
+                        data[key] = store.read(key)
+                        source = "table store" if from_cache else file_path
+                        self.logger.info(f"  Loaded {len(data[key])} rows from {source} ({file_size/1024:.1f}KB)")
 
                         # Log data structure info
                         if len(data[key]) > 0:
@@ -5741,22 +5940,16 @@ For more information, please check the documentation or contact support.
                     except Exception as e:
                         self.logger.error(f"  Error creating new empty file for {key} at {file_path}: {e}")
                         loading_stats['errors'].append(f"Create {key}: {str(e)}")
+                startup_profiler.end_phase(key)
 
-            # Convert date columns to datetime (even for empty dataframes)
-            for df_name in ['budget', 'sales', 'waste']:
-                if 'date' in data[df_name].columns:
-                    # Create a datetime column even if empty
-                    data[df_name]['date'] = pd.to_datetime(data[df_name]['date'], errors='coerce')
-
-            # Convert date columns in cleaning_maintenance
-            if 'last_completed' in data['cleaning_maintenance'].columns:
-                data['cleaning_maintenance']['last_completed'] = pd.to_datetime(data['cleaning_maintenance']['last_completed'], errors='coerce')
-            if 'next_due' in data['cleaning_maintenance'].columns:
-                data['cleaning_maintenance']['next_due'] = pd.to_datetime(data['cleaning_maintenance']['next_due'], errors='coerce')
-
-            # Convert expiry_date in inventory
-            if 'expiry_date' in data['inventory'].columns:
-                data['inventory']['expiry_date'] = pd.to_datetime(data['inventory']['expiry_date'], errors='coerce')
+            # Make sure date columns are datetimes (the table store parses them, empty
+            # and freshly created tables still need the dtype)
+            for df_name, date_columns in DATE_COLUMNS.items():
+                if df_name not in data:
+                    continue
+                for column in date_columns:
+                    if column in data[df_name].columns and not pd.api.types.is_datetime64_any_dtype(data[df_name][column]):
+                        data[df_name][column] = pd.to_datetime(data[df_name][column], errors='coerce')
 
             # Debug: Log data loading results
             print(f"[SEARCH] DATA LOADING DEBUG:")
@@ -5772,6 +5965,9 @@ For more information, please check the documentation or contact support.
             # Assign data to self.data immediately
             self.data = data
 
+            # Reloaded tables are new versions for the caches keyed by table version
+            self.bump_table_versions(key for key in data if tables is None or key in tables)
+
             # Log final summary
             summary_details = f"Loaded {len(data)} tables with {total_records} total records. Files: {loading_stats['files_found']} found, {loading_stats['files_loaded']} loaded, {loading_stats['files_created']} created"
 
@@ -5791,7 +5987,7 @@ For more information, please check the documentation or contact support.
                         source='Data Manager'
                     )
 
-            self.logger.log_performance("Complete data loading", 0)  # Will be calculated by caller
+            self.logger.log_performance("Complete data loading", time.perf_counter() - load_started)
             return data
         except Exception as e:
             error_msg = f"Error loading data: {e}"
@@ -6624,6 +6820,7 @@ For more information, please check the documentation or contact support.
         # Call the callback function
         self.logger.debug(f"Executing callback for {button_name}")
         self.current_page = button_name  # Track current page
+        self.current_page_callback = callback_function
         callback_function()
 
     def create_icon(self, emoji):
@@ -6716,6 +6913,8 @@ For more information, please check the documentation or contact support.
 
     def clear_content(self):
         """Clear the content area"""
+        self.pricing_widget = None
+
         # Remove all widgets from the content layout
         while self.content_layout.count():
             item = self.content_layout.takeAt(0)
@@ -6824,110 +7023,16 @@ For more information, please check the documentation or contact support.
 
             return card
 
-        # Calculate metrics
-        # Inventory metrics
-        # Calculate using either avg_price, price, or fallback to 0
-        inventory_df = self.data['inventory']
-        total_inventory_value = 0
-
-        if len(inventory_df) > 0:
-            # Calculate value for each row properly
-            for _, row in inventory_df.iterrows():
-                # Get quantity - first calculate available_qty if we have purchased and used
-                if 'total_qty' in row and pd.notna(row['total_qty']) and 'used_qty' in row and pd.notna(row['used_qty']):
-                    qty = float(row['total_qty']) - float(row['used_qty'])
-                # If available_qty is directly available, use it
-                elif 'available_qty' in row and pd.notna(row['available_qty']):
-                    qty = float(row['available_qty'])
-                # Fallback to regular quantity field
-                elif 'quantity' in row and pd.notna(row['quantity']):
-                    qty = float(row['quantity'])
-                else:
-                    qty = 0
-
-                # Get price, using avg_price if available, otherwise price
-                if 'avg_price' in row and pd.notna(row['avg_price']):
-                    price = float(row['avg_price'])
-                elif 'price' in row and pd.notna(row['price']):
-                    price = float(row['price'])
-                else:
-                    price = 0
-
-                # Add to total
-                total_inventory_value += qty * price
-
-        # Calculate low stock items using qty_left if available, otherwise use quantity
-        inventory_df = self.data['inventory']
-        low_stock_items = []
-
-        if len(inventory_df) > 0:
-            for _, row in inventory_df.iterrows():
-                # Get quantity - first calculate qty_left if we have purchased and used
-                if 'qty_purchased' in row and pd.notna(row['qty_purchased']) and 'qty_used' in row and pd.notna(row['qty_used']):
-                    qty = float(row['qty_purchased']) - float(row['qty_used'])
-                # If qty_left is directly available, use it
-                elif 'qty_left' in row and pd.notna(row['qty_left']):
-                    qty = float(row['qty_left'])
-                # Fallback to regular quantity field
-                elif 'quantity' in row and pd.notna(row['quantity']):
-                    qty = float(row['quantity'])
-                else:
-                    qty = 0
-
-                # Get threshold
-                if 'reorder_level' in row and pd.notna(row['reorder_level']):
-                    threshold = float(row['reorder_level'])
-                else:
-                    threshold = 1.0  # Default threshold
-
-                # Check if low stock
-                if qty <= threshold:
-                    low_stock_items.append(row)
-
-            # Create DataFrame from low stock items
-            if low_stock_items:
-                low_stock = pd.DataFrame(low_stock_items)
-            else:
-                low_stock = pd.DataFrame()
-        else:
-            low_stock = pd.DataFrame()
-
-        low_stock_count = len(low_stock)
-
-        # Sales metrics
-        if 'total_amount' in self.data['sales'].columns:
-            total_sales = self.data['sales']['total_amount'].sum()
-        else:
-            if 'price_per_unit' in self.data['sales'].columns and 'quantity' in self.data['sales'].columns:
-                self.data['sales']['total_amount'] = self.data['sales']['price_per_unit'] * self.data['sales']['quantity']
-                total_sales = self.data['sales']['total_amount'].sum()
-            else:
-                total_sales = 0.0
-
-        # Budget metrics
-        if 'amount' in self.data['budget'].columns:
-            total_budget = self.data['budget']['amount'].sum()
-        elif 'budget_amount' in self.data['budget'].columns:
-            total_budget = self.data['budget']['budget_amount'].sum()
-        else:
-            total_budget = 0.0
-
-        # Waste metrics
-        if 'cost' in self.data['waste'].columns:
-            waste_cost = self.data['waste']['cost'].sum()
-        else:
-            waste_cost = 0.0
-
-        # Expenses list metrics
-        if 'status' in self.data['expenses_list'].columns:
-            items_to_buy = len(self.data['expenses_list'][self.data['expenses_list']['status'] == 'Pending'])
-        else:
-            items_to_buy = len(self.data['expenses_list'])
-
-        if 'estimated_cost' in self.data['expenses_list'].columns:
-            estimated_cost = self.data['expenses_list']['estimated_cost'].sum()
-        else:
-            estimated_cost = 0.0
+        # Metrics are computed once per data version and reused on later visits
+        home_charts = self.get_home_chart_service()
+        metrics = home_charts.metrics(self.data, self.table_versions)
+        total_inventory_value = metrics['total_inventory_value']
+        low_stock_count = metrics['low_stock_count']
+        total_sales = metrics['total_sales']
+        total_budget = metrics['total_budget']
+        waste_cost = metrics['waste_cost']
+        items_to_buy = metrics['items_to_buy']
+        estimated_cost = metrics['estimated_cost']
 
         # Note: Meal planning metrics calculation removed as variables were unused
 
@@ -7049,61 +7154,27 @@ For more information, please check the documentation or contact support.
                 canvas.setMinimumHeight(180)
                 self.canvas_layout.addWidget(canvas)
 
-        # Inventory by category chart
-        inventory_chart_widget = ChartWidget("Inventory by Category")
-
-        # Create the chart with better colors
-        if 'total_value' not in self.data['inventory'].columns:
-            if 'price_per_unit' in self.data['inventory'].columns and 'quantity' in self.data['inventory'].columns:
-                self.data['inventory']['total_value'] = self.data['inventory']['price_per_unit'] * self.data['inventory']['quantity']
-            else:
-                self.data['inventory']['total_value'] = 1
-
-        inventory_by_category = self.data['inventory'].groupby('category')['total_value'].sum().reset_index()
+        # Charts are rendered in the background and cached; a cached chart is shown at once
+        self.home_chart_images = {}
+        self.home_chart_keys = {}
 
-        # Use a modern color palette
-        colors = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e', '#e67e22']
+        def add_chart(chart, widget):
+            image = ChartImage()
+            widget.set_canvas(image)
+            key, pixmap = home_charts.request(chart, self.data, self.table_versions, self.currency_symbol,
+                                              dpi=100 * self.devicePixelRatioF(), device_type=device_type)
+            self.home_chart_images[chart] = image
+            self.home_chart_keys[chart] = key
+            if pixmap is not None:
+                image.set_chart_pixmap(pixmap)
 
-        # Use a larger figure size for the pie chart to ensure labels are visible
-        fig1, ax1 = plt.subplots(figsize=(6, 4), facecolor='white')
+        device_type = self.responsive_manager.current_device_type if self.responsive_manager else None
 
-        # Create a simple, clear pie chart
-        ax1.pie(
-            inventory_by_category['total_value'],
-            labels=inventory_by_category['category'],  # Direct labels on the pie
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors[:len(inventory_by_category)],
-            wedgeprops={'edgecolor': 'white', 'linewidth': 1},
-            textprops={'color': 'black', 'fontweight': 'bold', 'fontsize': 9}
-        )
-
-        # Ensure the pie is drawn as a circle
-        ax1.axis('equal')
-
-        # Remove the legend as we're using direct labels
-        plt.tight_layout(pad=1.5)
-
-        ax1.set_title('Inventory Value Distribution', fontsize=12, pad=20, color='#2c3e50')
-        ax1.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-
-        plt.tight_layout()
-
-        # Make chart responsive if responsive manager is available
-        if self.responsive_chart_manager:
-            self.responsive_chart_manager.make_figure_responsive(fig1)
-
-        # Create responsive canvas
-        canvas1 = FigureCanvas(fig1)
-        canvas1.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        # Add to responsive widget
-        inventory_chart_widget.set_canvas(canvas1)
+        # Inventory by category chart
+        inventory_chart_widget = ChartWidget("Inventory by Category")
+        add_chart('inventory_by_category', inventory_chart_widget)
         top_charts_layout.addWidget(inventory_chart_widget)
 
-        # Close the figure to prevent memory issues
-        plt.close(fig1)
-
         # Add Firebase cloud sync section for subscription model
         if self.firebase_manager and self.current_user:
             # Create a header for the cloud sync section
@@ -7142,142 +7213,33 @@ For more information, please check the documentation or contact support.
 
         # Waste tracking chart using the improved chart widget
         waste_chart_widget = ChartWidget("Waste by Reason")
-
-        # Create the chart with better styling
-        if 'cost' not in self.data['waste'].columns:
-            self.data['waste']['cost'] = 1
-
-        # Use a larger figure size for the waste chart to ensure labels are visible
-        fig2, ax2 = plt.subplots(figsize=(6, 4), facecolor='white')
-
-        if len(self.data['waste']) > 0 and 'reason' in self.data['waste'].columns:
-            waste_by_reason = self.data['waste'].groupby('reason')['cost'].sum().reset_index()
-
-            # Sort by cost to make the chart more readable
-            waste_by_reason = waste_by_reason.sort_values('cost', ascending=True)
-
-            # Create a horizontal bar chart with consistent colors
-            bars = ax2.barh(
-                waste_by_reason['reason'],
-                waste_by_reason['cost'],
-                color=colors[:len(waste_by_reason)],
-                height=0.5,
-                edgecolor='white',
-                linewidth=1
-            )
-
-            # Add data labels to the end of each bar
-            for bar in bars:
-                width = bar.get_width()
-                ax2.text(
-                    width + 0.05,
-                    bar.get_y() + bar.get_height()/2,
-                    f'{self.currency_symbol}{width:.0f}',  # Use dynamic currency symbol
-                    va='center',
-                    fontweight='bold',
-                    fontsize=9,
-                    color='#333333'
-                )
-        else:
-            # If no waste data, show empty chart with a message
-            ax2.text(0.5, 0.5, 'No waste data available',
-                     horizontalalignment='center',
-                     verticalalignment='center',
-                     transform=ax2.transAxes,
-                     fontsize=12,
-                     color='#7f8c8d')
-
-        # Improve chart styling with dynamic currency symbol
-        ax2.set_title('Waste Cost Analysis', fontsize=12, pad=20, color='#2c3e50')
-        ax2.set_xlabel(f'Cost ({self.currency_symbol})', fontsize=10, color='#7f8c8d')
-        ax2.spines['top'].set_visible(False)
-        ax2.spines['right'].set_visible(False)
-        ax2.spines['bottom'].set_color('#ecf0f1')
-        ax2.spines['left'].set_color('#ecf0f1')
-        ax2.tick_params(colors='#7f8c8d')
-        ax2.set_axisbelow(True)
-        ax2.grid(axis='x', linestyle='--', alpha=0.7, color='#ecf0f1')
-
-        plt.tight_layout()
-
-        # Make chart responsive if responsive manager is available
-        if self.responsive_chart_manager:
-            self.responsive_chart_manager.make_figure_responsive(fig2)
-
-        # Create responsive canvas
-        canvas2 = FigureCanvas(fig2)
-        canvas2.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        # Add to responsive widget
-        waste_chart_widget.set_canvas(canvas2)
+        add_chart('waste_by_reason', waste_chart_widget)
         top_charts_layout.addWidget(waste_chart_widget)
 
-        # Close the figure to prevent memory issues
-        plt.close(fig2)
-
         # Add inventory trend chart using the improved chart widget
         trend_chart_widget = ChartWidget("Inventory Value Trend")
         # Set a larger minimum height for the trend chart
         trend_chart_widget.setMinimumHeight(300)
-
-        # Create sample trend data (in a real app, this would come from historical data)
-        # For demonstration, we'll create synthetic data
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-
-        # Create different trend lines for different categories
-        categories = inventory_by_category['category'].unique()[:3]  # Use top 3 categories
-
-        # Use a larger figure size for the trend chart to ensure all elements are visible
-        fig3, ax3 = plt.subplots(figsize=(10, 5), facecolor='white')
-
-        # Generate synthetic trend data for each category - with more distinct values
-        import numpy as np
-        np.random.seed(42)  # Use a seed for consistent results
-
-        # Create distinct base values for better separation
-        base_values = [1500, 1000, 500]
-
-        for i, category in enumerate(categories):
-            if len(categories) > 0:
-                # Use predefined base values for better separation between lines
-                base_value = base_values[i % len(base_values)]
-                # Create smoother trends with less variation
-                trend = np.random.randint(-100, 200, size=len(months)) + base_value
-                ax3.plot(months, trend, marker='o', markersize=6, linewidth=2, label=category, color=colors[i])
-
-        # Improve chart styling with dynamic currency symbol
-        ax3.set_title('Inventory Value Trends by Category', fontsize=12, pad=20, color='#2c3e50')
-        ax3.set_xlabel('Month', fontsize=10, color='#7f8c8d')
-        ax3.set_ylabel(f'Value ({self.currency_symbol})', fontsize=10, color='#7f8c8d')
-        ax3.spines['top'].set_visible(False)
-        ax3.spines['right'].set_visible(False)
-        ax3.spines['bottom'].set_color('#ecf0f1')
-        ax3.spines['left'].set_color('#ecf0f1')
-        ax3.tick_params(colors='#7f8c8d')
-        ax3.grid(linestyle='--', alpha=0.7, color='#ecf0f1')
-        # Only create legend if there are labeled artists
-        if ax3.get_legend_handles_labels()[0]:
-            # Remove annotations as they cause clutter and overlap
-            # Instead, make the legend more prominent
-            ax3.legend(frameon=True, fontsize=10, loc='upper right',
-                      facecolor='white', edgecolor='#e0e0e0')
-
-        plt.tight_layout()
-
-        # Make chart responsive if responsive manager is available
-        if self.responsive_chart_manager:
-            self.responsive_chart_manager.make_figure_responsive(fig3)
-
-        # Create responsive canvas
-        canvas3 = FigureCanvas(fig3)
-        canvas3.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-        # Add to responsive widget
-        trend_chart_widget.set_canvas(canvas3)
+        add_chart('inventory_trend', trend_chart_widget)
         charts_layout.addWidget(trend_chart_widget)  # Add below the top charts
 
-        # Close the figure to prevent memory issues
-        plt.close(fig3)
+    def get_home_chart_service(self):
+        """The home page metrics and chart renderer, created on first use"""
+        if self.home_charts is None:
+            self.home_charts = HomeChartService(self, self.responsive_chart_manager)
+            self.home_charts.chart_ready.connect(self.on_home_chart_ready)
+        return self.home_charts
+
+    def on_home_chart_ready(self, chart, key, pixmap):
+        """Show a chart rendered in the background if the home page still waits for it"""
+        image = getattr(self, 'home_chart_images', {}).get(chart)
+        if image is None or self.home_chart_keys.get(chart) != key:
+            return
+        try:
+            image.set_chart_pixmap(pixmap)
+        except RuntimeError:
+            # The home page was left and its widgets deleted
+            self.home_chart_images.pop(chart, None)
 
     def show_inventory_page(self):
         """Display the inventory management page"""
@@ -7621,7 +7583,8 @@ For more information, please check the documentation or contact support.
         # Import the pricing management module
         try:
             from modules.pricing_management import PricingManagementWidget
-            pricing_widget = PricingManagementWidget(self.data)
+            pricing_widget = PricingManagementWidget(self.data, table_versions=self.table_versions)
+            self.pricing_widget = pricing_widget
             self.logger.info("Using pricing management widget")
         except Exception as e:
             # Create placeholder if module fails to load
@@ -7677,7 +7640,7 @@ For more information, please check the documentation or contact support.
         self.content_layout.addWidget(header_widget)
 
         # Create the expenses widget using our fixed module
-        # ExpensesWidget is already imported at the top of the file
+        from modules.expenses_fixed import ExpensesWidget
         expenses_widget = ExpensesWidget(self.data)
 
         # Set main app reference for data refresh functionality
@@ -7797,6 +7760,7 @@ For more information, please check the documentation or contact support.
         general_layout.setContentsMargins(20, 20, 20, 20)
 
         # Create the settings widget using our enhanced SettingsWidget class
+        from modules.settings_fixed import SettingsWidget
         self.settings_widget = SettingsWidget(main_app=self, parent=self, data=self.data)
 
         # Connect the currency_changed signal to our apply_currency_changes method
@@ -8449,6 +8413,7 @@ Note: Click 'Refresh All Data' after making changes to CSV files to see updates
         except Exception as e:
             # Fallback to original logs viewer
             self.logger.warning(f"Enhanced logs viewer not available: {e}")
+            from modules.logs_viewer import LogsViewerWidget
             logs_widget = LogsViewerWidget()
 
         logs_tabs.addTab(logs_widget, "📋 Application Logs")
@@ -10187,26 +10152,24 @@ if __name__ == "__main__":
 
         app = QApplication(sys.argv)
 
-        # Initialize main window first
+        # Show the loading screen first; it follows the real initialization phases
+        from modules.startup_loading_screen import show_startup_loading_screen
+        loading_screen = show_startup_loading_screen()
+
         logger.log_section_header("Application Initialization")
-        window = KitchenDashboardApp()
+        window = KitchenDashboardApp(loading_screen=loading_screen)
         logger.log_section_footer("Application Initialization", True)
 
-        # Show loading screen with main app reference
-        from modules.startup_loading_screen import show_startup_loading_screen
-        loading_screen = show_startup_loading_screen(window)
-
-        # Connect loading screen completion to show main window
-        def on_loading_finished():
-            logger.log_section_header("UI Display")
-            window.show()
-            logger.log_section_footer("UI Display", True)
-            logger.info("Application ready - entering main event loop")
+        # The loading screen reports time-to-interactive and closes once the window has painted
+        window.interactive.connect(lambda seconds: loading_screen.finish_loading(window, seconds))
 
-            # WhatsApp integration disabled - using standalone messaging system
-            # Messages are logged to shared JSON file for processing by standalone messenger
+        logger.log_section_header("UI Display")
+        window.show()
+        logger.log_section_footer("UI Display", True)
+        logger.info("Application ready - entering main event loop")
 
-        loading_screen.loading_finished.connect(on_loading_finished)
+        # WhatsApp integration disabled - using standalone messaging system
+        # Messages are logged to shared JSON file for processing by standalone messenger
 
         # Run the application
         exit_code = app.exec()
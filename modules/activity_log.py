@@ -0,0 +1,312 @@
+"""
+Activity Log for Kitchen Dashboard
+Append-only activity history stored in indexed daily SQLite segments
+"""
+
+import os
+import glob
+import json
+import sqlite3
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+SEGMENT_PREFIX = 'activities_'
+SEGMENT_SUFFIX = '.db'
+
+# Lists the legacy JSON files already imported into the segments
+LEGACY_MARKER = '.legacy_imported'
+
+# Columns pulled out of each record for filtering; the full record is stored as JSON
+INDEXED_COLUMNS = ('timestamp', 'activity_type', 'level', 'module', 'action', 'execution_time')
+
+
+class ActivityLog:
+    """
+    Activity history as one SQLite database per day.
+
+    ``append`` only buffers a record. ``flush`` writes the records added
+    since the previous flush into the segment of their day, in one
+    transaction per segment, so saving never rewrites history. Each segment
+    is indexed on timestamp, module, type and level. Queries open only the
+    segments that overlap the requested time range, newest first, and stop as
+    soon as ``limit`` records were found, so "the last 24 hours" or "the
+    latest 100" never scan older days. Segments older than
+    ``retention_days`` are deleted on ``rotate`` (kept forever when None).
+    """
+
+    def __init__(self, directory: str, retention_days: Optional[int] = None):
+        self.directory = directory
+        self.retention_days = retention_days
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._pending: List[Dict[str, Any]] = []
+        self._connections: Dict[str, sqlite3.Connection] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def segment_path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{day}{SEGMENT_SUFFIX}")
+
+    def segment_days(self) -> List[str]:
+        """Days with a segment, newest first"""
+        prefix = os.path.join(self.directory, SEGMENT_PREFIX)
+        days = [path[len(prefix):-len(SEGMENT_SUFFIX)]
+                for path in glob.glob(f"{prefix}*{SEGMENT_SUFFIX}")]
+        return sorted(days, reverse=True)
+
+    def _connection(self, day: str) -> sqlite3.Connection:
+        conn = self._connections.get(day)
+        if conn is None:
+            conn = sqlite3.connect(self.segment_path(day), check_same_thread=False, isolation_level=None)
+            try:
+                self._prepare(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._connections[day] = conn
+        return conn
+
+    @staticmethod
+    def _prepare(conn: sqlite3.Connection):
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS activities (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                activity_type TEXT NOT NULL,
+                level TEXT NOT NULL,
+                module TEXT NOT NULL,
+                action TEXT NOT NULL,
+                execution_time REAL,
+                record TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_activities_timestamp ON activities (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activities_module ON activities (module, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activities_type ON activities (activity_type, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_activities_level ON activities (level, timestamp);
+        """)
+
+    def _close_past_segments(self, today: Optional[str] = None):
+        """Close the connections of segments before ``today`` (only today's segment keeps being written)"""
+        today = today or date.today().isoformat()
+        for day in [day for day in self._connections if day < today]:
+            self._connections.pop(day).close()
+
+    def rotate(self, today: Optional[date] = None) -> int:
+        """Close segments of past days and delete those past retention; returns segments deleted"""
+        today = (today or date.today()).isoformat()
+        removed = 0
+        with self._lock:
+            self.flush()
+            self._close_past_segments(today)
+            if self.retention_days is None:
+                return 0
+            cutoff = (date.fromisoformat(today) - timedelta(days=self.retention_days)).isoformat()
+            for day in self.segment_days():
+                if day < cutoff:
+                    for suffix in ('', '-wal', '-shm'):
+                        path = self.segment_path(day) + suffix
+                        if os.path.exists(path):
+                            os.remove(path)
+                    removed += 1
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]):
+        """Buffer a record (a dict with at least the indexed columns) for the next flush"""
+        with self._lock:
+            self._pending.append(record)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write records added since the last flush; returns how many were written"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+            by_day: Dict[str, List[Dict[str, Any]]] = {}
+            for record in pending:
+                by_day.setdefault(str(record['timestamp'])[:10], []).append(record)
+
+            written = 0
+            for day, records in sorted(by_day.items()):
+                try:
+                    self._write(day, records)
+                    written += len(records)
+                except Exception as e:
+                    self.logger.error(f"Error writing activities for {day}: {e}")
+                    self._pending.extend(records)
+            return written
+
+    def _write(self, day: str, records: Iterable[Dict[str, Any]]):
+        conn = self._connection(day)
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                f"INSERT INTO activities ({', '.join(INDEXED_COLUMNS)}, record) "
+                f"VALUES ({', '.join('?' * (len(INDEXED_COLUMNS) + 1))})",
+                [(
+                    str(r['timestamp']), str(r['activity_type']), str(r['level']), str(r['module']),
+                    str(r['action']), r.get('execution_time'), json.dumps(r, default=str)
+                ) for r in records]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        """Delete every segment"""
+        with self._lock:
+            self._pending = []
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+            for day in self.segment_days():
+                for suffix in ('', '-wal', '-shm'):
+                    path = self.segment_path(day) + suffix
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def import_legacy_json(self, paths: Iterable[str]) -> int:
+        """One-time import of the JSON activity files used before the log; returns records imported"""
+        marker = os.path.join(self.directory, LEGACY_MARKER)
+        imported = set()
+        if os.path.exists(marker):
+            with open(marker, 'r', encoding='utf-8') as f:
+                imported = set(json.load(f))
+
+        count = 0
+        for path in paths:
+            name = os.path.basename(path)
+            if name in imported or not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+                for record in records:
+                    if isinstance(record, dict) and all(record.get(c) is not None for c in INDEXED_COLUMNS[:5]):
+                        self.append(record)
+                        count += 1
+                self.flush()
+                imported.add(name)
+            except Exception as e:
+                self.logger.error(f"Error importing activities from {path}: {e}")
+
+        with open(marker, 'w', encoding='utf-8') as f:
+            json.dump(sorted(imported), f)
+        if count:
+            self.logger.info(f"Imported {count} activities from legacy JSON files")
+        return count
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _days_between(self, start: Optional[str], end: Optional[str]) -> List[str]:
+        return [day for day in self.segment_days()
+                if (start is None or day >= start[:10]) and (end is None or day <= end[:10])]
+
+    @staticmethod
+    def _where(activity_type=None, level=None, module=None, module_contains=None, start=None, end=None):
+        clauses, params = [], []
+        for column, value in (('activity_type', activity_type), ('level', level), ('module', module)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if module_contains:
+            clauses.append("module LIKE ? ESCAPE '\\'")
+            escaped = module_contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        if start:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def query(self, activity_type: Optional[str] = None, level: Optional[str] = None,
+              module: Optional[str] = None, module_contains: Optional[str] = None,
+              start: Optional[str] = None, end: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Matching records, newest first (ISO timestamps for ``start`` / ``end``)"""
+        where, params = self._where(activity_type, level, module, module_contains, start, end)
+        records = []
+        with self._lock:
+            self.flush()
+            for day in self._days_between(start, end):
+                remaining = None if limit is None else limit - len(records)
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    rows = self._connection(day).execute(
+                        f"SELECT record FROM activities {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                        params + [-1 if remaining is None else remaining]
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    # One damaged day must not hide the rest of the history
+                    self.logger.error(f"Error reading activities for {day}: {e}")
+                    continue
+                records.extend(json.loads(row[0]) for row in rows)
+            self._close_past_segments()
+        return records
+
+    def summary(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """Counts by type, level and module and the mean execution time, computed in SQL"""
+        where, params = self._where(start=start, end=end)
+        by_type: Dict[str, int] = {}
+        by_level: Dict[str, int] = {}
+        by_module: Dict[str, int] = {}
+        total = 0
+        timed = 0
+        time_sum = 0.0
+        with self._lock:
+            self.flush()
+            for day in self._days_between(start, end):
+                try:
+                    conn = self._connection(day)
+                    day_counts = [
+                        conn.execute(f"SELECT {column}, COUNT(*) FROM activities {where} GROUP BY {column}",
+                                     params).fetchall()
+                        for column in ('activity_type', 'level', 'module')
+                    ]
+                    row = conn.execute(
+                        f"SELECT COUNT(*), COUNT(execution_time), COALESCE(SUM(execution_time), 0) "
+                        f"FROM activities {where}", params).fetchone()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Error reading activities for {day}: {e}")
+                    continue
+                for counts, rows in zip((by_type, by_level, by_module), day_counts):
+                    for value, count in rows:
+                        counts[value] = counts.get(value, 0) + count
+                total += row[0]
+                timed += row[1]
+                time_sum += row[2]
+            self._close_past_segments()
+        return {
+            'total': total,
+            'by_type': by_type,
+            'by_level': by_level,
+            'by_module': by_module,
+            'performance_avg': time_sum / timed if timed else 0,
+        }
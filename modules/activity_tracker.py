@@ -4,7 +4,7 @@ Comprehensive tracking of user actions, system events, and performance metrics
 """
 
 import os
-import json
+import glob
 import logging
 import traceback
 from datetime import datetime, timedelta
@@ -15,6 +15,8 @@ import pandas as pd
 from PySide6.QtCore import QObject, Signal, QTimer, QThread
 from PySide6.QtWidgets import QApplication
 
+from modules.activity_log import ActivityLog
+
 class ActivityType(Enum):
     """Types of activities to track"""
     USER_ACTION = "user_action"
@@ -67,18 +69,18 @@ class ActivityTracker(QObject):
     
     activity_logged = Signal(ActivityRecord)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, data_dir: str = 'data'):
         super().__init__(parent)
         self.logger = logging.getLogger(__name__)
         
         # Initialize tracking data
-        self.activities: List[ActivityRecord] = []
         self.session_id = self.generate_session_id()
         self.user_id = "anonymous"  # Will be updated when user logs in
         
-        # File paths
-        self.activities_file = "data/activities.json"
-        self.daily_activities_dir = "data/daily_activities"
+        # File paths (activities.json and daily JSON files are only read once, for import)
+        self.activities_file = os.path.join(data_dir, "activities.json")
+        self.daily_activities_dir = os.path.join(data_dir, "daily_activities")
+        self.activity_log = ActivityLog(self.daily_activities_dir)
         
         # Performance tracking
         self.performance_metrics = {}
@@ -87,7 +89,7 @@ class ActivityTracker(QObject):
         # Load existing activities
         self.load_activities()
         
-        # Setup periodic save
+        # Setup periodic save (appends only the activities logged since the last save)
         self.save_timer = QTimer()
         self.save_timer.timeout.connect(self.save_activities)
         self.save_timer.start(30000)  # Save every 30 seconds
@@ -274,7 +276,7 @@ class ActivityTracker(QObject):
             metadata=metadata
         )
         
-        self.activities.append(activity)
+        self.activity_log.append(asdict(activity))
         self.activity_logged.emit(activity)
         
         # Also log to standard logger
@@ -287,140 +289,72 @@ class ActivityTracker(QObject):
                       module: Optional[str] = None,
                       start_time: Optional[datetime] = None,
                       end_time: Optional[datetime] = None,
-                      limit: Optional[int] = None) -> List[ActivityRecord]:
-        """Get filtered activities"""
-        
-        filtered_activities = self.activities.copy()
-        
-        # Apply filters
-        if activity_type:
-            filtered_activities = [a for a in filtered_activities if a.activity_type == activity_type.value]
-        
-        if level:
-            filtered_activities = [a for a in filtered_activities if a.level == level.value]
-        
-        if module:
-            filtered_activities = [a for a in filtered_activities if a.module == module]
-        
-        if start_time:
-            start_iso = start_time.isoformat()
-            filtered_activities = [a for a in filtered_activities if a.timestamp >= start_iso]
-        
-        if end_time:
-            end_iso = end_time.isoformat()
-            filtered_activities = [a for a in filtered_activities if a.timestamp <= end_iso]
-        
-        # Sort by timestamp (newest first)
-        filtered_activities.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        # Apply limit
-        if limit:
-            filtered_activities = filtered_activities[:limit]
-        
-        return filtered_activities
+                      limit: Optional[int] = None,
+                      module_contains: Optional[str] = None) -> List[ActivityRecord]:
+        """Get filtered activities (newest first), read from the indexed activity log"""
+        try:
+            records = self.activity_log.query(
+                activity_type=activity_type.value if activity_type else None,
+                level=level.value if level else None,
+                module=module,
+                module_contains=module_contains,
+                start=start_time.isoformat() if start_time else None,
+                end=end_time.isoformat() if end_time else None,
+                limit=limit or None
+            )
+            return [ActivityRecord(**record) for record in records]
+        except Exception as e:
+            self.logger.error(f"Error querying activities: {e}")
+            return []
     
     def get_activity_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get activity summary for the last N hours"""
         start_time = datetime.now() - timedelta(hours=hours)
-        recent_activities = self.get_activities(start_time=start_time)
+        counts = self.activity_log.summary(start=start_time.isoformat())
         
         summary = {
-            "total_activities": len(recent_activities),
-            "by_type": {},
-            "by_level": {},
-            "by_module": {},
-            "errors": 0,
-            "performance_avg": 0,
+            "total_activities": counts["total"],
+            "by_type": counts["by_type"],
+            "by_level": counts["by_level"],
+            "by_module": counts["by_module"],
+            "errors": counts["by_level"].get(ActivityLevel.ERROR.value, 0),
+            "performance_avg": counts["performance_avg"],
             "most_active_module": None
         }
         
-        # Count by type, level, module
-        for activity in recent_activities:
-            # By type
-            summary["by_type"][activity.activity_type] = summary["by_type"].get(activity.activity_type, 0) + 1
-            
-            # By level
-            summary["by_level"][activity.level] = summary["by_level"].get(activity.level, 0) + 1
-            
-            # By module
-            summary["by_module"][activity.module] = summary["by_module"].get(activity.module, 0) + 1
-            
-            # Count errors
-            if activity.level == ActivityLevel.ERROR.value:
-                summary["errors"] += 1
-        
         # Find most active module
         if summary["by_module"]:
             summary["most_active_module"] = max(summary["by_module"], key=summary["by_module"].get)
         
-        # Calculate average performance
-        performance_activities = [a for a in recent_activities if a.execution_time is not None]
-        if performance_activities:
-            summary["performance_avg"] = sum(a.execution_time for a in performance_activities) / len(performance_activities)
-        
         return summary
     
     def save_activities(self):
-        """Save activities to file"""
+        """Append activities logged since the last save to the activity log"""
         try:
-            os.makedirs(os.path.dirname(self.activities_file), exist_ok=True)
-            
-            # Convert activities to dict format
-            activities_data = [asdict(activity) for activity in self.activities]
-            
-            with open(self.activities_file, 'w') as f:
-                json.dump(activities_data, f, indent=2)
-                
+            self.activity_log.flush()
         except Exception as e:
             self.logger.error(f"Error saving activities: {e}")
     
     def load_activities(self):
-        """Load activities from file"""
+        """Import the pre-log JSON history (activities.json and daily JSON files) once"""
         try:
-            if os.path.exists(self.activities_file):
-                with open(self.activities_file, 'r') as f:
-                    activities_data = json.load(f)
-                
-                self.activities = [ActivityRecord(**data) for data in activities_data]
-                self.logger.info(f"Loaded {len(self.activities)} activities from file")
-            
+            legacy_files = [self.activities_file] + sorted(
+                glob.glob(os.path.join(self.daily_activities_dir, "activities_*.json")))
+            self.activity_log.import_legacy_json(legacy_files)
         except Exception as e:
             self.logger.error(f"Error loading activities: {e}")
-            self.activities = []
+    
+    def clear_activities(self):
+        """Delete the whole activity history"""
+        try:
+            self.activity_log.clear()
+        except Exception as e:
+            self.logger.error(f"Error clearing activities: {e}")
     
     def rotate_daily_logs(self):
-        """Rotate logs daily to prevent file size issues"""
+        """Close the segments of past days (each day is written to its own segment)"""
         try:
-            today = datetime.now().date()
-            
-            # Create daily activities directory
-            os.makedirs(self.daily_activities_dir, exist_ok=True)
-            
-            # Move old activities to daily file
-            old_activities = []
-            current_activities = []
-            
-            for activity in self.activities:
-                activity_date = datetime.fromisoformat(activity.timestamp).date()
-                if activity_date < today:
-                    old_activities.append(activity)
-                else:
-                    current_activities.append(activity)
-            
-            # Save old activities to daily file
-            if old_activities:
-                yesterday = today - timedelta(days=1)
-                daily_file = os.path.join(self.daily_activities_dir, f"activities_{yesterday.isoformat()}.json")
-                
-                activities_data = [asdict(activity) for activity in old_activities]
-                with open(daily_file, 'w') as f:
-                    json.dump(activities_data, f, indent=2)
-                
-                self.logger.info(f"Rotated {len(old_activities)} activities to {daily_file}")
-            
-            # Keep only current activities in memory
-            self.activities = current_activities
-            
+            self.activity_log.rotate()
         except Exception as e:
             self.logger.error(f"Error rotating daily logs: {e}")
     
@@ -464,11 +398,11 @@ class ActivityTracker(QObject):
 # Global activity tracker instance
 _activity_tracker = None
 
-def get_activity_tracker():
+def get_activity_tracker(data_dir: str = 'data'):
     """Get global activity tracker instance"""
     global _activity_tracker
     if _activity_tracker is None:
-        _activity_tracker = ActivityTracker()
+        _activity_tracker = ActivityTracker(data_dir=data_dir)
     return _activity_tracker
 
 # Convenience functions for easy tracking
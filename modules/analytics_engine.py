@@ -17,6 +17,9 @@ import seaborn as sns
 from PySide6.QtCore import QObject, Signal, QTimer, QThread
 from PySide6.QtWidgets import QApplication
 
+from modules.shared_cache import get_cache
+from modules.daily_cube import get_daily_cube
+
 # Import activity tracker
 try:
     from .activity_tracker import track_user_action, track_performance_start, track_performance_end, track_system_event
@@ -91,13 +94,15 @@ class AnalyticsEngine(QObject):
         self.logger = logging.getLogger(__name__)
         self.data = data
 
-        # Analytics cache
-        self.metrics_cache = {}
-        self.insights_cache = []
-        self.last_update = None
-
         # Configuration
         self.cache_duration = 300  # 5 minutes
+        self.period_days = 30  # Revenue and cost metrics cover this many days
+
+        # Analytics cache: computed metrics expire after cache_duration seconds
+        self.metrics_cache = get_cache('analytics_metrics', max_size=16, ttl=self.cache_duration)
+        self.metrics_cache_key = object()
+        self.insights_cache = []
+        self.last_update = None
 
         # Setup periodic analytics updates
         self.update_timer = QTimer()
@@ -118,29 +123,23 @@ class AnalyticsEngine(QObject):
             if 'sales' not in self.data or self.data['sales'].empty:
                 return results
 
-            sales_df = self.data['sales'].copy()
+            sales_df = self.data['sales']
 
-            # Ensure date column exists and is datetime
             if 'date' in sales_df.columns:
-                sales_df['date'] = pd.to_datetime(sales_df['date'], errors='coerce')
-
-                # Filter for the specified period
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=period_days)
-                current_period = sales_df[
-                    (sales_df['date'] >= start_date) & (sales_df['date'] <= end_date)
-                ]
+                # Period totals come from the daily sales cube, not the raw rows
+                sales_cube = get_daily_cube('sales')
+                today = datetime.now().date()
+                start_date = today - timedelta(days=period_days - 1)
+                current_period = sales_cube.totals(sales_df, start_date, today)
 
                 # Previous period for comparison
                 prev_start = start_date - timedelta(days=period_days)
-                prev_end = start_date
-                previous_period = sales_df[
-                    (sales_df['date'] >= prev_start) & (sales_df['date'] < prev_end)
-                ]
+                prev_end = start_date - timedelta(days=1)
+                previous_period = sales_cube.totals(sales_df, prev_start, prev_end)
 
                 # Total Revenue
-                current_revenue = current_period['total_amount'].sum() if 'total_amount' in current_period.columns else 0
-                previous_revenue = previous_period['total_amount'].sum() if 'total_amount' in previous_period.columns else 0
+                current_revenue = current_period['revenue']
+                previous_revenue = previous_period['revenue']
 
                 revenue_change = ((current_revenue - previous_revenue) / previous_revenue * 100) if previous_revenue > 0 else 0
                 revenue_trend = "up" if revenue_change > 5 else "down" if revenue_change < -5 else "stable"
@@ -156,10 +155,10 @@ class AnalyticsEngine(QObject):
                 )
 
                 # Average Order Value
-                current_orders = len(current_period)
+                current_orders = int(current_period['count'])
                 avg_order_value = current_revenue / current_orders if current_orders > 0 else 0
 
-                prev_orders = len(previous_period)
+                prev_orders = int(previous_period['count'])
                 prev_avg_order = previous_revenue / prev_orders if prev_orders > 0 else 0
 
                 aov_change = ((avg_order_value - prev_avg_order) / prev_avg_order * 100) if prev_avg_order > 0 else 0
@@ -176,12 +175,12 @@ class AnalyticsEngine(QObject):
                 )
 
                 # Daily Revenue Trend
-                daily_revenue = current_period.groupby(current_period['date'].dt.date)['total_amount'].sum()
+                daily_revenue = sales_cube.by(sales_df, 'date', start_date, today)['revenue']
                 revenue_trend_data = daily_revenue.values.tolist()
 
                 results['daily_revenue_trend'] = AnalyticsResult(
                     metric="daily_revenue_trend",
-                    value=daily_revenue.mean(),
+                    value=daily_revenue.mean() if len(daily_revenue) else 0,
                     change_percentage=0,  # Will be calculated based on trend
                     trend="stable",
                     period=f"{period_days}_days",
@@ -229,19 +228,22 @@ class AnalyticsEngine(QObject):
 
             # Waste costs
             if 'waste' in self.data and not self.data['waste'].empty:
-                waste_df = self.data['waste'].copy()
+                waste_df = self.data['waste']
 
                 if 'cost' in waste_df.columns:
-                    total_waste_cost = waste_df['cost'].sum()
+                    waste_cube = get_daily_cube('waste')
+                    waste_totals = waste_cube.totals(waste_df)
+                    today = datetime.now().date()
+                    period_cost = waste_cube.totals(waste_df, today - timedelta(days=period_days - 1), today)['cost']
 
                     results['waste_cost'] = AnalyticsResult(
                         metric="waste_cost",
-                        value=total_waste_cost,
+                        value=waste_totals['cost'],
                         change_percentage=0,  # Would need historical data
                         trend="stable",
                         period=f"{period_days}_days",
                         timestamp=datetime.now().isoformat(),
-                        metadata={"waste_items": len(waste_df)}
+                        metadata={"waste_items": int(waste_totals['count']), "period_cost": period_cost}
                     )
 
             # Budget analysis
@@ -469,17 +471,21 @@ class AnalyticsEngine(QObject):
 
     def update_analytics(self):
         """Update all analytics metrics"""
-        try:
-            track_user_action("analytics_engine", "update_analytics", "Updating analytics metrics")
+        track_user_action("analytics_engine", "update_analytics", "Updating analytics metrics")
+        return self._current_metrics()
 
+    def _current_metrics(self) -> Dict[str, AnalyticsResult]:
+        """Metrics for the current period, from the cache or calculated once"""
+        try:
             # Check if cache is still valid
-            if (self.last_update and
-                (datetime.now() - self.last_update).seconds < self.cache_duration):
-                return self.metrics_cache
+            cache_key = (self.metrics_cache_key, self.period_days)
+            cached = self.metrics_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
             # Calculate all metrics
-            revenue_metrics = self.calculate_revenue_metrics()
-            cost_metrics = self.calculate_cost_metrics()
+            revenue_metrics = self.calculate_revenue_metrics(self.period_days)
+            cost_metrics = self.calculate_cost_metrics(self.period_days)
             inventory_metrics = self.calculate_inventory_analytics()
             recipe_metrics = self.calculate_recipe_analytics()
 
@@ -495,7 +501,7 @@ class AnalyticsEngine(QObject):
             insights = self.generate_business_insights(all_metrics)
 
             # Update cache
-            self.metrics_cache = all_metrics
+            self.metrics_cache.put(cache_key, all_metrics)
             self.last_update = datetime.now()
 
             # Emit updated analytics
@@ -509,11 +515,13 @@ class AnalyticsEngine(QObject):
             self.logger.error(f"Error updating analytics: {e}")
             return {}
 
-    def get_metrics(self, force_refresh: bool = False) -> Dict[str, AnalyticsResult]:
-        """Get current analytics metrics"""
-        if force_refresh or not self.metrics_cache:
-            return self.update_analytics()
-        return self.metrics_cache
+    def get_metrics(self, force_refresh: bool = False, period_days: Optional[int] = None) -> Dict[str, AnalyticsResult]:
+        """Get current analytics metrics (over ``period_days``, default the last period asked for)"""
+        if period_days is not None:
+            self.period_days = period_days
+        if force_refresh:
+            self.metrics_cache.invalidate((self.metrics_cache_key, self.period_days))
+        return self._current_metrics()
 
     def get_insights(self) -> List[BusinessInsight]:
         """Get current business insights"""
@@ -3,14 +3,23 @@ Asynchronous Cloud Sync Worker for Kitchen Dashboard v1.0.6
 Handles background cloud sync operations with progress tracking and UI responsiveness
 """
 
+import os
 import logging
-import time
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
 from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
 from PySide6.QtWidgets import QApplication
 
+from modules.firestore_serializer import serialize_dataframe, METADATA_FIELDS
+from modules.cloud_delta_sync import (
+    UploadManifest, upload_delta, publish_delta, MANIFEST_FILENAME, WATERMARK_READS, WATERMARK_WRITES
+)
+from modules.cloud_sync_manager import ConflictResolution
+from modules.dataframe_merge import MergeBaseStore, three_way_merge
+
 
 class AsyncCloudSyncWorker(QThread):
     """
@@ -24,6 +33,11 @@ class AsyncCloudSyncWorker(QThread):
     operation_completed = Signal(dict)  # result_data
     error_occurred = Signal(dict)    # error_data
     
+    # Concurrent pipeline limits: collections processed at once, and Firestore
+    # round trips (batch commits / collection streams) in flight across all of them
+    MAX_PARALLEL_COLLECTIONS = 4
+    MAX_IN_FLIGHT_BATCHES = 6
+    
     def __init__(self, operation_type, firebase_manager, cloud_sync_settings, data=None, parent=None):
         super().__init__(parent)
         self.operation_type = operation_type
@@ -41,6 +55,11 @@ class AsyncCloudSyncWorker(QThread):
         self.processed_records = 0
         self.current_collection = ""
         self.start_time = None
+        self._progress_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(self.MAX_IN_FLIGHT_BATCHES)
+
+        # Snapshot of every table as of the last sync, the base for smart sync merges
+        self.merge_base = MergeBaseStore()
 
         # Validate Firebase manager on initialization
         self.firebase_available = self.validate_firebase_manager()
@@ -129,115 +148,134 @@ class AsyncCloudSyncWorker(QThread):
     def perform_upload(self):
         """Perform asynchronous upload operation"""
         try:
-            if not self.data:
-                raise ValueError("No data provided for upload")
-
-            # Check if data is empty
-            if not any(not df.empty for df in self.data.values()):
-                self.logger.warning("All data collections are empty")
-                self.operation_completed.emit({
-                    'success': False,
-                    'operation_type': 'upload',
-                    'message': "No data to upload - all collections are empty",
-                    'data': None
-                })
-                return
+            self.upload_all()
+        except Exception as e:
+            self.logger.error(f"Upload error: {e}")
+            self.error_occurred.emit({
+                'error': str(e),
+                'operation_type': 'upload'
+            })
+    
+    def upload_all(self):
+        """Upload every collection's changes (raises when any collection fails)"""
+        if not self.data:
+            raise ValueError("No data provided for upload")
 
-            user_id = self.cloud_sync_settings.get('user_id')
-            if not user_id:
-                raise ValueError("No user ID available")
+        # Check if data is empty
+        if not any(not df.empty for df in self.data.values()):
+            self.logger.warning("All data collections are empty")
+            self.operation_completed.emit({
+                'success': False,
+                'operation_type': 'upload',
+                'message': "No data to upload - all collections are empty",
+                'data': None
+            })
+            return
 
-            # Calculate total records (only non-empty DataFrames)
-            self.total_records = sum(len(df) for df in self.data.values() if not df.empty)
-            self.processed_records = 0
+        user_id = self.cloud_sync_settings.get('user_id')
+        if not user_id:
+            raise ValueError("No user ID available")
 
-            if self.total_records == 0:
-                self.logger.warning("No records found to upload")
-                self.operation_completed.emit({
-                    'success': False,
-                    'operation_type': 'upload',
-                    'message': "No records found to upload",
-                    'data': None
-                })
-                return
+        # Calculate total records (only non-empty DataFrames)
+        self.total_records = sum(len(df) for df in self.data.values() if not df.empty)
+        self.processed_records = 0
 
-            self.emit_status("uploading", f"Uploading {len(self.data)} collections ({self.total_records} records) to cloud...")
-            self.emit_progress(0, "Preparing upload...", 0, self.total_records)
-            
-            # Upload each collection
-            for i, (collection_name, df) in enumerate(self.data.items()):
-                if self.is_cancelled():
-                    return
-                
-                if df.empty:
-                    continue
-                
-                self.current_collection = collection_name
-                self.emit_status("uploading", f"Uploading {collection_name}...")
-                
-                # Upload collection with progress tracking
-                self.upload_collection(collection_name, df, user_id)
-                
-                # Update overall progress
-                collection_progress = int(((i + 1) / len(self.data)) * 100)
-                self.emit_progress(collection_progress, f"Uploaded {collection_name}", 
-                                 self.processed_records, self.total_records)
-            
-            # Complete upload
-            self.emit_progress(100, "Upload completed", self.total_records, self.total_records)
+        if self.total_records == 0:
+            self.logger.warning("No records found to upload")
             self.operation_completed.emit({
-                'success': True,
+                'success': False,
                 'operation_type': 'upload',
-                'message': f"Successfully uploaded {self.processed_records} records",
+                'message': "No records found to upload",
                 'data': None
             })
-            
-        except Exception as e:
-            self.logger.error(f"Upload error: {e}")
-            self.error_occurred.emit({
-                'error': str(e),
-                'operation_type': 'upload'
-            })
+            return
+
+        self.emit_status("uploading", f"Uploading {len(self.data)} collections ({self.total_records} records) to cloud...")
+        self.emit_progress(0, "Preparing upload...", 0, self.total_records)
+        
+        # Plan the writes against what was uploaded last time, trimmed to today's Firestore quota
+        manifest = self.get_upload_manifest()
+        deltas = {name: manifest.plan(user_id, name, df) for name, df in self.data.items() if not df.empty}
+        deferred = {}
+        planner = getattr(self.firebase_manager, 'quota_planner', None)
+        if planner is not None:
+            plan = planner.plan_upload(deltas.values(), reads_per_table=WATERMARK_READS,
+                                       writes_per_table=WATERMARK_WRITES)
+            deltas = {delta.table_name: delta for delta in plan.deltas}
+            deferred = plan.deferred
+            if deferred:
+                self.emit_status("uploading", f"Daily Firestore quota reached: {sum(deferred.values())} "
+                                              f"writes deferred to the next sync")
+        
+        # Upload the collections concurrently, reporting each one as it finishes
+        collections = list(deltas)
+        
+        def upload(name):
+            self.upload_collection(name, deltas[name], user_id)
+        
+        for completed, (collection_name, _) in enumerate(self.run_concurrently(collections, upload), start=1):
+            self.current_collection = collection_name
+            collection_progress = int((completed / len(collections)) * 100)
+            self.emit_progress(collection_progress, f"Uploaded {collection_name}", 
+                             self.processed_records, self.total_records)
+        
+        if self.is_cancelled():
+            return
+        
+        # Local and cloud now agree (except deferred tables): the base for the next merge
+        self.merge_base.save_all({name: df for name, df in self.data.items() if name not in deferred})
+        
+        # Complete upload
+        message = f"Successfully uploaded {self.processed_records} records"
+        if deferred:
+            message += f" ({sum(deferred.values())} deferred by the daily quota)"
+        self.emit_progress(100, "Upload completed", self.total_records, self.total_records)
+        self.operation_completed.emit({
+            'success': True,
+            'operation_type': 'upload',
+            'message': message,
+            'data': None
+        })
+    
+    def get_upload_manifest(self):
+        """Manifest of the rows already uploaded (shared with the Firebase manager when it has one)"""
+        manifest = getattr(self.firebase_manager, 'upload_manifest', None)
+        if manifest is None:
+            manifest = UploadManifest(os.path.join("data", MANIFEST_FILENAME))
+            self.firebase_manager.upload_manifest = manifest
+        return manifest
     
-    def upload_collection(self, collection_name, df, user_id):
-        """Upload a single collection with batch processing"""
+    def upload_collection(self, collection_name, delta, user_id):
+        """Upload a single collection's planned delta with batch processing"""
         try:
             if not self.firebase_manager or not self.firebase_manager.db:
                 raise ValueError("Firebase not available")
             
-            # Convert DataFrame to optimized format
-            records = self.optimize_dataframe_for_firestore(df)
-            batch_size = 100  # Firestore batch limit
+            manifest = self.get_upload_manifest()
             
-            # Process in batches
-            for i in range(0, len(records), batch_size):
-                if self.is_cancelled():
-                    return
-                
-                batch_records = records[i:i + batch_size]
-                
-                # Create Firestore batch
-                batch = self.firebase_manager.db.batch()
-                
-                for record in batch_records:
-                    doc_ref = (self.firebase_manager.db
-                              .collection('users')
-                              .document(user_id)
-                              .collection(collection_name)
-                              .document())
-                    batch.set(doc_ref, record)
-                
-                # Commit batch
-                batch.commit()
-                self.processed_records += len(batch_records)
-                
-                # Update progress within collection
-                collection_progress = int((i + len(batch_records)) / len(records) * 100)
+            if self.is_cancelled():
+                return
+            self.emit_status("uploading", f"Uploading {collection_name}...")
+            self.add_processed_records(delta.unchanged)
+            
+            committed = 0
+            
+            def on_batch(count):
+                nonlocal committed
+                committed += count
+                processed = self.add_processed_records(count)
                 self.emit_status("uploading", 
-                               f"Uploading {collection_name}: {self.processed_records}/{self.total_records} records")
-                
-                # Small delay to prevent overwhelming Firebase
-                time.sleep(0.1)
+                               f"Uploading {collection_name}: {processed}/{self.total_records} records")
+            
+            # Commits share the in-flight limit with the other collections' uploads. Whatever
+            # was committed is published, even when the upload was cancelled or failed part-way.
+            try:
+                upload_delta(self.firebase_manager.db, user_id, delta, manifest,
+                             batch_size=100, on_batch=on_batch, is_cancelled=self.is_cancelled,
+                             throttle=self._in_flight)
+            finally:
+                publish_delta(self.firebase_manager.db, user_id, delta, committed,
+                              len(self.data[collection_name]))
                 
         except Exception as e:
             self.logger.error(f"Error uploading collection {collection_name}: {e}")
@@ -257,24 +295,25 @@ class AsyncCloudSyncWorker(QThread):
             
             downloaded_data = {}
             
-            for i, collection_name in enumerate(collections):
-                if self.is_cancelled():
-                    return
-                
+            def download(name):
+                return self.download_collection(name, user_id)
+            
+            # Download the collections concurrently, reporting each one as it finishes
+            for completed, (collection_name, collection_data) in enumerate(
+                    self.run_concurrently(collections, download), start=1):
                 self.current_collection = collection_name
-                self.emit_status("downloading", f"Downloading {collection_name}...")
-                
-                # Download collection
-                collection_data = self.download_collection(collection_name, user_id)
                 
                 if collection_data is not None and not collection_data.empty:
                     downloaded_data[collection_name] = collection_data
                 
                 # Update progress
-                progress = int(((i + 1) / len(collections)) * 100)
-                self.emit_progress(progress, f"Downloaded {collection_name}", i + 1, len(collections))
-                
-                time.sleep(0.1)  # Prevent overwhelming Firebase
+                progress = int((completed / len(collections)) * 100)
+                self.emit_progress(progress, f"Downloaded {collection_name}", completed, len(collections))
+            
+            if self.is_cancelled():
+                return
+            
+            self.merge_base.save_all(downloaded_data)
             
             # Complete download
             self.emit_progress(100, "Download completed", len(collections), len(collections))
@@ -298,32 +337,40 @@ class AsyncCloudSyncWorker(QThread):
             if not self.firebase_manager or not self.firebase_manager.db:
                 raise ValueError("Firebase not available")
             
+            if self.is_cancelled():
+                return None
+            self.emit_status("downloading", f"Downloading {collection_name}...")
+            
             collection_ref = (self.firebase_manager.db
                             .collection('users')
                             .document(user_id)
                             .collection(collection_name))
             
-            docs = collection_ref.stream()
             records = []
+            doc_ids = []
             
-            for doc in docs:
-                if self.is_cancelled():
-                    return None
-                
-                doc_data = doc.to_dict()
-                # Remove metadata fields
-                doc_data.pop('_sync_timestamp', None)
-                doc_data.pop('_record_hash', None)
-                records.append(doc_data)
-            
-            if records:
-                return pd.DataFrame(records)
-            else:
-                return pd.DataFrame()
+            # The stream counts against the in-flight limit shared with other collections
+            with self._in_flight:
+                for doc in collection_ref.stream():
+                    if self.is_cancelled():
+                        return None
+                    
+                    doc_data = doc.to_dict()
+                    # Remove metadata fields
+                    for field in METADATA_FIELDS:
+                        doc_data.pop(field, None)
+                    records.append(doc_data)
+                    doc_ids.append(doc.id)
+            
+            df = pd.DataFrame(records) if records else pd.DataFrame()
+            # The collection now matches what will be saved locally: nothing to upload back
+            self.get_upload_manifest().record_download(user_id, collection_name, doc_ids, df)
+            return df
                 
         except Exception as e:
+            # A collection that could not be read must fail the sync, not look empty
             self.logger.error(f"Error downloading collection {collection_name}: {e}")
-            return None
+            raise
     
     def perform_smart_sync(self):
         """Perform asynchronous smart sync operation"""
@@ -351,7 +398,7 @@ class AsyncCloudSyncWorker(QThread):
             # Step 4: Upload merged data
             self.emit_progress(70, "Uploading merged data...", 0, 100)
             self.data = merged_data
-            self.perform_upload()
+            self.upload_all()
             
             if self.is_cancelled():
                 return
@@ -379,23 +426,28 @@ class AsyncCloudSyncWorker(QThread):
             collections = self.cloud_sync_settings.get('sync_collections', [])
             
             cloud_data = {}
-            for collection_name in collections:
-                if self.is_cancelled():
-                    return {}
-                
-                collection_data = self.download_collection(collection_name, user_id)
+            
+            def download(name):
+                return self.download_collection(name, user_id)
+            
+            for collection_name, collection_data in self.run_concurrently(collections, download):
                 if collection_data is not None and not collection_data.empty:
                     cloud_data[collection_name] = collection_data
             
+            if self.is_cancelled():
+                return {}
+            
             return cloud_data
             
         except Exception as e:
+            # Merging against a partial cloud copy would upload stale local rows over newer ones
             self.logger.error(f"Error getting cloud data: {e}")
-            return {}
+            raise
     
     def merge_data(self, local_data, cloud_data):
-        """Merge local and cloud data intelligently"""
+        """Merge local and cloud data by primary key against the last synced snapshot"""
         try:
+            policy = ConflictResolution(self.cloud_sync_settings.get('conflict_resolution', ConflictResolution.MERGE.value))
             merged_data = {}
             all_collections = set(local_data.keys()) | set(cloud_data.keys())
             
@@ -411,9 +463,12 @@ class AsyncCloudSyncWorker(QThread):
                 elif local_df is not None and cloud_df is None:
                     merged_data[collection_name] = local_df.copy()
                 elif local_df is not None and cloud_df is not None:
-                    # Merge both DataFrames
-                    combined_df = pd.concat([local_df, cloud_df], ignore_index=True)
-                    merged_data[collection_name] = combined_df.drop_duplicates()
+                    result = three_way_merge(local_df, cloud_df, self.merge_base.load(collection_name),
+                                             collection_name, policy)
+                    if result.conflicts:
+                        self.logger.warning(f"{len(result.conflicts)} conflicting rows in {collection_name} "
+                                            f"resolved with {policy.value}")
+                    merged_data[collection_name] = result.merged
                 
             return merged_data
             
@@ -421,25 +476,39 @@ class AsyncCloudSyncWorker(QThread):
             self.logger.error(f"Error merging data: {e}")
             return local_data or {}
     
-    def optimize_dataframe_for_firestore(self, df):
-        """Optimize DataFrame for Firestore storage"""
-        records = []
-        for _, row in df.iterrows():
-            record = {}
-            for col, value in row.items():
-                if pd.isna(value):
-                    record[col] = None
-                elif isinstance(value, (int, float)):
-                    record[col] = float(value) if not pd.isna(value) else 0.0
-                elif isinstance(value, bool):
-                    record[col] = bool(value)
-                else:
-                    record[col] = str(value)
-            
-            record['_sync_timestamp'] = datetime.now().isoformat()
-            records.append(record)
+    def run_concurrently(self, collection_names: List[str],
+                         task: Callable[[str], Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        Run ``task(collection_name)`` for each collection on a bounded thread pool.
+
+        Yields ``(collection_name, result)`` as collections finish. A failing
+        collection re-raises here; after a failure or a cancellation the
+        collections that have not started are dropped.
+        """
+        if not collection_names:
+            return
         
-        return records
+        workers = min(self.MAX_PARALLEL_COLLECTIONS, len(collection_names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cloud-sync") as pool:
+            futures = {pool.submit(task, name): name for name in collection_names}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+                    if self.is_cancelled():
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    def add_processed_records(self, count):
+        """Count records handled by any collection worker; returns the new total"""
+        with self._progress_lock:
+            self.processed_records += count
+            return self.processed_records
+    
+    def optimize_dataframe_for_firestore(self, df, sync_timestamp=None):
+        """Optimize DataFrame for Firestore storage (column-wise, one timestamp per batch)"""
+        return serialize_dataframe(df, sync_timestamp)
     
     def emit_progress(self, progress, message, processed, total):
         """Emit progress update signal"""
@@ -12,6 +12,7 @@ import os
 import logging
 from utils.table_styling import apply_universal_column_resizing
 from modules.universal_table_widget import UniversalTableWidget
+from modules.table_watcher import table_saved
 
 class BudgetManager(QWidget):
     def __init__(self, data, parent=None):
@@ -1285,6 +1286,7 @@ class BudgetManager(QWidget):
             budget_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                     'data', 'budget.csv')
             self.budget_df.to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Update the budget table
             self.populate_budget_table()
@@ -1337,6 +1339,7 @@ class BudgetManager(QWidget):
                 budget_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                         'data', 'budget.csv')
                 self.budget_df.to_csv(budget_file, index=False)
+                table_saved(budget_file)
 
                 # Update the budget table
                 self.populate_budget_table()
@@ -1380,6 +1383,7 @@ class BudgetManager(QWidget):
             budget_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                     'data', 'budget.csv')
             self.budget_df.to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Update the budget table
             self.populate_budget_table()
@@ -1454,6 +1458,7 @@ class BudgetManager(QWidget):
             expenses_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                       'data', 'expenses.csv')
             self.expenses_df.to_csv(expenses_file, index=False)
+            table_saved(expenses_file)
 
             # Update the expense table
             self.populate_expense_table()
@@ -1554,6 +1559,7 @@ class BudgetManager(QWidget):
             expenses_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                       'data', 'expenses.csv')
             expenses.to_csv(expenses_file, index=False)
+            table_saved(expenses_file)
         except Exception as e:
             logging.error(f"Error saving expense data: {e}")
 
@@ -1772,6 +1778,7 @@ class BudgetManager(QWidget):
                 budget_categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                     'data', 'budget_categories.csv')
                 self.data['budget_categories'].to_csv(budget_categories_file, index=False)
+                table_saved(budget_categories_file)
             except Exception as e:
                 logging.error(f"Error saving budget categories: {e}")
 
@@ -1963,6 +1970,7 @@ class BudgetManager(QWidget):
             budget_categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                 'data', 'budget_categories.csv')
             self.budget_categories_df.to_csv(budget_categories_file, index=False)
+            table_saved(budget_categories_file)
 
             # Refresh displays
             self.populate_category_tree()
@@ -2042,6 +2050,7 @@ class BudgetManager(QWidget):
                 budget_categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                     'data', 'budget_categories.csv')
                 self.budget_categories_df.to_csv(budget_categories_file, index=False)
+                table_saved(budget_categories_file)
 
                 # Refresh displays
                 self.populate_category_tree()
@@ -2101,6 +2110,7 @@ class BudgetManager(QWidget):
             budget_categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                 'data', 'budget_categories.csv')
             self.budget_categories_df.to_csv(budget_categories_file, index=False)
+            table_saved(budget_categories_file)
 
             # Refresh displays
             self.populate_category_tree()
@@ -2149,6 +2159,7 @@ class BudgetManager(QWidget):
                 categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                              'data', 'categories.csv')
                 categories_df.to_csv(categories_file, index=False)
+                table_saved(categories_file)
             except Exception as e:
                 logging.error(f"Error saving categories: {e}")
 
@@ -2265,6 +2276,7 @@ class BudgetManager(QWidget):
                 budget_categories_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                     'data', 'budget_categories.csv')
                 self.budget_categories_df.to_csv(budget_categories_file, index=False)
+                table_saved(budget_categories_file)
 
                 # Refresh the category tree to show updated spending
                 self.populate_category_tree()
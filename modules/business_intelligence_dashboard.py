@@ -43,6 +43,9 @@ except ImportError:
     def track_user_action(*args, **kwargs): pass
     def track_system_event(*args, **kwargs): pass
 
+# Days covered by each choice of the period selector
+PERIOD_DAYS = {"Last 7 Days": 7, "Last 30 Days": 30, "Last 90 Days": 90, "Last Year": 365}
+
 class MetricCard(QFrame):
     """Modern metric display card"""
     
@@ -602,8 +605,9 @@ class BusinessIntelligenceDashboard(QWidget):
                 self.logger.warning("Analytics engine not available")
                 return
             
-            # Get updated metrics
-            metrics = self.analytics_engine.get_metrics(force_refresh=True)
+            # Get updated metrics for the selected period (read from the daily sales cube)
+            period_days = PERIOD_DAYS.get(self.period_combo.currentText(), 30)
+            metrics = self.analytics_engine.get_metrics(force_refresh=True, period_days=period_days)
             self.update_metric_cards(metrics)
             self.update_charts(metrics)
             
@@ -7,6 +7,7 @@ import os
 import pandas as pd
 import logging
 from typing import Dict, List, Set, Optional
+from modules.table_watcher import table_saved
 
 class CategoryManager:
     """Manages unified categories across all modules"""
@@ -147,6 +148,7 @@ class CategoryManager:
             # Save updated inventory
             inventory_file = os.path.join('data', 'inventory.csv')
             inventory_df.to_csv(inventory_file, index=False)
+            table_saved(inventory_file)
             
             result['success'] = True
             
@@ -182,6 +184,7 @@ class CategoryManager:
             # Save updated shopping list
             shopping_file = os.path.join('data', 'shopping_list.csv')
             shopping_df.to_csv(shopping_file, index=False)
+            table_saved(shopping_file)
             
             result['success'] = True
             
@@ -233,6 +236,7 @@ class CategoryManager:
             # Save updated budget
             budget_file = os.path.join('data', 'budget.csv')
             budget_df.to_csv(budget_file, index=False)
+            table_saved(budget_file)
             
             result['success'] = True
             
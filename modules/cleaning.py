@@ -10,6 +10,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import calendar
 import os
+from modules.table_watcher import table_saved
 
 class CleaningWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -257,6 +258,7 @@ class CleaningWidget(QWidget):
             
             # Save to CSV
             self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
             
             # Update the table
             self.update_task_list()
@@ -337,6 +339,7 @@ class CleaningWidget(QWidget):
             
             # Save to CSV
             self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
             
             # Update the table
             self.update_task_list()
@@ -466,6 +469,7 @@ class CleaningWidget(QWidget):
         
         # Save to CSV
         self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+        table_saved('data/cleaning_maintenance.csv')
         
         # Reset form
         self.reset_form()
@@ -641,6 +645,7 @@ def setup_calendar_tab(self):
                 
                 # Save to CSV
                 self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+                table_saved('data/cleaning_maintenance.csv')
                 
                 # Update the table
                 self.update_task_list()
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 import calendar
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_watcher import table_saved
 
 class CleaningWidget(QWidget):
     def safe_string_convert(self, value):
@@ -454,6 +455,7 @@ class CleaningWidget(QWidget):
             
             # Save to CSV
             self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
             
             # Update the table
             self.update_task_list()
@@ -569,6 +571,7 @@ class CleaningWidget(QWidget):
             
             # Save to CSV
             self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
             
             # Update the table
             self.update_task_list()
@@ -686,6 +689,7 @@ class CleaningWidget(QWidget):
                 
                 # Save to CSV
                 self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+                table_saved('data/cleaning_maintenance.csv')
                 
                 # Update the table
                 self.update_task_list()
@@ -720,6 +724,7 @@ class CleaningWidget(QWidget):
             
             # Save to CSV
             self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
             
             # Update the table
             self.update_task_list()
@@ -1160,6 +1165,7 @@ class CleaningWidget(QWidget):
                 
                 # Save to CSV
                 self.cleaning_df.to_csv('data/cleaning_maintenance.csv', index=False)
+                table_saved('data/cleaning_maintenance.csv')
                 
                 # Update the table
                 self.update_task_list()
@@ -0,0 +1,324 @@
+"""
+Cloud Delta Sync for Kitchen Dashboard
+Stable Firestore document IDs and a local upload manifest so syncs write only changed rows
+"""
+
+import os
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.firestore_serializer import RECORD_HASH_FIELD, SERVER_TIMESTAMP, record_hashes, serialize_dataframe
+
+MANIFEST_FILENAME = '.cloud_manifest.json'
+
+# Firestore allows up to 500 operations per batch
+MAX_BATCH_OPERATIONS = 500
+
+# Per-user collection holding one watermark document per synced table
+SYNC_META_COLLECTION = '_sync_meta'
+
+# Deleted document IDs kept in a watermark document for incremental downloads
+MAX_TOMBSTONES = 500
+
+# Publishing a watermark reads it before and after the write
+WATERMARK_READS = 2
+WATERMARK_WRITES = 1
+
+
+def find_id_column(df: pd.DataFrame) -> Optional[str]:
+    """First ``id`` / ``*_id`` column that is complete and unique (the table's natural key)"""
+    for column in df.columns:
+        name = str(column).lower()
+        if name != 'id' and not name.endswith('_id'):
+            continue
+        values = df[column]
+        if values.notna().all() and values.is_unique:
+            return column
+    return None
+
+
+def _id_text(values: pd.Series) -> pd.Series:
+    """Document-safe text for id values (12.0 -> '12', no slashes)"""
+    numeric = pd.to_numeric(values, errors='coerce')
+    whole = numeric.notna() & (numeric == numeric.round())
+    text = values.astype(str).str.strip()
+    if whole.any():
+        text = text.where(~whole, numeric[whole].astype('int64').astype(str))
+    return text.str.replace('/', '_', regex=False)
+
+
+def stable_record_ids(df: pd.DataFrame, hashes: Optional[np.ndarray] = None,
+                      id_column: Optional[str] = None) -> np.ndarray:
+    """
+    Firestore document ID for every row, the same on every sync.
+
+    Tables with a natural id column use its values; other tables use the row's
+    content hash, with ``-<n>`` appended to repeated identical rows.
+    """
+    if len(df) == 0:
+        return np.array([], dtype=object)
+
+    id_column = id_column or find_id_column(df)
+    if id_column is not None:
+        ids = _id_text(df[id_column])
+        if ids.is_unique and not ids.isin(['', '.', '..']).any():
+            return ids.to_numpy(dtype=object)
+
+    if hashes is None:
+        hashes = record_hashes(df)
+    hashes = pd.Series(hashes, dtype=object)
+    occurrence = hashes.groupby(hashes, sort=False).cumcount()
+    ids = ('h' + hashes).where(occurrence == 0, 'h' + hashes + '-' + occurrence.astype(str))
+    return ids.to_numpy(dtype=object)
+
+
+@dataclass
+class TableDelta:
+    """Writes needed to bring one cloud collection in line with a local table"""
+    table_name: str
+    doc_ids: List[str] = field(default_factory=list)
+    records: List[Dict] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def write_count(self) -> int:
+        return len(self.records) + len(self.deletes)
+
+
+class UploadManifest:
+    """
+    Local record of what each cloud collection holds.
+
+    Maps ``user_id -> table -> document id -> _record_hash`` for every
+    document this installation has uploaded. Committed batches are recorded
+    as they land and the file is rewritten atomically when a table's upload
+    ends (even when it fails), so an interrupted sync resumes from the last
+    batch that reached Firestore.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[str, Dict[str, Dict[str, str]]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r') as f:
+                        self._entries = json.load(f).get('users', {})
+            except Exception as e:
+                self.logger.error(f"Error loading upload manifest: {e}")
+                self._entries = {}
+        return self._entries
+
+    def save(self):
+        """Write the manifest file"""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump({'users': self._entries}, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Error saving upload manifest: {e}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def uploaded(self, user_id: str, table_name: str) -> Dict[str, str]:
+        """Copy of the document id -> hash map last uploaded for a table"""
+        with self._lock:
+            return dict(self._load().get(user_id, {}).get(table_name, {}))
+
+    def plan(self, user_id: str, table_name: str, df: pd.DataFrame,
+             sync_timestamp: Any = None, full: bool = False) -> TableDelta:
+        """Inserted / changed rows to set (every row when ``full``) and vanished documents to delete"""
+        delta = TableDelta(table_name)
+        hashes = record_hashes(df)
+        doc_ids = stable_record_ids(df, hashes)
+        uploaded = self.uploaded(user_id, table_name)
+
+        previous = pd.Series(doc_ids, dtype=object).map(uploaded)
+        if full:
+            changed = np.ones(len(df), dtype=bool)
+        else:
+            changed = (previous != pd.Series(hashes, dtype=object)).to_numpy()
+        delta.unchanged = int((~changed).sum())
+
+        positions = np.flatnonzero(changed)
+        if len(positions):
+            delta.doc_ids = doc_ids[positions].tolist()
+            delta.records = serialize_dataframe(df.iloc[positions], sync_timestamp)
+
+        current = set(doc_ids.tolist())
+        delta.deletes = [doc_id for doc_id in uploaded if doc_id not in current]
+        return delta
+
+    def record(self, user_id: str, table_name: str, written: Dict[str, str], deleted: Iterable[str] = (),
+               save: bool = True):
+        """Remember documents that were committed to Firestore"""
+        with self._lock:
+            table = self._load().setdefault(user_id, {}).setdefault(table_name, {})
+            table.update(written)
+            for doc_id in deleted:
+                table.pop(doc_id, None)
+            if save:
+                self._save()
+
+    def record_download(self, user_id: str, table_name: str, doc_ids: Iterable[str], df: pd.DataFrame):
+        """
+        Remember a collection that was just downloaded in full.
+
+        ``df`` holds one row per document of ``doc_ids`` (in the same order),
+        built from the documents' fields. Each document is recorded with the
+        hash of its row, so saving the downloaded table locally plans no
+        writes back to the collection it came from.
+        """
+        doc_ids = list(doc_ids)
+        hashes = record_hashes(df).tolist() if len(doc_ids) else []
+        with self._lock:
+            self._load().setdefault(user_id, {})[table_name] = dict(zip(doc_ids, hashes))
+            self._save()
+
+    def forget(self, user_id: str, tables: Optional[Iterable[str]] = None):
+        """Drop manifest entries (after the cloud collections were cleared)"""
+        with self._lock:
+            user_tables = self._load().get(user_id, {})
+            for table_name in (list(user_tables) if tables is None else tables):
+                user_tables.pop(table_name, None)
+            self._save()
+
+
+def upload_delta(db, user_id: str, delta: TableDelta, manifest: UploadManifest,
+                 batch_size: int = 100, on_batch: Optional[Callable[[int], None]] = None,
+                 is_cancelled: Optional[Callable[[], bool]] = None, throttle=None) -> int:
+    """
+    Apply a TableDelta to ``users/<user_id>/<table>`` in Firestore batches.
+
+    Documents are written under their stable IDs, so re-running a sync is
+    idempotent. Each committed batch is recorded in the manifest and reported
+    to ``on_batch`` with its operation count; the manifest is saved once at
+    the end. ``throttle`` (e.g. a semaphore shared by concurrent uploads) is
+    held around each commit. Returns the number of writes.
+    """
+    collection = db.collection('users').document(user_id).collection(delta.table_name)
+    operations = [('set', doc_id, record) for doc_id, record in zip(delta.doc_ids, delta.records)]
+    operations.extend(('delete', doc_id, None) for doc_id in delta.deletes)
+    batch_size = max(1, min(batch_size, MAX_BATCH_OPERATIONS))
+
+    written = 0
+    try:
+        for start in range(0, len(operations), batch_size):
+            if is_cancelled and is_cancelled():
+                break
+
+            chunk = operations[start:start + batch_size]
+            batch = db.batch()
+            for action, doc_id, record in chunk:
+                if action == 'set':
+                    batch.set(collection.document(doc_id), record)
+                else:
+                    batch.delete(collection.document(doc_id))
+            if throttle is not None:
+                with throttle:
+                    batch.commit()
+            else:
+                batch.commit()
+
+            manifest.record(
+                user_id, delta.table_name,
+                {doc_id: record[RECORD_HASH_FIELD] for action, doc_id, record in chunk if action == 'set'},
+                [doc_id for action, doc_id, _ in chunk if action == 'delete'],
+                save=False
+            )
+            written += len(chunk)
+            if on_batch:
+                on_batch(len(chunk))
+    finally:
+        if written:
+            manifest.save()
+
+    return written
+
+
+def watermark_ref(db, user_id: str, table_name: str):
+    """Firestore document holding a table's version, updated_at and recent deletes"""
+    return db.collection('users').document(user_id).collection(SYNC_META_COLLECTION).document(table_name)
+
+
+def read_watermark(db, user_id: str, table_name: str) -> Optional[Dict[str, Any]]:
+    """A table's watermark document (one read); None when the table was never uploaded"""
+    snapshot = watermark_ref(db, user_id, table_name).get()
+    return snapshot.to_dict() if snapshot.exists else None
+
+
+def publish_watermark(db, user_id: str, table_name: str, record_count: int, deleted_ids: Iterable[str] = (),
+                      min_version: int = 0) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Bump a table's remote version after rows were committed to its collection.
+
+    Every path that uploads rows calls this once per table and upload, so
+    other installations see the change with a single read of the watermark.
+    ``deleted_ids`` are kept as tombstones tagged with the new version, which
+    lets incremental downloads apply the deletes. The version is at least
+    ``min_version + 1`` (the last version this installation saw).
+
+    Returns the watermark read before the bump and the new one as stored,
+    with the server's ``updated_at`` (two reads, one write).
+    """
+    previous = read_watermark(db, user_id, table_name)
+    remote = previous or {}
+    version = max(int(remote.get('version', 0)), min_version) + 1
+
+    # An installation that last saw a version older than tombstones_since has missed some deletes
+    tombstones = list(remote.get('deleted', []))
+    tombstones_since = remote.get('tombstones_since', 0)
+    if not isinstance(tombstones_since, int) or any(not isinstance(entry.get('version'), int) for entry in tombstones):
+        # Written before deletes were versioned
+        tombstones = [entry for entry in tombstones if isinstance(entry.get('version'), int)]
+        tombstones_since = int(remote.get('version', 0))
+    tombstones += [{'id': doc_id, 'version': version} for doc_id in deleted_ids]
+    if len(tombstones) > MAX_TOMBSTONES:
+        dropped = tombstones[:-MAX_TOMBSTONES]
+        tombstones = tombstones[-MAX_TOMBSTONES:]
+        tombstones_since = max(tombstones_since, dropped[-1]['version'])
+
+    watermark_ref(db, user_id, table_name).set({
+        'version': version,
+        'updated_at': SERVER_TIMESTAMP,
+        'record_count': record_count,
+        'deleted': tombstones,
+        'tombstones_since': tombstones_since
+    })
+    return previous, read_watermark(db, user_id, table_name)
+
+
+def publish_delta(db, user_id: str, delta: TableDelta, written: int,
+                  record_count: int) -> Optional[Dict[str, Any]]:
+    """
+    Publish the watermark for the part of a delta that ``upload_delta`` committed.
+
+    Sets are committed before deletes, so the first ``written - len(records)``
+    deletes are the ones that landed. Returns the new watermark, or None when
+    nothing was written.
+    """
+    if not written:
+        return None
+    deleted = delta.deletes[:max(0, written - len(delta.records))]
+    return publish_watermark(db, user_id, delta.table_name, record_count, deleted)[1]
@@ -0,0 +1,497 @@
+"""
+Cloud Outbox for Kitchen Dashboard
+Durable SQLite queue of row-level changes, drained to Firestore in the background
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from PySide6.QtCore import QObject, Signal
+
+from modules.cloud_delta_sync import MAX_BATCH_OPERATIONS, WATERMARK_WRITES, UploadManifest, publish_watermark
+from modules.firestore_serializer import RECORD_HASH_FIELD, SERVER_TIMESTAMP, SYNC_TIMESTAMP_FIELD
+from modules.table_store import TableStore
+
+OUTBOX_FILENAME = '.cloud_outbox.db'
+
+
+@dataclass
+class OutboxEntry:
+    """One pending document write: ``set`` a record or ``delete`` a document"""
+    seq: int
+    user_id: str
+    table_name: str
+    doc_id: str
+    action: str
+    record: Optional[Dict[str, Any]]
+    record_hash: Optional[str]
+    revision: int
+    attempts: int
+
+
+class CloudOutbox:
+    """
+    Local queue of the row-level changes not yet committed to Firestore.
+
+    Tables written by the app are first *marked* (one tiny insert on the
+    writing thread). A marked table is later *captured*: it is diffed against
+    the upload manifest and every inserted, changed or removed row becomes an
+    outbox entry keyed by its stable document ID, so repeated edits of a row
+    collapse into one entry holding the latest version. Entries stay in the
+    SQLite file until their batch is committed, which makes the queue survive
+    crashes and restarts.
+    """
+
+    BASE_RETRY_DELAY = 2.0
+    MAX_RETRY_DELAY = 600.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS changed_tables (
+                table_name TEXT PRIMARY KEY,
+                marked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                action TEXT NOT NULL,
+                payload TEXT,
+                record_hash TEXT,
+                revision INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                UNIQUE (user_id, table_name, doc_id)
+            );
+            CREATE INDEX IF NOT EXISTS outbox_ready ON outbox (next_attempt, seq);
+            CREATE TABLE IF NOT EXISTS watermarks_due (
+                user_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                deleted_id TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (user_id, table_name, deleted_id)
+            );
+        """)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Changed tables
+    # ------------------------------------------------------------------
+
+    def mark_changed(self, table_name: str):
+        """Remember that a table was written and has to be captured"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO changed_tables (table_name, marked_at) VALUES (?, ?) "
+                "ON CONFLICT (table_name) DO UPDATE SET marked_at = excluded.marked_at",
+                (table_name, time.time())
+            )
+
+    def changed_tables(self) -> Dict[str, float]:
+        """Marked tables with the time they were last marked"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT table_name, marked_at FROM changed_tables"))
+
+    def capture(self, user_id: str, table_name: str, df: pd.DataFrame, manifest: UploadManifest,
+                marked_at: Optional[float] = None) -> int:
+        """
+        Queue the difference between a table and what the cloud holds.
+
+        Entries of the table that are no longer needed (the row was changed
+        back, or committed by a full sync) are dropped. The table's mark is
+        cleared unless it was marked again after ``marked_at``. Returns the
+        number of pending entries for the table.
+        """
+        delta = manifest.plan(user_id, table_name, df)
+        # The server stamps _sync_timestamp when the entry is finally sent
+        rows = [(user_id, table_name, doc_id, 'set',
+                 json.dumps({key: value for key, value in record.items() if key != SYNC_TIMESTAMP_FIELD}),
+                 record[RECORD_HASH_FIELD])
+                for doc_id, record in zip(delta.doc_ids, delta.records)]
+        rows.extend((user_id, table_name, doc_id, 'delete', None, None) for doc_id in delta.deletes)
+        wanted = {row[2] for row in rows}
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO outbox (user_id, table_name, doc_id, action, payload, record_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, table_name, doc_id) DO UPDATE SET "
+                    "action = excluded.action, payload = excluded.payload, record_hash = excluded.record_hash, "
+                    "revision = revision + 1 "
+                    "WHERE action != excluded.action OR record_hash IS NOT excluded.record_hash",
+                    rows
+                )
+                stale = [(user_id, table_name, doc_id) for (doc_id,) in self._conn.execute(
+                    "SELECT doc_id FROM outbox WHERE user_id = ? AND table_name = ?", (user_id, table_name)
+                ) if doc_id not in wanted]
+                self._conn.executemany(
+                    "DELETE FROM outbox WHERE user_id = ? AND table_name = ? AND doc_id = ?", stale)
+                if marked_at is not None:
+                    self._conn.execute("DELETE FROM changed_tables WHERE table_name = ? AND marked_at <= ?",
+                                       (table_name, marked_at))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Draining
+    # ------------------------------------------------------------------
+
+    def ready(self, user_id: str, limit: int, now: Optional[float] = None) -> List[OutboxEntry]:
+        """A user's oldest entries whose retry time has come"""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, user_id, table_name, doc_id, action, payload, record_hash, revision, attempts "
+                "FROM outbox WHERE user_id = ? AND next_attempt <= ? ORDER BY seq LIMIT ?", (user_id, now, limit)
+            ).fetchall()
+        return [
+            OutboxEntry(seq, user_id, table_name, doc_id, action,
+                        json.loads(payload) if payload is not None else None, record_hash, revision, attempts)
+            for seq, user_id, table_name, doc_id, action, payload, record_hash, revision, attempts in rows
+        ]
+
+    def complete(self, entries: List[OutboxEntry]):
+        """
+        Drop committed entries (unless the row changed again while they were being sent).
+
+        Their tables are noted in the same transaction as needing a new
+        watermark, with the deleted document IDs as tombstones, so the
+        watermark is published even when the app stops right after the commit.
+        """
+        due = {(entry.user_id, entry.table_name, '') for entry in entries}
+        due.update((entry.user_id, entry.table_name, entry.doc_id) for entry in entries if entry.action == 'delete')
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("DELETE FROM outbox WHERE seq = ? AND revision = ?",
+                                       [(entry.seq, entry.revision) for entry in entries])
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO watermarks_due (user_id, table_name, deleted_id) VALUES (?, ?, ?)",
+                    sorted(due))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def watermarks_due(self, user_id: str) -> Dict[str, List[str]]:
+        """Tables of a user whose watermark has to be bumped, with the deletes to publish"""
+        tables: Dict[str, List[str]] = {}
+        with self._lock:
+            for table_name, deleted_id in self._conn.execute(
+                    "SELECT table_name, deleted_id FROM watermarks_due WHERE user_id = ? ORDER BY rowid",
+                    (user_id,)):
+                deleted = tables.setdefault(table_name, [])
+                if deleted_id:
+                    deleted.append(deleted_id)
+        return tables
+
+    def watermark_published(self, user_id: str, table_name: str, deleted_ids: List[str]):
+        """Forget a due watermark once it was published (deletes noted since then stay due)"""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM watermarks_due WHERE user_id = ? AND table_name = ? AND deleted_id = ?",
+                [(user_id, table_name, deleted_id) for deleted_id in [''] + list(deleted_ids)])
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the ``attempts``-th failure"""
+        delay = min(self.MAX_RETRY_DELAY, self.BASE_RETRY_DELAY * 2 ** max(0, attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def fail(self, entries: List[OutboxEntry], error: str) -> float:
+        """Schedule failed entries for a later attempt; returns the delay used"""
+        attempts = max((entry.attempts for entry in entries), default=0) + 1
+        delay = self.retry_delay(attempts)
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE seq = ?",
+                [(attempts, time.time() + delay, error[:500], entry.seq) for entry in entries]
+            )
+        return delay
+
+    def next_attempt(self) -> Optional[float]:
+        """Time at which the next entry becomes ready (None when empty)"""
+        with self._lock:
+            return self._conn.execute("SELECT MIN(next_attempt) FROM outbox").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending and failing entry counts per table"""
+        with self._lock:
+            tables = {
+                table_name: {'pending': pending, 'failing': failing}
+                for table_name, pending, failing in self._conn.execute(
+                    "SELECT table_name, COUNT(*), SUM(attempts > 0) FROM outbox GROUP BY table_name")
+            }
+            last_error = self._conn.execute(
+                "SELECT last_error FROM outbox WHERE last_error IS NOT NULL ORDER BY next_attempt DESC LIMIT 1"
+            ).fetchone()
+        return {
+            'pending': sum(table['pending'] for table in tables.values()),
+            'tables': tables,
+            'changed_tables': sorted(self.changed_tables()),
+            'last_error': last_error[0] if last_error else None,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+
+class OutboxDrainer(QObject):
+    """
+    Background thread that empties the cloud outbox into Firestore.
+
+    Register ``table_changed`` as a table store write listener. The drainer
+    captures marked tables once a user is signed in and commits the queued
+    entries in batches of the Firebase manager's ``batch_size`` (trimmed to
+    the remaining daily quota). Committed documents are recorded in the
+    upload manifest before they leave the outbox, so after a crash nothing
+    that reached Firestore is sent again. After each batch the watermark of
+    every table it touched is bumped once (with the batch's deletes as
+    tombstones), so other installations detect and download the changes. A
+    failed batch is retried with exponential backoff; the UI thread never
+    waits on the network.
+    """
+
+    batch_committed = Signal(int)     # documents written
+    drain_failed = Signal(str)        # error message
+
+    IDLE_INTERVAL = 60.0
+    QUOTA_RETRY_DELAY = 900.0
+
+    def __init__(self, outbox: CloudOutbox, store: TableStore, firebase_manager, parent=None,
+                 start: bool = True):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.outbox = outbox
+        self.store = store
+        self.firebase_manager = firebase_manager
+
+        self._condition = threading.Condition()
+        self._woken = False
+        self._stopping = False
+        self._paused_until = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="cloud-outbox-drainer", daemon=True)
+        if start:
+            self.start()
+
+    def start(self):
+        """Start the drainer thread"""
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def table_changed(self, table_name: str):
+        """Write listener: record the table durably and wake the drainer"""
+        try:
+            self.outbox.mark_changed(table_name)
+        except Exception as e:
+            self.logger.error(f"Error marking {table_name} for cloud upload: {e}")
+        self.wake()
+
+    def wake(self):
+        """Drain now instead of waiting for the next retry or idle check"""
+        with self._condition:
+            self._woken = True
+            self._condition.notify_all()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the drainer thread (pending entries stay in the outbox)"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _wait_time(self) -> float:
+        wait = self.IDLE_INTERVAL
+        next_attempt = self.outbox.next_attempt()
+        if next_attempt is not None:
+            wait = min(wait, next_attempt - time.time())
+        if self._paused_until:
+            wait = max(wait, self._paused_until - time.time())
+        return max(0.0, wait)
+
+    def _run(self):
+        """Worker loop: capture and drain until idle, then sleep until woken or the next retry"""
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                if not self._woken:
+                    self._condition.wait(self._wait_time())
+                self._woken = False
+                if self._stopping:
+                    return
+
+            try:
+                while not self._stopping and self.drain_once():
+                    pass
+            except Exception as e:
+                self.logger.error(f"Error draining cloud outbox: {e}")
+
+    def _user_id(self) -> Optional[str]:
+        manager = self.firebase_manager
+        if manager is None or not manager.is_authenticated():
+            return None
+        user = manager.get_current_user() or {}
+        return user.get('user_id')
+
+    def capture_changed_tables(self, user_id: str) -> int:
+        """Turn the marked tables into outbox entries"""
+        queued = 0
+        for table_name, marked_at in self.outbox.changed_tables().items():
+            try:
+                df = self.store.read(table_name) if self.store.exists(table_name) else pd.DataFrame()
+                queued += self.outbox.capture(user_id, table_name, df, self.firebase_manager.upload_manifest,
+                                              marked_at)
+            except Exception as e:
+                self.logger.error(f"Error capturing {table_name} for cloud upload: {e}")
+        return queued
+
+    def drain_once(self) -> int:
+        """Capture marked tables and commit one batch; returns the number of entries it cleared"""
+        user_id = self._user_id()
+        if not user_id:
+            return 0
+        self.capture_changed_tables(user_id)
+
+        manager = self.firebase_manager
+        db = getattr(manager, 'db', None)
+        if db is None or time.time() < self._paused_until:
+            return 0
+
+        batch_size = max(1, min(getattr(manager, 'batch_size', 100), MAX_BATCH_OPERATIONS))
+        entries, skipped = self._skip_committed(self.outbox.ready(user_id, batch_size))
+        if not entries:
+            self.publish_watermarks(user_id)
+            return skipped
+
+        planner = getattr(manager, 'quota_planner', None)
+        if planner is not None:
+            budget = planner.budget()
+            # Leave room for the watermark of every table in the batch
+            watermark_writes = len({entry.table_name for entry in entries}) * WATERMARK_WRITES
+            sets = [entry for entry in entries if entry.action == 'set'][:max(0, budget['writes'] - watermark_writes)]
+            deletes = [entry for entry in entries if entry.action == 'delete'][:budget['deletes']]
+            allowed = {entry.seq for entry in sets + deletes}
+            entries = [entry for entry in entries if entry.seq in allowed]
+            if not entries:
+                self._paused_until = time.time() + self.QUOTA_RETRY_DELAY
+                self.logger.warning("Cloud outbox paused: daily Firestore quota used up")
+                return 0
+
+        try:
+            batch = db.batch()
+            user_ref = db.collection('users').document(user_id)
+            for entry in entries:
+                reference = user_ref.collection(entry.table_name).document(entry.doc_id)
+                if entry.action == 'set':
+                    batch.set(reference, {**entry.record, SYNC_TIMESTAMP_FIELD: SERVER_TIMESTAMP})
+                else:
+                    batch.delete(reference)
+            meter = getattr(manager, 'quota_meter', None)
+            if meter is not None:
+                with meter.operation('outbox_drain'):
+                    batch.commit()
+            else:
+                batch.commit()
+        except Exception as e:
+            delay = self.outbox.fail(entries, str(e))
+            self.logger.warning(f"Cloud outbox batch of {len(entries)} failed, retrying in {delay:.0f}s: {e}")
+            self.drain_failed.emit(str(e))
+            return 0
+
+        self._record_committed(entries)
+        self.outbox.complete(entries)
+        self.publish_watermarks(user_id)
+        self.batch_committed.emit(len(entries))
+        return len(entries) + skipped
+
+    def publish_watermarks(self, user_id: str) -> int:
+        """Bump the watermark of every table with committed but unpublished changes"""
+        manager = self.firebase_manager
+        meter = getattr(manager, 'quota_meter', None)
+        published = 0
+        for table_name, deleted in self.outbox.watermarks_due(user_id).items():
+            try:
+                record_count = len(manager.upload_manifest.uploaded(user_id, table_name))
+                if meter is not None:
+                    with meter.operation('outbox_drain'):
+                        publish_watermark(manager.db, user_id, table_name, record_count, deleted)
+                else:
+                    publish_watermark(manager.db, user_id, table_name, record_count, deleted)
+            except Exception as e:
+                # Stays due and is published after the next batch or idle check
+                self.logger.warning(f"Error publishing the {table_name} watermark: {e}")
+                continue
+            self.outbox.watermark_published(user_id, table_name, deleted)
+            published += 1
+        return published
+
+    def _skip_committed(self, entries: List[OutboxEntry]) -> Tuple[List[OutboxEntry], int]:
+        """Complete entries the manifest shows as already in Firestore (committed before a crash or by a full sync)"""
+        manifest = self.firebase_manager.upload_manifest
+        uploaded = {}
+        pending, done = [], []
+        for entry in entries:
+            key = (entry.user_id, entry.table_name)
+            if key not in uploaded:
+                uploaded[key] = manifest.uploaded(*key)
+            current = uploaded[key].get(entry.doc_id)
+            in_cloud = current is None if entry.action == 'delete' else current == entry.record_hash
+            (done if in_cloud else pending).append(entry)
+        if done:
+            self.outbox.complete(done)
+        return pending, len(done)
+
+    def _record_committed(self, entries: List[OutboxEntry]):
+        manifest = self.firebase_manager.upload_manifest
+        tables: Dict[tuple, tuple] = {}
+        for entry in entries:
+            written, deleted = tables.setdefault((entry.user_id, entry.table_name), ({}, []))
+            if entry.action == 'set':
+                written[entry.doc_id] = entry.record_hash
+            else:
+                deleted.append(entry.doc_id)
+        for (user_id, table_name), (written, deleted) in tables.items():
+            manifest.record(user_id, table_name, written, deleted, save=False)
+        manifest.save()
+
+
+# Global outbox instance
+_cloud_outbox = None
+
+
+def get_cloud_outbox(data_dir: str = 'data') -> CloudOutbox:
+    """Get global cloud outbox instance"""
+    global _cloud_outbox
+    if _cloud_outbox is None:
+        _cloud_outbox = CloudOutbox(os.path.join(data_dir, OUTBOX_FILENAME))
+    return _cloud_outbox
@@ -0,0 +1,310 @@
+"""
+Daily Aggregate Cube for Kitchen Dashboard
+Sales, cost and waste measures summed per day and dimension, kept up to date as rows are recorded
+"""
+
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _first_column(df: pd.DataFrame, *columns: str) -> pd.Series:
+    """Row-wise first non-missing value of ``columns`` (as numbers), 0 where none is known"""
+    values = pd.Series(np.nan, index=df.index, dtype=float)
+    for column in columns:
+        if column in df.columns:
+            values = values.combine_first(pd.to_numeric(df[column], errors='coerce'))
+    return values.fillna(0.0)
+
+
+def _revenue(df: pd.DataFrame) -> pd.Series:
+    quantity = pd.to_numeric(df['quantity'], errors='coerce') if 'quantity' in df.columns else None
+    values = pd.Series(np.nan, index=df.index, dtype=float)
+    for column in ('total_amount', 'total'):
+        if column in df.columns:
+            values = values.combine_first(pd.to_numeric(df[column], errors='coerce'))
+    if quantity is not None:
+        for column in ('price', 'price_per_unit'):
+            if column in df.columns:
+                values = values.combine_first(pd.to_numeric(df[column], errors='coerce') * quantity)
+    return values.fillna(0.0)
+
+
+def _sales_profit(df: pd.DataFrame) -> pd.Series:
+    profit = pd.to_numeric(df['profit'], errors='coerce') if 'profit' in df.columns else None
+    fallback = _revenue(df) - _first_column(df, 'total_cost', 'cost')
+    return fallback if profit is None else profit.combine_first(fallback)
+
+
+class CubeSpec:
+    """
+    Shape of a cube: each dimension names the source columns it is read from
+    (first present wins, '' when none is), each measure is a function from
+    the source rows to one number per row. Every cube also counts its rows.
+    """
+
+    def __init__(self, dimensions: Dict[str, Sequence[str]], measures: Dict[str, Callable[[pd.DataFrame], pd.Series]],
+                 date_column: str = 'date'):
+        self.dimensions = dimensions
+        self.measures = measures
+        self.date_column = date_column
+
+
+SALES_CUBE = CubeSpec(
+    dimensions={
+        'recipe': ('recipe_name', 'item_name', 'items'),
+        'platform': ('platform',),
+        'category': ('category',),
+        'payment_method': ('payment_method',),
+    },
+    measures={
+        'revenue': _revenue,
+        # The order total as recorded by the platform report imports
+        'total': lambda df: _first_column(df, 'total'),
+        'quantity': lambda df: _first_column(df, 'quantity'),
+        'cost': lambda df: _first_column(df, 'total_cost', 'cost'),
+        'profit': _sales_profit,
+        'discount': lambda df: _first_column(df, 'discount', 'discount_amount'),
+        'commission': lambda df: _first_column(df, 'commission'),
+    },
+)
+
+WASTE_CUBE = CubeSpec(
+    dimensions={
+        'item': ('item_name',),
+        'category': ('category',),
+        'reason': ('reason',),
+    },
+    measures={
+        'cost': lambda df: _first_column(df, 'cost'),
+        'quantity': lambda df: _first_column(df, 'quantity'),
+    },
+)
+
+# Zomato / Swiggy settlement reports (one row per order)
+PLATFORM_CUBE = CubeSpec(
+    dimensions={},
+    measures={
+        'revenue': lambda df: _first_column(df, 'net_amount'),
+        'subtotal': lambda df: _first_column(df, 'subtotal'),
+        'commission': lambda df: _first_column(df, 'commission'),
+        'delivery_fee': lambda df: _first_column(df, 'delivery_fee'),
+    },
+)
+
+CUBE_SPECS = {
+    'sales': SALES_CUBE,
+    'waste': WASTE_CUBE,
+    'zomato': PLATFORM_CUBE,
+    'swiggy': PLATFORM_CUBE,
+}
+
+
+def _day(value) -> Optional[pd.Timestamp]:
+    return None if value is None else pd.Timestamp(value).normalize()
+
+
+def period_range(period: str, today: Optional[date] = None) -> Tuple[Optional[date], Optional[date]]:
+    """First and last day (inclusive, None for open) of a period selector's choice"""
+    today = today or datetime.now().date()
+    if period == "Today":
+        return today, today
+    if period == "This Week":
+        return today - timedelta(days=today.weekday()), None
+    if period == "This Month":
+        next_month = (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return today.replace(day=1), next_month - timedelta(days=1)
+    if period == "This Year":
+        return today.replace(month=1, day=1), today.replace(month=12, day=31)
+    if period.startswith("Last ") and period.endswith(" Days"):
+        days = int(period.split()[1])
+        return today - timedelta(days=days - 1), today
+    if period == "Last Year":
+        return today - timedelta(days=364), today
+    return None, None  # All Time
+
+
+class DailyCube:
+    """
+    Measures of one table summed per (day, dimensions...).
+
+    The cube follows the table it was last given: it is rebuilt when the
+    table is replaced or its ``version`` is bumped (``invalidate``, on every
+    write that is not an append), while rows added with ``record`` are
+    folded into the existing cells without touching the older ones.
+    Reports then filter and group the cells, whose number grows with days
+    rather than with rows. The parsed day of every source row is kept too,
+    so listing a period's rows does not parse dates again.
+    """
+
+    def __init__(self, name: str, spec: CubeSpec):
+        self.name = name
+        self.spec = spec
+        self.dimensions = ['date'] + list(spec.dimensions)
+        self.measures = list(spec.measures) + ['count']
+        self._cells = self._empty_cells()
+        self._row_days = np.array([], dtype='datetime64[ns]')
+        self._signature = None
+        self._lock = threading.RLock()
+        self.version = 0
+        self.rebuilds = 0
+
+    def _empty_cells(self) -> pd.DataFrame:
+        cells = pd.DataFrame({dimension: pd.Series(dtype=object) for dimension in self.dimensions})
+        cells['date'] = pd.Series(dtype='datetime64[ns]')
+        for measure in self.measures:
+            cells[measure] = pd.Series(dtype=float)
+        return cells
+
+    def _table_signature(self, table: pd.DataFrame) -> Tuple:
+        return (id(table), len(table), self.version)
+
+    def _days(self, rows: pd.DataFrame) -> pd.Series:
+        column = self.spec.date_column
+        if column not in rows.columns:
+            return pd.Series(pd.NaT, index=rows.index, dtype='datetime64[ns]')
+        days = rows[column]
+        if not pd.api.types.is_datetime64_any_dtype(days):
+            days = pd.to_datetime(days, errors='coerce')
+        if getattr(days.dt, 'tz', None) is not None:
+            days = days.dt.tz_localize(None)
+        return days.dt.normalize().astype('datetime64[ns]')
+
+    def _aggregate(self, rows: pd.DataFrame, days: pd.Series) -> pd.DataFrame:
+        facts = pd.DataFrame({'date': days}, index=rows.index)
+        for dimension, columns in self.spec.dimensions.items():
+            values = pd.Series('', index=rows.index, dtype=object)
+            for column in reversed(columns):
+                if column in rows.columns:
+                    present = rows[column].notna()
+                    values = values.where(~present, rows[column].astype(str))
+            facts[dimension] = values
+        for measure, compute in self.spec.measures.items():
+            facts[measure] = compute(rows).astype(float)
+        facts['count'] = 1.0
+        return self._combine(facts)
+
+    def _combine(self, facts: pd.DataFrame) -> pd.DataFrame:
+        return facts.groupby(self.dimensions, dropna=False, sort=False)[self.measures].sum().reset_index()
+
+    def rebuild(self, table: pd.DataFrame):
+        """Aggregate every row of ``table`` (O(rows), only when the table was replaced or edited)"""
+        with self._lock:
+            if table is None or len(table) == 0:
+                self._cells = self._empty_cells()
+                self._row_days = np.array([], dtype='datetime64[ns]')
+            else:
+                days = self._days(table)
+                self._cells = self._aggregate(table, days)
+                self._row_days = days.to_numpy()
+            self._signature = None if table is None else self._table_signature(table)
+            self.rebuilds += 1
+
+    def record(self, new_rows: pd.DataFrame, table: Optional[pd.DataFrame] = None):
+        """
+        Fold rows just appended to the table into the cube (O(new rows)).
+
+        ``table`` is the table after the append. If the cube was not in step
+        with the table before it, it is left to be rebuilt on the next read.
+        """
+        with self._lock:
+            if self._signature is None or self._signature[2] != self.version:
+                return  # rebuilt on the next read anyway
+            if new_rows is None or len(new_rows) == 0:
+                return
+            if table is not None and self._signature[1] + len(new_rows) != len(table):
+                self.version += 1
+                return
+            days = self._days(new_rows)
+            self._cells = self._combine(pd.concat([self._cells, self._aggregate(new_rows, days)], ignore_index=True))
+            self._row_days = np.concatenate([self._row_days, days.to_numpy()])
+            if table is not None:
+                self._signature = self._table_signature(table)
+            else:
+                self._signature = (self._signature[0], self._signature[1] + len(new_rows), self.version)
+
+    def invalidate(self):
+        """Bump the version: rebuild on the next read (the table was edited in place)"""
+        with self._lock:
+            self.version += 1
+
+    def sync(self, table: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """The cells of ``table``, rebuilt first if the table is not the one the cube follows"""
+        with self._lock:
+            if table is None:
+                table = pd.DataFrame()
+            if self._signature != self._table_signature(table):
+                self.rebuild(table)
+            return self._cells
+
+    def cells(self, table: pd.DataFrame, start=None, end=None, **where) -> pd.DataFrame:
+        """Cells between ``start`` and ``end`` (days, inclusive) matching ``where`` dimension values"""
+        cells = self.sync(table)
+        mask = pd.Series(True, index=cells.index)
+        if start is not None:
+            mask &= cells['date'] >= _day(start)
+        if end is not None:
+            mask &= cells['date'] <= _day(end)
+        for dimension, value in where.items():
+            mask &= cells[dimension] == value
+        return cells[mask]
+
+    def totals(self, table: pd.DataFrame, start=None, end=None, **where) -> Dict[str, float]:
+        """Every measure summed over the period"""
+        cells = self.cells(table, start, end, **where)
+        return {measure: float(cells[measure].sum()) for measure in self.measures}
+
+    def by(self, table: pd.DataFrame, dimension: str, start=None, end=None, **where) -> pd.DataFrame:
+        """Measures summed per value of ``dimension`` ('date' for a daily series)"""
+        cells = self.cells(table, start, end, **where)
+        return cells.groupby(dimension, sort=True)[self.measures].sum()
+
+    def rows(self, table: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+        """The table's rows dated within the period, using the days parsed when they were folded in"""
+        with self._lock:
+            self.sync(table)
+            if start is None and end is None:
+                return table
+            mask = np.ones(len(self._row_days), dtype=bool)
+            if start is not None:
+                mask &= self._row_days >= _day(start).to_datetime64()
+            if end is not None:
+                mask &= self._row_days <= _day(end).to_datetime64()
+            return table[mask]
+
+
+_cubes: Dict[str, DailyCube] = {}
+_cubes_lock = threading.Lock()
+
+
+def get_daily_cube(name: str, spec: Optional[CubeSpec] = None) -> DailyCube:
+    """The shared cube called ``name`` (``sales``, ``waste``, ``zomato``, ``swiggy`` or one built from ``spec``)"""
+    with _cubes_lock:
+        cube = _cubes.get(name)
+        if cube is None:
+            cube = _cubes[name] = DailyCube(name, spec or CUBE_SPECS[name])
+        return cube
+
+
+def record_rows(name: str, new_rows: pd.DataFrame, table: Optional[pd.DataFrame] = None):
+    """Fold rows appended to table ``name`` into its cube, if one has been built"""
+    cube = _cubes.get(name)
+    if cube is not None:
+        try:
+            cube.record(new_rows, table)
+        except Exception as e:
+            logger.error(f"Error folding new {name} rows into the daily cube: {e}")
+            cube.invalidate()
+
+
+def invalidate_cube(name: Optional[str] = None):
+    """Rebuild cube ``name`` (or every cube) on its next read"""
+    for cube_name, cube in list(_cubes.items()):
+        if name is None or cube_name == name:
+            cube.invalidate()
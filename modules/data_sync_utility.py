@@ -8,6 +8,7 @@ Provides utilities for keeping CSV files and application data in sync.
 import os
 import pandas as pd
 from datetime import datetime
+from modules.table_watcher import table_saved
 
 class DataSyncManager:
     """Manages synchronization between CSV files and application data"""
@@ -32,6 +33,7 @@ class DataSyncManager:
             
             # Save with proper encoding
             df.to_csv(filepath, index=False, encoding='utf-8')
+            table_saved(filepath)
             
             # Update sync timestamp
             self.last_sync[filename] = datetime.now()
@@ -8,6 +8,7 @@ Validates and cleans data before saving to CSV files.
 import pandas as pd
 import os
 from datetime import datetime
+from modules.table_watcher import table_saved
 
 class DataValidator:
     """Validates and cleans data for the Kitchen Dashboard"""
@@ -66,6 +67,7 @@ class DataValidator:
             
             # Save with proper encoding
             df.to_csv(filepath, index=False, encoding='utf-8')
+            table_saved(filepath)
             
             return True
             
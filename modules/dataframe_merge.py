@@ -0,0 +1,342 @@
+"""
+DataFrame Merge for Kitchen Dashboard
+Key-based three-way merge of local and cloud tables against the last synced snapshot
+"""
+
+import os
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.cloud_delta_sync import find_id_column
+from modules.cloud_sync_manager import ConflictResolution
+from modules.firestore_serializer import METADATA_FIELDS, firestore_column
+
+logger = logging.getLogger(__name__)
+
+# Primary keys of tables without a single unique id column
+TABLE_KEYS = {
+    'recipe_ingredients': ['recipe_id', 'item_name'],
+    'recipe_packing_materials': ['recipe_id', 'material_id'],
+    'recipe_appliance_mappings': ['recipe_name', 'appliance_name'],
+    'meal_plan': ['day', 'meal_type'],
+    'sales_orders': ['order_id'],
+}
+
+KEY_SEPARATOR = '\x1f'
+
+
+@dataclass
+class MergeResult:
+    """Merged table plus what happened to every key"""
+    table_name: str
+    merged: pd.DataFrame
+    key_columns: List[str] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    conflicts: List[str] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        return (f"{self.table_name}: {self.inserted} inserted, {self.updated} updated, "
+                f"{self.deleted} deleted, {len(self.conflicts)} conflicts")
+
+
+def _is_number_column(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _comparable(series: pd.Series, as_text: bool = False) -> np.ndarray:
+    """
+    Cell values in a form that compares equal across dtypes.
+
+    Numeric columns become float64 (so 12 and 12.0 match); everything else
+    becomes the text of its Firestore value, with missing cells as 'None'.
+    """
+    if _is_number_column(series) and not as_text:
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return firestore_column(series).astype(str).astype(object)
+
+
+def value_codes(columns: List[pd.Series]) -> List[np.ndarray]:
+    """
+    Integer code for every cell of the same column across several frames.
+
+    Equal values get equal codes in every frame, so rows can be hashed and
+    cells compared as integers instead of strings.
+    """
+    as_text = not all(_is_number_column(series) for series in columns)
+    values = [_comparable(series, as_text) for series in columns]
+    codes, _ = pd.factorize(np.concatenate(values), use_na_sentinel=False)
+    return np.split(codes.astype('int64'), np.cumsum([len(v) for v in values])[:-1])
+
+
+def _row_hashes(codes: Dict[str, np.ndarray], length: int) -> np.ndarray:
+    """64-bit hash of every row from its value codes"""
+    if not codes:
+        return np.zeros(length, dtype='uint64')
+    return pd.util.hash_pandas_object(pd.DataFrame(codes), index=False).to_numpy()
+
+
+def _key_text(series: pd.Series) -> np.ndarray:
+    """Key values as text, with whole numbers written without a decimal point"""
+    values = _comparable(series)
+    if values.dtype == object:
+        return values
+    whole = np.isfinite(values) & (values == np.round(values))
+    if whole.all():
+        return values.astype('int64').astype(str).astype(object)
+    text = values.astype(str).astype(object)
+    text[whole] = values[whole].astype('int64').astype(str)
+    return text
+
+
+def key_columns_for(table_name: str, *frames: Optional[pd.DataFrame]) -> List[str]:
+    """
+    Primary key columns shared by all frames.
+
+    Uses ``TABLE_KEYS`` or the table's natural id column; an empty list means
+    rows are keyed by their content.
+    """
+    frames = [df for df in frames if df is not None]
+    candidates = TABLE_KEYS.get(table_name)
+    if not candidates:
+        source = next((df for df in frames if not df.empty), None)
+        id_column = find_id_column(source) if source is not None else None
+        candidates = [id_column] if id_column is not None else []
+    if candidates and all(set(candidates) <= set(df.columns) for df in frames):
+        return list(candidates)
+    return []
+
+
+def _merge_keys(codes: Dict[str, np.ndarray], key_columns: List[str], hashes: np.ndarray) -> np.ndarray:
+    """
+    Integer merge key of every row: its primary key codes, or its content hash
+    when the table has none. Repeated keys are numbered so every row keeps its
+    own key. The occurrence number is hashed in on every side, duplicates or
+    not, so the n-th row of a key matches across base, local and cloud.
+    """
+    if not key_columns:
+        keys = hashes
+    elif len(key_columns) == 1:
+        keys = codes[key_columns[0]].astype('uint64')
+    else:
+        keys = _row_hashes({column: codes[column] for column in key_columns}, len(hashes))
+    occurrence = pd.Series(keys).groupby(keys, sort=False).cumcount().to_numpy()
+    return _row_hashes({'key': keys, 'occurrence': occurrence}, len(keys))
+
+
+def key_labels(df: pd.DataFrame, key_columns: List[str]) -> List[str]:
+    """Readable merge keys for rows of ``df`` (used to report conflicts)"""
+    if len(df) == 0:
+        return []
+    if not key_columns:
+        codes = {column: value_codes([df[column]])[0] for column in df.columns}
+        return [f"h{value:016x}" for value in _row_hashes(codes, len(df)).tolist()]
+    labels = pd.Series(_key_text(df[key_columns[0]]), dtype=object)
+    for column in key_columns[1:]:
+        labels = labels + KEY_SEPARATOR + pd.Series(_key_text(df[column]), dtype=object)
+    return labels.tolist()
+
+
+def three_way_merge(local_df: Optional[pd.DataFrame], cloud_df: Optional[pd.DataFrame],
+                    base_df: Optional[pd.DataFrame] = None, table_name: str = '',
+                    policy: ConflictResolution = ConflictResolution.MERGE) -> MergeResult:
+    """
+    Merge local and cloud versions of a table against the last synced ``base_df``.
+
+    Rows are matched by primary key with hash joins and each key is classified
+    once: a side that still matches the base is treated as unchanged, so
+    single-sided inserts, updates and deletes apply directly. Keys changed on
+    both sides (or changed on one and deleted on the other) are conflicts and
+    follow ``policy``: ``LOCAL_WINS`` and ``REMOTE_WINS`` take one side,
+    ``MERGE`` combines them column by column (keeping the locally edited
+    cells) and ``ASK_USER`` keeps the local row and reports the conflict.
+    Without a base every difference is a conflict. The result has exactly
+    one row per key, local rows first in their original order.
+    """
+    columns = []
+    for df in (local_df, cloud_df):
+        if df is not None:
+            columns.extend(column for column in df.columns if column not in columns and column not in METADATA_FIELDS)
+
+    # Every side with the merged column set (a missing side is an empty table)
+    sides = {}
+    for side, df in (('local', local_df), ('cloud', cloud_df), ('base', base_df)):
+        if df is None and side == 'base':
+            continue
+        sides[side] = (df if df is not None else pd.DataFrame(columns=columns)).reindex(columns=columns)
+
+    # Value codes per column shared by all sides, then one hash per row
+    codes = {side: {} for side in sides}
+    for column in columns:
+        for side, column_codes in zip(sides, value_codes([frame[column] for frame in sides.values()])):
+            codes[side][column] = column_codes
+    row_hash = {side: _row_hashes(codes[side], len(frame)) for side, frame in sides.items()}
+
+    key_columns = key_columns_for(table_name, local_df, cloud_df, base_df)
+    index = {side: pd.Index(_merge_keys(codes[side], key_columns, row_hash[side]))
+             for side in sides}
+
+    # Hash join: the row of every key on each side (-1 where absent)
+    keys = index['local'].append(index['cloud'][~index['cloud'].isin(index['local'])])
+    position = {side: index[side].get_indexer(keys) for side in sides}
+    position.setdefault('base', np.full(len(keys), -1))
+    present = {side: rows >= 0 for side, rows in position.items()}
+
+    def differs(side, other):
+        both = present[side] & present[other]
+        changed = np.zeros(len(keys), dtype=bool)
+        if both.any():
+            changed[both] = row_hash[side][position[side][both]] != row_hash[other][position[other][both]]
+        return (present[side] != present[other]) | changed
+
+    in_local, in_cloud, in_base = present['local'], present['cloud'], present['base']
+    local_changed = differs('local', 'base')
+    cloud_changed = differs('cloud', 'base')
+
+    same = in_local & in_cloud & ~differs('local', 'cloud')
+    take_local = ~same & in_local & (~cloud_changed | ~in_base & ~in_cloud)
+    take_cloud = ~same & in_cloud & (~local_changed | ~in_base & ~in_local)
+    delete = ~same & in_base & (in_local ^ in_cloud) & ~(local_changed & cloud_changed)
+    take_local &= ~delete
+    take_cloud &= ~delete
+    conflict = ~(same | take_local | take_cloud | delete)
+
+    # Resolve conflicts into one of: local row, cloud row, cell-wise merge, drop
+    merge_cells = np.zeros(len(keys), dtype=bool)
+    if conflict.any():
+        if policy == ConflictResolution.REMOTE_WINS:
+            take_cloud |= conflict & in_cloud
+            delete |= conflict & ~in_cloud
+        elif policy == ConflictResolution.MERGE:
+            merge_cells = conflict & in_local & in_cloud & in_base
+            take_local |= conflict & in_local & ~merge_cells
+            take_cloud |= conflict & ~in_local
+        else:
+            take_local |= conflict & in_local
+            delete |= conflict & ~in_local
+
+    # Build the result column by column: local rows, with cloud cells where they win
+    kept = ~delete
+    local_rows = position['local'][kept]
+    cloud_rows = position['cloud'][kept]
+    use_cloud = take_cloud[kept]
+    merge_rows = np.flatnonzero(merge_cells[kept])
+    merge_base_rows = position['base'][kept][merge_rows]
+
+    merged = {}
+    for column in columns:
+        cells = use_cloud.copy()
+        if len(merge_rows):
+            local_codes = codes['local'][column][local_rows[merge_rows]]
+            cells[merge_rows] = local_codes == codes['base'][column][merge_base_rows]
+        parts = [
+            sides[side][column].take(rows[mask]).set_axis(np.flatnonzero(mask))
+            for side, rows, mask in (('local', local_rows, ~cells), ('cloud', cloud_rows, cells))
+            if mask.any()
+        ]
+        if len(parts) == 1:
+            merged[column] = parts[0].reset_index(drop=True)
+        elif parts:
+            merged[column] = pd.concat(parts).reindex(range(len(cells))).reset_index(drop=True)
+        else:
+            merged[column] = sides['local'][column].iloc[:0].reset_index(drop=True)
+    merged = pd.DataFrame(merged, columns=columns) if columns else pd.DataFrame(index=range(int(kept.sum())))
+
+    # Keep the original dtype where both sides agreed on it
+    for column in columns:
+        dtypes = {df[column].dtype for df in (local_df, cloud_df) if df is not None and column in df.columns}
+        if len(dtypes) == 1 and merged[column].dtype not in dtypes:
+            try:
+                merged[column] = merged[column].astype(dtypes.pop())
+            except (TypeError, ValueError):
+                pass
+
+    result = MergeResult(
+        table_name=table_name,
+        merged=merged,
+        key_columns=key_columns,
+        inserted=int(((take_local & ~in_cloud) | (take_cloud & ~in_local))[~in_base].sum()),
+        updated=int(((take_local & in_cloud) | (take_cloud & in_local) | merge_cells).sum()),
+        deleted=int((delete & (in_local | in_cloud)).sum()),
+        unchanged=int(same.sum()),
+        conflicts=_conflict_labels(sides, position, conflict, key_columns),
+    )
+    logger.info(f"Merged {result.summary}")
+    return result
+
+
+def _conflict_labels(sides, position, conflict, key_columns) -> List[str]:
+    """Readable keys of the conflicting rows, taken from whichever side has them"""
+    if not conflict.any():
+        return []
+    rows = np.flatnonzero(conflict)
+    from_local = position['local'][rows] >= 0
+    labels = np.empty(len(rows), dtype=object)
+    labels[from_local] = key_labels(sides['local'].iloc[position['local'][rows[from_local]]], key_columns)
+    labels[~from_local] = key_labels(sides['cloud'].iloc[position['cloud'][rows[~from_local]]], key_columns)
+    return labels.tolist()
+
+
+class MergeBaseStore:
+    """
+    Snapshots of every table as of the last successful sync (the merge base).
+
+    Kept as pickles in ``<data_dir>/.merge_base`` so dtypes survive restarts.
+    """
+
+    DIRNAME = '.merge_base'
+
+    def __init__(self, data_dir: str = 'data'):
+        self.base_dir = os.path.join(data_dir, self.DIRNAME)
+        self._lock = threading.Lock()
+
+    def path(self, table_name: str) -> str:
+        return os.path.join(self.base_dir, f"{table_name}.pkl")
+
+    def load(self, table_name: str) -> Optional[pd.DataFrame]:
+        path = self.path(table_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable merge base for {table_name}: {e}")
+            return None
+
+    def save(self, table_name: str, df: pd.DataFrame):
+        """Atomically replace the base snapshot of one table"""
+        with self._lock:
+            os.makedirs(self.base_dir, exist_ok=True)
+            path = self.path(table_name)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                df.drop(columns=[c for c in METADATA_FIELDS if c in df.columns]).to_pickle(temp_path)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def save_all(self, tables: Dict[str, pd.DataFrame]):
+        for table_name, df in tables.items():
+            if df is not None:
+                self.save(table_name, df)
+
+    def forget(self, table_name: Optional[str] = None):
+        with self._lock:
+            if table_name:
+                names = [table_name]
+            elif os.path.isdir(self.base_dir):
+                names = [name[:-len('.pkl')] for name in os.listdir(self.base_dir) if name.endswith('.pkl')]
+            else:
+                names = []
+            for name in names:
+                if os.path.exists(self.path(name)):
+                    os.remove(self.path(name))
@@ -0,0 +1,226 @@
+"""
+DataFrame Table Model for Kitchen Dashboard
+Virtualized Qt model/view classes that display pandas DataFrames without per-cell items
+"""
+
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from PySide6.QtWidgets import QTableView
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Read-only table model over a DataFrame.
+
+    Each column is kept as a NumPy array and cells are formatted only when
+    the view asks for them, so only the rows on screen are ever turned into
+    strings. Replacing the DataFrame is a single model reset.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None, headers: Optional[Sequence[str]] = None, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self._df = pd.DataFrame()
+        self._columns = []
+        self._headers = list(headers) if headers else []
+        self._sort_keys = {}
+        self.set_dataframe(df if df is not None else pd.DataFrame(), headers)
+
+    def set_dataframe(self, df: pd.DataFrame, headers: Optional[Sequence[str]] = None):
+        """Replace the displayed DataFrame"""
+        self.beginResetModel()
+        self._df = df
+        # Datetime columns are boxed once so cells format like pandas Timestamps
+        self._columns = [
+            df[column].astype(object).to_numpy() if pd.api.types.is_datetime64_any_dtype(df[column])
+            else df[column].to_numpy()
+            for column in df.columns
+        ]
+        if headers is not None:
+            self._headers = list(headers)
+        self._sort_keys = {}
+        self.endResetModel()
+
+    def dataframe(self) -> pd.DataFrame:
+        """The DataFrame behind the model"""
+        return self._df
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._df)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        return self.format_value(self._columns[index.column()][index.row()])
+
+    @staticmethod
+    def format_value(value) -> str:
+        """Cell text: the value as a string, empty for missing values"""
+        try:
+            return "" if pd.isna(value) else str(value)
+        except (TypeError, ValueError):
+            # Containers (lists, dicts) are never "missing"
+            return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if len(self._headers) == len(self._columns) and section < len(self._headers):
+                return str(self._headers[section])
+            if section < len(self._df.columns):
+                return str(self._df.columns[section])
+            return None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def sort_key(self, column: int) -> np.ndarray:
+        """Sortable key array for a column: numeric when it parses as numbers, lowercase text otherwise"""
+        if column not in self._sort_keys:
+            series = self._df.iloc[:, column]
+            numeric = pd.to_numeric(series, errors='coerce')
+            if numeric.notna().any() or series.isna().all():
+                key = numeric.to_numpy(dtype='float64', na_value=np.nan)
+            else:
+                key = series.astype(str).str.lower().to_numpy(dtype=object)
+            self._sort_keys[column] = key
+        return self._sort_keys[column]
+
+
+class DataFrameProxyModel(QAbstractProxyModel):
+    """
+    Filtering / sorting proxy for a DataFrameTableModel.
+
+    The visible rows are a NumPy array of source row positions. Filters are
+    applied as boolean masks and sorting is an argsort of a cached column
+    key, so neither calls back into Python per row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = np.arange(0)
+        self._filtered_rows = np.arange(0)
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self._on_source_reset)
+        self._on_source_reset()
+
+    def _on_source_reset(self):
+        """Show every source row again"""
+        self.beginResetModel()
+        self._filtered_rows = np.arange(self.sourceModel().rowCount())
+        self._rows = self._sorted(self._filtered_rows)
+        self.endResetModel()
+
+    def set_filter_mask(self, mask: Optional[np.ndarray]):
+        """Show only source rows where ``mask`` is True (all rows for None)"""
+        self.set_source_rows(None if mask is None else np.flatnonzero(mask))
+
+    def set_source_rows(self, rows: Optional[np.ndarray]):
+        """Show the given source row positions (in source order before sorting)"""
+        source_count = self.sourceModel().rowCount() if self.sourceModel() else 0
+        self.beginResetModel()
+        self._filtered_rows = np.arange(source_count) if rows is None else np.asarray(rows, dtype=np.int64)
+        self._rows = self._sorted(self._filtered_rows)
+        self.endResetModel()
+
+    def source_rows(self) -> np.ndarray:
+        """Source row positions in display order"""
+        return self._rows
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._rows = self._sorted(self._filtered_rows)
+        self.layoutChanged.emit()
+
+    def _sorted(self, rows: np.ndarray) -> np.ndarray:
+        """Rows ordered by the current sort column, missing values last"""
+        model = self.sourceModel()
+        if self._sort_column < 0 or model is None or len(rows) == 0 or self._sort_column >= model.columnCount():
+            return rows
+
+        key = model.sort_key(self._sort_column)[rows]
+        if key.dtype == object:
+            order = pd.Series(key).argsort(kind='stable').to_numpy()
+            missing = np.zeros(len(rows), dtype=bool)
+        else:
+            missing = np.isnan(key)
+            order = np.argsort(key, kind='stable')
+        present = order[~missing[order]]
+        if self._sort_order == Qt.DescendingOrder:
+            present = present[::-1]
+        return rows[np.concatenate([present, order[missing[order]]])]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        model = self.sourceModel()
+        return 0 if parent.isValid() or model is None else model.columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column < 0 or row >= len(self._rows) or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(int(self._rows[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        positions = np.flatnonzero(self._rows == source_index.row())
+        if len(positions) == 0:
+            return QModelIndex()
+        return self.index(int(positions[0]), source_index.column())
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.sourceModel().data(self.mapToSource(index), role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical and role == Qt.DisplayRole:
+            return str(section + 1)
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return self.sourceModel().flags(self.mapToSource(index))
+
+
+class DataFrameTableView(QTableView):
+    """Table view with the row helpers callers used on QTableWidget"""
+
+    def currentRow(self) -> int:
+        """Display row of the current index (-1 when nothing is current)"""
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def rowCount(self) -> int:
+        return self.model().rowCount() if self.model() else 0
+
+    def columnCount(self) -> int:
+        return self.model().columnCount() if self.model() else 0
@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QFrame, QScrollArea, QProgressBar, QCheckBox)
 from PySide6.QtCore import Qt, Signal, QDate, QTimer
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor
+from modules.table_watcher import table_saved
 
 # Import notification system
 try:
@@ -786,6 +787,7 @@ class EnhancedBudgetWidget(QWidget):
                     # Save to CSV
                     budget_file = os.path.join('data', 'budget.csv')
                     budget_df.to_csv(budget_file, index=False)
+                    table_saved(budget_file)
 
                     # Refresh the table
                     self.populate_budget_table()
@@ -842,6 +844,7 @@ class EnhancedBudgetWidget(QWidget):
             # Save to CSV
             budget_file = os.path.join('data', 'budget.csv')
             budget_df.to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
         except Exception as e:
             self.logger.error(f"Error initializing default budget categories: {e}")
@@ -1311,9 +1314,11 @@ class EnhancedBudgetWidget(QWidget):
             # Save to CSV files
             expenses_file = os.path.join('data', 'manual_expenses.csv')
             self.data['manual_expenses'].to_csv(expenses_file, index=False)
+            table_saved(expenses_file)
 
             budget_file = os.path.join('data', 'budget.csv')
             self.data['budget'].to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Refresh displays
             self.load_data()
@@ -1356,6 +1361,7 @@ class EnhancedBudgetWidget(QWidget):
             # Save to CSV
             budget_file = os.path.join('data', 'budget.csv')
             self.data['budget'].to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Refresh displays
             self.load_data()
@@ -1460,6 +1466,7 @@ class EnhancedBudgetWidget(QWidget):
             # Save to CSV
             manual_expenses_file = os.path.join('data', 'manual_expenses.csv')
             self.data['manual_expenses'].to_csv(manual_expenses_file, index=False)
+            table_saved(manual_expenses_file)
 
             # Update budget tracking
             self.update_budget_with_expense(category, amount)
@@ -1492,6 +1499,7 @@ class EnhancedBudgetWidget(QWidget):
                 # Save updated budget
                 budget_file = os.path.join('data', 'budget.csv')
                 budget_df.to_csv(budget_file, index=False)
+                table_saved(budget_file)
 
         except Exception as e:
             self.logger.error(f"Error updating budget with expense: {e}")
@@ -1587,6 +1595,7 @@ class EnhancedBudgetWidget(QWidget):
             # Save to CSV
             budget_file = os.path.join('data', 'budget.csv')
             self.data['budget'].to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Refresh displays
             self.load_data()
@@ -1603,6 +1612,7 @@ class EnhancedBudgetWidget(QWidget):
             data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
             budget_file = os.path.join(data_dir, 'budget.csv')
             self.data['budget'].to_csv(budget_file, index=False)
+            table_saved(budget_file)
         except Exception as e:
             self.logger.error(f"Error saving budget data: {e}")
     
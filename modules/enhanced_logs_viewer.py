@@ -503,17 +503,13 @@ class EnhancedLogsViewer(QWidget):
             level = self.level_filter.currentData()
             module = self.module_filter.text().strip()
 
-            # Apply filters with smaller limit to avoid UI freeze
-            activities = self.activity_tracker.get_activities(limit=50)
-
-            if activity_type:
-                activities = [a for a in activities if a.activity_type == activity_type]
-
-            if level:
-                activities = [a for a in activities if a.level == level]
-
-            if module:
-                activities = [a for a in activities if module.lower() in a.module.lower()]
+            # Filters run as indexed queries on the activity log; only the newest 50 matches are loaded
+            activities = self.activity_tracker.get_activities(
+                activity_type=ActivityType(activity_type) if activity_type else None,
+                level=ActivityLevel(level) if level else None,
+                module_contains=module or None,
+                limit=50
+            )
 
             self.display_activities(activities)
         except Exception as e:
@@ -639,8 +635,7 @@ class EnhancedLogsViewer(QWidget):
         
         if reply == QMessageBox.Yes:
             if self.activity_tracker:
-                self.activity_tracker.activities.clear()
-                self.activity_tracker.save_activities()
+                self.activity_tracker.clear_activities()
             
             self.cmd_logs.clear()
             self.display_activities([])
@@ -5,23 +5,26 @@ Provides bell icon notification system with history and persistence
 """
 
 import sys
-import os
 import pandas as pd
-import json
 from datetime import datetime
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
+from modules.notification_pipeline import NotificationPipeline, PipelineScheduler
+from modules.notification_store import filter_categories, get_notification_store
+
 class NotificationBellWidget(QWidget):
     """Enhanced bell icon widget with notification count badge and categorization"""
 
-    def __init__(self, parent=None):
+    # Notifications added within this window are saved in one transaction
+    FLUSH_DELAY_MS = 250
+
+    def __init__(self, parent=None, store=None):
         super().__init__(parent)
-        self.notification_count = 0
-        self.unread_count = 0
-        self.notifications = []
+        self.store = store or get_notification_store()
         self.notification_panel = None
+        self.top_unread_category = None
 
         # Enhanced notification categories with priorities, colors, and comprehensive coverage
         self.categories = {
@@ -67,10 +70,19 @@ class NotificationBellWidget(QWidget):
         # Set up UI
         self.init_ui()
 
-        # Auto-save timer
-        self.save_timer = QTimer()
-        self.save_timer.timeout.connect(self.save_notifications)
-        self.save_timer.start(30000)  # Save every 30 seconds
+        # Bursts of notifications are saved (and shown in the open panel) together
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.FLUSH_DELAY_MS)
+        self.flush_timer.timeout.connect(self.save_notifications)
+
+    @property
+    def unread_count(self):
+        return self.store.unread_count
+
+    @property
+    def notification_count(self):
+        return self.store.total_count
     
     def init_ui(self):
         """Initialize the bell icon UI"""
@@ -136,7 +148,7 @@ class NotificationBellWidget(QWidget):
     def show_notification_panel(self):
         """Show/hide the notification panel"""
         if self.notification_panel is None:
-            self.notification_panel = NotificationPanel(self.notifications, self)
+            self.notification_panel = NotificationPanel(self.store, self)
             self.notification_panel.notification_read.connect(self.mark_notification_read)
             self.notification_panel.clear_all.connect(self.clear_all_notifications)
         
@@ -164,7 +176,7 @@ class NotificationBellWidget(QWidget):
             category = self.auto_detect_category(title, message)
 
         # Generate unique ID
-        notification_id = int(datetime.now().timestamp() * 1000)
+        notification_id = self.store.next_id()
 
         notification = {
             'id': notification_id,
@@ -180,32 +192,6 @@ class NotificationBellWidget(QWidget):
             'color': self.categories.get(category, {}).get('color', '#3498db')
         }
 
-        # Insert based on priority (higher priority = lower number = first)
-        inserted = False
-        for i, existing in enumerate(self.notifications):
-            if notification['priority'] < existing.get('priority', 5):
-                self.notifications.insert(i, notification)
-                inserted = True
-                break
-
-        if not inserted:
-            self.notifications.append(notification)
-
-        self.unread_count += 1
-        self.notification_count += 1
-
-        # Limit to 200 notifications (increased for better history)
-        if len(self.notifications) > 200:
-            # Remove oldest read notifications first
-            read_notifications = [n for n in self.notifications if n.get('read', False)]
-            if read_notifications:
-                # Remove oldest read notification
-                oldest_read = max(read_notifications, key=lambda x: x['timestamp'])
-                self.notifications.remove(oldest_read)
-            else:
-                # Remove oldest notification if all are unread
-                self.notifications = self.notifications[:200]
-
         # Handle sound notifications for critical categories
         category_info = self.categories.get(category, {})
         if category_info.get('sound', False):
@@ -215,15 +201,18 @@ class NotificationBellWidget(QWidget):
         if category_info.get('persist', False):
             notification['persistent'] = True
 
+        # Buffer in the store (the store keeps display order by priority and trims the history)
+        self.store.add(notification)
+        top_priority = self.categories.get(self.top_unread_category, {}).get('priority')
+        if top_priority is None or notification['priority'] < top_priority:
+            self.top_unread_category = category
+
         # Update display
         self.update()
 
-        # Update panel if visible
-        if self.notification_panel and self.notification_panel.isVisible():
-            self.notification_panel.refresh_notifications(self.notifications)
-
-        # Save notifications
-        self.save_notifications()
+        # Save (and refresh the open panel) once the burst is over
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
 
         # Enhanced logging with category and priority
         priority = notification.get('priority', 5)
@@ -318,69 +307,44 @@ class NotificationBellWidget(QWidget):
 
     def get_highest_priority_category(self):
         """Get the category of the highest priority unread notification"""
-        unread_notifications = [n for n in self.notifications if not n.get('read', False)]
-        if not unread_notifications:
-            return None
-
-        highest_priority = min(n.get('priority', 5) for n in unread_notifications)
-        for notification in unread_notifications:
-            if notification.get('priority', 5) == highest_priority:
-                return notification.get('category', 'info')
-        return 'info'
+        return self.top_unread_category if self.unread_count > 0 else None
     
     def mark_notification_read(self, notification_id):
         """Mark a notification as read"""
-        for notification in self.notifications:
-            if notification['id'] == notification_id and not notification['read']:
-                notification['read'] = True
-                self.unread_count = max(0, self.unread_count - 1)
-                break
+        try:
+            if self.store.mark_read(notification_id):
+                self.top_unread_category = self.store.top_unread_category()
+        except Exception as e:
+            print(f"Error marking notification read: {e}")
         
         self.update()
-        self.save_notifications()
     
     def clear_all_notifications(self):
         """Clear all notifications"""
-        self.notifications.clear()
-        self.unread_count = 0
-        self.notification_count = 0
+        self.store.clear()
+        self.top_unread_category = None
         self.update()
-        self.save_notifications()
         
         if self.notification_panel:
-            self.notification_panel.refresh_notifications(self.notifications)
+            self.notification_panel.refresh_notifications()
     
     def load_notifications(self):
-        """Load notifications from file"""
+        """Load the notification summary the badge shows from the store"""
         try:
-            notifications_file = 'data/notifications.json'
-            if os.path.exists(notifications_file):
-                with open(notifications_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.notifications = data.get('notifications', [])
-                    
-                    # Count unread notifications
-                    self.unread_count = sum(1 for n in self.notifications if not n.get('read', False))
-                    self.notification_count = len(self.notifications)
+            self.top_unread_category = self.store.top_unread_category()
         except Exception as e:
             print(f"Error loading notifications: {e}")
-            self.notifications = []
-            self.unread_count = 0
-            self.notification_count = 0
+            self.top_unread_category = None
     
     def save_notifications(self):
-        """Save notifications to file"""
+        """Save buffered notifications and refresh the open panel"""
         try:
-            os.makedirs('data', exist_ok=True)
-            notifications_file = 'data/notifications.json'
-            
-            data = {
-                'notifications': self.notifications,
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            with open(notifications_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if self.store.flush():
+                # Trimming the history may have dropped the most urgent unread notification
+                self.top_unread_category = self.store.top_unread_category()
+                if self.notification_panel and self.notification_panel.isVisible():
+                    self.notification_panel.refresh_notifications()
+                self.update()
         except Exception as e:
             print(f"Error saving notifications: {e}")
 
@@ -391,9 +355,14 @@ class NotificationPanel(QWidget):
     notification_read = Signal(int)
     clear_all = Signal()
 
-    def __init__(self, notifications, parent=None):
+    # Notifications loaded per page as the list is scrolled
+    PAGE_SIZE = 25
+
+    def __init__(self, store, parent=None):
         super().__init__(parent)
-        self.notifications = notifications
+        self.store = store
+        self.loaded_count = 0
+        self.has_more = False
         self.current_filter = 'all'  # all, unread, critical, error, warning, success, info, system
         self.init_ui()
 
@@ -526,11 +495,15 @@ class NotificationPanel(QWidget):
         
         scroll_area.setWidget(self.notifications_widget)
         frame_layout.addWidget(scroll_area)
+        self.scroll_area = scroll_area
+
+        # Load the next page when the list is scrolled near its end
+        scroll_area.verticalScrollBar().valueChanged.connect(self.on_scrolled)
         
         layout.addWidget(main_frame)
         
         # Populate notifications
-        self.refresh_notifications(self.notifications)
+        self.refresh_notifications()
 
     def set_filter(self, category):
         """Set the notification filter"""
@@ -543,54 +516,43 @@ class NotificationPanel(QWidget):
             self.filter_buttons[category].setChecked(True)
 
         self.current_filter = category
-        self.refresh_notifications(self.notifications)
-
-    def filter_notifications(self, notifications):
-        """Filter notifications based on current filter"""
-        if self.current_filter == 'all':
-            return notifications
-        elif self.current_filter == 'operational':
-            # Group operational categories
-            operational_categories = ['inventory', 'staff', 'schedule', 'budget', 'recipe']
-            return [n for n in notifications if n.get('category') in operational_categories]
-        else:
-            # Filter by specific category or related categories
-            if self.current_filter == 'critical':
-                filter_categories = ['critical', 'emergency', 'security']
-            elif self.current_filter == 'error':
-                filter_categories = ['error', 'failure']
-            elif self.current_filter == 'warning':
-                filter_categories = ['warning', 'maintenance', 'resource']
-            elif self.current_filter == 'success':
-                filter_categories = ['success', 'completion']
-            else:
-                filter_categories = [self.current_filter]
+        self.refresh_notifications()
 
-            return [n for n in notifications if n.get('category') in filter_categories]
-    
-    def refresh_notifications(self, notifications):
-        """Refresh the notifications display with filtering"""
+    def refresh_notifications(self):
+        """Show the first page of the current filter"""
         # Clear existing notifications
-        for i in reversed(range(self.notifications_layout.count())):
-            child = self.notifications_layout.itemAt(i).widget()
+        while self.notifications_layout.count():
+            child = self.notifications_layout.takeAt(0).widget()
             if child:
                 child.setParent(None)
+        self.loaded_count = 0
 
-        # Filter notifications
-        filtered_notifications = self.filter_notifications(notifications)
-
-        # Add notifications
-        if not filtered_notifications:
+        if not self.load_more():
             no_notifications = QLabel("No notifications in this category")
             no_notifications.setAlignment(Qt.AlignCenter)
             no_notifications.setStyleSheet("color: #7f8c8d; font-style: italic; padding: 20px;")
             self.notifications_layout.addWidget(no_notifications)
-        else:
-            for notification in filtered_notifications:
-                notification_widget = self.create_notification_widget(notification)
-                self.notifications_layout.addWidget(notification_widget)
 
         self.notifications_layout.addStretch()
+
+    def load_more(self):
+        """Append the next page of the current filter; returns how many were added"""
+        page = self.store.page(filter_categories(self.current_filter), self.loaded_count, self.PAGE_SIZE)
+        self.has_more = len(page) == self.PAGE_SIZE
+
+        # Insert before the trailing stretch (if the list already has one)
+        position = self.loaded_count
+        for notification in page:
+            self.notifications_layout.insertWidget(position, self.create_notification_widget(notification))
+            position += 1
+        self.loaded_count += len(page)
+        return len(page)
+
+    def on_scrolled(self, value):
+        """Lazily load the next page near the end of the list"""
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if self.has_more and value >= scroll_bar.maximum() - 100:
+            self.load_more()
     
     def create_notification_widget(self, notification):
         """Create an enhanced widget for a single notification"""
@@ -717,12 +679,26 @@ class CentralizedNotificationManager:
             'enable_bell': True,
             'enable_logging': True,
             'auto_categorize': True,
+            'coalesce': True,
             'max_history': 500
         }
 
+        # Bursts are merged into digests once a scheduler exists in the GUI thread
+        self.pipeline = NotificationPipeline(self._deliver)
+        self.scheduler = None
+
+    @property
+    def store(self):
+        """Notification store behind the bell (the shared store until a bell is registered)"""
+        if self.bell_widget is not None:
+            return self.bell_widget.store
+        return get_notification_store()
+
     def register_bell_widget(self, bell_widget):
         """Register the bell widget"""
         self.bell_widget = bell_widget
+        if self.scheduler is None:
+            self.scheduler = PipelineScheduler(self.pipeline)
         print("📢 Bell widget registered with centralized manager")
 
     def register_toast_manager(self, toast_manager):
@@ -739,8 +715,12 @@ class CentralizedNotificationManager:
         print(f"📢 Component subscribed to notifications: {categories or ['all']}")
 
     def notify(self, title, message, category='info', priority=None, source=None,
-               show_toast=True, show_bell=True, duration=5000):
-        """Send a notification through all registered channels"""
+               show_toast=True, show_bell=True, duration=5000, key=None):
+        """Send a notification through all registered channels
+
+        Notifications sharing category, source and ``key`` (default: the
+        title) that arrive together are delivered as one digest.
+        """
 
         # Create notification object
         notification = {
@@ -749,6 +729,7 @@ class CentralizedNotificationManager:
             'category': category,
             'priority': priority,
             'source': source,
+            'key': key,
             'timestamp': datetime.now().isoformat(),
             'id': int(datetime.now().timestamp() * 1000)
         }
@@ -758,6 +739,25 @@ class CentralizedNotificationManager:
         if len(self.notification_history) > self.settings['max_history']:
             self.notification_history = self.notification_history[:self.settings['max_history']]
 
+        if self.scheduler is None or not self.settings['coalesce']:
+            self._deliver(notification, show_toast, show_bell, duration)
+        elif self.pipeline.submit(notification, show_toast, show_bell, duration):
+            self.scheduler.request()
+
+        return notification
+
+    def flush_pending(self):
+        """Deliver every held notification now (e.g. before shutdown)"""
+        return self.pipeline.flush(force=True)
+
+    def _deliver(self, notification, show_toast=True, show_bell=True, duration=5000):
+        """Show a notification (or digest) on the bell, as a toast and to subscribers"""
+        title = notification['title']
+        message = notification['message']
+        category = notification['category']
+        priority = notification.get('priority')
+        source = notification.get('source')
+
         # Send to bell widget
         if show_bell and self.bell_widget and self.settings['enable_bell']:
             try:
@@ -781,8 +781,6 @@ class CentralizedNotificationManager:
                 except Exception as e:
                     print(f"Error notifying subscriber: {e}")
 
-        return notification
-
     def get_notifications(self, category=None, unread_only=False, limit=None):
         """Get notifications with optional filtering"""
         notifications = self.notification_history
@@ -17,6 +17,9 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
 from PySide6.QtCore import Qt, Signal, QDate, QTimer
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor
 
+from modules.daily_cube import invalidate_cube, record_rows
+from modules.table_watcher import table_saved
+
 # Import notification system
 try:
     from .notification_system import notify_info, notify_success, notify_warning, notify_error
@@ -580,11 +583,13 @@ class EnhancedSalesWidget(QWidget):
 
                 # Append new data
                 self.data['sales'] = pd.concat([self.data['sales'], results['data']], ignore_index=True)
+                record_rows('sales', results['data'], self.data['sales'])
 
                 # Save to file
                 data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
                 sales_file = os.path.join(data_dir, 'sales.csv')
                 self.data['sales'].to_csv(sales_file, index=False)
+                table_saved(sales_file)
 
                 # Refresh display
                 self.load_data()
@@ -640,6 +645,8 @@ class EnhancedSalesWidget(QWidget):
             data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
             sales_file = os.path.join(data_dir, 'sales.csv')
             self.data['sales'].to_csv(sales_file, index=False)
+            table_saved(sales_file)
+            invalidate_cube('sales')
 
             self.load_data()
             self.data_changed.emit()
@@ -690,6 +697,8 @@ class EnhancedSalesWidget(QWidget):
             data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
             sales_file = os.path.join(data_dir, 'sales.csv')
             self.data['sales'].to_csv(sales_file, index=False)
+            table_saved(sales_file)
+            invalidate_cube('sales')
 
             self.load_data()
             self.data_changed.emit()
@@ -830,11 +839,13 @@ class AddSaleDialog(QDialog):
 
             new_df = pd.DataFrame([new_sale])
             self.data['sales'] = pd.concat([self.data['sales'], new_df], ignore_index=True)
+            record_rows('sales', new_df, self.data['sales'])
 
             # Save to file
             data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
             sales_file = os.path.join(data_dir, 'sales.csv')
             self.data['sales'].to_csv(sales_file, index=False)
+            table_saved(sales_file)
 
             # Use inventory integration system for comprehensive updates
             try:
@@ -10,6 +10,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_watcher import table_saved
 
 class ExpensesWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -510,6 +511,7 @@ class ExpensesWidget(QWidget):
             # Save to CSV
             self.data['expenses_list'] = self.expenses_df
             self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+            table_saved('data/expenses_list.csv')
 
             # Update the inventory if the item exists there
             quantity = float(self.expenses_table.item(row, 3).text())
@@ -570,6 +572,7 @@ class ExpensesWidget(QWidget):
             # Save to CSV
             self.data['expenses_list'] = self.expenses_df
             self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+            table_saved('data/expenses_list.csv')
             
             # Refresh the list
             self.update_expenses_list()
@@ -683,6 +686,7 @@ class ExpensesWidget(QWidget):
             # Save to CSV
             self.data['expenses_list'] = self.expenses_df
             self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+            table_saved('data/expenses_list.csv')
 
             # Refresh the list
             self.update_expenses_list()
@@ -718,6 +722,7 @@ class ExpensesWidget(QWidget):
                 # Save to CSV
                 self.data['expenses_list'] = self.expenses_df
                 self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+                table_saved('data/expenses_list.csv')
                 
                 # Refresh the list
                 self.update_expenses_list()
@@ -978,6 +983,7 @@ class ExpensesWidget(QWidget):
         
         # Save to CSV
         self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+        table_saved('data/expenses_list.csv')
         
         # Update table
         self.update_expenses_list()
@@ -1036,6 +1042,7 @@ class ExpensesWidget(QWidget):
             
             # Save to CSV
             self.data['items'].to_csv('data/items.csv', index=False)
+            table_saved('data/items.csv')
             
             print(f"Added new item '{item_name}' to items database")
         
@@ -1068,6 +1075,7 @@ class ExpensesWidget(QWidget):
             
             # Save to CSV
             self.data['categories'].to_csv('data/categories.csv', index=False)
+            table_saved('data/categories.csv')
             
             print(f"Added new category '{category}' to categories database")
 
@@ -1219,6 +1227,7 @@ class ExpensesWidget(QWidget):
             # Update data dictionary and save
             self.data['expenses_list'] = self.expenses_df
             self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+            table_saved('data/expenses_list.csv')
 
             # Refresh the list
             self.update_expenses_list()
@@ -1548,6 +1557,7 @@ class ExpensesWidget(QWidget):
 
         # Save inventory to CSV
         self.data['inventory'].to_csv('data/inventory.csv', index=False)
+        table_saved('data/inventory.csv')
         print(f"Inventory saved to CSV with {len(self.data['inventory'])} items")
 
         # Trigger refresh of all tabs to reflect the changes
@@ -1663,6 +1673,7 @@ class ExpensesWidget(QWidget):
             # Update data and save
             self.data['expenses_list'] = self.expenses_df
             self.expenses_df.to_csv('data/expenses_list.csv', index=False)
+            table_saved('data/expenses_list.csv')
 
             # Refresh display
             self.update_expenses_list()
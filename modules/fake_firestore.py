@@ -0,0 +1,228 @@
+"""
+Fake Firestore Client for Kitchen Dashboard
+In-memory stand-in for the Firestore client used to test and benchmark cloud sync offline
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from modules.firestore_serializer import SERVER_TIMESTAMP
+
+
+class FakeDocumentSnapshot:
+    """Result of ``DocumentReference.get()`` / ``stream()``"""
+
+    def __init__(self, reference, data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentReference:
+    def __init__(self, client, path: str):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def collection(self, name: str):
+        return FakeCollectionReference(self._client, f"{self.path}/{name}")
+
+    def collections(self):
+        """Sub-collections that currently hold documents"""
+        prefix = f"{self.path}/"
+        names = {path[len(prefix):].split('/', 1)[0] for path in self._client.paths() if path.startswith(prefix)}
+        return [self.collection(name) for name in sorted(names)]
+
+    def get(self) -> FakeDocumentSnapshot:
+        with self._client.round_trip():
+            self._client.count('reads')
+            return FakeDocumentSnapshot(self, self._client.read(self.path))
+
+    def set(self, data: Dict[str, Any]):
+        with self._client.round_trip():
+            self._client.apply([(self.path, dict(data))])
+
+    def delete(self):
+        with self._client.round_trip():
+            self._client.apply([(self.path, None)])
+
+
+class FakeCollectionReference:
+    def __init__(self, client, path: str, condition: Optional[Tuple[str, str, Any]] = None):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+        self._condition = condition
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentReference:
+        if doc_id is None:
+            doc_id = self._client.auto_id()
+        return FakeDocumentReference(self._client, f"{self.path}/{doc_id}")
+
+    def where(self, field: str, op: str, value: Any):
+        if op not in self._client.OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        return FakeCollectionReference(self._client, self.path, (field, op, value))
+
+    def _matches(self, data: Dict[str, Any]) -> bool:
+        if self._condition is None:
+            return True
+        field, op, value = self._condition
+        if field not in data or data[field] is None:
+            return False
+        try:
+            return self._client.OPERATORS[op](data[field], value)
+        except TypeError:
+            # Like Firestore, a range filter only matches values of its own type
+            return False
+
+    def stream(self) -> Iterator[FakeDocumentSnapshot]:
+        """Matching documents (fetched in one round trip, one read per document)"""
+        prefix = f"{self.path}/"
+        with self._client.round_trip():
+            matches = [
+                (path, data) for path, data in self._client.items()
+                if path.startswith(prefix) and '/' not in path[len(prefix):] and self._matches(data)
+            ]
+            self._client.count('reads', len(matches))
+        for path, data in matches:
+            yield FakeDocumentSnapshot(FakeDocumentReference(self._client, path), data)
+
+
+class FakeWriteBatch:
+    MAX_OPERATIONS = 500
+
+    def __init__(self, client):
+        self._client = client
+        self._operations = []
+
+    def set(self, reference: FakeDocumentReference, data: Dict[str, Any]):
+        self._operations.append((reference.path, dict(data)))
+
+    def delete(self, reference: FakeDocumentReference):
+        self._operations.append((reference.path, None))
+
+    def commit(self):
+        if len(self._operations) > self.MAX_OPERATIONS:
+            raise ValueError(f"A batch can contain at most {self.MAX_OPERATIONS} operations")
+        with self._client.round_trip():
+            self._client.apply(self._operations)
+            self._client.count('commits')
+        self._operations = []
+
+
+class FakeFirestoreClient:
+    """
+    Thread-safe in-memory Firestore client.
+
+    Implements the subset of the API the sync code uses: nested
+    collection/document references, ``get``/``set``/``delete``, ``stream``
+    with a single ``where`` filter and write batches. Every call that would
+    hit the network sleeps for ``latency`` seconds, so sync throughput and
+    concurrency can be benchmarked offline; reads, writes, commits and the
+    peak number of concurrent round trips are counted. While ``offline`` is
+    set every round trip raises ConnectionError. ``SERVER_TIMESTAMP`` fields
+    are replaced with the fake server's commit time (UTC, increasing).
+    """
+
+    OPERATORS = {
+        '==': lambda a, b: a == b,
+        '>': lambda a, b: a > b,
+        '>=': lambda a, b: a >= b,
+        '<': lambda a, b: a < b,
+        '<=': lambda a, b: a <= b,
+    }
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.offline = False
+        self._next_id = 0
+        self._last_commit_time = None
+        self._lock = threading.RLock()
+
+    def collection(self, name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    @contextmanager
+    def round_trip(self):
+        """Simulate one network round trip"""
+        if self.offline:
+            raise ConnectionError("Firestore is unreachable")
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def auto_id(self) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"auto{self._next_id:012d}"
+
+    def read(self, path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self.docs.get(path)
+            return dict(data) if data is not None else None
+
+    def items(self):
+        with self._lock:
+            return [(path, dict(data)) for path, data in self.docs.items()]
+
+    def paths(self):
+        with self._lock:
+            return list(self.docs)
+
+    def commit_time(self) -> datetime:
+        """Server clock for a commit (later than every earlier commit)"""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            if self._last_commit_time is not None and now <= self._last_commit_time:
+                now = self._last_commit_time + timedelta(microseconds=1)
+            self._last_commit_time = now
+            return now
+
+    def apply(self, operations):
+        """Apply (path, data-or-None) writes atomically"""
+        with self._lock:
+            committed_at = self.commit_time()
+            for path, data in operations:
+                self.writes += 1
+                if data is None:
+                    self.docs.pop(path, None)
+                else:
+                    self.docs[path] = {key: committed_at if value is SERVER_TIMESTAMP else value
+                                       for key, value in data.items()}
+
+    def documents(self, collection_path: str) -> Dict[str, Dict[str, Any]]:
+        """Documents directly inside a collection, by document ID (for assertions)"""
+        prefix = f"{collection_path}/"
+        with self._lock:
+            return {
+                path[len(prefix):]: dict(data) for path, data in self.docs.items()
+                if path.startswith(prefix) and '/' not in path[len(prefix):]
+            }
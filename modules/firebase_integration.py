@@ -6,6 +6,8 @@ import pandas as pd
 from datetime import datetime
 import requests
 
+from modules.firestore_metering import MeteredFirestoreClient, get_quota_meter
+
 # Firebase Admin SDK with fallback for missing modules
 FIREBASE_ADMIN_AVAILABLE = False
 firebase_admin = None
@@ -402,7 +404,7 @@ def initialize_firebase():
 
         # Get Firestore database instance
         log_info("Getting Firestore database instance...")
-        FIRESTORE_DB = firestore.client()
+        FIRESTORE_DB = MeteredFirestoreClient(firestore.client(), get_quota_meter())
         
         # Initialize Pyrebase for authentication if available
         if PYREBASE_AVAILABLE:
@@ -0,0 +1,432 @@
+"""
+Firestore Metering for Kitchen Dashboard
+Counts real document reads, writes and deletes per collection and plans syncs within the free tier
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from modules.cloud_delta_sync import TableDelta
+
+logger = logging.getLogger(__name__)
+
+# Firestore free tier (per project per day, reset at midnight Pacific time)
+FREE_TIER_LIMITS = {'reads': 50000, 'writes': 20000, 'deletes': 20000}
+USAGE_KINDS = tuple(FREE_TIER_LIMITS)
+USAGE_FILENAME = '.firestore_usage.json'
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    QUOTA_TIMEZONE = None
+
+
+def quota_date() -> str:
+    """The Firestore quota day that is running now"""
+    return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+def _empty_usage() -> Dict[str, int]:
+    return {kind: 0 for kind in USAGE_KINDS}
+
+
+class QuotaMeter:
+    """
+    Daily Firestore usage, counted from the calls actually made.
+
+    Usage is kept per collection and per operation (set with ``operation()``),
+    rolls over with the quota day and is persisted so that restarting the app
+    does not reset the counters. Totals of previous days are kept as history.
+    """
+
+    SAVE_INTERVAL = 5.0
+    HISTORY_DAYS = 30
+
+    def __init__(self, path: str, limits: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.limits = dict(FREE_TIER_LIMITS, **(limits or {}))
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._dirty = False
+        self._last_save = 0.0
+
+        self.date = quota_date()
+        self.totals = _empty_usage()
+        self.collections: Dict[str, Dict[str, int]] = {}
+        self.operations: Dict[str, Dict[str, int]] = {}
+        self.history: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.history = data.get('history', {})
+            if data.get('date') == self.date:
+                self.totals.update(data.get('totals', {}))
+                self.collections = data.get('collections', {})
+                self.operations = data.get('operations', {})
+            elif data.get('date'):
+                self.history[data['date']] = data.get('totals', _empty_usage())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Firestore usage file: {e}")
+
+    def _roll_over(self):
+        """Start a new quota day (called with the lock held)"""
+        today = quota_date()
+        if today == self.date:
+            return
+        self.history[self.date] = dict(self.totals)
+        for old_date in sorted(self.history)[:-self.HISTORY_DAYS]:
+            del self.history[old_date]
+        self.date = today
+        self.totals = _empty_usage()
+        self.collections = {}
+        self.operations = {}
+        self._dirty = True
+
+    @contextmanager
+    def operation(self, name: str):
+        """Attribute the calls made by this thread inside the block to ``name``"""
+        previous = getattr(self._local, 'operation', None)
+        self._local.operation = name
+        try:
+            yield
+        finally:
+            self._local.operation = previous
+
+    def record(self, kind: str, count: int = 1, collection: Optional[str] = None):
+        """Count ``count`` document reads/writes/deletes"""
+        if count <= 0:
+            return
+        with self._lock:
+            self._roll_over()
+            self.totals[kind] += count
+            operation = getattr(self._local, 'operation', None) or 'other'
+            for bucket, name in ((self.collections, collection or 'other'), (self.operations, operation)):
+                usage = bucket.setdefault(name, _empty_usage())
+                usage[kind] += count
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+                self._save()
+
+    def used(self, kind: str) -> int:
+        with self._lock:
+            self._roll_over()
+            return self.totals[kind]
+
+    def remaining(self, kind: str) -> int:
+        return max(0, self.limits[kind] - self.used(kind))
+
+    def usage(self) -> Dict[str, Any]:
+        """Today's totals, limits and the per-collection / per-operation breakdown"""
+        with self._lock:
+            self._roll_over()
+            return {
+                'date': self.date,
+                **self.totals,
+                'limits': dict(self.limits),
+                'remaining': {kind: max(0, self.limits[kind] - self.totals[kind]) for kind in USAGE_KINDS},
+                'collections': {name: dict(usage) for name, usage in self.collections.items()},
+                'operations': {name: dict(usage) for name, usage in self.operations.items()},
+            }
+
+    def flush(self):
+        """Persist pending usage now"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        data = {
+            'date': self.date,
+            'totals': self.totals,
+            'collections': self.collections,
+            'operations': self.operations,
+            'history': self.history,
+        }
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error saving Firestore usage: {e}")
+
+
+@dataclass
+class SyncPlan:
+    """Part of a sync that fits today's quota, and what was deferred"""
+    deltas: List[TableDelta] = field(default_factory=list)
+    deferred: Dict[str, int] = field(default_factory=dict)   # table -> operations left for later
+    reads: int = 0
+    writes: int = 0
+    deletes: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.deferred
+
+
+class QuotaPlanner:
+    """
+    Predicts what a sync will cost and trims it to the quota left today.
+
+    A fraction of every daily limit is held back so the app can still log in,
+    check watermarks and save single records after a large sync.
+    """
+
+    RESERVE_FRACTION = 0.05
+
+    def __init__(self, meter: QuotaMeter):
+        self.meter = meter
+
+    def budget(self) -> Dict[str, int]:
+        """Operations of each kind still available to syncs today"""
+        return {
+            kind: max(0, self.meter.remaining(kind) - int(self.meter.limits[kind] * self.RESERVE_FRACTION))
+            for kind in USAGE_KINDS
+        }
+
+    def fits(self, reads: int = 0, writes: int = 0, deletes: int = 0) -> bool:
+        budget = self.budget()
+        return reads <= budget['reads'] and writes <= budget['writes'] and deletes <= budget['deletes']
+
+    def plan_upload(self, deltas: Iterable[TableDelta], reads_per_table: int = 0,
+                    writes_per_table: int = 0) -> SyncPlan:
+        """
+        Fit delta uploads into the remaining quota.
+
+        ``reads_per_table`` / ``writes_per_table`` is the fixed overhead of
+        uploading a table (e.g. watermark documents). A table that does not fit
+        is split: the first rows that fit are uploaded and the rest are left
+        for a later sync - the upload manifest only records committed rows, so
+        the next plan picks them up again automatically.
+        """
+        budget = self.budget()
+        plan = SyncPlan()
+        for delta in deltas:
+            if delta.write_count == 0:
+                plan.deltas.append(delta)
+                continue
+            if budget['reads'] < reads_per_table or budget['writes'] < writes_per_table:
+                plan.deferred[delta.table_name] = delta.write_count
+                continue
+
+            sets = min(len(delta.records), budget['writes'] - writes_per_table)
+            deletes = min(len(delta.deletes), budget['deletes'])
+            if sets == 0 and deletes == 0:
+                plan.deferred[delta.table_name] = delta.write_count
+                continue
+            if sets < len(delta.records) or deletes < len(delta.deletes):
+                plan.deferred[delta.table_name] = delta.write_count - sets - deletes
+                delta = replace(delta, doc_ids=delta.doc_ids[:sets], records=delta.records[:sets],
+                                deletes=delta.deletes[:deletes])
+
+            plan.deltas.append(delta)
+            plan.reads += reads_per_table
+            plan.writes += sets + writes_per_table
+            plan.deletes += deletes
+            budget['reads'] -= reads_per_table
+            budget['writes'] -= sets + writes_per_table
+            budget['deletes'] -= deletes
+
+        if plan.deferred:
+            logger.warning(f"Firestore quota: deferring {sum(plan.deferred.values())} operations "
+                           f"({', '.join(plan.deferred)}) to a later sync")
+        return plan
+
+
+# ----------------------------------------------------------------------
+# Metered client: wraps the Firestore client and counts every call
+# ----------------------------------------------------------------------
+
+QUERY_METHODS = ('where', 'order_by', 'limit', 'limit_to_last', 'offset', 'select',
+                 'start_at', 'start_after', 'end_at', 'end_before')
+
+
+class MeteredQuery:
+    """Query (or collection) whose results are counted as document reads"""
+
+    def __init__(self, query, meter: QuotaMeter, collection: str):
+        self._query = query
+        self._meter = meter
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attribute = getattr(self._query, name)
+        if name in QUERY_METHODS:
+            def chained(*args, **kwargs):
+                return MeteredQuery(attribute(*args, **kwargs), self._meter, self._collection)
+            return chained
+        return attribute
+
+    def stream(self, *args, **kwargs):
+        """Yield the matching documents; every document is one read (an empty result still costs one)"""
+        count = 0
+        try:
+            for snapshot in self._query.stream(*args, **kwargs):
+                count += 1
+                yield snapshot
+        finally:
+            self._meter.record('reads', max(count, 1), self._collection)
+
+    def get(self, *args, **kwargs):
+        return list(self.stream(*args, **kwargs))
+
+
+class MeteredCollectionReference(MeteredQuery):
+    def document(self, *args):
+        return MeteredDocumentReference(self._query.document(*args), self._meter, self._collection)
+
+    def add(self, *args, **kwargs):
+        result = self._query.add(*args, **kwargs)
+        self._meter.record('writes', 1, self._collection)
+        return result
+
+    def list_documents(self, *args, **kwargs):
+        references = list(self._query.list_documents(*args, **kwargs))
+        self._meter.record('reads', max(len(references), 1), self._collection)
+        return [MeteredDocumentReference(reference, self._meter, self._collection) for reference in references]
+
+
+class MeteredDocumentReference:
+    def __init__(self, reference, meter: QuotaMeter, collection: str):
+        self._reference = reference
+        self._meter = meter
+        self._collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self._reference, name)
+
+    def collection(self, name: str) -> MeteredCollectionReference:
+        return MeteredCollectionReference(self._reference.collection(name), self._meter, name)
+
+    def collections(self, *args, **kwargs):
+        collections = list(self._reference.collections(*args, **kwargs))
+        self._meter.record('reads', 1, self._collection)
+        return [MeteredCollectionReference(collection, self._meter, collection.id) for collection in collections]
+
+    def get(self, *args, **kwargs):
+        snapshot = self._reference.get(*args, **kwargs)
+        self._meter.record('reads', 1, self._collection)
+        return snapshot
+
+    def _write(self, method, kind, *args, **kwargs):
+        result = getattr(self._reference, method)(*args, **kwargs)
+        self._meter.record(kind, 1, self._collection)
+        return result
+
+    def set(self, *args, **kwargs):
+        return self._write('set', 'writes', *args, **kwargs)
+
+    def create(self, *args, **kwargs):
+        return self._write('create', 'writes', *args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return self._write('update', 'writes', *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._write('delete', 'deletes', *args, **kwargs)
+
+
+def _unwrap(reference):
+    return reference._reference if isinstance(reference, MeteredDocumentReference) else reference
+
+
+class MeteredWriteBatch:
+    """Write batch whose operations are counted when (and only if) it commits"""
+
+    def __init__(self, batch, meter: QuotaMeter):
+        self._batch = batch
+        self._meter = meter
+        self._pending = Counter()
+
+    def __getattr__(self, name):
+        return getattr(self._batch, name)
+
+    def _add(self, method, kind, reference, *args, **kwargs):
+        getattr(self._batch, method)(_unwrap(reference), *args, **kwargs)
+        self._pending[(kind, getattr(reference, '_collection', None))] += 1
+        return self
+
+    def set(self, reference, *args, **kwargs):
+        return self._add('set', 'writes', reference, *args, **kwargs)
+
+    def create(self, reference, *args, **kwargs):
+        return self._add('create', 'writes', reference, *args, **kwargs)
+
+    def update(self, reference, *args, **kwargs):
+        return self._add('update', 'writes', reference, *args, **kwargs)
+
+    def delete(self, reference, *args, **kwargs):
+        return self._add('delete', 'deletes', reference, *args, **kwargs)
+
+    def commit(self, *args, **kwargs):
+        result = self._batch.commit(*args, **kwargs)
+        for (kind, collection), count in self._pending.items():
+            self._meter.record(kind, count, collection)
+        self._pending.clear()
+        return result
+
+
+class MeteredFirestoreClient:
+    """
+    Drop-in wrapper around a Firestore client that counts billable operations.
+
+    Every document read, write and delete made through it - directly, via
+    queries or via write batches - is recorded in ``meter`` under the
+    collection it touched.
+    """
+
+    def __init__(self, client, meter: QuotaMeter):
+        self.raw_client = client
+        self.meter = meter
+
+    def __getattr__(self, name):
+        return getattr(self.raw_client, name)
+
+    def collection(self, name: str) -> MeteredCollectionReference:
+        return MeteredCollectionReference(self.raw_client.collection(name), self.meter, name.rsplit('/', 1)[-1])
+
+    def document(self, path: str) -> MeteredDocumentReference:
+        parts = path.strip('/').split('/')
+        collection = parts[-2] if len(parts) >= 2 else parts[0]
+        return MeteredDocumentReference(self.raw_client.document(path), self.meter, collection)
+
+    def collections(self, *args, **kwargs):
+        collections = list(self.raw_client.collections(*args, **kwargs))
+        self.meter.record('reads', 1, None)
+        return [MeteredCollectionReference(collection, self.meter, collection.id) for collection in collections]
+
+    def batch(self) -> MeteredWriteBatch:
+        return MeteredWriteBatch(self.raw_client.batch(), self.meter)
+
+
+# Global meter instances, one per usage file
+_quota_meters: Dict[str, QuotaMeter] = {}
+_quota_meters_lock = threading.Lock()
+
+
+def get_quota_meter(data_dir: str = 'data') -> QuotaMeter:
+    """Get the global Firestore quota meter of a data directory"""
+    path = os.path.abspath(os.path.join(data_dir, USAGE_FILENAME))
+    with _quota_meters_lock:
+        meter = _quota_meters.get(path)
+        if meter is None:
+            meter = _quota_meters[path] = QuotaMeter(path)
+        return meter
@@ -0,0 +1,148 @@
+"""
+Firestore Serializer for Kitchen Dashboard
+Column-wise conversion of DataFrames into Firestore records with vectorized row hashes
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from firebase_admin import firestore
+    SERVER_TIMESTAMP = firestore.SERVER_TIMESTAMP
+except ImportError:
+    class _ServerTimestamp:
+        """Stand-in for firestore.SERVER_TIMESTAMP when the Firebase SDK is not installed"""
+
+        def __repr__(self):
+            return 'SERVER_TIMESTAMP'
+
+    SERVER_TIMESTAMP = _ServerTimestamp()
+
+logger = logging.getLogger(__name__)
+
+# Metadata fields added to every uploaded record (stripped again on download).
+# _sync_timestamp is set by the Firestore server so installations with skewed
+# clocks still order their uploads correctly.
+SYNC_TIMESTAMP_FIELD = '_sync_timestamp'
+RECORD_HASH_FIELD = '_record_hash'
+METADATA_FIELDS = (SYNC_TIMESTAMP_FIELD, RECORD_HASH_FIELD)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _with_missing(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    """Object array of ``values`` with None where ``missing`` is set"""
+    values = values.astype(object)
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def _convert_cell(value) -> Any:
+    """Per-cell fallback for object columns holding mixed types"""
+    if isinstance(value, (list, dict)):
+        return str(value)
+    if pd.isna(value):
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return str(value)
+
+
+def firestore_column(series: pd.Series) -> np.ndarray:
+    """
+    Convert one column into Firestore-ready values, chosen once from its dtype.
+
+    Numbers become floats, booleans stay booleans, datetimes and text become
+    strings and missing values become None. Only object columns mixing
+    numbers and text fall back to converting cell by cell.
+    """
+    missing = series.isna().to_numpy()
+
+    if pd.api.types.is_bool_dtype(series):
+        return _with_missing(series.to_numpy(dtype=object), missing)
+    if pd.api.types.is_numeric_dtype(series):
+        return _with_missing(series.to_numpy(dtype='float64', na_value=np.nan), missing)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _with_missing(series.dt.strftime(DATETIME_FORMAT).to_numpy(dtype=object), missing)
+
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred in ('string', 'empty'):
+        return _with_missing(series.to_numpy(dtype=object), missing)
+    if inferred in ('integer', 'floating', 'mixed-integer-float', 'decimal'):
+        return _with_missing(pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64'), missing)
+    if inferred == 'boolean':
+        return _with_missing(series.to_numpy(dtype=object), missing)
+    return np.array([_convert_cell(value) for value in series.to_numpy(dtype=object)], dtype=object)
+
+
+def firestore_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Every column of ``df`` converted with ``firestore_column``, keyed by its
+    name as a string (Firestore field names are strings). When two columns
+    share a name the last one wins, as it would in a record dict.
+    """
+    columns = {}
+    for position, column in enumerate(df.columns):
+        name = str(column)
+        if name in columns:
+            logger.warning(f"Duplicate column '{name}' in upload, keeping the last one")
+        columns[name] = firestore_column(df.iloc[:, position])
+    return columns
+
+
+def record_hashes(df: pd.DataFrame, columns: Optional[Dict[Any, np.ndarray]] = None) -> np.ndarray:
+    """
+    Content hash of every row as a 16-character hex string.
+
+    Rows are hashed from their Firestore values (not the raw dtypes), so a
+    table re-read from CSV with ints turned into floats hashes the same.
+    Fields are hashed by name in sorted order, so a row hashes the same
+    whatever the column order (e.g. rebuilt from downloaded documents) and
+    differently once a column is renamed. Sync metadata is never part of
+    the hash.
+    """
+    if len(df) == 0:
+        return np.array([], dtype=object)
+    if columns is None:
+        columns = firestore_columns(df)
+
+    names = sorted(str(name) for name in columns)
+    values = {str(name): column for name, column in columns.items()}
+    normalized = pd.DataFrame({
+        position: f"{name}\x1f" + pd.Series(values[name], dtype=object).astype(str)
+        for position, name in enumerate(names)
+    })
+    hashes = pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+    return np.array([format(value, '016x') for value in hashes.tolist()], dtype=object)
+
+
+def serialize_dataframe(df: pd.DataFrame, sync_timestamp: Any = None,
+                        include_hash: bool = True) -> List[Dict]:
+    """
+    Convert a DataFrame into a list of Firestore records.
+
+    Conversion runs column by column and all records of the batch share one
+    ``_sync_timestamp`` (the server's commit time unless one is given);
+    ``_record_hash`` is computed for all rows in one pass.
+    """
+    if df is None or df.empty:
+        return []
+
+    if sync_timestamp is None:
+        sync_timestamp = SERVER_TIMESTAMP
+
+    columns = firestore_columns(df)
+    names = list(columns.keys()) + [SYNC_TIMESTAMP_FIELD]
+    values = [column.tolist() for column in columns.values()]
+    values.append([sync_timestamp] * len(df))
+    if include_hash:
+        names.append(RECORD_HASH_FIELD)
+        values.append(record_hashes(df, columns).tolist())
+
+    return [dict(zip(names, row)) for row in zip(*values)]
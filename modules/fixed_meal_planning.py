@@ -23,6 +23,7 @@ from PySide6.QtWidgets import (
 import logging # Added for diagnostics
 from PySide6.QtCore import Qt, Signal, QDate, QModelIndex # Added QModelIndex
 from PySide6.QtGui import QFont, QIcon # Added QIcon
+from modules.table_watcher import table_saved
 
 # Import notification system
 try:
@@ -1132,6 +1133,7 @@ class FixedMealPlanningWidget(QWidget):
                 # Save the sample data to the file
                 os.makedirs(os.path.dirname(ingredients_file), exist_ok=True)
                 self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                table_saved(ingredients_file)
                 logging.info(f"Created sample recipe ingredients file at: {ingredients_file}")
         except Exception as e:
             logging.error(f"Error loading recipe ingredients: {e}")
@@ -1324,6 +1326,7 @@ class FixedMealPlanningWidget(QWidget):
 
                     # Save updated items
                     items_df.to_csv(items_file, index=False)
+                    table_saved(items_file)
 
                     # Update data dictionary if it exists
                     if 'items' in self.data:
@@ -1372,6 +1375,7 @@ class FixedMealPlanningWidget(QWidget):
 
             # Save updated categories
             categories_df.to_csv(categories_file, index=False)
+            table_saved(categories_file)
 
             # Update data dictionary if it exists
             if 'categories' in self.data:
@@ -1434,6 +1438,7 @@ class FixedMealPlanningWidget(QWidget):
             
             self.recipes_df = pd.concat([self.recipes_df, new_recipe_df[expected_recipe_cols]], ignore_index=True)
             self.recipes_df.to_csv(recipes_file, index=False)
+            table_saved(recipes_file)
             logging.info(f"Recipe '{recipe_data['recipe_name']}' added with ID {new_recipe_id} and saved to {recipes_file}")
 
             if ingredients_data:
@@ -1467,6 +1472,7 @@ class FixedMealPlanningWidget(QWidget):
                     self.data['recipe_ingredients'] = pd.concat([self.data['recipe_ingredients'], new_ingredients_df[expected_ingredient_cols]], ignore_index=True)
                 
                 self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                table_saved(ingredients_file)
                 logging.info(f"Added {len(ingredients_data)} ingredients for recipe ID {new_recipe_id} and saved to {ingredients_file}")
 
             self.populate_recipe_table()
@@ -1508,6 +1514,7 @@ class FixedMealPlanningWidget(QWidget):
 
                 # Save updated recipes
                 self.recipes_df.to_csv(recipes_file, index=False)
+                table_saved(recipes_file)
 
                 # Update ingredients - remove old ones and add new ones
                 if 'recipe_ingredients' in self.data:
@@ -1549,6 +1556,7 @@ class FixedMealPlanningWidget(QWidget):
 
                     # Save updated ingredients
                     self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                    table_saved(ingredients_file)
 
                 # Refresh the UI
                 self.populate_recipe_table()
@@ -1599,9 +1607,11 @@ class FixedMealPlanningWidget(QWidget):
                         self.data['recipe_ingredients']['recipe_id'] != recipe_id
                     ]
                     self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                    table_saved(ingredients_file)
 
                 # Save updated recipes
                 self.recipes_df.to_csv(recipes_file, index=False)
+                table_saved(recipes_file)
 
                 # Update data dictionary
                 if 'recipes' in self.data:
@@ -1685,6 +1695,7 @@ class FixedMealPlanningWidget(QWidget):
 
                     # Save to CSV
                     self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                    table_saved(ingredients_file)
 
                     # Check if we need to add the ingredient to items.csv
                     if 'category' in ingredient_data and ingredient_data['category']:
@@ -1749,6 +1760,7 @@ class FixedMealPlanningWidget(QWidget):
 
                     # Save to CSV
                     self.data['recipe_ingredients'].to_csv(ingredients_file, index=False)
+                    table_saved(ingredients_file)
 
                     # Refresh the ingredients display
                     self.load_recipe_ingredients(recipe_id)
@@ -1886,6 +1898,7 @@ class FixedMealPlanningWidget(QWidget):
                 inventory_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
                                           'data', 'inventory.csv')
                 self.data['inventory'].to_csv(inventory_file, index=False)
+                table_saved(inventory_file)
                 logging.info(f"Updated inventory after recipe sale (Recipe ID: {recipe_id}, Quantity: {quantity})")
                 return True
             except Exception as e:
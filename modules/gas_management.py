@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate, QTimer, Signal
 from PySide6.QtGui import QFont, QIcon, QPixmap
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_watcher import table_saved
 
 class GasManagementWidget(QWidget):
     """Main gas management widget with tabs for tracking, orders, and alerts"""
@@ -714,11 +715,13 @@ class GasManagementWidget(QWidget):
             if 'gas_tracking' in self.data and not self.data['gas_tracking'].empty:
                 tracking_path = os.path.join('data', 'gas_tracking.csv')
                 self.data['gas_tracking'].to_csv(tracking_path, index=False, encoding='utf-8')
+                table_saved(tracking_path)
 
             # Save gas orders data
             if 'gas_orders' in self.data and not self.data['gas_orders'].empty:
                 orders_path = os.path.join('data', 'gas_orders.csv')
                 self.data['gas_orders'].to_csv(orders_path, index=False, encoding='utf-8')
+                table_saved(orders_path)
 
             self.logger.info("Gas data saved successfully")
 
@@ -1194,6 +1197,7 @@ class GasManagementWidget(QWidget):
             # Save to CSV
             gas_usage_file = os.path.join('data', 'gas_usage.csv')
             self.data['gas_usage'].to_csv(gas_usage_file, index=False)
+            table_saved(gas_usage_file)
 
             # Update displays
             self.load_gas_data()
@@ -1235,6 +1239,7 @@ class GasManagementWidget(QWidget):
             # Save to CSV
             gas_usage_file = os.path.join('data', 'gas_usage.csv')
             self.data['gas_usage'].to_csv(gas_usage_file, index=False)
+            table_saved(gas_usage_file)
 
             self.logger.info(f"Gas usage updated: {estimated_gas_usage:.3f} kg for cooking {recipe_data.get('recipe_name', 'Unknown')}")
 
@@ -0,0 +1,362 @@
+"""
+Home Charts for Kitchen Dashboard
+Home page metrics computed once per data version and charts rendered off the UI thread into cached pixmaps
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QLabel, QSizePolicy
+
+from modules.shared_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+# Tables each chart (and the metric cards) is drawn from
+CHART_TABLES = {
+    'inventory_by_category': ('inventory',),
+    'waste_by_reason': ('waste',),
+    'inventory_trend': ('inventory',),
+}
+METRIC_TABLES = ('inventory', 'sales', 'budget', 'waste', 'expenses_list')
+
+# Figure size (inches) of each chart before the responsive manager resizes it
+CHART_FIGSIZES = {
+    'inventory_by_category': (6, 4),
+    'waste_by_reason': (6, 4),
+    'inventory_trend': (10, 5),
+}
+
+CHART_COLORS = ['#3498db', '#2ecc71', '#e74c3c', '#f39c12', '#9b59b6', '#1abc9c', '#34495e', '#e67e22']
+
+# Months and base values of the sample inventory trend
+TREND_MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+TREND_BASE_VALUES = [1500, 1000, 500]
+
+# Rendered charts kept in memory (three per data version and size)
+CHART_CACHE_SIZE = 24
+
+
+def data_version(data: Dict[str, Any], versions: Dict[str, int], tables: Iterable[str]) -> Tuple:
+    """
+    Version of ``tables`` in ``data``: the change counter the app bumps on
+    every edit, save and reload, plus the identity and length of each
+    DataFrame as a fallback for tables replaced without a bump. A same-length
+    edit in place is only seen through the counter.
+    """
+    return tuple(
+        (table, versions.get(table, 0), id(data.get(table)),
+         len(data[table]) if isinstance(data.get(table), pd.DataFrame) else 0)
+        for table in tables
+    )
+
+
+def _table(data: Dict[str, Any], name: str) -> pd.DataFrame:
+    df = data.get(name)
+    return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    if column in df.columns:
+        return pd.to_numeric(df[column], errors='coerce')
+    return pd.Series(np.nan, index=df.index, dtype=float)
+
+
+def _difference(df: pd.DataFrame, total: str, used: str) -> pd.Series:
+    """``total - used`` where both are known, NaN elsewhere"""
+    return _numeric(df, total) - _numeric(df, used)
+
+
+def compute_home_metrics(data: Dict[str, Any]) -> Dict[str, float]:
+    """Values of the home page metric cards; the tables are only read"""
+    inventory = _table(data, 'inventory')
+    if len(inventory) > 0:
+        # Quantity: purchased minus used, else available_qty, else quantity
+        qty = (_difference(inventory, 'total_qty', 'used_qty')
+               .combine_first(_numeric(inventory, 'available_qty'))
+               .combine_first(_numeric(inventory, 'quantity'))
+               .fillna(0))
+        price = _numeric(inventory, 'avg_price').combine_first(_numeric(inventory, 'price')).fillna(0)
+        total_inventory_value = float((qty * price).sum())
+
+        # Low stock: qty_left (or quantity) at or below the reorder level (default 1)
+        qty_left = (_difference(inventory, 'qty_purchased', 'qty_used')
+                    .combine_first(_numeric(inventory, 'qty_left'))
+                    .combine_first(_numeric(inventory, 'quantity'))
+                    .fillna(0))
+        threshold = _numeric(inventory, 'reorder_level').fillna(1.0)
+        low_stock_count = int((qty_left <= threshold).sum())
+    else:
+        total_inventory_value = 0.0
+        low_stock_count = 0
+
+    sales = _table(data, 'sales')
+    if 'total_amount' in sales.columns:
+        total_sales = sales['total_amount'].sum()
+    elif 'price_per_unit' in sales.columns and 'quantity' in sales.columns:
+        total_sales = (sales['price_per_unit'] * sales['quantity']).sum()
+    else:
+        total_sales = 0.0
+
+    budget = _table(data, 'budget')
+    if 'amount' in budget.columns:
+        total_budget = budget['amount'].sum()
+    elif 'budget_amount' in budget.columns:
+        total_budget = budget['budget_amount'].sum()
+    else:
+        total_budget = 0.0
+
+    waste = _table(data, 'waste')
+    waste_cost = waste['cost'].sum() if 'cost' in waste.columns else 0.0
+
+    expenses = _table(data, 'expenses_list')
+    if 'status' in expenses.columns:
+        items_to_buy = int((expenses['status'] == 'Pending').sum())
+    else:
+        items_to_buy = len(expenses)
+    estimated_cost = expenses['estimated_cost'].sum() if 'estimated_cost' in expenses.columns else 0.0
+
+    return {
+        'total_inventory_value': total_inventory_value,
+        'low_stock_count': low_stock_count,
+        'total_sales': total_sales,
+        'total_budget': total_budget,
+        'waste_cost': waste_cost,
+        'items_to_buy': items_to_buy,
+        'estimated_cost': estimated_cost,
+    }
+
+
+def inventory_value_by_category(data: Dict[str, Any]) -> pd.DataFrame:
+    """Total value per category (price x quantity when there is no total_value column)"""
+    inventory = _table(data, 'inventory')
+    if 'category' not in inventory.columns:
+        return pd.DataFrame(columns=['category', 'total_value'])
+    if 'total_value' in inventory.columns:
+        values = inventory['total_value']
+    elif 'price_per_unit' in inventory.columns and 'quantity' in inventory.columns:
+        values = inventory['price_per_unit'] * inventory['quantity']
+    else:
+        values = pd.Series(1, index=inventory.index)
+    return values.groupby(inventory['category']).sum().rename('total_value').reset_index()
+
+
+def waste_cost_by_reason(data: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """Waste cost per reason, cheapest first (each entry counts 1 without a cost column)"""
+    waste = _table(data, 'waste')
+    if len(waste) == 0 or 'reason' not in waste.columns:
+        return None
+    costs = waste['cost'] if 'cost' in waste.columns else pd.Series(1, index=waste.index)
+    by_reason = costs.groupby(waste['reason']).sum().rename('cost').reset_index()
+    return by_reason.sort_values('cost', ascending=True)
+
+
+def _style_axis(ax):
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['bottom'].set_color('#ecf0f1')
+    ax.spines['left'].set_color('#ecf0f1')
+    ax.tick_params(colors='#7f8c8d')
+
+
+def _draw_inventory_by_category(ax, by_category: pd.DataFrame, currency_symbol: str):
+    ax.pie(
+        by_category['total_value'],
+        labels=by_category['category'],
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=CHART_COLORS[:len(by_category)],
+        wedgeprops={'edgecolor': 'white', 'linewidth': 1},
+        textprops={'color': 'black', 'fontweight': 'bold', 'fontsize': 9}
+    )
+    ax.set_title('Inventory Value Distribution', fontsize=12, pad=20, color='#2c3e50')
+    ax.axis('equal')
+
+
+def _draw_waste_by_reason(ax, by_reason: Optional[pd.DataFrame], currency_symbol: str):
+    if by_reason is not None:
+        bars = ax.barh(
+            by_reason['reason'],
+            by_reason['cost'],
+            color=CHART_COLORS[:len(by_reason)],
+            height=0.5,
+            edgecolor='white',
+            linewidth=1
+        )
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width + 0.05, bar.get_y() + bar.get_height() / 2, f'{currency_symbol}{width:.0f}',
+                    va='center', fontweight='bold', fontsize=9, color='#333333')
+    else:
+        ax.text(0.5, 0.5, 'No waste data available', horizontalalignment='center',
+                verticalalignment='center', transform=ax.transAxes, fontsize=12, color='#7f8c8d')
+
+    ax.set_title('Waste Cost Analysis', fontsize=12, pad=20, color='#2c3e50')
+    ax.set_xlabel(f'Cost ({currency_symbol})', fontsize=10, color='#7f8c8d')
+    _style_axis(ax)
+    ax.set_axisbelow(True)
+    ax.grid(axis='x', linestyle='--', alpha=0.7, color='#ecf0f1')
+
+
+def _draw_inventory_trend(ax, by_category: pd.DataFrame, currency_symbol: str):
+    # Sample trend lines for the first three categories (there is no value history yet)
+    categories = by_category['category'].unique()[:3]
+    random = np.random.RandomState(42)
+    for i, category in enumerate(categories):
+        base_value = TREND_BASE_VALUES[i % len(TREND_BASE_VALUES)]
+        trend = random.randint(-100, 200, size=len(TREND_MONTHS)) + base_value
+        ax.plot(TREND_MONTHS, trend, marker='o', markersize=6, linewidth=2, label=category, color=CHART_COLORS[i])
+
+    ax.set_title('Inventory Value Trends by Category', fontsize=12, pad=20, color='#2c3e50')
+    ax.set_xlabel('Month', fontsize=10, color='#7f8c8d')
+    ax.set_ylabel(f'Value ({currency_symbol})', fontsize=10, color='#7f8c8d')
+    _style_axis(ax)
+    ax.grid(linestyle='--', alpha=0.7, color='#ecf0f1')
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend(frameon=True, fontsize=10, loc='upper right', facecolor='white', edgecolor='#e0e0e0')
+
+
+CHART_DRAWERS: Dict[str, Callable] = {
+    'inventory_by_category': _draw_inventory_by_category,
+    'waste_by_reason': _draw_waste_by_reason,
+    'inventory_trend': _draw_inventory_trend,
+}
+
+CHART_AGGREGATES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'inventory_by_category': inventory_value_by_category,
+    'waste_by_reason': waste_cost_by_reason,
+    'inventory_trend': inventory_value_by_category,
+}
+
+
+def render_chart(chart: str, aggregate: Any, currency_symbol: str, figsize: Tuple[float, float],
+                 dpi: float = 100, responsive_chart_manager=None, device_type=None) -> QImage:
+    """
+    Draw ``chart`` from its aggregate with the Agg backend and return the image.
+
+    Uses ``Figure`` directly rather than pyplot, so it is safe to call from a
+    worker thread and never touches the Qt canvas.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor='white')
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    CHART_DRAWERS[chart](ax, aggregate, currency_symbol)
+    fig.tight_layout()
+    if responsive_chart_manager:
+        responsive_chart_manager.make_figure_responsive(fig, device_type)
+
+    canvas.draw()
+    buffer = canvas.buffer_rgba()
+    height, width = buffer.shape[:2]
+    # Copy so the image owns its pixels once the figure is gone
+    return QImage(bytes(buffer), width, height, width * 4, QImage.Format_RGBA8888).copy()
+
+
+class HomeChartService(QObject):
+    """
+    Metrics and chart images for the home page.
+
+    Aggregates are computed on the UI thread (cheap group-bys, and the
+    DataFrames are only safe to read there) once per data version; rendering
+    runs on a single worker thread. Images are cached as pixmaps keyed by
+    (chart, data version, size), so returning to the home page reuses them
+    and a chart is only drawn again when one of its tables changes.
+    ``chart_ready`` is emitted on the UI thread when a requested chart is done.
+    """
+
+    chart_ready = Signal(str, object, QPixmap)  # chart, key, pixmap
+    _rendered = Signal(str, object, object)
+
+    def __init__(self, parent=None, responsive_chart_manager=None):
+        super().__init__(parent)
+        self.responsive_chart_manager = responsive_chart_manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='home-charts')
+        self._pixmaps = get_cache('home_charts', max_size=CHART_CACHE_SIZE)
+        self._aggregates = get_cache('home_aggregates', max_size=16)
+        self._pending = set()
+        self._rendered.connect(self._store, Qt.QueuedConnection)
+
+    def metrics(self, data: Dict[str, Any], versions: Dict[str, int]) -> Dict[str, float]:
+        version = data_version(data, versions, METRIC_TABLES)
+        return self._aggregates.get_or_compute(('metrics', version), lambda: compute_home_metrics(data))
+
+    def chart_key(self, chart: str, data: Dict[str, Any], versions: Dict[str, int], currency_symbol: str,
+                  dpi: float = 100, device_type=None) -> Tuple:
+        version = data_version(data, versions, CHART_TABLES[chart])
+        size = (CHART_FIGSIZES[chart], dpi, getattr(device_type, 'value', device_type))
+        return (chart, version, size, currency_symbol)
+
+    def request(self, chart: str, data: Dict[str, Any], versions: Dict[str, int], currency_symbol: str,
+                dpi: float = 100, device_type=None) -> Tuple[Tuple, Optional[QPixmap]]:
+        """
+        The cache key of ``chart`` and its pixmap if it is already rendered;
+        otherwise the render is queued and ``chart_ready`` follows with the key.
+        """
+        key = self.chart_key(chart, data, versions, currency_symbol, dpi, device_type)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None or key in self._pending:
+            return key, pixmap
+
+        compute = CHART_AGGREGATES[chart]
+        aggregate = self._aggregates.get_or_compute((compute.__name__, key[1]), lambda: compute(data))
+        self._pending.add(key)
+        self._executor.submit(self._render, chart, key, aggregate, currency_symbol, dpi, device_type)
+        return key, None
+
+    def _render(self, chart, key, aggregate, currency_symbol, dpi, device_type):
+        try:
+            image = render_chart(chart, aggregate, currency_symbol, CHART_FIGSIZES[chart], dpi,
+                                 self.responsive_chart_manager, device_type)
+        except Exception as e:
+            logger.error(f"Error rendering {chart} chart: {e}")
+            image = None
+        self._rendered.emit(chart, key, image)
+
+    @Slot(str, object, object)
+    def _store(self, chart, key, image):
+        self._pending.discard(key)
+        if image is None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps.put(key, pixmap)
+        self.chart_ready.emit(chart, key, pixmap)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ChartImage(QLabel):
+    """A rendered chart, scaled to the label keeping its aspect ratio"""
+
+    def __init__(self, parent=None):
+        super().__init__("Loading chart...", parent)
+        self._pixmap = None
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumHeight(180)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setStyleSheet("color: #7f8c8d;")
+
+    def set_chart_pixmap(self, pixmap: QPixmap):
+        self._pixmap = pixmap
+        self._rescale()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._rescale()
+
+    def _rescale(self):
+        if self._pixmap is None or self.width() <= 0 or self.height() <= 0:
+            return
+        ratio = self.devicePixelRatioF()
+        scaled = self._pixmap.scaled(int(self.width() * ratio), int(self.height() * ratio),
+                                     Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        scaled.setDevicePixelRatio(ratio)
+        self.setPixmap(scaled)
@@ -12,6 +12,9 @@ from datetime import datetime
 import os
 import json
 
+from modules import unit_conversion
+from modules.table_watcher import table_saved
+
 # Import the universal table widget
 try:
     from .universal_table_widget import UniversalTableWidget
@@ -611,6 +614,7 @@ class InventoryWidget(QWidget):
 
                     # Save to CSV
                     self.inventory_df.to_csv('data/inventory.csv', index=False)
+                    table_saved('data/inventory.csv')
 
                     # Refresh the universal table widget
                     if hasattr(self, 'inventory_table_widget'):
@@ -1111,6 +1115,7 @@ class InventoryWidget(QWidget):
             
             # Save to CSV
             self.inventory_df.to_csv('data/inventory.csv', index=False)
+            table_saved('data/inventory.csv')
             
             # Show success message
             QMessageBox.information(self, "Success", f"{item_name} deleted successfully!")
@@ -1305,10 +1310,8 @@ class InventoryWidget(QWidget):
 
         # Calculate price per gram if unit is weight-based
         price_per_g = None
-        if unit.lower() in ['g', 'kg']:
-            qty_in_grams = available_quantity
-            if unit.lower() == 'kg':
-                qty_in_grams *= 1000
+        if unit_conversion.is_weight_unit(unit):
+            qty_in_grams = unit_conversion.convert(available_quantity, unit, 'g')
 
             if qty_in_grams > 0:
                 price_per_g = price / qty_in_grams
@@ -1339,6 +1342,7 @@ class InventoryWidget(QWidget):
         
         # Save to CSV
         self.inventory_df.to_csv('data/inventory.csv', index=False)
+        table_saved('data/inventory.csv')
         
         # Show success message
         QMessageBox.information(self, "Success", f"{item_name} added to inventory!")
@@ -1876,6 +1880,7 @@ class InventoryWidget(QWidget):
         
         # Save to CSV
         self.items_df.to_csv('data/items.csv', index=False)
+        table_saved('data/items.csv')
         
         # If category is new, add it to categories
         if category and ('categories' not in self.data or 
@@ -1903,6 +1908,7 @@ class InventoryWidget(QWidget):
             
             # Save to CSV
             self.data['categories'].to_csv('data/categories.csv', index=False)
+            table_saved('data/categories.csv')
         
         # Update category combos in the UI
         self.update_category_combos()
@@ -1956,6 +1962,7 @@ class InventoryWidget(QWidget):
 
         # Save to CSV
         self.items_df.to_csv('data/items.csv', index=False)
+        table_saved('data/items.csv')
 
         # If category is new, add it to categories
         if new_category and ('categories' not in self.data or
@@ -1978,6 +1985,7 @@ class InventoryWidget(QWidget):
             })
             self.data['categories'] = pd.concat([self.data['categories'], new_category_df], ignore_index=True)
             self.data['categories'].to_csv('data/categories.csv', index=False)
+            table_saved('data/categories.csv')
             if hasattr(self, 'update_category_combos'): # Check if method exists
                 self.update_category_combos()
 
@@ -2018,6 +2026,7 @@ class InventoryWidget(QWidget):
             
             # Save to CSV
             self.items_df.to_csv('data/items.csv', index=False)
+            table_saved('data/items.csv')
             
             # Update tables
             self.update_items_table()
@@ -2317,6 +2326,7 @@ class InventoryWidget(QWidget):
         
         # Save to CSV
         self.categories_df.to_csv('data/categories.csv', index=False)
+        table_saved('data/categories.csv')
         
         # Update table
         self.update_categories_table()
@@ -2360,6 +2370,7 @@ class InventoryWidget(QWidget):
         
         # Save to CSV
         self.categories_df.to_csv('data/categories.csv', index=False)
+        table_saved('data/categories.csv')
         
         # Update table
         self.update_categories_table()
@@ -2373,6 +2384,7 @@ class InventoryWidget(QWidget):
             self.data['items'].loc[self.data['items']['category'] == old_category_name, 'category'] = new_category_name
             self.items_df = self.data['items'].copy()
             self.items_df.to_csv('data/items.csv', index=False)
+            table_saved('data/items.csv')
             self.update_items_table()
         
         QMessageBox.information(self, "Success", f"Category '{new_category_name}' updated successfully.")
@@ -2401,6 +2413,7 @@ class InventoryWidget(QWidget):
                 self.data['items'].loc[self.data['items']['category'] == category_name, 'category'] = ""
                 self.items_df = self.data['items'].copy()
                 self.items_df.to_csv('data/items.csv', index=False)
+                table_saved('data/items.csv')
                 self.update_items_table()
         
         # Confirm deletion
@@ -2417,6 +2430,7 @@ class InventoryWidget(QWidget):
             
             # Save to CSV
             self.categories_df.to_csv('data/categories.csv', index=False)
+            table_saved('data/categories.csv')
             
             # Update table
             self.update_categories_table()
@@ -2714,6 +2728,7 @@ class InventoryWidget(QWidget):
             
             # Save to CSV
             self.inventory_df.to_csv('data/inventory.csv', index=False)
+            table_saved('data/inventory.csv')
             
             # Show success message
             QMessageBox.information(self, "Success", f"{item_name} updated successfully!")
@@ -2908,6 +2923,7 @@ class InventoryWidget(QWidget):
             shopping_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                        'data', 'shopping_list.csv')
             shopping_df.to_csv(shopping_file, index=False)
+            table_saved(shopping_file)
 
             dialog.accept()
             QMessageBox.information(self, "Success", f"Added {added_count} items to shopping list!")
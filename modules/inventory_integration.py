@@ -9,6 +9,7 @@ import pandas as pd
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+from modules.table_watcher import table_saved
 
 class InventoryIntegration:
     """Manages inventory integration with sales, gas, and packing materials"""
@@ -231,6 +232,7 @@ class InventoryIntegration:
             # Save gas usage data
             gas_file = os.path.join('data', 'gas_usage.csv')
             self.data['gas_usage'].to_csv(gas_file, index=False)
+            table_saved(gas_file)
             
             result['success'] = True
             self.logger.info(f"Gas usage updated: {gas_usage:.3f} kg for {recipe_name}")
@@ -285,6 +287,7 @@ class InventoryIntegration:
                 # Save packing materials data
                 packing_file = os.path.join('data', 'packing_materials.csv')
                 packing_df.to_csv(packing_file, index=False)
+                table_saved(packing_file)
                 result['success'] = True
                 self.logger.info(f"Packing materials updated: {', '.join(updated_items)}")
             
@@ -332,6 +335,7 @@ class InventoryIntegration:
                 # Save budget data
                 budget_file = os.path.join('data', 'budget.csv')
                 self.data['budget'].to_csv(budget_file, index=False)
+                table_saved(budget_file)
                 result['success'] = True
             
         except Exception as e:
@@ -381,5 +385,6 @@ class InventoryIntegration:
         try:
             inventory_file = os.path.join('data', 'inventory.csv')
             self.data['inventory'].to_csv(inventory_file, index=False)
+            table_saved(inventory_file)
         except Exception as e:
             self.logger.error(f"Error saving inventory: {e}")
@@ -0,0 +1,124 @@
+"""
+Lazy Loader for Kitchen Dashboard
+Registry of optional subsystems that are imported and constructed on first use or after the first paint
+"""
+
+import time
+import logging
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QTimer
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def lazy_import(module_name: str, attribute: Optional[str] = None):
+    """Import ``module_name`` (and return ``attribute`` of it) when first called, not at file import"""
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+class ServiceRegistry:
+    """
+    Named subsystems built by factories on first ``get``.
+
+    A factory that raises is logged once and its service stays ``None``, so
+    callers keep their ``if self.service:`` fallbacks. Services registered
+    with ``warm_up=True`` can be built ahead of use with ``warm_up()``, one
+    per event-loop turn after the window has painted, so the UI stays
+    responsive while they load. Build times are kept in ``load_times``.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._warm: List[str] = []
+        self._lock = threading.RLock()
+        self.load_times: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], warm_up: bool = False):
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+            if warm_up and name not in self._warm:
+                self._warm.append(name)
+
+    def get(self, name: str) -> Any:
+        """The service, built now if this is its first use (None if it is unknown or failed)"""
+        instance = self._instances.get(name, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name, _MISSING)
+            if instance is not _MISSING:
+                return instance
+            factory = self._factories.get(name)
+            if factory is None:
+                return None
+            start = time.perf_counter()
+            try:
+                instance = factory()
+                logger.info(f"Loaded {name} in {time.perf_counter() - start:.3f}s")
+            except Exception as e:
+                logger.error(f"Failed to load {name}: {e}")
+                instance = None
+            self.load_times[name] = time.perf_counter() - start
+            self._instances[name] = instance
+            return instance
+
+    def set(self, name: str, instance: Any):
+        """Replace a service (or provide one without a factory)"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def pending_warm_up(self) -> List[str]:
+        return [name for name in self._warm if name not in self._instances]
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, on_done: Optional[Callable[[], None]] = None,
+                interval_ms: int = 0):
+        """Build ``names`` (default: the warm-up services) one per event-loop turn, then call ``on_done``"""
+        queue = [name for name in (names if names is not None else self.pending_warm_up())
+                 if name not in self._instances]
+
+        def step():
+            while queue and queue[0] in self._instances:
+                queue.pop(0)
+            if queue:
+                self.get(queue.pop(0))
+                QTimer.singleShot(interval_ms, step)
+            elif on_done is not None:
+                on_done()
+
+        QTimer.singleShot(interval_ms, step)
+
+
+class LazyService:
+    """
+    Attribute backed by the owner's ``services`` registry.
+
+    ``self.notification_ai`` builds the service on first access; assigning
+    to the attribute replaces it.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+
+    def __set_name__(self, owner, name):
+        if self.name is None:
+            self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        services = instance.__dict__.get('services')
+        return services.get(self.name) if services is not None else None
+
+    def __set__(self, instance, value):
+        instance.__dict__['services'].set(self.name, value)
@@ -39,8 +39,8 @@ class LogsViewerWidget(QWidget):
         self.app_logger = get_logger()
         self.log_buffer = AppLogger.get_log_buffer()
         
-        # Connect to log signal
-        self.app_logger.signal.new_log.connect(self.add_log)
+        # Connect to log signal (entries arrive in batches)
+        self.app_logger.signal.new_logs.connect(self.add_logs)
         
         # Set up the main layout
         self.layout = QVBoxLayout(self)
@@ -127,19 +127,31 @@ class LogsViewerWidget(QWidget):
         self.logs_table.setRowCount(0)  # Clear existing rows
 
         # Add all logs from buffer
-        for log_entry in self.log_buffer:
+        entries = []
+        for log_entry in list(self.log_buffer):
             if len(log_entry) >= 5:  # New format with caller_info and stack_trace
-                level, message, timestamp, caller_info, stack_trace = log_entry
-                self.add_log_to_table(level, message, timestamp, caller_info, stack_trace)
+                entries.append(tuple(log_entry[:5]))
             elif len(log_entry) >= 3:  # Old format
-                level, message, timestamp = log_entry[:3]
-                self.add_log_to_table(level, message, timestamp, "", "")
+                entries.append(tuple(log_entry[:3]) + ("", ""))
+        self.add_logs(entries)
     
     def add_log(self, level, message, timestamp, caller_info="", stack_trace=""):
-        """Add a new log entry (connected to logger signal)"""
+        """Add a new log entry"""
         self.add_log_to_table(level, message, timestamp, caller_info, stack_trace)
+
+    def add_logs(self, entries):
+        """Add a batch of log entries (connected to logger signal) with one repaint and scroll"""
+        auto_scroll = self.auto_scroll.isChecked()
+        self.logs_table.setUpdatesEnabled(False)
+        try:
+            for entry in entries:
+                self.add_log_to_table(*entry, scroll=False)
+        finally:
+            self.logs_table.setUpdatesEnabled(True)
+        if auto_scroll:
+            self.logs_table.scrollToBottom()
     
-    def add_log_to_table(self, level, message, timestamp, caller_info="", stack_trace=""):
+    def add_log_to_table(self, level, message, timestamp, caller_info="", stack_trace="", scroll=True):
         """Add a log entry to the table with proper formatting"""
         # Apply filters
         if self.level_combo.currentText() != "All Levels" and level != self.level_combo.currentText():
@@ -191,7 +203,7 @@ class LogsViewerWidget(QWidget):
             self.logs_table.item(row_position, col).setBackground(bg_color)
 
         # Auto-scroll to bottom if enabled
-        if self.auto_scroll.isChecked():
+        if scroll and self.auto_scroll.isChecked():
             self.logs_table.scrollToBottom()
     
     def apply_filters(self):
@@ -11,6 +11,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_watcher import table_saved
 
 class MealPlanningWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -528,6 +529,7 @@ class MealPlanningWidget(QWidget):
 
         # Save to CSV
         self.meal_plan_df.to_csv('data/meal_plan.csv', index=False)
+        table_saved('data/meal_plan.csv')
 
         # Update data dictionary
         self.data['meal_plan'] = self.meal_plan_df
@@ -580,6 +582,7 @@ class MealPlanningWidget(QWidget):
 
                 # Save to CSV
                 self.meal_plan_df.to_csv('data/meal_plan.csv', index=False)
+                table_saved('data/meal_plan.csv')
 
                 # Update data dictionary
                 self.data['meal_plan'] = self.meal_plan_df
@@ -842,6 +845,7 @@ class MealPlanningWidget(QWidget):
 
                 # Save to CSV
                 self.meal_plan_df.to_csv('data/meal_plan.csv', index=False)
+                table_saved('data/meal_plan.csv')
 
                 # Update data dictionary
                 self.data['meal_plan'] = self.meal_plan_df
@@ -877,6 +881,7 @@ class MealPlanningWidget(QWidget):
 
                 # Save to CSV
                 self.meal_plan_df.to_csv('data/meal_plan.csv', index=False)
+                table_saved('data/meal_plan.csv')
 
                 # Update data dictionary
                 self.data['meal_plan'] = self.meal_plan_df
@@ -955,6 +960,7 @@ class MealPlanningWidget(QWidget):
 
                 # Save to CSV
                 self.meal_plan_df.to_csv('data/meal_plan.csv', index=False)
+                table_saved('data/meal_plan.csv')
 
                 # Update data dictionary
                 self.data['meal_plan'] = self.meal_plan_df
@@ -1704,6 +1710,7 @@ class MealPlanningWidget(QWidget):
             
             # Save to CSV
             self.recipes_df.to_csv('data/recipes.csv', index=False)
+            table_saved('data/recipes.csv')
             
             # Update data dictionary
             self.data['recipes'] = self.recipes_df
@@ -2513,7 +2520,9 @@ class MealPlanningWidget(QWidget):
                 # Save to CSV files with error handling
                 try:
                     self.recipes_df.to_csv('data/recipes.csv', index=False)
+                    table_saved('data/recipes.csv')
                     recipe_ingredients_df.to_csv('data/recipe_ingredients.csv', index=False)
+                    table_saved('data/recipe_ingredients.csv')
                 except Exception as save_error:
                     progress_msg.hide()
                     QMessageBox.critical(dialog, "Save Error", f"Failed to save files: {str(save_error)}")
@@ -2664,9 +2673,11 @@ class MealPlanningWidget(QWidget):
                         recipe_ingredients_df = pd.concat([recipe_ingredients_df, new_ingredients], ignore_index=True)
                         self.data['recipe_ingredients'] = recipe_ingredients_df
                         recipe_ingredients_df.to_csv('data/recipe_ingredients.csv', index=False)
+                        table_saved('data/recipe_ingredients.csv')
 
                 # Save recipes
                 self.recipes_df.to_csv('data/recipes.csv', index=False)
+                table_saved('data/recipes.csv')
                 self.data['recipes'] = self.recipes_df
 
                 # Refresh table
@@ -2760,9 +2771,11 @@ class MealPlanningWidget(QWidget):
                     ]
                     self.data['recipe_ingredients'] = recipe_ingredients_df
                     recipe_ingredients_df.to_csv('data/recipe_ingredients.csv', index=False)
+                    table_saved('data/recipe_ingredients.csv')
 
                 # Save updated recipes
                 self.recipes_df.to_csv('data/recipes.csv', index=False)
+                table_saved('data/recipes.csv')
                 self.data['recipes'] = self.recipes_df
 
                 # Refresh recipe table
@@ -2827,6 +2840,7 @@ class MealPlanningWidget(QWidget):
         
         # Save to CSV
         self.data['inventory'].to_csv('data/inventory.csv', index=False)
+        table_saved('data/inventory.csv')
     
     def setup_nutrition_tab(self):
         # Create layout for the tab
@@ -3206,6 +3220,7 @@ class MealPlanningWidget(QWidget):
         
         # Save to CSV
         existing_shopping.to_csv('data/shopping_list.csv', index=False)
+        table_saved('data/shopping_list.csv')
         
         # Update data dictionary
         self.data['shopping_list'] = existing_shopping
@@ -3444,6 +3459,7 @@ class MealPlanningWidget(QWidget):
 
             # Save to CSV
             shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Update data dictionary
             self.data['shopping_list'] = shopping_df
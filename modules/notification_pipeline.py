@@ -0,0 +1,198 @@
+"""
+Notification Pipeline for Kitchen Dashboard
+Coalesces bursts of notifications into digests and rate-limits each category
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+logger = logging.getLogger(__name__)
+
+# Delivered the moment they are raised, never held back or merged
+IMMEDIATE_CATEGORIES = {'emergency', 'security'}
+
+# Merged with their group but never delayed by the rate limit
+RATE_EXEMPT_CATEGORIES = IMMEDIATE_CATEGORIES | {'critical'}
+
+# Notifications of a group whose messages are listed in a digest
+DIGEST_PREVIEW = 3
+
+
+class _Group:
+    """Notifications with the same (category, source, key) waiting to be delivered"""
+
+    __slots__ = ('notifications', 'first_at', 'show_toast', 'show_bell', 'duration')
+
+    def __init__(self, first_at: float):
+        self.notifications: List[Dict[str, Any]] = []
+        self.first_at = first_at
+        self.show_toast = False
+        self.show_bell = False
+        self.duration = 0
+
+
+class NotificationPipeline:
+    """
+    Stage between raising a notification and showing it.
+
+    Notifications are grouped by (category, source, key), where the key
+    defaults to the title, so an inventory scan raising one "Low Stock Alert"
+    per item forms a single group. A group is delivered once it has been open
+    for ``window`` seconds: a lone notification as-is, several as one digest
+    ("14 items low on stock"). Each category may deliver at most
+    ``rate_limit`` notifications per ``rate_period`` seconds; a group over
+    the limit stays open and keeps absorbing notifications until the category
+    has budget again. Emergency and security notifications bypass the
+    pipeline entirely.
+
+    ``deliver(notification, show_toast, show_bell, duration)`` is called for
+    every delivered notification or digest. The pipeline never schedules
+    itself: ``submit`` reports whether a flush is needed and ``flush`` /
+    ``next_due`` are driven by a ``PipelineScheduler`` (or a test).
+    """
+
+    def __init__(self, deliver: Callable, window: float = 1.5, rate_limit: int = 6,
+                 rate_period: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.deliver = deliver
+        self.window = window
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.clock = clock
+
+        # Digest title templates by coalescing key; {count} is the group size
+        self.digest_titles: Dict[str, str] = {}
+
+        self._groups: Dict[tuple, _Group] = {}
+        self._sent: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.delivered = 0
+
+    @staticmethod
+    def group_key(notification: Dict[str, Any]) -> tuple:
+        return (notification.get('category'), notification.get('source'),
+                notification.get('key') or notification.get('title'))
+
+    def submit(self, notification: Dict[str, Any], show_toast: bool = True, show_bell: bool = True,
+               duration: int = 5000) -> bool:
+        """Queue a notification; returns True if it was held and a flush must be scheduled"""
+        self.submitted += 1
+        if notification.get('category') in IMMEDIATE_CATEGORIES:
+            self._deliver(notification, show_toast, show_bell, duration)
+            return False
+
+        key = self.group_key(notification)
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(self.clock())
+            group.notifications.append(notification)
+            group.show_toast = group.show_toast or show_toast
+            group.show_bell = group.show_bell or show_bell
+            group.duration = max(group.duration, duration)
+        return True
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(group.notifications) for group in self._groups.values())
+
+    def _budget_free_at(self, category: str, now: float) -> float:
+        """When the category may deliver again (``now`` if it has budget left)"""
+        if category in RATE_EXEMPT_CATEGORIES:
+            return now
+        sent = self._sent.setdefault(category, deque())
+        while sent and sent[0] <= now - self.rate_period:
+            sent.popleft()
+        if len(sent) < self.rate_limit:
+            return now
+        return sent[0] + self.rate_period
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next group can be delivered, or None when nothing is pending"""
+        now = self.clock()
+        with self._lock:
+            due = [max(group.first_at + self.window, self._budget_free_at(key[0], now))
+                   for key, group in self._groups.items()]
+        return max(0.0, min(due) - now) if due else None
+
+    def flush(self, force: bool = False) -> int:
+        """Deliver every group whose window has passed (all groups with ``force``); returns deliveries"""
+        now = self.clock()
+        ready = []
+        with self._lock:
+            for key, group in list(self._groups.items()):
+                if not force and group.first_at + self.window > now:
+                    continue
+                if not force and self._budget_free_at(key[0], now) > now:
+                    continue
+                del self._groups[key]
+                if key[0] not in RATE_EXEMPT_CATEGORIES:
+                    self._sent.setdefault(key[0], deque()).append(now)
+                ready.append((key, group))
+
+        for key, group in ready:
+            notification = group.notifications[0] if len(group.notifications) == 1 else self.digest(key, group)
+            self._deliver(notification, group.show_toast, group.show_bell, group.duration)
+        return len(ready)
+
+    def digest(self, key: tuple, group: _Group) -> Dict[str, Any]:
+        """One notification summarising a group"""
+        notifications = group.notifications
+        count = len(notifications)
+        latest = notifications[-1]
+        title_template = self.digest_titles.get(key[2])
+        title = title_template.format(count=count) if title_template else f"{latest.get('title')} ({count})"
+
+        messages = list(dict.fromkeys(str(n.get('message', '')) for n in notifications))
+        message = '\n'.join(messages[:DIGEST_PREVIEW])
+        if len(messages) > DIGEST_PREVIEW:
+            message += f"\n…and {len(messages) - DIGEST_PREVIEW} more"
+
+        priorities = [n['priority'] for n in notifications if n.get('priority') is not None]
+        return dict(latest, title=title, message=message,
+                    priority=min(priorities) if priorities else latest.get('priority'),
+                    digest_count=count, digest_of=notifications)
+
+    def _deliver(self, notification, show_toast, show_bell, duration):
+        self.delivered += 1
+        try:
+            self.deliver(notification, show_toast, show_bell, duration)
+        except Exception as e:
+            logger.error(f"Error delivering notification '{notification.get('title')}': {e}")
+
+
+class PipelineScheduler(QObject):
+    """Flushes a NotificationPipeline from the thread it lives in (the GUI thread)"""
+
+    flush_requested = Signal()
+
+    def __init__(self, pipeline: NotificationPipeline, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        # Queued when requested from another thread, so the timer is only touched here
+        self.flush_requested.connect(self.arm)
+
+    def request(self):
+        """Schedule a flush for the pipeline's next due group (safe from any thread)"""
+        self.flush_requested.emit()
+
+    def arm(self):
+        delay = self.pipeline.next_due()
+        if delay is None:
+            return
+        delay_ms = int(delay * 1000) + 1
+        if not self.timer.isActive() or self.timer.remainingTime() > delay_ms:
+            self.timer.start(delay_ms)
+
+    def flush(self):
+        self.pipeline.flush()
+        self.arm()
@@ -0,0 +1,266 @@
+"""
+Notification Store for Kitchen Dashboard
+Indexed SQLite store behind the notification bell with batched inserts and paged queries
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+NOTIFICATIONS_DB_FILENAME = 'notifications.db'
+LEGACY_JSON_FILENAME = 'notifications.json'
+
+# Bell panel filters and the categories each one shows
+FILTER_GROUPS = {
+    'critical': ('critical', 'emergency', 'security'),
+    'error': ('error', 'failure'),
+    'warning': ('warning', 'maintenance', 'resource'),
+    'operational': ('inventory', 'staff', 'schedule', 'budget', 'recipe'),
+    'success': ('success', 'completion'),
+}
+
+COLUMNS = ('id', 'title', 'message', 'type', 'category', 'priority', 'source', 'timestamp',
+           'read', 'persistent', 'icon', 'color')
+
+
+def filter_categories(filter_name: Optional[str]) -> Optional[tuple]:
+    """Categories shown by a panel filter (None for 'all')"""
+    if not filter_name or filter_name == 'all':
+        return None
+    return FILTER_GROUPS.get(filter_name, (filter_name,))
+
+
+class NotificationStore:
+    """
+    Persistent notification history for the bell widget.
+
+    Notifications are kept in a WAL-mode SQLite database with indexes for the
+    bell's questions (unread count, most urgent unread category, one page of
+    a category filter in display order). ``add`` only buffers the notification;
+    ``flush`` writes the buffer in one transaction and trims the history to
+    ``MAX_NOTIFICATIONS`` (oldest read notifications go first). Queries flush
+    first, so they always see every added notification. Unread and total
+    counts are kept in memory so the badge never queries the database.
+    """
+
+    MAX_NOTIFICATIONS = 200
+
+    def __init__(self, path: str, legacy_json: Optional[str] = None):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._pending: List[Dict[str, Any]] = []
+        self._last_id = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notifications (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                message TEXT NOT NULL,
+                type TEXT,
+                category TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                source TEXT,
+                timestamp TEXT NOT NULL,
+                read INTEGER NOT NULL DEFAULT 0,
+                persistent INTEGER NOT NULL DEFAULT 0,
+                icon TEXT,
+                color TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_notifications_display ON notifications (priority, id);
+            CREATE INDEX IF NOT EXISTS idx_notifications_category ON notifications (category, priority, id);
+            CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications (read, priority, id);
+        """)
+
+        if legacy_json and self._conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            self._import_json(legacy_json)
+        self._conn.execute("PRAGMA user_version = 1")
+        self._refresh_counts()
+        self._last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM notifications").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _import_json(self, json_path: str):
+        """One-time import of the notifications.json history used before the store"""
+        try:
+            if not os.path.exists(json_path):
+                return
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            notifications = data.get('notifications', []) if isinstance(data, dict) else data
+            legacy = sorted((n for n in notifications if isinstance(n, dict) and 'id' in n),
+                            key=lambda n: int(n['id']))
+            # Old ids are millisecond timestamps and could repeat; keep every entry, in order
+            last_id = None
+            for position, notification in enumerate(legacy):
+                notification_id = int(notification['id'])
+                if last_id is not None and notification_id <= last_id:
+                    legacy[position] = dict(notification, id=last_id + 1)
+                    notification_id = last_id + 1
+                last_id = notification_id
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._insert(legacy)
+                self._trim()
+                self._conn.execute("COMMIT")
+            self.logger.info(f"Imported {len(notifications)} notifications from {json_path}")
+        except Exception as e:
+            self.logger.error(f"Error importing notifications from {json_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def next_id(self) -> int:
+        """Unique, increasing notification id (millisecond timestamp based)"""
+        with self._lock:
+            self._last_id = max(int(time.time() * 1000), self._last_id + 1)
+            return self._last_id
+
+    def add(self, notification: Dict[str, Any]):
+        """Buffer a notification for the next flush"""
+        with self._lock:
+            self._pending.append(notification)
+            self.total_count += 1
+            if not notification.get('read', False):
+                self.unread_count += 1
+
+    def flush(self) -> int:
+        """Write buffered notifications in one transaction; returns how many were written"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+            try:
+                self._conn.execute("BEGIN")
+                self._insert(pending)
+                trimmed = self._trim()
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                self._conn.execute("ROLLBACK")
+                self.logger.error(f"Error saving notifications: {e}")
+                self._pending = pending + self._pending
+                return 0
+            if trimmed:
+                self._refresh_counts()
+            return len(pending)
+
+    def _insert(self, notifications: Iterable[Dict[str, Any]]):
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO notifications ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(COLUMNS))})",
+            [(
+                int(n['id']), str(n.get('title', '')), str(n.get('message', '')), n.get('type'),
+                n.get('category') or 'info', int(n.get('priority') or 5), n.get('source'),
+                n.get('timestamp') or '', int(bool(n.get('read', False))),
+                int(bool(n.get('persistent', False))), n.get('icon'), n.get('color')
+            ) for n in notifications]
+        )
+
+    def _trim(self) -> int:
+        """Drop the oldest read notifications (then the oldest unread) beyond MAX_NOTIFICATIONS"""
+        excess = self._conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0] - self.MAX_NOTIFICATIONS
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM notifications WHERE id IN "
+            "(SELECT id FROM notifications ORDER BY read DESC, id LIMIT ?)", (excess,)
+        )
+        return excess
+
+    def _refresh_counts(self):
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(read = 0), 0) FROM notifications").fetchone()
+        self.total_count = row[0] + len(self._pending)
+        self.unread_count = row[1] + sum(1 for n in self._pending if not n.get('read', False))
+
+    def mark_read(self, notification_id: int) -> bool:
+        """Mark one notification read; False if it was already read or does not exist"""
+        with self._lock:
+            self.flush()
+            changed = self._conn.execute(
+                "UPDATE notifications SET read = 1 WHERE id = ? AND read = 0", (notification_id,)
+            ).rowcount
+            if changed:
+                self.unread_count = max(0, self.unread_count - 1)
+            return bool(changed)
+
+    def clear(self):
+        """Delete every notification"""
+        with self._lock:
+            self._pending = []
+            self._conn.execute("DELETE FROM notifications")
+            self.total_count = self.unread_count = 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _where(categories: Optional[Iterable[str]]):
+        if categories is None:
+            return '', []
+        categories = list(categories)
+        return f"WHERE category IN ({', '.join('?' * len(categories))})", categories
+
+    def page(self, categories: Optional[Iterable[str]] = None, offset: int = 0,
+             limit: int = 25) -> List[Dict[str, Any]]:
+        """Notifications in display order (most urgent first, then oldest first)"""
+        where, params = self._where(categories)
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                f"SELECT * FROM notifications {where} ORDER BY priority, id LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        notifications = []
+        for row in rows:
+            notification = dict(row)
+            notification['read'] = bool(notification['read'])
+            notification['persistent'] = bool(notification['persistent'])
+            notifications.append(notification)
+        return notifications
+
+    def count(self, categories: Optional[Iterable[str]] = None, unread_only: bool = False) -> int:
+        """Number of notifications matching a filter"""
+        where, params = self._where(categories)
+        if unread_only:
+            where = f"{where} AND read = 0" if where else "WHERE read = 0"
+        with self._lock:
+            self.flush()
+            return self._conn.execute(f"SELECT COUNT(*) FROM notifications {where}", params).fetchone()[0]
+
+    def top_unread_category(self) -> Optional[str]:
+        """Category of the most urgent unread notification"""
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(
+                "SELECT category FROM notifications WHERE read = 0 ORDER BY priority, id LIMIT 1").fetchone()
+        return row[0] if row else None
+
+
+# Global notification store instance
+_notification_store = None
+
+
+def get_notification_store(data_dir: str = 'data') -> NotificationStore:
+    """Get global notification store instance"""
+    global _notification_store
+    if _notification_store is None:
+        _notification_store = NotificationStore(os.path.join(data_dir, NOTIFICATIONS_DB_FILENAME),
+                                                os.path.join(data_dir, LEGACY_JSON_FILENAME))
+    return _notification_store
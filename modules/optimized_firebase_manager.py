@@ -14,6 +14,12 @@ from dataclasses import dataclass, asdict
 from PySide6.QtCore import QObject, Signal, QTimer, QThread
 from PySide6.QtWidgets import QMessageBox, QInputDialog, QLineEdit
 
+from modules.firestore_serializer import serialize_dataframe, METADATA_FIELDS
+from modules.cloud_delta_sync import (
+    UploadManifest, upload_delta, publish_delta, MANIFEST_FILENAME, WATERMARK_READS, WATERMARK_WRITES
+)
+from modules.firestore_metering import MeteredFirestoreClient, QuotaPlanner, get_quota_meter
+
 # Firebase imports with fallback
 try:
     import firebase_admin
@@ -88,17 +94,15 @@ class OptimizedFirebaseManager(QObject):
         self.current_session: Optional[UserSession] = None
         self.session_timeout = 3600  # 1 hour
 
-        # Free tier optimization
+        # Free tier optimization: every Firestore call is metered and syncs are planned to fit
         self.batch_size = 100  # Optimize for Firestore free tier
-        self.max_daily_reads = 50000  # Free tier limit
-        self.max_daily_writes = 20000  # Free tier limit
-        self.daily_read_count = 0
-        self.daily_write_count = 0
-        self.last_reset_date = datetime.now().date()
+        self.quota_meter = get_quota_meter()
+        self.quota_planner = QuotaPlanner(self.quota_meter)
 
         # Sync management
         self.sync_queue = []
         self.active_syncs = {}
+        self.upload_manifest = UploadManifest(os.path.join("data", MANIFEST_FILENAME))
 
         # Initialize Firebase
         self.initialize_firebase()
@@ -141,7 +145,7 @@ class OptimizedFirebaseManager(QObject):
                             self.logger.info("Using existing Firebase Admin app")
 
                         # Initialize Firestore client
-                        self.db = firestore.client()
+                        self.db = MeteredFirestoreClient(firestore.client(), self.quota_meter)
                         self.logger.info("Firestore client initialized successfully")
 
                         # Test database connection with comprehensive testing
@@ -370,7 +374,7 @@ class OptimizedFirebaseManager(QObject):
             self.logger.info("Attempting to reinitialize database connection...")
 
             if self.admin_app and not self.db:
-                self.db = firestore.client()
+                self.db = MeteredFirestoreClient(firestore.client(), self.quota_meter)
 
                 # Test the new connection
                 if self.test_database_connection():
@@ -715,29 +719,46 @@ class OptimizedFirebaseManager(QObject):
         if self.current_session:
             self.current_session.last_activity = datetime.now().isoformat()
     
+    @property
+    def max_daily_reads(self) -> int:
+        return self.quota_meter.limits['reads']
+
+    @property
+    def max_daily_writes(self) -> int:
+        return self.quota_meter.limits['writes']
+
+    @property
+    def daily_read_count(self) -> int:
+        return self.quota_meter.used('reads')
+
+    @property
+    def daily_write_count(self) -> int:
+        return self.quota_meter.used('writes')
+
+    @property
+    def last_reset_date(self):
+        return datetime.fromisoformat(self.quota_meter.date).date()
+
     def check_daily_limits(self) -> bool:
         """Check if we're within daily Firebase limits"""
-        current_date = datetime.now().date()
-        
-        # Reset counters if new day
-        if current_date != self.last_reset_date:
-            self.daily_read_count = 0
-            self.daily_write_count = 0
-            self.last_reset_date = current_date
-        
-        # Check limits
-        if self.daily_read_count >= self.max_daily_reads:
+        if not self.quota_planner.fits(reads=1):
             self.logger.warning("Daily read limit reached")
             return False
         
-        if self.daily_write_count >= self.max_daily_writes:
+        if not self.quota_planner.fits(writes=1):
             self.logger.warning("Daily write limit reached")
             return False
         
         return True
     
-    def sync_data_to_cloud(self, data: Dict[str, pd.DataFrame], user_id: str = None) -> str:
-        """Sync data to cloud with optimization"""
+    def sync_data_to_cloud(self, data: Dict[str, pd.DataFrame], user_id: str = None, delta_only: bool = True) -> str:
+        """
+        Sync data to cloud with optimization.
+
+        Rows are stored under stable document IDs. With ``delta_only`` only
+        rows whose ``_record_hash`` differs from the last upload are written,
+        and documents for rows removed locally are deleted.
+        """
         if not self.db or not self.current_session:
             self.logger.error("Firebase not initialized or user not authenticated")
             return None
@@ -769,44 +790,42 @@ class OptimizedFirebaseManager(QObject):
             self.sync_progress.emit(operation_id, 0)
             
             total_records = sum(len(df) for df in data.values())
+            processed_records = 0
             synced_records = 0
             
-            # Sync each table
-            for table_name, df in data.items():
-                if df.empty:
-                    continue
-                
-                # Convert DataFrame to optimized format
-                records = self.optimize_dataframe_for_firestore(df)
-                
-                # Batch write for efficiency
-                batch = self.db.batch()
-                batch_count = 0
-                
-                for record in records:
-                    # Create document reference
-                    doc_ref = self.db.collection('users').document(user_id).collection(table_name).document()
-                    
-                    # Add to batch
-                    batch.set(doc_ref, record)
-                    batch_count += 1
-                    synced_records += 1
-                    
-                    # Commit batch when full
-                    if batch_count >= self.batch_size:
-                        batch.commit()
-                        self.daily_write_count += batch_count
-                        batch = self.db.batch()
-                        batch_count = 0
-                        
-                        # Update progress
-                        progress = int((synced_records / total_records) * 100)
-                        self.sync_progress.emit(operation_id, progress)
-                
-                # Commit remaining records
-                if batch_count > 0:
-                    batch.commit()
-                    self.daily_write_count += batch_count
+            def on_batch(count):
+                nonlocal synced_records, processed_records
+                synced_records += count
+                processed_records += count
+                progress = int((min(processed_records, total_records) / total_records) * 100)
+                self.sync_progress.emit(operation_id, progress)
+            
+            # Plan every table (only rows changed since the last upload when delta_only)
+            # and trim the plan to the quota left today
+            deltas = [
+                self.upload_manifest.plan(user_id, table_name, df, full=not delta_only)
+                for table_name, df in data.items() if not df.empty
+            ]
+            plan = self.quota_planner.plan_upload(deltas, reads_per_table=WATERMARK_READS,
+                                                  writes_per_table=WATERMARK_WRITES)
+            processed_records += sum(delta.unchanged for delta in deltas) + sum(plan.deferred.values())
+            
+            with self.quota_meter.operation("sync_to_cloud"):
+                for delta in plan.deltas:
+                    committed = synced_records
+                    try:
+                        upload_delta(self.db, user_id, delta, self.upload_manifest, self.batch_size, on_batch)
+                    finally:
+                        # Publish the table's new watermark for whatever was committed
+                        publish_delta(self.db, user_id, delta, synced_records - committed,
+                                      len(data[delta.table_name]))
+                    self.logger.info(f"Synced {delta.table_name}: {len(delta.records)} set, "
+                                     f"{len(delta.deletes)} deleted, {delta.unchanged} unchanged")
+            self.quota_meter.flush()
+            
+            if not plan.complete:
+                self.logger.warning(f"Daily Firestore quota: {sum(plan.deferred.values())} operations "
+                                    f"deferred to the next sync ({', '.join(plan.deferred)})")
             
             # Update sync status
             sync_status.status = "completed"
@@ -869,30 +888,34 @@ class OptimizedFirebaseManager(QObject):
             downloaded_data = {}
             total_records = 0
 
-            for collection_name in collections:
-                try:
-                    collection_ref = user_ref.collection(collection_name)
-                    docs = collection_ref.stream()
-
-                    records = []
-                    for doc in docs:
-                        doc_data = doc.to_dict()
-                        # Remove metadata fields
-                        doc_data.pop('_sync_timestamp', None)
-                        doc_data.pop('_record_hash', None)
-                        records.append(doc_data)
-                        total_records += 1
-                        self.daily_read_count += 1
-
-                    if records:
-                        # Convert to DataFrame
-                        df = pd.DataFrame(records)
-                        downloaded_data[collection_name] = df
-                        self.logger.info(f"Downloaded {len(records)} records from {collection_name}")
-
-                except Exception as e:
-                    self.logger.error(f"Error downloading collection {collection_name}: {e}")
-                    continue
+            with self.quota_meter.operation("sync_from_cloud"):
+                for collection_name in collections:
+                    try:
+                        collection_ref = user_ref.collection(collection_name)
+                        docs = collection_ref.stream()
+
+                        records = []
+                        doc_ids = []
+                        for doc in docs:
+                            doc_data = doc.to_dict()
+                            # Remove metadata fields
+                            for field in METADATA_FIELDS:
+                                doc_data.pop(field, None)
+                            records.append(doc_data)
+                            doc_ids.append(doc.id)
+                            total_records += 1
+
+                        df = pd.DataFrame(records) if records else pd.DataFrame()
+                        # Saving the download locally must not upload it back
+                        self.upload_manifest.record_download(user_id, collection_name, doc_ids, df)
+                        if records:
+                            downloaded_data[collection_name] = df
+                            self.logger.info(f"Downloaded {len(records)} records from {collection_name}")
+
+                    except Exception as e:
+                        self.logger.error(f"Error downloading collection {collection_name}: {e}")
+                        continue
+            self.quota_meter.flush()
 
             track_performance_end(operation_id, "firebase_manager", "sync_data_from_cloud",
                                 metadata={"records_downloaded": total_records})
@@ -941,8 +964,6 @@ class OptimizedFirebaseManager(QObject):
                     summary['collections'][collection_name] = docs_count
                     summary['total_records'] += docs_count
 
-                    self.daily_read_count += docs_count
-
             return summary
 
         except Exception as e:
@@ -972,8 +993,8 @@ class OptimizedFirebaseManager(QObject):
             for doc in docs:
                 doc_data = doc.to_dict()
                 # Remove metadata fields
-                doc_data.pop('_sync_timestamp', None)
-                doc_data.pop('_record_hash', None)
+                for field in METADATA_FIELDS:
+                    doc_data.pop(field, None)
                 records.append(doc_data)
 
             self.logger.info(f"Retrieved {len(records)} records from {collection_name}")
@@ -1023,17 +1044,16 @@ class OptimizedFirebaseManager(QObject):
 
                     if batch_count >= self.batch_size:
                         batch.commit()
-                        self.daily_write_count += batch_count
                         batch = self.db.batch()
                         batch_count = 0
 
                 # Commit remaining deletes
                 if batch_count > 0:
                     batch.commit()
-                    self.daily_write_count += batch_count
 
                 self.logger.info(f"Cleared collection: {collection_name}")
 
+            self.upload_manifest.forget(user_id, collections)
             return True
 
         except Exception as e:
@@ -1056,7 +1076,6 @@ class OptimizedFirebaseManager(QObject):
             }
             
             doc_ref.set(analytics_record)
-            self.daily_write_count += 1
             
             track_user_action("firebase_manager", "analytics_synced", "Analytics data synced to cloud")
             return True
@@ -1065,33 +1084,12 @@ class OptimizedFirebaseManager(QObject):
             self.logger.error(f"Analytics sync failed: {e}")
             return False
     
-    def optimize_dataframe_for_firestore(self, df: pd.DataFrame) -> List[Dict]:
-        """Optimize DataFrame for Firestore storage"""
-        records = []
-        
-        for _, row in df.iterrows():
-            record = {}
-            for col, value in row.items():
-                # Handle different data types
-                if pd.isna(value):
-                    record[col] = None
-                elif isinstance(value, (int, float)):
-                    record[col] = float(value) if not pd.isna(value) else 0.0
-                elif isinstance(value, bool):
-                    record[col] = bool(value)
-                else:
-                    record[col] = str(value)
-            
-            # Add metadata
-            record['_sync_timestamp'] = datetime.now().isoformat()
-            record['_record_hash'] = self.generate_record_hash(record)
-            
-            records.append(record)
-        
-        return records
+    def optimize_dataframe_for_firestore(self, df: pd.DataFrame, sync_timestamp: str = None) -> List[Dict]:
+        """Optimize DataFrame for Firestore storage (column-wise, one timestamp per batch)"""
+        return serialize_dataframe(df, sync_timestamp)
     
     def generate_record_hash(self, record: Dict) -> str:
-        """Generate hash for record deduplication"""
+        """Generate hash for a single record (tables are hashed with firestore_serializer.record_hashes)"""
         # Create a stable string representation
         record_str = json.dumps(record, sort_keys=True, default=str)
         return hashlib.md5(record_str.encode()).hexdigest()
@@ -1147,6 +1145,7 @@ class OptimizedFirebaseManager(QObject):
 
     def get_usage_statistics(self) -> Dict:
         """Get Firebase usage statistics for v1.0.6"""
+        usage = self.quota_meter.usage()
         return {
             "daily_reads": self.daily_read_count,
             "daily_writes": self.daily_write_count,
@@ -1154,7 +1153,10 @@ class OptimizedFirebaseManager(QObject):
             "max_writes": self.max_daily_writes,
             "reads_remaining": self.max_daily_reads - self.daily_read_count,
             "writes_remaining": self.max_daily_writes - self.daily_write_count,
-            "last_reset_date": self.last_reset_date.isoformat() if self.last_reset_date else None
+            "last_reset_date": self.last_reset_date.isoformat() if self.last_reset_date else None,
+            "daily_deletes": usage['deletes'],
+            "by_collection": usage['collections'],
+            "by_operation": usage['operations']
         }
 
     def cleanup_old_syncs(self):
@@ -16,6 +16,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QListWidgetItem, QSplitter)
 from PySide6.QtCore import Qt, QDate, Signal
 from PySide6.QtGui import QFont
+from modules.table_watcher import table_saved
 
 class OrderItemWidget(QFrame):
     """Widget for individual order item"""
@@ -534,6 +535,7 @@ class OrderManagementWidget(QWidget):
             import os
             os.makedirs('data', exist_ok=True)
             self.data['orders'].to_csv('data/orders.csv', index=False)
+            table_saved('data/orders.csv')
             
         except Exception as e:
             self.logger.error(f"Error saving order: {e}")
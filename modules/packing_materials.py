@@ -12,6 +12,8 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_store import get_table_store
+from modules.table_watcher import table_saved
 
 # Add the parent directory to the path to import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -1996,6 +1998,7 @@ class PackingMaterialsWidget(QWidget):
                 # Save to CSV
                 os.makedirs('data', exist_ok=True)
                 self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                table_saved('data/packing_materials.csv')
 
                 # Refresh display
                 self.load_data()
@@ -2047,6 +2050,7 @@ class PackingMaterialsWidget(QWidget):
             # Save updated inventory
             os.makedirs('data', exist_ok=True)
             self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+            table_saved('data/packing_materials.csv')
 
             # Refresh display
             self.load_data()
@@ -2209,6 +2213,7 @@ class PackingMaterialsWidget(QWidget):
 
                 # Save to CSV
                 self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+                table_saved('data/recipe_packing_materials.csv')
 
                 # Refresh display
                 self.load_recipe_materials()
@@ -2310,10 +2315,12 @@ class PackingMaterialsWidget(QWidget):
                     recipe_mask = self.data['recipe_packing_materials']['material_name'] == material_name
                     self.data['recipe_packing_materials'] = self.data['recipe_packing_materials'][~recipe_mask]
                     self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+                    table_saved('data/recipe_packing_materials.csv')
 
                 # Save updated data
                 os.makedirs('data', exist_ok=True)
                 self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                table_saved('data/packing_materials.csv')
 
                 # Refresh display
                 self.load_data()
@@ -2410,6 +2417,7 @@ class PackingMaterialsWidget(QWidget):
                     # Save to CSV
                     os.makedirs('data', exist_ok=True)
                     self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                    table_saved('data/packing_materials.csv')
 
                     # Refresh display
                     self.load_data()
@@ -2464,6 +2472,7 @@ class PackingMaterialsWidget(QWidget):
             # Save to CSV
             os.makedirs('data', exist_ok=True)
             purchase_history.to_csv('data/packing_materials_purchase_history.csv', index=False)
+            table_saved('data/packing_materials_purchase_history.csv')
 
         except Exception as e:
             self.logger.error(f"Error adding purchase record: {e}")
@@ -2876,10 +2885,12 @@ class PackingMaterialsWidget(QWidget):
                         'order_id', 'sale_id', 'notes'
                     ])
                     empty_df.to_csv('data/packing_materials_usage_history.csv', index=False)
+                    table_saved('data/packing_materials_usage_history.csv')
                 else:
                     # Reset usage IDs to be sequential
                     real_data['usage_id'] = range(1, len(real_data) + 1)
                     real_data.to_csv('data/packing_materials_usage_history.csv', index=False)
+                    table_saved('data/packing_materials_usage_history.csv')
 
                 # Refresh the display
                 self.load_data()
@@ -3129,8 +3140,10 @@ class PackingMaterialsWidget(QWidget):
             if recipe_items.empty:
                 return
 
-            # Load existing usage history
-            usage_history = self.load_usage_history()
+            # Only the number of recorded usages is needed for new usage ids (known without a read)
+            store = get_table_store('data')
+            history_table = 'packing_materials_usage_history'
+            usage_count = store.row_count(history_table)
 
             # Get current materials data for costs
             materials_data = self.data.get('packing_materials', pd.DataFrame())
@@ -3152,7 +3165,7 @@ class PackingMaterialsWidget(QWidget):
 
                 # Create usage record
                 usage_record = {
-                    'usage_id': len(usage_history) + len(new_usage_records) + 1,
+                    'usage_id': usage_count + len(new_usage_records) + 1,
                     'usage_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'recipe_id': recipe_id,
                     'recipe_name': recipe_name,
@@ -3179,15 +3192,18 @@ class PackingMaterialsWidget(QWidget):
             # Save usage records
             if new_usage_records:
                 new_df = pd.DataFrame(new_usage_records)
-                usage_history = pd.concat([usage_history, new_df], ignore_index=True)
 
-                # Save to CSV
+                # Append to the CSV journal (full rewrite only if the file is missing or its columns changed)
                 os.makedirs('data', exist_ok=True)
-                usage_history.to_csv('data/packing_materials_usage_history.csv', index=False)
+                if not store.append(history_table, new_df):
+                    usage_history = pd.concat([self.load_usage_history(), new_df], ignore_index=True)
+                    usage_history.to_csv('data/packing_materials_usage_history.csv', index=False)
+                    table_saved('data/packing_materials_usage_history.csv')
 
                 # Update materials stock
                 if not materials_data.empty:
                     materials_data.to_csv('data/packing_materials.csv', index=False)
+                    table_saved('data/packing_materials.csv')
                     self.data['packing_materials'] = materials_data
 
                 self.logger.info(f"Recorded usage for {len(new_usage_records)} materials for recipe {recipe_name}")
@@ -3200,16 +3216,13 @@ class PackingMaterialsWidget(QWidget):
         try:
             import os
 
-            # Load existing usage history
-            usage_history = self.load_usage_history()
-
-            # Add new records
+            # Append new records to the CSV journal (full rewrite only if the file is missing or its columns changed)
             new_df = pd.DataFrame(usage_records)
-            usage_history = pd.concat([usage_history, new_df], ignore_index=True)
-
-            # Save to CSV
             os.makedirs('data', exist_ok=True)
-            usage_history.to_csv('data/packing_materials_usage_history.csv', index=False)
+            if not get_table_store('data').append('packing_materials_usage_history', new_df):
+                usage_history = pd.concat([self.load_usage_history(), new_df], ignore_index=True)
+                usage_history.to_csv('data/packing_materials_usage_history.csv', index=False)
+                table_saved('data/packing_materials_usage_history.csv')
 
             self.logger.info(f"Recorded {len(usage_records)} bulk usage records")
 
@@ -3379,6 +3392,7 @@ class PackingMaterialsWidget(QWidget):
                             self.data['packing_materials'].loc[material_mask, 'current_stock'] = new_stock
                             os.makedirs('data', exist_ok=True)
                             self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                            table_saved('data/packing_materials.csv')
 
                     # Refresh displays
                     self.load_data()
@@ -3699,6 +3713,7 @@ class RecordPurchaseDialog(QDialog):
 
             # Save purchase history
             updated_history.to_csv('data/packing_materials_purchase_history.csv', index=False)
+            table_saved('data/packing_materials_purchase_history.csv')
 
             # Update material stock and pricing
             mask = self.data['packing_materials']['material_id'] == material_id
@@ -3721,6 +3736,7 @@ class RecordPurchaseDialog(QDialog):
             # Save updated materials
             os.makedirs('data', exist_ok=True)
             self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+            table_saved('data/packing_materials.csv')
 
             QMessageBox.information(
                 self, "Success",
@@ -4247,6 +4263,7 @@ class EditPurchaseDialog(QDialog):
 
             # Save purchase history
             purchase_history.to_csv('data/packing_materials_purchase_history.csv', index=False)
+            table_saved('data/packing_materials_purchase_history.csv')
 
             # Update material cost and stock if needed
             self.update_material_data(material_id, purchase_history)
@@ -4298,6 +4315,7 @@ class EditPurchaseDialog(QDialog):
                         # Save updated materials data
                         os.makedirs('data', exist_ok=True)
                         self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                        table_saved('data/packing_materials.csv')
 
         except Exception as e:
             self.logger.error(f"Error updating material data: {e}")
@@ -4360,6 +4378,7 @@ class EditPurchaseDialog(QDialog):
                 # Save updated purchase history
                 os.makedirs('data', exist_ok=True)
                 updated_history.to_csv('data/packing_materials_purchase_history.csv', index=False)
+                table_saved('data/packing_materials_purchase_history.csv')
 
                 self.logger.info(f"Synced {len(updated_records)} cost updates to purchase history")
 
@@ -4582,6 +4601,7 @@ class EditMaterialDialog(QDialog):
             try:
                 os.makedirs('data', exist_ok=True)
                 self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+                table_saved('data/packing_materials.csv')
 
                 # Force refresh the parent widget if it has the method
                 if hasattr(self.parent(), 'refresh_data_display'):
@@ -5165,6 +5185,7 @@ class AddMaterialDialog(QDialog):
             # Save to CSV
             os.makedirs('data', exist_ok=True)
             self.data['packing_materials'].to_csv('data/packing_materials.csv', index=False, encoding='utf-8')
+            table_saved('data/packing_materials.csv')
 
             super().accept()
 
@@ -5456,6 +5477,7 @@ class AddRecipeMaterialDialog(QDialog):
 
                         # Save to CSV
                         self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+                        table_saved('data/recipe_packing_materials.csv')
 
                         # Force refresh parent widget data
                         self.force_refresh_parent_data()
@@ -5500,6 +5522,7 @@ class AddRecipeMaterialDialog(QDialog):
 
             # Save to CSV
             self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+            table_saved('data/recipe_packing_materials.csv')
 
             # Force refresh parent widget data
             self.force_refresh_parent_data()
@@ -6133,6 +6156,7 @@ class BulkAssignMaterialsDialog(QDialog):
             # Save to CSV
             if assignments_created > 0:
                 self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+                table_saved('data/recipe_packing_materials.csv')
 
                 message = f"Successfully created {assignments_created} material assignments!"
                 if assignments_skipped > 0:
@@ -6534,6 +6558,7 @@ class CopyMaterialsDialog(QDialog):
             # Save to CSV
             if materials_copied > 0:
                 self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+                table_saved('data/recipe_packing_materials.csv')
                 notify_success("Success", f"Copied {materials_copied} materials to {self.target_recipe}", parent=self)
                 super().accept()
             else:
@@ -6690,6 +6715,7 @@ class EditRecipeMaterialDialog(QDialog):
 
             # Save to CSV
             self.data['recipe_packing_materials'].to_csv('data/recipe_packing_materials.csv', index=False)
+            table_saved('data/recipe_packing_materials.csv')
 
             super().accept()
 
@@ -3,6 +3,7 @@ Performance Monitor Widget
 Real-time performance monitoring for Kitchen Dashboard
 """
 
+import os
 import logging
 import psutil
 import time
@@ -13,6 +14,9 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PySide6.QtCore import QTimer, Signal
 from PySide6.QtGui import QFont
 
+from modules.shared_cache import cache_statistics, clear_all_caches
+from utils.startup_profiler import format_breakdown, load_reports, REPORT_DIRNAME
+
 class PerformanceCard(QFrame):
     """Performance metric card"""
     
@@ -106,6 +110,9 @@ class PerformanceMonitorWidget(QWidget):
         
         # Progress bars
         self.create_progress_section(layout)
+
+        # Startup phase timings of the last launch
+        self.create_startup_section(layout)
         
         # Control buttons
         self.create_controls_section(layout)
@@ -181,6 +188,37 @@ class PerformanceMonitorWidget(QWidget):
         
         parent_layout.addWidget(progress_group)
     
+    def create_startup_section(self, parent_layout):
+        """Create the startup breakdown section (last launch, change since the one before)"""
+        startup_group = QGroupBox("Startup")
+        startup_layout = QVBoxLayout(startup_group)
+
+        self.startup_text = QTextEdit()
+        self.startup_text.setReadOnly(True)
+        self.startup_text.setMaximumHeight(140)
+        self.startup_text.setFont(QFont("Consolas", 9))
+        startup_layout.addWidget(self.startup_text)
+
+        parent_layout.addWidget(startup_group)
+        self.update_startup_breakdown()
+
+    def startup_report_dir(self) -> str:
+        from utils.app_logger import get_logger
+        return os.path.join(get_logger().logs_dir, REPORT_DIRNAME)
+
+    def update_startup_breakdown(self):
+        """Show the newest startup report"""
+        try:
+            reports = load_reports(self.startup_report_dir(), limit=2)
+            if not reports:
+                self.startup_text.setPlainText("No startup report yet")
+                return
+            previous = reports[1] if len(reports) > 1 else None
+            self.startup_text.setPlainText('\n'.join(format_breakdown(reports[0], previous)))
+        except Exception as e:
+            self.logger.error(f"Error loading startup report: {e}")
+            self.startup_text.setPlainText(f"Startup report unavailable: {e}")
+
     def create_controls_section(self, parent_layout):
         """Create control buttons section"""
         controls_layout = QHBoxLayout()
@@ -237,6 +275,7 @@ class PerformanceMonitorWidget(QWidget):
             }
         """)
         refresh_btn.clicked.connect(self.update_metrics)
+        refresh_btn.clicked.connect(self.update_startup_breakdown)
         controls_layout.addWidget(refresh_btn)
         
         controls_layout.addStretch()
@@ -348,6 +387,10 @@ class PerformanceMonitorWidget(QWidget):
         try:
             from PySide6.QtGui import QPixmap
             QPixmap.clearCache()
+            for name, stats in cache_statistics().items():
+                self.log_message(f"{name}: {stats['entries']} entries, {stats['hit_rate']:.0%} hit rate, "
+                                 f"{stats['evictions']} evictions", "info")
+            clear_all_caches()
             self.log_message("✅ Caches cleared successfully", "success")
             self.cleanup_requested.emit()
         except Exception as e:
@@ -364,7 +407,9 @@ class PerformanceMonitorWidget(QWidget):
                 'memory_percent': psutil.virtual_memory().percent,
                 'thread_count': process.num_threads(),
                 'cpu_avg': sum(self.cpu_history) / len(self.cpu_history) if self.cpu_history else 0,
-                'memory_avg': sum(self.memory_history) / len(self.memory_history) if self.memory_history else 0
+                'memory_avg': sum(self.memory_history) / len(self.memory_history) if self.memory_history else 0,
+                'caches': cache_statistics(),
+                'startup': next(iter(load_reports(self.startup_report_dir(), limit=1)), None)
             }
         except Exception as e:
             self.logger.error(f"Error getting performance summary: {e}")
@@ -5,7 +5,7 @@ Dedicated module for Zomato and Swiggy report management and analytics
 
 import logging
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QTableWidgetItem, QHeaderView, QLabel, QTabWidget,
                              QPushButton, QComboBox, QDateEdit, QGroupBox,
@@ -15,6 +15,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
 from PySide6.QtCore import Qt, QDate, Signal, QTimer
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor
 
+from modules.daily_cube import get_daily_cube, invalidate_cube, period_range
+
 try:
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
@@ -777,7 +779,7 @@ class PlatformReportsWidget(QWidget):
 
             df = self.data['platform_reports']['zomato']
             period = self.zomato_period_combo.currentText()
-            filtered_df = self.filter_by_period(df, period)
+            filtered_df = self.filter_by_period(df, period, 'zomato')
 
             self.populate_table(self.zomato_table, filtered_df)
 
@@ -793,35 +795,21 @@ class PlatformReportsWidget(QWidget):
 
             df = self.data['platform_reports']['swiggy']
             period = self.swiggy_period_combo.currentText()
-            filtered_df = self.filter_by_period(df, period)
+            filtered_df = self.filter_by_period(df, period, 'swiggy')
 
             self.populate_table(self.swiggy_table, filtered_df)
 
         except Exception as e:
             self.logger.error(f"Error updating Swiggy data: {e}")
 
-    def filter_by_period(self, df, period):
-        """Filter dataframe by selected period"""
+    def filter_by_period(self, df, period, platform):
+        """Filter a platform's report by selected period"""
         if df.empty or 'date' not in df.columns:
             return df
 
-        today = datetime.now()
-
-        if period == "Today":
-            start_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "This Week":
-            start_date = today - timedelta(days=today.weekday())
-        elif period == "This Month":
-            start_date = today.replace(day=1)
-        elif period == "This Year":
-            start_date = today.replace(month=1, day=1)
-        else:  # All Time
-            return df
-
-        # Convert date column to datetime if it's not already
-        df['date'] = pd.to_datetime(df['date'])
-
-        return df[df['date'] >= start_date]
+        # Order dates were parsed when the platform's daily cube took the rows in
+        start_date, end_date = period_range(period)
+        return get_daily_cube(platform).rows(df, start_date, end_date)
 
     def populate_table(self, table, df):
         """Populate table with dataframe data"""
@@ -845,32 +833,15 @@ class PlatformReportsWidget(QWidget):
     def update_metrics(self):
         """Update platform metrics cards"""
         try:
-            # Calculate Zomato metrics
-            zomato_df = self.data['platform_reports']['zomato']
-            if not zomato_df.empty:
-                zomato_revenue = zomato_df['net_amount'].sum()
-                zomato_orders = len(zomato_df)
-            else:
-                zomato_revenue = 0
-                zomato_orders = 0
-
-            # Calculate Swiggy metrics
-            swiggy_df = self.data['platform_reports']['swiggy']
-            if not swiggy_df.empty:
-                swiggy_revenue = swiggy_df['net_amount'].sum()
-                swiggy_orders = len(swiggy_df)
-            else:
-                swiggy_revenue = 0
-                swiggy_orders = 0
+            # Platform totals come from the daily cubes (rebuilt only when a report is imported)
+            zomato = get_daily_cube('zomato').totals(self.data['platform_reports']['zomato'])
+            swiggy = get_daily_cube('swiggy').totals(self.data['platform_reports']['swiggy'])
+            zomato_revenue, zomato_orders = zomato['revenue'], int(zomato['count'])
+            swiggy_revenue, swiggy_orders = swiggy['revenue'], int(swiggy['count'])
 
             # Calculate combined metrics
             total_revenue = zomato_revenue + swiggy_revenue
-            total_commission = 0
-
-            if not zomato_df.empty:
-                total_commission += zomato_df['commission'].sum()
-            if not swiggy_df.empty:
-                total_commission += swiggy_df['commission'].sum()
+            total_commission = zomato['commission'] + swiggy['commission']
 
             # Update cards
             self.zomato_revenue_card.update_value(f"₹{zomato_revenue:.2f}")
@@ -928,12 +899,14 @@ class PlatformReportsWidget(QWidget):
                 self.data['platform_reports']['zomato'].to_csv(
                     'data/zomato_reports.csv', index=False
                 )
+                invalidate_cube('zomato')
 
             # Save Swiggy data
             if not self.data['platform_reports']['swiggy'].empty:
                 self.data['platform_reports']['swiggy'].to_csv(
                     'data/swiggy_reports.csv', index=False
                 )
+                invalidate_cube('swiggy')
 
         except Exception as e:
             self.logger.error(f"Error saving platform data: {e}")
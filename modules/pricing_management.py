@@ -19,6 +19,11 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
 from PySide6.QtCore import Qt, Signal, QDate, QTimer, QPoint
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor, QAction
 from utils.table_styling import apply_universal_column_resizing
+from modules.recipe_costing import RecipeCostingEngine, recipe_key as costing_key
+from modules.table_store import get_table_store
+from modules.shared_cache import get_cache
+from modules.table_watcher import table_saved
+from modules import unit_conversion
 
 # Import notification system
 try:
@@ -29,6 +34,12 @@ except ImportError:
     def notify_warning(title, message, **kwargs): logging.warning(f"{title}: {message}")
     def notify_error(title, message, **kwargs): logging.error(f"{title}: {message}")
 
+
+def _price_lookup_cache():
+    """Shared cache of per-ingredient inventory / shopping list price lookups"""
+    return get_cache('pricing_lookups', max_size=4096)
+
+
 class PricingCard(QFrame):
     """Modern pricing metrics card widget"""
 
@@ -142,10 +153,16 @@ class PricingManagementWidget(QWidget):
 
     data_changed = Signal()
     pricing_updated = Signal(str, str, float)  # recipe_name, field_name, new_value
-    
-    def __init__(self, data, parent=None):
+
+    # Tables whose edits can be applied by recosting only the affected recipes
+    PRICE_SOURCE_TABLES = {'inventory', 'shopping_list'}
+    PACKING_TABLES = {'packing_materials', 'recipe_packing_materials'}
+
+    def __init__(self, data, parent=None, table_versions=None):
         super().__init__(parent)
         self.data = data
+        # The application's per-table change counters (bumped on every edit, save and reload)
+        self.table_versions = table_versions if table_versions is not None else {}
         self.logger = logging.getLogger(__name__)
 
         self.data_loaded = False
@@ -1043,6 +1060,7 @@ class PricingManagementWidget(QWidget):
     def load_data_no_missing_check(self):
         """Load and display pricing data without checking missing items"""
         try:
+            self.invalidate_costing_engine()
             self.populate_cost_analysis_no_missing_check()
             self.populate_pricing_strategy_no_missing_check()
             self.populate_profit_analysis_no_missing_check()
@@ -1057,6 +1075,7 @@ class PricingManagementWidget(QWidget):
         try:
             # First reload pricing data from CSV to get latest updates
             self.reload_pricing_data_from_csv()
+            self.invalidate_costing_engine()
 
             self.populate_cost_analysis()
             self.populate_pricing_strategy()
@@ -1138,95 +1157,104 @@ class PricingManagementWidget(QWidget):
             self.cost_table.setRowCount(len(recipes_df))
 
             for row, (_, recipe) in enumerate(recipes_df.iterrows()):
-                recipe_name = recipe.get('recipe_name', '')
-                recipe_id = recipe.get('recipe_id', row + 1)
+                self.populate_cost_row(row, recipe)
 
-                # Calculate cost of making using application's ingredient data
-                cost_of_making = self.calculate_ingredient_cost(recipe_id)
+        except Exception as e:
+            self.logger.error(f"Error populating cost analysis: {e}")
 
-                # Get pricing data from Excel reference (if available)
-                excel_pricing = self.recipe_pricing_data.get(recipe_name, {})
-                others_pricing = excel_pricing.get('others_pricing')
-                our_pricing = excel_pricing.get('our_pricing')
+    def populate_cost_row(self, row, recipe):
+        """Populate one recipe row of the cost analysis table"""
+        try:
+            recipe_name = recipe.get('recipe_name', '')
+            recipe_id = recipe.get('recipe_id', row + 1)
 
-                # Calculate standard charges
-                pkg_cost = self.calculate_actual_packaging_cost(recipe_name)
+            # Calculate cost of making using application's ingredient data
+            cost_of_making = self.calculate_ingredient_cost(recipe_id)
 
-                # Calculate electricity cost using proper method with cooking time
-                cook_time = recipe.get('cook_time', 30)  # Default 30 minutes if not specified
-                electricity_cost = self.calculate_electricity_cost(cook_time, recipe_name=recipe_name)
+            # Get pricing data from Excel reference (if available)
+            excel_pricing = self.recipe_pricing_data.get(recipe_name, {})
+            others_pricing = excel_pricing.get('others_pricing')
+            our_pricing = excel_pricing.get('our_pricing')
 
-                gas_cost = self.calculate_gas_cost(recipe_data=recipe)
-                other_charges = 2.0  # Standard 2 rupees as per user requirement
+            # Calculate standard charges
+            pkg_cost = self.calculate_actual_packaging_cost(recipe_name)
 
-                # Calculate GST+SGST using configurable rates
-                gst_sgst_rates = self.get_tax_rates()
-                if cost_of_making is not None and cost_of_making > 0:
-                    total_base_cost = cost_of_making + pkg_cost + electricity_cost + gas_cost + other_charges
-                    gst_amount = total_base_cost * (gst_sgst_rates['gst_rate'] + gst_sgst_rates['sgst_rate'])
-                else:
-                    total_base_cost = 0
-                    gst_amount = 0
+            # Calculate electricity cost using proper method with cooking time
+            cook_time = recipe.get('cook_time', 30)  # Default 30 minutes if not specified
+            electricity_cost = self.calculate_electricity_cost(cook_time, recipe_name=recipe_name)
 
-                # Populate table
-                self.cost_table.setItem(row, 0, QTableWidgetItem(recipe_name))
+            gas_cost = self.calculate_gas_cost(recipe_data=recipe)
+            other_charges = 2.0  # Standard 2 rupees as per user requirement
 
-                # Cost of Making - calculated from actual ingredients
-                if cost_of_making is not None and cost_of_making > 0:
-                    self.cost_table.setItem(row, 1, QTableWidgetItem(f"Rs.{cost_of_making:.2f}"))
+            # Calculate GST+SGST using configurable rates
+            gst_sgst_rates = self.get_tax_rates()
+            if cost_of_making is not None and cost_of_making > 0:
+                total_base_cost = cost_of_making + pkg_cost + electricity_cost + gas_cost + other_charges
+                gst_amount = total_base_cost * (gst_sgst_rates['gst_rate'] + gst_sgst_rates['sgst_rate'])
+            else:
+                total_base_cost = 0
+                gst_amount = 0
 
-                    # Calculate profit if we have our pricing
-                    if our_pricing is not None:
-                        total_cost_with_charges = total_base_cost + gst_amount
-                        profit = our_pricing - total_cost_with_charges
-                        profit_percentage = (profit / total_cost_with_charges) * 100 if total_cost_with_charges > 0 else 0
+            # Populate table
+            self.cost_table.setItem(row, 0, QTableWidgetItem(recipe_name))
 
-                        # Others Pricing
-                        if others_pricing is not None:
-                            self.cost_table.setItem(row, 2, QTableWidgetItem(f"Rs.{others_pricing:.2f}"))
-                        else:
-                            self.cost_table.setItem(row, 2, QTableWidgetItem("N/A"))
+            # Cost of Making - calculated from actual ingredients
+            if cost_of_making is not None and cost_of_making > 0:
+                self.cost_table.setItem(row, 1, QTableWidgetItem(f"Rs.{cost_of_making:.2f}"))
 
-                        # Our Pricing
-                        self.cost_table.setItem(row, 3, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
+                # Calculate profit if we have our pricing
+                if our_pricing is not None:
+                    total_cost_with_charges = total_base_cost + gst_amount
+                    profit = our_pricing - total_cost_with_charges
+                    profit_percentage = (profit / total_cost_with_charges) * 100 if total_cost_with_charges > 0 else 0
 
-                        # Profit
-                        profit_item = QTableWidgetItem(f"Rs.{profit:.2f}")
-                        if profit > 0:
-                            profit_item.setForeground(QColor("#10b981"))  # Green
-                        else:
-                            profit_item.setForeground(QColor("#ef4444"))  # Red
-                        self.cost_table.setItem(row, 4, profit_item)
-
-                        # Profit Percentage
-                        percentage_item = QTableWidgetItem(f"{profit_percentage:.1f}%")
-                        if profit_percentage > 100:
-                            percentage_item.setForeground(QColor("#10b981"))  # Green
-                        elif profit_percentage > 50:
-                            percentage_item.setForeground(QColor("#3b82f6"))  # Blue
-                        elif profit_percentage > 0:
-                            percentage_item.setForeground(QColor("#f59e0b"))  # Orange
-                        else:
-                            percentage_item.setForeground(QColor("#ef4444"))  # Red
-                        self.cost_table.setItem(row, 5, percentage_item)
+                    # Others Pricing
+                    if others_pricing is not None:
+                        self.cost_table.setItem(row, 2, QTableWidgetItem(f"Rs.{others_pricing:.2f}"))
+                    else:
+                        self.cost_table.setItem(row, 2, QTableWidgetItem("N/A"))
+
+                    # Our Pricing
+                    self.cost_table.setItem(row, 3, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
+
+                    # Profit
+                    profit_item = QTableWidgetItem(f"Rs.{profit:.2f}")
+                    if profit > 0:
+                        profit_item.setForeground(QColor("#10b981"))  # Green
+                    else:
+                        profit_item.setForeground(QColor("#ef4444"))  # Red
+                    self.cost_table.setItem(row, 4, profit_item)
+
+                    # Profit Percentage
+                    percentage_item = QTableWidgetItem(f"{profit_percentage:.1f}%")
+                    if profit_percentage > 100:
+                        percentage_item.setForeground(QColor("#10b981"))  # Green
+                    elif profit_percentage > 50:
+                        percentage_item.setForeground(QColor("#3b82f6"))  # Blue
+                    elif profit_percentage > 0:
+                        percentage_item.setForeground(QColor("#f59e0b"))  # Orange
                     else:
-                        # No pricing data available
-                        for col in range(2, 6):
-                            self.cost_table.setItem(row, col, QTableWidgetItem("N/A"))
+                        percentage_item.setForeground(QColor("#ef4444"))  # Red
+                    self.cost_table.setItem(row, 5, percentage_item)
                 else:
-                    # No ingredient cost data available
-                    for col in range(1, 6):
+                    # No pricing data available
+                    for col in range(2, 6):
                         self.cost_table.setItem(row, col, QTableWidgetItem("N/A"))
+            else:
+                # No ingredient cost data available
+                for col in range(1, 6):
+                    self.cost_table.setItem(row, col, QTableWidgetItem("N/A"))
 
-                # Set standard charges columns with actual values
-                self.cost_table.setItem(row, 6, QTableWidgetItem(f"Rs.{pkg_cost:.2f}"))  # PKG Cost
-                self.cost_table.setItem(row, 7, QTableWidgetItem(f"Rs.{other_charges:.2f}"))  # Other Charges
-                self.cost_table.setItem(row, 8, QTableWidgetItem(f"Rs.{electricity_cost:.2f}"))  # Electricity Cost
-                self.cost_table.setItem(row, 9, QTableWidgetItem(f"Rs.{gas_cost:.2f}"))  # Gas Cost
-                self.cost_table.setItem(row, 10, QTableWidgetItem(f"Rs.{gst_amount:.2f}"))  # GST Amount
+            # Set standard charges columns with actual values
+            self.cost_table.setItem(row, 6, QTableWidgetItem(f"Rs.{pkg_cost:.2f}"))  # PKG Cost
+            self.cost_table.setItem(row, 7, QTableWidgetItem(f"Rs.{other_charges:.2f}"))  # Other Charges
+            self.cost_table.setItem(row, 8, QTableWidgetItem(f"Rs.{electricity_cost:.2f}"))  # Electricity Cost
+            self.cost_table.setItem(row, 9, QTableWidgetItem(f"Rs.{gas_cost:.2f}"))  # Gas Cost
+            self.cost_table.setItem(row, 10, QTableWidgetItem(f"Rs.{gst_amount:.2f}"))  # GST Amount
 
         except Exception as e:
-            self.logger.error(f"Error populating cost analysis: {e}")
+            self.logger.error(f"Error populating cost analysis row {row}: {e}")
+
 
     def populate_pricing_strategy_no_missing_check(self):
         """Populate pricing strategy table without checking missing items"""
@@ -1238,43 +1266,52 @@ class PricingManagementWidget(QWidget):
             self.pricing_table.setRowCount(len(recipes_df))
 
             for row, (_, recipe) in enumerate(recipes_df.iterrows()):
-                recipe_name = recipe.get('recipe_name', '')
-                recipe_id = recipe.get('recipe_id', row + 1)
+                self.populate_pricing_strategy_row(row, recipe)
 
-                # Calculate ingredient cost directly
-                ingredient_cost = self.calculate_ingredient_cost(recipe_id)
-
-                if ingredient_cost is None:
-                    self.pricing_table.setItem(row, 0, QTableWidgetItem(recipe_name))
-                    self.pricing_table.setItem(row, 1, QTableWidgetItem("❌ Missing Ingredients"))
-                    for col in range(2, 7):
-                        self.pricing_table.setItem(row, col, QTableWidgetItem("N/A"))
-                    continue
+        except Exception as e:
+            self.logger.error(f"Error populating pricing strategy (no missing check): {e}")
 
-                making_cost = ingredient_cost  # Making cost equals ingredient cost
-                packaging_cost = self.calculate_actual_packaging_cost(recipe_name)
-                other_charges = 2.0
-                total_cost = ingredient_cost + making_cost + packaging_cost + other_charges
+    def populate_pricing_strategy_row(self, row, recipe):
+        """Populate one recipe row of the pricing strategy table"""
+        try:
+            recipe_name = recipe.get('recipe_name', '')
+            recipe_id = recipe.get('recipe_id', row + 1)
 
-                # Pricing strategy
-                others_pricing = total_cost * 1.8  # 80% markup
-                margin_percentage = 30.0  # 30% margin
-                margin_value = total_cost * (margin_percentage / 100)
-                our_pricing = total_cost + margin_value
-                selling_price = max(our_pricing, others_pricing * 0.9)  # 10% below others
-                profit = selling_price - total_cost
+            # Calculate ingredient cost directly
+            ingredient_cost = self.calculate_ingredient_cost(recipe_id)
 
-                # Populate table
+            if ingredient_cost is None:
                 self.pricing_table.setItem(row, 0, QTableWidgetItem(recipe_name))
-                self.pricing_table.setItem(row, 1, QTableWidgetItem(f"Rs.{total_cost:.2f}"))
-                self.pricing_table.setItem(row, 2, QTableWidgetItem(f"Rs.{others_pricing:.2f}"))
-                self.pricing_table.setItem(row, 3, QTableWidgetItem(f"Rs.{margin_value:.2f}"))
-                self.pricing_table.setItem(row, 4, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
-                self.pricing_table.setItem(row, 5, QTableWidgetItem(f"Rs.{selling_price:.2f}"))
-                self.pricing_table.setItem(row, 6, QTableWidgetItem(f"Rs.{profit:.2f}"))
+                self.pricing_table.setItem(row, 1, QTableWidgetItem("❌ Missing Ingredients"))
+                for col in range(2, 7):
+                    self.pricing_table.setItem(row, col, QTableWidgetItem("N/A"))
+                return
+
+            making_cost = ingredient_cost  # Making cost equals ingredient cost
+            packaging_cost = self.calculate_actual_packaging_cost(recipe_name)
+            other_charges = 2.0
+            total_cost = ingredient_cost + making_cost + packaging_cost + other_charges
+
+            # Pricing strategy
+            others_pricing = total_cost * 1.8  # 80% markup
+            margin_percentage = 30.0  # 30% margin
+            margin_value = total_cost * (margin_percentage / 100)
+            our_pricing = total_cost + margin_value
+            selling_price = max(our_pricing, others_pricing * 0.9)  # 10% below others
+            profit = selling_price - total_cost
+
+            # Populate table
+            self.pricing_table.setItem(row, 0, QTableWidgetItem(recipe_name))
+            self.pricing_table.setItem(row, 1, QTableWidgetItem(f"Rs.{total_cost:.2f}"))
+            self.pricing_table.setItem(row, 2, QTableWidgetItem(f"Rs.{others_pricing:.2f}"))
+            self.pricing_table.setItem(row, 3, QTableWidgetItem(f"Rs.{margin_value:.2f}"))
+            self.pricing_table.setItem(row, 4, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
+            self.pricing_table.setItem(row, 5, QTableWidgetItem(f"Rs.{selling_price:.2f}"))
+            self.pricing_table.setItem(row, 6, QTableWidgetItem(f"Rs.{profit:.2f}"))
 
         except Exception as e:
-            self.logger.error(f"Error populating pricing strategy (no missing check): {e}")
+            self.logger.error(f"Error populating pricing strategy row {row}: {e}")
+
 
     def populate_profit_analysis_no_missing_check(self):
         """Populate profit analysis table using application data"""
@@ -1286,79 +1323,88 @@ class PricingManagementWidget(QWidget):
             self.profit_table.setRowCount(len(recipes_df))
 
             for row, (_, recipe) in enumerate(recipes_df.iterrows()):
-                recipe_name = recipe.get('recipe_name', '')
-                recipe_id = recipe.get('recipe_id', row + 1)
-
-                # Calculate cost of making using application's ingredient data
-                cost_of_making = self.calculate_ingredient_cost(recipe_id)
+                self.populate_profit_row(row, recipe)
 
-                # Get our pricing from Excel reference
-                excel_pricing = self.recipe_pricing_data.get(recipe_name, {})
-                our_pricing = excel_pricing.get('our_pricing')
+        except Exception as e:
+            self.logger.error(f"Error populating profit analysis (no missing check): {e}")
 
-                if cost_of_making is None or cost_of_making <= 0:
-                    self.profit_table.setItem(row, 0, QTableWidgetItem(recipe_name))
-                    for col in range(1, 6):
-                        self.profit_table.setItem(row, col, QTableWidgetItem("Soon"))
-                    continue
+    def populate_profit_row(self, row, recipe):
+        """Populate one recipe row of the profit analysis table"""
+        try:
+            recipe_name = recipe.get('recipe_name', '')
+            recipe_id = recipe.get('recipe_id', row + 1)
 
-                # Calculate profit if we have pricing data
-                if our_pricing is not None:
-                    profit = our_pricing - cost_of_making
-                    profit_percentage = (profit / cost_of_making) * 100 if cost_of_making > 0 else 0
+            # Calculate cost of making using application's ingredient data
+            cost_of_making = self.calculate_ingredient_cost(recipe_id)
 
-                    # Determine status
-                    if profit_percentage > 100:
-                        status = "Excellent"
-                        status_color = "#10b981"
-                    elif profit_percentage > 50:
-                        status = "Good"
-                        status_color = "#3b82f6"
-                    elif profit_percentage > 0:
-                        status = "Average"
-                        status_color = "#f59e0b"
-                    else:
-                        status = "Loss"
-                        status_color = "#ef4444"
-                else:
-                    profit = None
-                    profit_percentage = None
-                    status = "No Pricing"
-                    status_color = "#6b7280"
+            # Get our pricing from Excel reference
+            excel_pricing = self.recipe_pricing_data.get(recipe_name, {})
+            our_pricing = excel_pricing.get('our_pricing')
 
-                # Populate table
+            if cost_of_making is None or cost_of_making <= 0:
                 self.profit_table.setItem(row, 0, QTableWidgetItem(recipe_name))
+                for col in range(1, 6):
+                    self.profit_table.setItem(row, col, QTableWidgetItem("Soon"))
+                return
 
-                if our_pricing is not None:
-                    self.profit_table.setItem(row, 1, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
+            # Calculate profit if we have pricing data
+            if our_pricing is not None:
+                profit = our_pricing - cost_of_making
+                profit_percentage = (profit / cost_of_making) * 100 if cost_of_making > 0 else 0
+
+                # Determine status
+                if profit_percentage > 100:
+                    status = "Excellent"
+                    status_color = "#10b981"
+                elif profit_percentage > 50:
+                    status = "Good"
+                    status_color = "#3b82f6"
+                elif profit_percentage > 0:
+                    status = "Average"
+                    status_color = "#f59e0b"
                 else:
-                    self.profit_table.setItem(row, 1, QTableWidgetItem("Soon"))
+                    status = "Loss"
+                    status_color = "#ef4444"
+            else:
+                profit = None
+                profit_percentage = None
+                status = "No Pricing"
+                status_color = "#6b7280"
 
-                self.profit_table.setItem(row, 2, QTableWidgetItem(f"Rs.{cost_of_making:.2f}"))
+            # Populate table
+            self.profit_table.setItem(row, 0, QTableWidgetItem(recipe_name))
 
-                if profit is not None:
-                    profit_item = QTableWidgetItem(f"Rs.{profit:.2f}")
-                    if profit > 0:
-                        profit_item.setForeground(QColor("#10b981"))
-                    else:
-                        profit_item.setForeground(QColor("#ef4444"))
-                    self.profit_table.setItem(row, 3, profit_item)
-                else:
-                    self.profit_table.setItem(row, 3, QTableWidgetItem("Soon"))
+            if our_pricing is not None:
+                self.profit_table.setItem(row, 1, QTableWidgetItem(f"Rs.{our_pricing:.2f}"))
+            else:
+                self.profit_table.setItem(row, 1, QTableWidgetItem("Soon"))
 
-                if profit_percentage is not None:
-                    percentage_item = QTableWidgetItem(f"{profit_percentage:.1f}%")
-                    percentage_item.setForeground(QColor(status_color))
-                    self.profit_table.setItem(row, 4, percentage_item)
+            self.profit_table.setItem(row, 2, QTableWidgetItem(f"Rs.{cost_of_making:.2f}"))
+
+            if profit is not None:
+                profit_item = QTableWidgetItem(f"Rs.{profit:.2f}")
+                if profit > 0:
+                    profit_item.setForeground(QColor("#10b981"))
                 else:
-                    self.profit_table.setItem(row, 4, QTableWidgetItem("Soon"))
+                    profit_item.setForeground(QColor("#ef4444"))
+                self.profit_table.setItem(row, 3, profit_item)
+            else:
+                self.profit_table.setItem(row, 3, QTableWidgetItem("Soon"))
 
-                status_item = QTableWidgetItem(status)
-                status_item.setForeground(QColor(status_color))
-                self.profit_table.setItem(row, 5, status_item)
+            if profit_percentage is not None:
+                percentage_item = QTableWidgetItem(f"{profit_percentage:.1f}%")
+                percentage_item.setForeground(QColor(status_color))
+                self.profit_table.setItem(row, 4, percentage_item)
+            else:
+                self.profit_table.setItem(row, 4, QTableWidgetItem("Soon"))
+
+            status_item = QTableWidgetItem(status)
+            status_item.setForeground(QColor(status_color))
+            self.profit_table.setItem(row, 5, status_item)
 
         except Exception as e:
-            self.logger.error(f"Error populating profit analysis (no missing check): {e}")
+            self.logger.error(f"Error populating profit analysis row {row}: {e}")
+
 
     def populate_discount_analysis_no_missing_check(self):
         """Populate discount analysis table without checking missing items"""
@@ -1370,89 +1416,189 @@ class PricingManagementWidget(QWidget):
             self.discount_table.setRowCount(len(recipes_df))
 
             for row, (_, recipe) in enumerate(recipes_df.iterrows()):
-                recipe_name = recipe.get('recipe_name', '')
-                recipe_id = recipe.get('recipe_id', row + 1)
+                self.populate_discount_row(row, recipe)
 
-                # Calculate ingredient cost directly
-                ingredient_cost = self.calculate_ingredient_cost(recipe_id)
-
-                if ingredient_cost is None:
-                    self.discount_table.setItem(row, 0, QTableWidgetItem(recipe_name))
-                    self.discount_table.setItem(row, 1, QTableWidgetItem("❌ Missing Ingredients"))
-                    for col in range(2, 11):
-                        self.discount_table.setItem(row, col, QTableWidgetItem("N/A"))
-                    continue
+        except Exception as e:
+            self.logger.error(f"Error populating discount analysis (no missing check): {e}")
 
-                total_cost = ingredient_cost * 1.5
-                original_price = total_cost * 1.4
+    def populate_discount_row(self, row, recipe):
+        """Populate one recipe row of the discount analysis table"""
+        try:
+            recipe_name = recipe.get('recipe_name', '')
+            recipe_id = recipe.get('recipe_id', row + 1)
 
-                # Calculate discounted prices
-                discount_10 = original_price * 0.9
-                discount_15 = original_price * 0.85
-                discount_20 = original_price * 0.8
-                discount_25 = original_price * 0.75
-                discount_30 = original_price * 0.7
-                discount_35 = original_price * 0.65
-                discount_40 = original_price * 0.6
-                discount_45 = original_price * 0.55
-                discount_50 = original_price * 0.5
+            # Calculate ingredient cost directly
+            ingredient_cost = self.calculate_ingredient_cost(recipe_id)
 
-                # Populate table
+            if ingredient_cost is None:
                 self.discount_table.setItem(row, 0, QTableWidgetItem(recipe_name))
-                self.discount_table.setItem(row, 1, QTableWidgetItem(f"Rs.{original_price:.2f}"))
-                self.discount_table.setItem(row, 2, QTableWidgetItem(f"Rs.{discount_10:.2f}"))
-                self.discount_table.setItem(row, 3, QTableWidgetItem(f"Rs.{discount_15:.2f}"))
-                self.discount_table.setItem(row, 4, QTableWidgetItem(f"Rs.{discount_20:.2f}"))
-                self.discount_table.setItem(row, 5, QTableWidgetItem(f"Rs.{discount_25:.2f}"))
-                self.discount_table.setItem(row, 6, QTableWidgetItem(f"Rs.{discount_30:.2f}"))
-                self.discount_table.setItem(row, 7, QTableWidgetItem(f"Rs.{discount_35:.2f}"))
-                self.discount_table.setItem(row, 8, QTableWidgetItem(f"Rs.{discount_40:.2f}"))
-                self.discount_table.setItem(row, 9, QTableWidgetItem(f"Rs.{discount_45:.2f}"))
-                self.discount_table.setItem(row, 10, QTableWidgetItem(f"Rs.{discount_50:.2f}"))
+                self.discount_table.setItem(row, 1, QTableWidgetItem("❌ Missing Ingredients"))
+                for col in range(2, 11):
+                    self.discount_table.setItem(row, col, QTableWidgetItem("N/A"))
+                return
+
+            total_cost = ingredient_cost * 1.5
+            original_price = total_cost * 1.4
+
+            # Calculate discounted prices
+            discount_10 = original_price * 0.9
+            discount_15 = original_price * 0.85
+            discount_20 = original_price * 0.8
+            discount_25 = original_price * 0.75
+            discount_30 = original_price * 0.7
+            discount_35 = original_price * 0.65
+            discount_40 = original_price * 0.6
+            discount_45 = original_price * 0.55
+            discount_50 = original_price * 0.5
+
+            # Populate table
+            self.discount_table.setItem(row, 0, QTableWidgetItem(recipe_name))
+            self.discount_table.setItem(row, 1, QTableWidgetItem(f"Rs.{original_price:.2f}"))
+            self.discount_table.setItem(row, 2, QTableWidgetItem(f"Rs.{discount_10:.2f}"))
+            self.discount_table.setItem(row, 3, QTableWidgetItem(f"Rs.{discount_15:.2f}"))
+            self.discount_table.setItem(row, 4, QTableWidgetItem(f"Rs.{discount_20:.2f}"))
+            self.discount_table.setItem(row, 5, QTableWidgetItem(f"Rs.{discount_25:.2f}"))
+            self.discount_table.setItem(row, 6, QTableWidgetItem(f"Rs.{discount_30:.2f}"))
+            self.discount_table.setItem(row, 7, QTableWidgetItem(f"Rs.{discount_35:.2f}"))
+            self.discount_table.setItem(row, 8, QTableWidgetItem(f"Rs.{discount_40:.2f}"))
+            self.discount_table.setItem(row, 9, QTableWidgetItem(f"Rs.{discount_45:.2f}"))
+            self.discount_table.setItem(row, 10, QTableWidgetItem(f"Rs.{discount_50:.2f}"))
 
         except Exception as e:
-            self.logger.error(f"Error populating discount analysis (no missing check): {e}")
+            self.logger.error(f"Error populating discount analysis row {row}: {e}")
+
+
+    def _costing_data_signature(self):
+        """Identity and version of the tables the costing engine was built from"""
+        return tuple(
+            (id(self.data.get(key)), len(self.data[key]) if key in self.data else 0, self.table_versions.get(key, 0))
+            for key in ('inventory', 'shopping_list', 'recipe_ingredients')
+        )
+
+    def get_costing_engine(self):
+        """Costing engine for the current data (rebuilt when the tables are replaced)"""
+        signature = self._costing_data_signature()
+        if getattr(self, '_costing_engine', None) is None or self._costing_signature != signature:
+            self._costing_engine = RecipeCostingEngine(self.data, self.ingredient_unit_prices)
+            self._costing_signature = signature
+        return self._costing_engine
+
+    def invalidate_costing_engine(self):
+        """Drop cached recipe costs so the next calculation sees edited prices"""
+        self._costing_engine = None
+        self.invalidate_price_lookups()
+
+    def invalidate_price_lookups(self):
+        """Drop this widget's cached inventory / shopping list price lookups"""
+        owner = id(self)
+        _price_lookup_cache().invalidate_where(lambda key: key[0] == owner)
+
+    def _cached_price_lookup(self, source, item_name, lookup):
+        """Memoize a per-ingredient price lookup until the price tables change"""
+        key = (id(self), self._costing_data_signature(), source, str(item_name).lower())
+        return _price_lookup_cache().get_or_compute(key, lambda: lookup(item_name))
+
+    def on_price_data_changed(self, data=None, tables=None):
+        """Recost only the recipes affected by edited prices and update them in place
+
+        ``data`` is the application's (re)loaded data and ``tables`` the
+        tables that changed. Edits to recipes or their ingredient lists still
+        rebuild everything.
+        """
+        try:
+            if data is not None:
+                self.data = data
+            tables = set(tables or self.PRICE_SOURCE_TABLES)
+            engine = getattr(self, '_costing_engine', None)
+            if tables & self.PRICE_SOURCE_TABLES:
+                self.invalidate_price_lookups()
+
+            if engine is None or not tables <= (self.PRICE_SOURCE_TABLES | self.PACKING_TABLES):
+                self.invalidate_costing_engine()
+                self.refresh_all_tables()
+                return
 
-    def calculate_ingredient_cost(self, recipe_id):
-        """Calculate total ingredient cost for a recipe using actual pricing data"""
+            changes = engine.refresh_prices(self.data) if tables & self.PRICE_SOURCE_TABLES else {}
+            packing_recipes = engine.refresh_packing(self.data) if tables & self.PACKING_TABLES else set()
+            self._costing_signature = self._costing_data_signature()
+
+            if not changes and not packing_recipes:
+                self.logger.debug("Price data changed without affecting any recipe cost")
+                return
+
+            self.logger.info(f"Recosting {len(changes)} recipes (ingredients) and {len(packing_recipes)} recipes (packaging)")
+            self.refresh_recipe_rows(recipe_ids=changes.keys(), recipe_names=packing_recipes)
+            if changes:
+                self.push_recipe_costs(changes)
+            self.update_overview_cards()
+
+        except Exception as e:
+            self.logger.error(f"Error applying price changes: {e}")
+
+    def refresh_recipe_rows(self, recipe_ids=(), recipe_names=()):
+        """Repopulate the table rows of the given recipes only"""
+        if 'recipes' not in self.data or self.data['recipes'].empty or not hasattr(self, 'cost_table'):
+            return
+
+        recipes_df = self.data['recipes']
+        keys = {costing_key(recipe_id) for recipe_id in recipe_ids}
+        names = set(recipe_names)
+        for row, (_, recipe) in enumerate(recipes_df.iterrows()):
+            if costing_key(recipe.get('recipe_id', row + 1)) in keys or recipe.get('recipe_name') in names:
+                self.populate_cost_row(row, recipe)
+                self.populate_pricing_strategy_row(row, recipe)
+                self.populate_profit_row(row, recipe)
+                self.populate_discount_row(row, recipe)
+
+    def push_recipe_costs(self, changes):
+        """Write recalculated recipe costs into the pricing data and pricing.csv"""
         try:
-            if 'recipe_ingredients' not in self.data:
-                return 0.0
+            if 'recipes' not in self.data or self.data['recipes'].empty:
+                return
 
-            recipe_ingredients = self.data['recipe_ingredients']
+            recipes_df = self.data['recipes']
+            new_costs = {}
+            for recipe_id, recipe_name in zip(recipes_df['recipe_id'], recipes_df['recipe_name']):
+                change = changes.get(costing_key(recipe_id))
+                if change is not None and change[1] is not None:
+                    new_costs[recipe_name] = change[1]
 
-            # Get ingredients for this recipe
-            recipe_items = recipe_ingredients[recipe_ingredients['recipe_id'] == recipe_id]
+            for recipe_name, cost in new_costs.items():
+                if recipe_name in self.recipe_pricing_data:
+                    self.recipe_pricing_data[recipe_name]['cost_of_making'] = cost
 
-            total_cost = 0.0
-            missing_ingredients = []
+            pricing_csv_path = os.path.join('data', 'pricing.csv')
+            if not new_costs or not os.path.exists(pricing_csv_path):
+                return
 
-            for _, ingredient in recipe_items.iterrows():
-                item_name = ingredient.get('item_name', '')
-                quantity = float(ingredient.get('quantity', 0))
-                unit = ingredient.get('unit', '')
+            pricing_df = pd.read_csv(pricing_csv_path)
+            rows = pricing_df['recipe_name'].isin(new_costs.keys())
+            if not rows.any():
+                return
 
-                # Get unit price from our pricing data
-                unit_price = self.get_ingredient_unit_price(item_name, unit)
+            other_charges = pd.to_numeric(pricing_df.loc[rows, 'other_charges'], errors='coerce').fillna(2.0) \
+                if 'other_charges' in pricing_df.columns else 2.0
+            total_costs = pricing_df.loc[rows, 'recipe_name'].map(new_costs) + other_charges
+            pricing_df.loc[rows, 'total_cost'] = total_costs.round(2)
+            pricing_df.loc[rows, 'cost_per_serving'] = total_costs.round(2)
+            pricing_df.loc[rows, 'last_calculated'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
 
-                if unit_price > 0:
-                    ingredient_cost = quantity * unit_price
-                    total_cost += ingredient_cost
-                    self.logger.debug(f"Recipe {recipe_id}: {item_name} = {quantity} {unit} × Rs.{unit_price} = Rs.{ingredient_cost:.4f}")
-                else:
-                    missing_ingredients.append({
-                        'item_name': item_name,
-                        'quantity': quantity,
-                        'unit': unit
-                    })
-                    self.logger.warning(f"Missing price for ingredient: {item_name}")
+            get_table_store('data').write('pricing', pricing_df)
+            if 'pricing' in self.data:
+                self.data['pricing'] = pricing_df
+            self.logger.info(f"Updated costs of {int(rows.sum())} recipes in {pricing_csv_path}")
 
-            if missing_ingredients:
-                self.logger.warning(f"Recipe {recipe_id} has {len(missing_ingredients)} missing ingredient prices")
-                # Return None to indicate incomplete pricing data
-                return None
+        except Exception as e:
+            self.logger.error(f"Error saving recalculated recipe costs: {e}")
 
-            return round(total_cost, 2)
+    def calculate_ingredient_cost(self, recipe_id):
+        """Calculate total ingredient cost for a recipe using actual pricing data"""
+        try:
+            if 'recipe_ingredients' not in self.data:
+                return 0.0
+
+            # All recipes are costed in one pass and cached until the data changes
+            return self.get_costing_engine().cost_for(recipe_id)
 
         except Exception as e:
             self.logger.error(f"Error calculating ingredient cost for recipe {recipe_id}: {e}")
@@ -1623,124 +1769,18 @@ class PricingManagementWidget(QWidget):
     def convert_units(self, quantity, from_unit, to_unit):
         """Convert quantity from one unit to another"""
         try:
-            # Normalize units to lowercase
-            from_unit = from_unit.lower().strip()
-            to_unit = to_unit.lower().strip()
-
-            # If units are the same, no conversion needed
-            if from_unit == to_unit:
-                return quantity
-
-            # Volume conversions
-            volume_conversions = {
-                ('ml', 'l'): 0.001,
-                ('l', 'ml'): 1000,
-                ('ml', 'liters'): 0.001,
-                ('liters', 'ml'): 1000,
-                ('ml', 'liter'): 0.001,
-                ('liter', 'ml'): 1000,
-            }
-
-            # Weight conversions
-            weight_conversions = {
-                ('grams', 'kg'): 0.001,
-                ('kg', 'grams'): 1000,
-                ('g', 'grams'): 1,  # Convert old 'g' to 'grams'
-                ('grams', 'g'): 1,  # Convert 'grams' to old 'g'
-                ('g', 'kg'): 0.001,  # Legacy support
-                ('kg', 'g'): 1000,  # Legacy support
-            }
-
-            # Special cooking unit conversions (approximate)
-            cooking_conversions = {
-                # Teaspoons and tablespoons to grams (approximate for spices)
-                ('tsp', 'grams'): 5,  # 1 tsp ≈ 5g for spices
-                ('tbsp', 'grams'): 15,  # 1 tbsp ≈ 15g for spices
-
-                # Units/pieces to grams (very approximate, depends on item)
-                ('units', 'grams'): 50,  # 1 unit ≈ 50g (average for vegetables)
-                ('pcs', 'grams'): 50,
-                ('pieces', 'grams'): 50,
-
-                # Leaves to grams
-                ('leaves', 'grams'): 1,  # 1 leaf ≈ 1g
-
-                # Legacy support for old units
-                ('tsp', 'g'): 5,
-                ('tbsp', 'g'): 15,
-                ('units', 'g'): 50,
-                ('pcs', 'g'): 50,
-                ('pieces', 'g'): 50,
-                ('leaves', 'g'): 1,
-
-                # Volume to weight conversions (for liquids, 1ml ≈ 1g)
-                ('ml', 'grams'): 1,
-                ('ml', 'g'): 1,
-                ('ml', 'gram'): 1,
-                ('grams', 'ml'): 1,
-                ('g', 'ml'): 1,
-                ('gram', 'ml'): 1,
-                ('l', 'grams'): 1000,
-                ('l', 'g'): 1000,
-                ('l', 'gram'): 1000,
-                ('grams', 'l'): 0.001,
-                ('g', 'l'): 0.001,
-                ('gram', 'l'): 0.001,
-                ('liters', 'grams'): 1000,
-                ('liters', 'g'): 1000,
-                ('liters', 'gram'): 1000,
-                ('grams', 'liters'): 0.001,
-                ('g', 'liters'): 0.001,
-                ('gram', 'liters'): 0.001,
-                ('liter', 'grams'): 1000,
-                ('liter', 'g'): 1000,
-                ('liter', 'gram'): 1000,
-                ('grams', 'liter'): 0.001,
-                ('g', 'liter'): 0.001,
-                ('gram', 'liter'): 0.001,
-
-                # Critical missing conversions that are causing the warnings
-                ('ml', 'kg'): 0.000001,  # 1ml = 0.000001kg (for liquids)
-                ('kg', 'ml'): 1000000,   # 1kg = 1000000ml (for liquids)
-            }
-
-            # Combine all conversions
-            all_conversions = {**volume_conversions, **weight_conversions, **cooking_conversions}
-
-            # Check for direct conversion
-            conversion_key = (from_unit, to_unit)
-            if conversion_key in all_conversions:
-                converted_quantity = quantity * all_conversions[conversion_key]
-                self.logger.debug(f"Converted {quantity} {from_unit} to {converted_quantity} {to_unit}")
-                return converted_quantity
-
-            # If no conversion found, use reasonable defaults based on unit types
-            if self.is_volume_unit(from_unit) and self.is_weight_unit(to_unit):
-                # Volume to weight: assume 1ml = 1g (for liquids)
-                self.logger.debug(f"Volume to weight conversion: {quantity} {from_unit} ≈ {quantity} {to_unit}")
-                return quantity
-            elif self.is_weight_unit(from_unit) and self.is_volume_unit(to_unit):
-                # Weight to volume: assume 1g = 1ml (for liquids)
-                self.logger.debug(f"Weight to volume conversion: {quantity} {from_unit} ≈ {quantity} {to_unit}")
-                return quantity
-            else:
-                # Last resort: 1:1 ratio
-                self.logger.warning(f"No conversion found from {from_unit} to {to_unit}, using 1:1 ratio")
-                return quantity
-
+            return unit_conversion.convert(quantity, from_unit, to_unit)
         except Exception as e:
             self.logger.error(f"Error converting units from {from_unit} to {to_unit}: {e}")
             return quantity
 
     def is_volume_unit(self, unit):
         """Check if unit is a volume unit"""
-        volume_units = ['ml', 'l', 'liters', 'liter']
-        return unit.lower() in volume_units
+        return unit_conversion.is_volume_unit(unit)
 
     def is_weight_unit(self, unit):
         """Check if unit is a weight unit"""
-        weight_units = ['grams', 'kg', 'g', 'gram', 'kilograms', 'kilogram']  # grams first as preferred
-        return unit.lower() in weight_units
+        return unit_conversion.is_weight_unit(unit)
 
     def store_missing_ingredients(self, recipe_id, missing_ingredients, found_ingredients=None):
         """Store missing ingredients for reporting"""
@@ -1781,6 +1821,9 @@ class PricingManagementWidget(QWidget):
 
     def get_ingredient_price_from_inventory_only(self, item_name):
         """Get ingredient price ONLY from inventory.csv - no other sources"""
+        return self._cached_price_lookup('inventory', item_name, self._lookup_inventory_price)
+
+    def _lookup_inventory_price(self, item_name):
         try:
             if 'inventory' not in self.data:
                 return None
@@ -1839,6 +1882,9 @@ class PricingManagementWidget(QWidget):
 
     def get_ingredient_price_from_shopping_list(self, item_name):
         """Get ingredient price from shopping list using average_price"""
+        return self._cached_price_lookup('shopping_list', item_name, self._lookup_shopping_list_price)
+
+    def _lookup_shopping_list_price(self, item_name):
         try:
             if 'shopping_list' not in self.data:
                 return None
@@ -2466,34 +2512,15 @@ class PricingManagementWidget(QWidget):
 
             recipes_df = self.data['recipes']
             total_recipes = len(recipes_df)
-            calculated_count = 0
-            missing_ingredients = set()
 
-            for _, recipe in recipes_df.iterrows():
-                recipe_id = recipe.get('recipe_id')
-                recipe_name = recipe.get('recipe_name', f'Recipe {recipe_id}')
-
-                try:
-                    # Calculate ingredient cost using actual pricing data
-                    ingredient_cost = self.calculate_ingredient_cost(recipe_id)
-
-                    if ingredient_cost is not None and ingredient_cost > 0:
-                        calculated_count += 1
-                        self.logger.info(f"Calculated cost for {recipe_name}: Rs.{ingredient_cost:.2f}")
-                    else:
-                        # Check for missing ingredient prices
-                        if 'recipe_ingredients' in self.data:
-                            recipe_items = self.data['recipe_ingredients'][
-                                self.data['recipe_ingredients']['recipe_id'] == recipe_id
-                            ]
-                            for _, ingredient in recipe_items.iterrows():
-                                item_name = ingredient.get('item_name', '')
-                                unit_price = self.get_ingredient_unit_price(item_name, ingredient.get('unit', ''))
-                                if unit_price == 0:
-                                    missing_ingredients.add(item_name)
-
-                except Exception as e:
-                    self.logger.error(f"Error calculating {recipe_name}: {e}")
+            # Cost every recipe in one pass against the current prices
+            self.invalidate_costing_engine()
+            engine = self.get_costing_engine()
+            recipe_ids = recipes_df['recipe_id'] if 'recipe_id' in recipes_df.columns else []
+            costs = [engine.cost_for(recipe_id) for recipe_id in recipe_ids]
+            calculated_count = sum(1 for cost in costs if cost is not None and cost > 0)
+            missing_ingredients = set(engine.missing_ingredients())
+            self.logger.info(f"Calculated ingredient costs for {calculated_count}/{total_recipes} recipes")
 
             # Refresh all tables
             self.refresh_all_tables()
@@ -2589,8 +2616,8 @@ class PricingManagementWidget(QWidget):
             for item in updated_items:
                 self.logger.info(f"Updated pricing for {item['name']}: {item['old_price']} -> {item['new_price']}")
 
-            # Refresh pricing data
-            self.load_data()
+            # Recost only the recipes using the edited items
+            self.on_price_data_changed(tables=self.PRICE_SOURCE_TABLES)
 
             notify_success("Success", f"Updated pricing for {len(updated_items)} items", parent=self)
 
@@ -3280,6 +3307,7 @@ class PricingManagementWidget(QWidget):
             # Save to the main pricing CSV file that the app loads from
             csv_path = os.path.join('data', 'pricing.csv')
             df.to_csv(csv_path, index=False)
+            table_saved(csv_path)
 
             # Also save to the backup file for compatibility
             backup_path = os.path.join('data', 'updated_pricing_data.csv')
@@ -3295,8 +3323,8 @@ class PricingManagementWidget(QWidget):
         try:
             if recipe_name in self.recipe_pricing_data:
                 data = self.recipe_pricing_data[recipe_name]
-                # Basic cost calculation - can be enhanced
-                base_cost = 10.0  # Default base cost
+                # Recalculated ingredient cost when known, otherwise a default base cost
+                base_cost = data.get('cost_of_making') or 10.0
                 other_charges = data.get('other_charges', 2.0)
                 return base_cost + other_charges
             return 10.0
@@ -0,0 +1,356 @@
+"""
+Recipe Costing Engine for Kitchen Dashboard
+Resolves ingredient prices and costs every recipe in one vectorized pass
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from modules.unit_conversion import convert_series
+
+
+def _numeric_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Numeric view of a column (all NaN when the column does not exist)"""
+    if column not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype='float64')
+    return pd.to_numeric(df[column], errors='coerce')
+
+
+def recipe_key(value):
+    """Make recipe ids comparable whether they were read as int, float or str"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class RecipeCostingEngine:
+    """
+    Costs all recipes from ``recipe_ingredients`` in a single pass.
+
+    Ingredient names are normalized once and resolved to a unit price with the
+    same precedence the pricing page always used: the built-in price table,
+    then inventory (exact name, then partial name), then the shopping list.
+    Per-ingredient costs are then a vectorized multiply and recipe totals a
+    groupby, so recalculating every recipe costs one merge instead of one
+    inventory scan per ingredient.
+    """
+
+    # Inventory / shopping prices above this are treated as bad data
+    MAX_UNIT_PRICE = 1000.0
+
+    def __init__(self, data: Dict[str, pd.DataFrame], static_unit_prices: Optional[Dict[str, float]] = None,
+                 convert_units: bool = True):
+        self.logger = logging.getLogger(__name__)
+        self.data = data
+        self.static_unit_prices = static_unit_prices or {}
+        self.convert_units = convert_units
+
+        self._inventory_index = self._build_price_index(data.get('inventory'), self._inventory_prices)
+        self._shopping_index = self._build_price_index(data.get('shopping_list'), self._shopping_prices)
+        self._resolved: Dict[str, Dict[str, Any]] = {}
+        self._ingredient_costs: Optional[pd.DataFrame] = None
+        self._recipe_costs: Optional[Dict[Any, Optional[float]]] = None
+        self._item_recipes: Optional[Dict[str, set]] = None
+
+    # ------------------------------------------------------------------
+    # Price index
+    # ------------------------------------------------------------------
+
+    def _build_price_index(self, df: Optional[pd.DataFrame], price_function) -> Dict[str, Any]:
+        """Lowercased name -> price (NaN = listed without a usable price) plus the row order for partial matches"""
+        if df is None or df.empty or 'item_name' not in df.columns:
+            return {'exact': {}, 'names': [], 'prices': [], 'units': {}}
+
+        names = df['item_name'].astype('string').str.lower()
+        prices = price_function(df).clip(upper=self.MAX_UNIT_PRICE)
+        units = df['unit'].astype('string') if 'unit' in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+
+        table = pd.DataFrame({'name': names, 'price': prices, 'unit': units}).dropna(subset=['name'])
+        first = table.drop_duplicates('name', keep='first')
+        return {
+            'exact': dict(zip(first['name'], first['price'])),
+            'names': table['name'].tolist(),
+            'prices': table['price'].tolist(),
+            'units': {name: (None if pd.isna(unit) else str(unit)) for name, unit in zip(first['name'], first['unit'])},
+        }
+
+    @staticmethod
+    def _inventory_prices(inventory: pd.DataFrame) -> pd.Series:
+        """Unit price per inventory row: avg_price, else price_per_unit (divided by quantity when it looks like a total)"""
+        avg_price = _numeric_column(inventory, 'avg_price')
+        price_per_unit = _numeric_column(inventory, 'price_per_unit')
+        quantity = _numeric_column(inventory, 'quantity').fillna(1.0)
+
+        looks_like_total = (price_per_unit > 100) & (quantity > 1)
+        price_per_unit = price_per_unit.where(~looks_like_total, price_per_unit / quantity)
+        return avg_price.where(avg_price.notna(), price_per_unit)
+
+    @staticmethod
+    def _shopping_prices(shopping: pd.DataFrame) -> pd.Series:
+        """Unit price per shopping row: avg_price, else current_price, else last_price per quantity"""
+        avg_price = _numeric_column(shopping, 'avg_price')
+        current_price = _numeric_column(shopping, 'current_price')
+        last_price = _numeric_column(shopping, 'last_price')
+        quantity = _numeric_column(shopping, 'quantity').fillna(1.0)
+
+        last_unit_price = last_price.where(~(quantity > 0), last_price / quantity)
+        price = avg_price.where(avg_price.notna(), current_price)
+        return price.where(price.notna(), last_unit_price)
+
+    @staticmethod
+    def _lookup(index: Dict[str, Any], key: str):
+        """Exact then partial (substring) match; returns (found, price, matched name)"""
+        if key in index['exact']:
+            return True, index['exact'][key], key
+        for name, price in zip(index['names'], index['prices']):
+            if key in name:
+                return True, price, name
+        return False, np.nan, None
+
+    def resolve(self, item_name: str) -> Dict[str, Any]:
+        """Resolve one (stripped) ingredient name to its unit price and price source"""
+        if item_name in self._resolved:
+            return self._resolved[item_name]
+
+        result = {'unit_price': 0.0, 'source': None, 'price_unit': None}
+        static_price = self.static_unit_prices.get(item_name, 0.0)
+        if static_price:
+            result.update(unit_price=float(static_price), source='static')
+        else:
+            key = item_name.lower()
+            found, price, matched = self._lookup(self._inventory_index, key)
+            if found and pd.notna(price):
+                result.update(unit_price=float(price), source='inventory',
+                              price_unit=self._inventory_index['units'].get(matched))
+            else:
+                found, price, _ = self._lookup(self._shopping_index, key)
+                if found and pd.notna(price):
+                    result.update(unit_price=float(price), source='shopping_list')
+
+        self._resolved[item_name] = result
+        return result
+
+    # ------------------------------------------------------------------
+    # Costing
+    # ------------------------------------------------------------------
+
+    def ingredient_costs(self) -> pd.DataFrame:
+        """Cost of every recipe_ingredients row (cost is NaN where the price is missing)"""
+        if self._ingredient_costs is not None:
+            return self._ingredient_costs
+
+        ingredients = self.data.get('recipe_ingredients')
+        if ingredients is None or ingredients.empty or 'recipe_id' not in ingredients.columns:
+            self._ingredient_costs = pd.DataFrame(columns=['recipe_key', 'item_name', 'clean_name', 'quantity', 'unit',
+                                                           'unit_price', 'price_unit', 'price_quantity', 'cost', 'missing'])
+            return self._ingredient_costs
+
+        names = ingredients['item_name'] if 'item_name' in ingredients.columns else pd.Series(np.nan, index=ingredients.index)
+        units = ingredients['unit'].fillna('').astype(str).str.strip() if 'unit' in ingredients.columns \
+            else pd.Series('', index=ingredients.index)
+
+        costs = pd.DataFrame({
+            'recipe_key': ingredients['recipe_id'].map(recipe_key),
+            'item_name': names,
+            'clean_name': names.where(names.isna(), names.astype(str).str.strip()),
+            'quantity': _numeric_column(ingredients, 'quantity').fillna(0.0),
+            'unit': units,
+        }).reset_index(drop=True)
+        self._price_rows(costs)
+
+        missing_names = sorted(costs.loc[costs['missing'], 'item_name'].dropna().astype(str).unique())
+        if missing_names:
+            self.logger.warning(f"Missing prices for {len(missing_names)} ingredients: {', '.join(missing_names[:10])}")
+
+        self._ingredient_costs = costs
+        return costs
+
+    def _price_rows(self, costs: pd.DataFrame, rows: Optional[pd.Series] = None):
+        """(Re)price the selected ingredient rows in place (all rows when ``rows`` is None)"""
+        selected = costs if rows is None else costs.loc[rows]
+        names = selected['clean_name']
+
+        # Resolve each distinct name once, then broadcast with a hash lookup
+        resolved = pd.DataFrame.from_dict(
+            {name: self.resolve(name) for name in names.dropna().unique()},
+            orient='index', columns=['unit_price', 'source', 'price_unit']
+        )
+        unit_prices = names.map(resolved['unit_price']).astype('float64').fillna(0.0)
+        price_units = names.map(resolved['price_unit']).astype(object)
+        quantities = selected['quantity']
+        if self.convert_units:
+            # Quantities in the unit the (inventory) price is quoted in
+            price_units = price_units.where(price_units.notna(), selected['unit'])
+            quantities = convert_series(quantities, selected['unit'], price_units)
+
+        missing = ~(unit_prices > 0)
+        columns = {
+            'unit_price': unit_prices,
+            'price_unit': price_units,
+            'price_quantity': quantities,
+            'missing': missing,
+            'cost': (quantities * unit_prices).where(~missing),
+        }
+        for column, values in columns.items():
+            if rows is None:
+                costs[column] = values
+            else:
+                costs.loc[rows, column] = values
+
+    @staticmethod
+    def _totals(costs: pd.DataFrame) -> Dict[Any, Optional[float]]:
+        """Recipe totals for a slice of the ingredient cost table"""
+        totals = costs.groupby('recipe_key', sort=False).agg(total=('cost', 'sum'), missing=('missing', 'sum'))
+        return {
+            key: (None if missing else round(float(total), 2))
+            for key, total, missing in totals.itertuples(name=None)
+        }
+
+    def recipe_costs(self) -> Dict[Any, Optional[float]]:
+        """Ingredient cost per recipe id (None when any ingredient has no price)"""
+        if self._recipe_costs is not None:
+            return self._recipe_costs
+
+        costs = self.ingredient_costs()
+        self._recipe_costs = self._totals(costs) if not costs.empty else {}
+        return self._recipe_costs
+
+    def cost_for(self, recipe_id) -> Optional[float]:
+        """Ingredient cost of one recipe (0.0 for recipes without ingredients)"""
+        return self.recipe_costs().get(recipe_key(recipe_id), 0.0)
+
+    def missing_ingredients(self, recipe_id=None) -> List[str]:
+        """Names of ingredients without a price, optionally for one recipe"""
+        costs = self.ingredient_costs()
+        missing = costs[costs['missing']]
+        if recipe_id is not None:
+            missing = missing[missing['recipe_key'] == recipe_key(recipe_id)]
+        return missing['item_name'].dropna().astype(str).unique().tolist()
+
+    # ------------------------------------------------------------------
+    # Dependencies and incremental recosting
+    # ------------------------------------------------------------------
+
+    def _item_recipe_index(self) -> Dict[str, set]:
+        """Reverse index: lowercased ingredient name -> recipe keys using it"""
+        if self._item_recipes is None:
+            costs = self.ingredient_costs()
+            named = costs.dropna(subset=['clean_name'])
+            self._item_recipes = {
+                name.lower(): set(keys)
+                for name, keys in named.groupby('clean_name', sort=False)['recipe_key']
+            } if not named.empty else {}
+        return self._item_recipes
+
+    def _affected_names(self, item_names) -> List[str]:
+        """Ingredient names whose price may come from any of the given inventory/shopping items
+
+        A price source matches an ingredient exactly or by containing its
+        name, so only ingredient names that are substrings of a changed item
+        can be affected.
+        """
+        changed = {str(name).strip().lower() for name in item_names if isinstance(name, str) and name.strip()}
+        return [name for name in self._item_recipe_index()
+                if any(name in item for item in changed)]
+
+    def recipes_using_item(self, item_name: str) -> set:
+        """Recipe keys whose cost depends on an inventory/shopping item"""
+        index = self._item_recipe_index()
+        recipes = set()
+        for name in self._affected_names([item_name]):
+            recipes |= index[name]
+        return recipes
+
+    def recost_items(self, item_names) -> Dict[Any, Tuple[Optional[float], Optional[float]]]:
+        """Recost only the recipes using the given items; returns {recipe key: (old cost, new cost)}"""
+        affected = set(self._affected_names(item_names))
+        if not affected:
+            return {}
+
+        costs = self.ingredient_costs()
+        old_costs = self.recipe_costs()
+        for name in list(self._resolved):
+            if name.lower() in affected:
+                del self._resolved[name]
+
+        rows = costs['clean_name'].str.lower().isin(affected).fillna(False).astype(bool)
+        self._price_rows(costs, rows)
+
+        keys = costs.loc[rows, 'recipe_key'].unique()
+        changes = {}
+        for key, new_cost in self._totals(costs[costs['recipe_key'].isin(keys)]).items():
+            old_cost = old_costs.get(key)
+            if old_cost != new_cost:
+                changes[key] = (old_cost, new_cost)
+            old_costs[key] = new_cost
+        return changes
+
+    def refresh_prices(self, data: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[Any, Tuple[Optional[float], Optional[float]]]:
+        """Pick up edited inventory / shopping prices and recost only the recipes that use them"""
+        if data is not None:
+            self.data = data
+
+        changed_items = set()
+        for attribute, table, price_function in (('_inventory_index', 'inventory', self._inventory_prices),
+                                                 ('_shopping_index', 'shopping_list', self._shopping_prices)):
+            old_index = getattr(self, attribute)
+            new_index = self._build_price_index(self.data.get(table), price_function)
+            changed_items |= {name for name, _, _ in _price_rows_set(old_index) ^ _price_rows_set(new_index)}
+            setattr(self, attribute, new_index)
+
+        return self.recost_items(changed_items)
+
+    # ------------------------------------------------------------------
+    # Packing materials
+    # ------------------------------------------------------------------
+
+    def _packing_rows(self) -> set:
+        """Rows of recipe_packing_materials as comparable tuples"""
+        return _row_set(self.data.get('recipe_packing_materials'),
+                        ['recipe_name', 'material_id', 'material_name', 'quantity_needed', 'cost_per_recipe'])
+
+    def recipes_using_material(self, material) -> set:
+        """Recipe names packed with a material (by id or name)"""
+        packing = self.data.get('recipe_packing_materials')
+        if packing is None or packing.empty or 'recipe_name' not in packing.columns:
+            return set()
+        matches = pd.Series(False, index=packing.index)
+        if 'material_name' in packing.columns:
+            matches |= packing['material_name'].astype(str).str.strip().str.lower() == str(material).strip().lower()
+        if 'material_id' in packing.columns:
+            matches |= packing['material_id'].map(recipe_key) == recipe_key(material)
+        return set(packing.loc[matches, 'recipe_name'].dropna())
+
+    def refresh_packing(self, data: Optional[Dict[str, pd.DataFrame]] = None) -> set:
+        """Pick up packing material edits; returns the names of recipes whose packaging changed"""
+        old_rows = self._packing_rows()
+        old_materials = _row_set(self.data.get('packing_materials'), ['material_id', 'material_name', 'cost_per_unit'])
+        if data is not None:
+            self.data = data
+
+        recipes = {row[0] for row in old_rows ^ self._packing_rows()}
+        new_materials = _row_set(self.data.get('packing_materials'), ['material_id', 'material_name', 'cost_per_unit'])
+        for material_id, material_name, _ in old_materials ^ new_materials:
+            recipes |= self.recipes_using_material(material_id) | self.recipes_using_material(material_name)
+        return {recipe for recipe in recipes if recipe is not None}
+
+
+def _price_rows_set(index: Dict[str, Any]) -> set:
+    """(name, price, unit) tuples of a price index with NaN made comparable"""
+    return {
+        (name, None if pd.isna(price) else float(price), index['units'].get(name))
+        for name, price in zip(index['names'], index['prices'])
+    }
+
+
+def _row_set(df: Optional[pd.DataFrame], columns: List[str]) -> set:
+    """Rows of selected columns as tuples with NaN made comparable"""
+    if df is None or df.empty:
+        return set()
+    frame = df.reindex(columns=columns).astype(object)
+    frame = frame.where(frame.notna(), None)
+    return set(frame.itertuples(index=False, name=None))
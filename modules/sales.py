@@ -7,10 +7,14 @@ from PySide6.QtGui import QColor, QFont
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from datetime import datetime, timedelta
+from datetime import datetime
 import calendar
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_store import get_table_store
+from modules.daily_cube import get_daily_cube, invalidate_cube, period_range, record_rows
+from modules.unit_conversion import conversion_factor
+from modules.table_watcher import table_saved
 
 
 class SalesWidget(QWidget):
@@ -22,7 +26,7 @@ class SalesWidget(QWidget):
     def __init__(self, data, inventory_widget=None, parent=None):
         super().__init__(parent)
         self.data = data
-        self.sales_df = data['sales'].copy()
+        self.sales_df = data['sales']
         self.inventory_widget = inventory_widget
 
         # Set up the main layout
@@ -140,49 +144,15 @@ class SalesWidget(QWidget):
         # Get selected period
         period = self.period_combo.currentText()
 
-        # Filter data based on selected period
-        today = datetime.now().date()
-        filtered_sales = self.sales_df.copy()
-
-        # Check if we have any data and if date column exists
-        if len(filtered_sales) > 0 and 'date' in filtered_sales.columns:
-            # Ensure date column is datetime type
-            if filtered_sales['date'].dtype == 'object':
-                try:
-                    filtered_sales['date'] = pd.to_datetime(
-                        filtered_sales['date'], errors='coerce')
-                except Exception as e:
-                    print(f"Error converting dates: {e}")
-
-            # Only apply date filters if we have datetime data
-            if pd.api.types.is_datetime64_any_dtype(filtered_sales['date']):
-                if period == "Today":
-                    filtered_sales = filtered_sales[filtered_sales['date'].dt.date == today]
-                elif period == "This Week":
-                    start_of_week = today - timedelta(days=today.weekday())
-                    filtered_sales = filtered_sales[filtered_sales['date'].dt.date >= start_of_week]
-                elif period == "This Month":
-                    filtered_sales = filtered_sales[
-                        (filtered_sales['date'].dt.month == today.month) &
-                        (filtered_sales['date'].dt.year == today.year)
-                    ]
-                elif period == "This Year":
-                    filtered_sales = filtered_sales[filtered_sales['date'].dt.year == today.year]
+        # Period totals come from the daily sales cube; only the rows listed below are filtered
+        sales_cube = get_daily_cube('sales')
+        start_date, end_date = period_range(period)
+        totals = sales_cube.totals(self.sales_df, start_date, end_date)
+        filtered_sales = sales_cube.rows(self.sales_df, start_date, end_date)
 
         # Calculate summary metrics
-        total_sales = len(filtered_sales)
-
-        # Check if total_amount column exists
-        if 'total_amount' in filtered_sales.columns:
-            total_revenue = filtered_sales['total_amount'].sum()
-        elif 'price' in filtered_sales.columns and 'quantity' in filtered_sales.columns:
-            # Calculate total_amount from price and quantity
-            filtered_sales['total_amount'] = filtered_sales['price'] * \
-                filtered_sales['quantity']
-            total_revenue = filtered_sales['total_amount'].sum()
-        else:
-            # If no price or quantity columns, use a default value
-            total_revenue = 0
+        total_sales = int(totals['count'])
+        total_revenue = totals['revenue']
 
         avg_sale_value = total_revenue / total_sales if total_sales > 0 else 0
 
@@ -361,6 +331,8 @@ class SalesWidget(QWidget):
 
                 # Save the updated sales data
                 self.sales_df.to_csv('data/sales.csv', index=False)
+                table_saved('data/sales.csv')
+                invalidate_cube('sales')
 
                 # Update the data in the main application
                 self.data['sales'] = self.sales_df
@@ -384,6 +356,7 @@ class SalesWidget(QWidget):
 
                             # Save updated sales_orders
                             self.data['sales_orders'].to_csv('data/sales_orders.csv', index=False)
+                            table_saved('data/sales_orders.csv')
                             print(f"✅ Also removed corresponding order from sales_orders for {item_name}")
                         else:
                             print(f"ℹ️ No matching order found in sales_orders for {item_name}")
@@ -451,6 +424,7 @@ class SalesWidget(QWidget):
                         inventory_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                       'data', 'inventory.csv')
                         self.data['inventory'].to_csv(inventory_file, index=False)
+                        table_saved(inventory_file)
 
                         print(f"✅ Inventory restoration completed for {recipe_name}")
                         return True
@@ -479,6 +453,7 @@ class SalesWidget(QWidget):
                     inventory_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                   'data', 'inventory.csv')
                     self.data['inventory'].to_csv(inventory_file, index=False)
+                    table_saved(inventory_file)
 
                     print(f"✅ Inventory restoration completed for {recipe_name} (old format)")
                     return True
@@ -1050,12 +1025,15 @@ class SalesWidget(QWidget):
 
         # Add to sales dataframe
         self.sales_df = pd.concat([self.sales_df, new_sale], ignore_index=True)
+        record_rows('sales', new_sale, self.sales_df)
 
         # Update data dictionary
         self.data['sales'] = self.sales_df
 
-        # Save to CSV
-        self.sales_df.to_csv('data/sales.csv', index=False)
+        # Append to the CSV journal (full rewrite only if the columns changed)
+        if not get_table_store('data').append('sales', new_sale):
+            self.sales_df.to_csv('data/sales.csv', index=False)
+            table_saved('data/sales.csv')
 
         # Update the main data structure
         self.data['sales'] = self.sales_df
@@ -1191,8 +1169,10 @@ class SalesWidget(QWidget):
             # Concatenate with existing orders
             self.data['sales_orders'] = pd.concat([sales_orders_df, new_order_df], ignore_index=True)
 
-            # Save to CSV
-            self.data['sales_orders'].to_csv('data/sales_orders.csv', index=False)
+            # Append to the CSV journal (full rewrite only if the columns changed)
+            if not get_table_store('data').append('sales_orders', new_order_df):
+                self.data['sales_orders'].to_csv('data/sales_orders.csv', index=False)
+                table_saved('data/sales_orders.csv')
 
             # Emit signal to refresh order management
             self.sale_added.emit()
@@ -1295,6 +1275,7 @@ class SalesWidget(QWidget):
                                                           'data', 'inventory.csv')
                             self.data['inventory'].to_csv(
                                 inventory_file, index=False)
+                            table_saved(inventory_file)
 
                             # Generate sale ID for logging
                             sale_id = len(self.sales_df) + 1 if hasattr(self, 'sales_df') else 1
@@ -1385,6 +1366,7 @@ class SalesWidget(QWidget):
                 inventory_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                               'data', 'inventory.csv')
                 self.data['inventory'].to_csv(inventory_file, index=False)
+                table_saved(inventory_file)
 
                 # Generate sale ID for logging
                 sale_id = len(self.sales_df) + 1 if hasattr(self, 'sales_df') else 1
@@ -1461,6 +1443,7 @@ class SalesWidget(QWidget):
                 inventory_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                               'data', 'inventory.csv')
                 self.data['inventory'].to_csv(inventory_file, index=False)
+                table_saved(inventory_file)
 
                 # Generate sale ID for logging
                 sale_id = len(self.sales_df) + 1 if hasattr(self, 'sales_df') else 1
@@ -1575,6 +1558,7 @@ class SalesWidget(QWidget):
                         items_file = os.path.join(os.path.dirname(os.path.dirname(
                             os.path.abspath(__file__))), 'data', 'items.csv')
                         self.data['items'].to_csv(items_file, index=False)
+                        table_saved(items_file)
                         print(
                             f"Added {item_name} to items database and saved to {items_file}")
                     except Exception as e:
@@ -1585,6 +1569,7 @@ class SalesWidget(QWidget):
                 inventory_file = os.path.join(os.path.dirname(os.path.dirname(
                     os.path.abspath(__file__))), 'data', 'inventory.csv')
                 inventory_df.to_csv(inventory_file, index=False)
+                table_saved(inventory_file)
                 print(f"Saved updated inventory to {inventory_file}")
             except Exception as e:
                 print(f"Error saving inventory: {e}")
@@ -1608,25 +1593,10 @@ class SalesWidget(QWidget):
 
         # Convert units if necessary
         if inv_unit_lower != unit_lower:
-            # Enhanced conversion for common units with more unit variations
-            if inv_unit_lower in ['kg', 'kilogram', 'kilograms'] and unit_lower in ['g', 'gram', 'grams']:
-                # Convert recipe grams to inventory kg
-                qty_to_deduct /= 1000  # Convert g to kg
-                print(
-                    f"Converting {quantity_to_deduct} {unit_lower} to {qty_to_deduct} {inv_unit_lower}")
-            elif inv_unit_lower in ['g', 'gram', 'grams'] and unit_lower in ['kg', 'kilogram', 'kilograms']:
-                # Convert recipe kg to inventory g
-                qty_to_deduct *= 1000  # Convert kg to g
-                print(
-                    f"Converting {quantity_to_deduct} {unit_lower} to {qty_to_deduct} {inv_unit_lower}")
-            elif inv_unit_lower in ['l', 'liter', 'liters', 'litre', 'litres'] and unit_lower in ['ml', 'milliliter', 'milliliters', 'millilitre', 'millilitres']:
-                # Convert recipe ml to inventory L
-                qty_to_deduct /= 1000  # Convert ml to L
-                print(
-                    f"Converting {quantity_to_deduct} {unit_lower} to {qty_to_deduct} {inv_unit_lower}")
-            elif inv_unit_lower in ['ml', 'milliliter', 'milliliters', 'millilitre', 'millilitres'] and unit_lower in ['l', 'liter', 'liters', 'litre', 'litres']:
-                # Convert recipe L to inventory ml
-                qty_to_deduct *= 1000  # Convert L to ml
+            factor = conversion_factor(unit_lower, inv_unit_lower, approximate=False)
+            if factor is not None:
+                # Same kind of unit (g/kg, ml/L, ...) - exact conversion
+                qty_to_deduct *= factor
                 print(
                     f"Converting {quantity_to_deduct} {unit_lower} to {qty_to_deduct} {inv_unit_lower}")
             else:
@@ -1677,6 +1647,7 @@ class SalesWidget(QWidget):
             inventory_file = os.path.join(os.path.dirname(os.path.dirname(
                 os.path.abspath(__file__))), 'data', 'inventory.csv')
             inventory_df.to_csv(inventory_file, index=False)
+            table_saved(inventory_file)
             print(f"Saved updated inventory to {inventory_file}")
         except Exception as e:
             print(f"Error saving inventory: {e}")
@@ -18,6 +18,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QScrollArea, QSizePolicy, QApplication)
 from PySide6.QtCore import Qt, QDate, Signal
 from PySide6.QtGui import QFont, QColor
+from modules.table_watcher import table_saved
 
 class SalesOrderDialog(QDialog):
     """Comprehensive order dialog with detailed cost breakdown"""
@@ -1245,10 +1246,13 @@ class SalesOrderManagementWidget(QWidget):
             new_df = pd.DataFrame([order_data])
             self.data['sales_orders'] = pd.concat([self.data['sales_orders'], new_df], ignore_index=True)
             
-            # Save to CSV
+            # Append the order to the CSV journal (full rewrite only if the columns changed)
             import os
+            from modules.table_store import get_table_store
             os.makedirs('data', exist_ok=True)
-            self.data['sales_orders'].to_csv('data/sales_orders.csv', index=False)
+            if not get_table_store('data').append('sales_orders', new_df):
+                self.data['sales_orders'].to_csv('data/sales_orders.csv', index=False)
+                table_saved('data/sales_orders.csv')
             
         except Exception as e:
             self.logger.error(f"Error saving order: {e}")
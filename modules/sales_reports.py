@@ -5,8 +5,10 @@ Handles Zomato and Swiggy sales tracking and reporting
 
 import logging
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.table_styling import apply_universal_column_resizing
+from modules.daily_cube import get_daily_cube, period_range, record_rows
+from modules.table_watcher import table_saved
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
                              QTableWidgetItem, QHeaderView, QLabel, QTabWidget,
                              QPushButton, QComboBox, QDateEdit, QGroupBox,
@@ -23,6 +25,12 @@ try:
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
+
+def platform_totals(sales_df, start_date=None, end_date=None):
+    """Sales cube measures per delivery platform for a period (sales without a platform are left out)"""
+    by_platform = get_daily_cube('sales').by(sales_df, 'platform', start_date, end_date)
+    return by_platform[by_platform.index != '']
+
 class SalesMetricsCard(QFrame):
     """Sales metrics display card"""
     
@@ -543,9 +551,11 @@ class SalesReportsWidget(QWidget):
             
             new_df = pd.DataFrame(processed_data)
             self.data['sales'] = pd.concat([self.data['sales'], new_df], ignore_index=True)
+            record_rows('sales', new_df, self.data['sales'])
             
             # Save to CSV
             self.data['sales'].to_csv('data/sales.csv', index=False)
+            table_saved('data/sales.csv')
             
         except Exception as e:
             self.logger.error(f"Error processing {platform} report: {e}")
@@ -559,15 +569,17 @@ class SalesReportsWidget(QWidget):
             
             sales_df = self.data['sales']
             
-            # Filter by selected period
+            # Overview cards read the period from the daily sales cube
             period = self.period_combo.currentText()
+            start_date, end_date = period_range(period)
+            by_platform = platform_totals(sales_df, start_date, end_date)
             filtered_df = self.filter_by_period(sales_df, period)
             
             # Update overview cards
-            total_sales = filtered_df['total'].sum() if 'total' in filtered_df.columns else 0
-            zomato_sales = filtered_df[filtered_df['platform'] == 'Zomato']['total'].sum() if 'platform' in filtered_df.columns else 0
-            swiggy_sales = filtered_df[filtered_df['platform'] == 'Swiggy']['total'].sum() if 'platform' in filtered_df.columns else 0
-            total_commission = filtered_df['commission'].sum() if 'commission' in filtered_df.columns else 0
+            total_sales = by_platform['total'].sum()
+            zomato_sales = by_platform['total'].get('Zomato', 0)
+            swiggy_sales = by_platform['total'].get('Swiggy', 0)
+            total_commission = by_platform['commission'].sum()
             
             self.total_sales_card.update_value(f"₹{total_sales:.2f}")
             self.zomato_sales_card.update_value(f"₹{zomato_sales:.2f}")
@@ -585,23 +597,9 @@ class SalesReportsWidget(QWidget):
         if df.empty or 'date' not in df.columns:
             return df
         
-        today = datetime.now()
-        
-        if period == "Today":
-            start_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == "This Week":
-            start_date = today - timedelta(days=today.weekday())
-        elif period == "This Month":
-            start_date = today.replace(day=1)
-        elif period == "This Year":
-            start_date = today.replace(month=1, day=1)
-        else:  # All Time
-            return df
-        
-        # Convert date column to datetime if it's not already
-        df['date'] = pd.to_datetime(df['date'])
-        
-        return df[df['date'] >= start_date]
+        # Sales dates were parsed when the daily cube took the rows in
+        start_date, end_date = period_range(period)
+        return get_daily_cube('sales').rows(df, start_date, end_date)
     
     def populate_sales_table(self, df):
         """Populate sales table with data"""
@@ -654,20 +652,16 @@ class SalesReportsWidget(QWidget):
             
             sales_df = self.data['sales']
             
-            # Filter by date range
-            sales_df['date'] = pd.to_datetime(sales_df['date'])
-            filtered_df = sales_df[
-                (sales_df['date'] >= pd.Timestamp(start_date)) &
-                (sales_df['date'] <= pd.Timestamp(end_date))
-            ]
+            # Totals for the date range come from the daily sales cube
+            by_platform = platform_totals(sales_df, start_date, end_date)
             
-            if filtered_df.empty:
+            if by_platform.empty:
                 return "No sales data found for the selected date range."
             
             # Generate summary
-            total_orders = len(filtered_df)
-            total_revenue = filtered_df['total'].sum()
-            total_commission = filtered_df['commission'].sum()
+            total_orders = int(by_platform['count'].sum())
+            total_revenue = by_platform['total'].sum()
+            total_commission = by_platform['commission'].sum()
             net_revenue = total_revenue - total_commission
             
             report = f"""
@@ -684,10 +678,9 @@ Platform Breakdown:
 """
             
             # Platform breakdown
-            for platform in filtered_df['platform'].unique():
-                platform_data = filtered_df[filtered_df['platform'] == platform]
-                platform_orders = len(platform_data)
-                platform_revenue = platform_data['total'].sum()
+            for platform, platform_data in by_platform.iterrows():
+                platform_orders = int(platform_data['count'])
+                platform_revenue = platform_data['total']
                 
                 report += f"\n{platform}:"
                 report += f"\n  Orders: {platform_orders}"
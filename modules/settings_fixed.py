@@ -19,6 +19,7 @@ from datetime import datetime
 import io
 import logging
 import json
+from modules.table_watcher import table_saved
 
 # Import Firebase integration if available
 try:
@@ -720,6 +721,7 @@ class SettingsWidget(QWidget):
                 for key, columns in empty_dataframes.items():
                     df = pd.DataFrame(columns=columns)
                     df.to_csv(os.path.join(data_dir, f'{key}.csv'), index=False)
+                    table_saved(os.path.join(data_dir, f'{key}.csv'))
                     self.data[key] = df
                 
                 QMessageBox.information(
@@ -1012,6 +1014,7 @@ class SettingsWidget(QWidget):
                     df = pd.DataFrame(columns=headers)
                     # Save to CSV
                     df.to_csv(filepath, index=False)
+                    table_saved(filepath)
                     
                     # Also update the data dictionary
                     key = os.path.splitext(filename)[0]  # Remove .csv extension
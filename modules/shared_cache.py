@@ -0,0 +1,249 @@
+"""
+Shared Cache for Kitchen Dashboard
+O(1) LRU cache with optional TTL, byte budgets and hit/miss/eviction statistics
+"""
+
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes"""
+    try:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=False).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=False))
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        if isinstance(value, (list, tuple, set)):
+            return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+        return sys.getsizeof(value)
+    except Exception:
+        return 0
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache.
+
+    Entries live in an OrderedDict, so lookups, inserts, refreshes and
+    evictions are all O(1). Entries can expire after ``ttl`` seconds (per
+    cache or per ``put``), and the cache can be bounded by entry count
+    (``max_size``) and/or approximate memory (``max_bytes``). Hits, misses,
+    evictions and expirations are counted; a ``monitor`` with
+    ``record_cache_hit`` / ``record_cache_miss`` / ``record_cache_eviction``
+    methods is told about each one as it happens.
+    """
+
+    def __init__(self, name: str = 'cache', max_size: Optional[int] = 1000, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizeof: Callable[[Any], int] = estimate_size, monitor=None):
+        self.name = name
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.monitor = monitor
+
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (value, expires_at, size)
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for ``key`` (refreshing its recency) or ``default``"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is _MISSING:
+            self._notify('record_cache_miss')
+            return default
+        self._notify('record_cache_hit')
+        return entry[0]
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Cached value for ``key``, computing and caching it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, ttl)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether ``key`` holds a live entry (does not count as a hit or refresh recency)"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            return entry is not _MISSING and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def size(self) -> int:
+        """Number of entries"""
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Cache ``value`` under ``key``, evicting least recently used entries past the limits"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never worth holding: it would evict everything else
+            self.invalidate(key)
+            return
+
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self.bytes += size
+            while self._entries and ((self.max_size is not None and len(self._entries) > self.max_size) or
+                                     (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted += 1
+            self.evictions += evicted
+        for _ in range(evicted):
+            self._notify('record_cache_eviction')
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one entry; returns whether it existed"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries now instead of on their next lookup"""
+        now = time.monotonic()
+        with self._lock:
+            keys = [key for key, (_, expires_at, _) in self._entries.items()
+                    if expires_at is not None and expires_at <= now]
+            for key in keys:
+                self._remove(key)
+            self.expirations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _notify(self, method: str):
+        if self.monitor is None:
+            return
+        try:
+            callback = getattr(self.monitor, method, None)
+            if callback is not None:
+                callback()
+        except Exception as e:
+            logger.debug(f"Cache monitor failed for {self.name}: {e}")
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and current occupancy"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_size': self.max_size,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hit_rate,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+# Named caches shared across modules
+_caches: Dict[str, LRUCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, **options) -> LRUCache:
+    """
+    Get the shared cache called ``name``, creating it with ``options``
+    (``max_size``, ``max_bytes``, ``ttl``, ``monitor``) on first use.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = LRUCache(name, **options)
+        return cache
+
+
+def cache_statistics() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every shared cache"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def clear_all_caches():
+    """Empty every shared cache"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
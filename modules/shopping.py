@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import os
+from modules.table_watcher import table_saved
 
 class ShoppingWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -327,6 +328,7 @@ class ShoppingWidget(QWidget):
 
             # Save to CSV
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Update inventory if the item exists there
             self.update_inventory_quantity(item_name, quantity, unit)
@@ -354,6 +356,7 @@ class ShoppingWidget(QWidget):
             
             # Save to CSV
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
             
             # Update the table
             self.update_shopping_list()
@@ -387,6 +390,7 @@ class ShoppingWidget(QWidget):
                 
                 # Save to CSV
                 self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+                table_saved('data/shopping_list.csv')
                 
                 # Update the table
                 self.update_shopping_list()
@@ -552,6 +556,7 @@ class ShoppingWidget(QWidget):
 
         # Save to CSV
         self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+        table_saved('data/shopping_list.csv')
 
         # Show success message
         QMessageBox.information(self, "Success", f"{item_name} added to the shopping list!")
@@ -713,6 +718,7 @@ class ShoppingWidget(QWidget):
             # Update data and save
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Refresh display
             self.update_shopping_list()
@@ -761,6 +767,7 @@ class ShoppingWidget(QWidget):
 
             # Save to CSV
             self.data['items'].to_csv('data/items.csv', index=False)
+            table_saved('data/items.csv')
 
             # Log the update
             print(f"Updated inventory: {item_name} from {current_quantity} to {new_quantity} {item_unit}")
@@ -801,10 +808,11 @@ class ShoppingWidget(QWidget):
             self.data['budget'] = budget_df
             budget_file = os.path.join('data', 'budget.csv')
             budget_df.to_csv(budget_file, index=False)
+            table_saved(budget_file)
 
             # Mark data as changed for auto-save
             if hasattr(self, 'main_app') and hasattr(self.main_app, 'mark_data_changed'):
-                self.main_app.mark_data_changed()
+                self.main_app.mark_data_changed('budget')
 
             print(f"Budget tracking updated: {category} category spent ₹{amount:.2f} for {item_name}")
 
@@ -865,6 +873,7 @@ class ShoppingWidget(QWidget):
         
         # Save to CSV
         self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+        table_saved('data/shopping_list.csv')
         
         # Show success message
         QMessageBox.information(self, "Success", f"{item_name} added to the shopping list!")
@@ -10,6 +10,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime, timedelta
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_watcher import table_saved
 
 class ShoppingWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -511,6 +512,7 @@ class ShoppingWidget(QWidget):
             # Save to CSV
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Update the inventory if the item exists there
             quantity = float(self.shopping_table.item(row, 2).text())
@@ -568,6 +570,7 @@ class ShoppingWidget(QWidget):
             # Save to CSV
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
             
             # Refresh the list
             self.update_shopping_list()
@@ -681,6 +684,7 @@ class ShoppingWidget(QWidget):
             # Save to CSV
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Refresh the list
             self.update_shopping_list()
@@ -716,6 +720,7 @@ class ShoppingWidget(QWidget):
                 # Save to CSV
                 self.data['shopping_list'] = self.shopping_df
                 self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+                table_saved('data/shopping_list.csv')
                 
                 # Refresh the list
                 self.update_shopping_list()
@@ -947,6 +952,7 @@ class ShoppingWidget(QWidget):
         
         # Save to CSV
         self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+        table_saved('data/shopping_list.csv')
         
         # Update table
         self.update_shopping_list()
@@ -997,6 +1003,7 @@ class ShoppingWidget(QWidget):
             
             # Save to CSV
             self.data['items'].to_csv('data/items.csv', index=False)
+            table_saved('data/items.csv')
             
             print(f"Added new item '{item_name}' to items database")
         
@@ -1029,6 +1036,7 @@ class ShoppingWidget(QWidget):
             
             # Save to CSV
             self.data['categories'].to_csv('data/categories.csv', index=False)
+            table_saved('data/categories.csv')
             
             print(f"Added new category '{category}' to categories database")
 
@@ -1179,6 +1187,7 @@ class ShoppingWidget(QWidget):
             # Update data dictionary and save
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Refresh the list
             self.update_shopping_list()
@@ -1559,6 +1568,7 @@ class ShoppingWidget(QWidget):
 
         # Save inventory to CSV
         self.data['inventory'].to_csv('data/inventory.csv', index=False)
+        table_saved('data/inventory.csv')
         print(f"Inventory saved to CSV with {len(self.data['inventory'])} items")
 
         # Trigger refresh of all tabs to reflect the changes
@@ -1674,6 +1684,7 @@ class ShoppingWidget(QWidget):
             # Update data and save
             self.data['shopping_list'] = self.shopping_df
             self.shopping_df.to_csv('data/shopping_list.csv', index=False)
+            table_saved('data/shopping_list.csv')
 
             # Refresh display
             self.update_shopping_list()
@@ -12,6 +12,7 @@ import csv
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+from modules.table_watcher import table_saved
 
 class ExpensesInventorySync:
     """Handles synchronization between expenses list and inventory"""
@@ -75,6 +76,7 @@ class ExpensesInventorySync:
             # Save updated inventory
             if results['updated_inventory'] > 0 or results['new_inventory_items'] > 0:
                 inventory_df.to_csv(self.inventory_file, index=False)
+                table_saved(self.inventory_file)
                 print(f"[SUCCESS] Inventory updated: {results['updated_inventory']} items updated, {results['new_inventory_items']} new items")
             
             return results
@@ -167,6 +169,7 @@ class ExpensesInventorySync:
                 
                 # Save updated shopping list
                 shopping_df.to_csv(self.shopping_file, index=False)
+                table_saved(self.shopping_file)
                 return True
                 
         except Exception as e:
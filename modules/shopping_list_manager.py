@@ -13,6 +13,7 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional
 from shopping_inventory_sync import ExpensesInventorySync
+from modules.table_watcher import table_saved
 
 class ExpensesListManager:
     """Manages expenses list operations and inventory integration"""
@@ -79,6 +80,7 @@ class ExpensesListManager:
             # Save updated expenses list
             if results['marked_purchased'] > 0:
                 shopping_df.to_csv(self.expenses_file, index=False)
+                table_saved(self.expenses_file)
                 print(f"💾 Updated expenses list with {results['marked_purchased']} purchased items")
                 
                 # Sync to inventory
@@ -111,6 +113,7 @@ class ExpensesListManager:
             shopping_df.loc[idx, 'current_price'] = 0.0
             
             shopping_df.to_csv(self.shopping_file, index=False)
+            table_saved(self.shopping_file)
             
             item_name = shopping_df.loc[idx, 'item_name']
             print(f"[SUCCESS] Marked as pending: {item_name}")
@@ -161,6 +164,7 @@ class ExpensesListManager:
             # Save updated shopping list
             if results['updated'] > 0:
                 shopping_df.to_csv(self.shopping_file, index=False)
+                table_saved(self.shopping_file)
                 print(f"💾 Updated {results['updated']} item dates to {today}")
         
         except Exception as e:
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Set
 from PySide6.QtCore import QObject, Signal, QTimer
 from PySide6.QtWidgets import QMessageBox
+from modules.table_watcher import table_saved
 
 # Import activity tracker
 try:
@@ -486,10 +487,12 @@ class SmartIngredientManager(QObject):
             if 'inventory' in self.data:
                 inventory_file = os.path.join(data_dir, 'inventory.csv')
                 self.data['inventory'].to_csv(inventory_file, index=False)
+                table_saved(inventory_file)
             
             if 'items' in self.data:
                 items_file = os.path.join(data_dir, 'items.csv')
                 self.data['items'].to_csv(items_file, index=False)
+                table_saved(items_file)
                 
         except Exception as e:
             self.logger.error(f"Error saving inventory data: {e}")
@@ -17,6 +17,7 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
 from PySide6.QtCore import Qt, QDate, Signal
 from PySide6.QtGui import QFont, QColor
 from modules.universal_table_widget import UniversalTableWidget
+from modules.table_watcher import table_saved
 
 class StaffManagementWidget(QWidget):
     """Main widget for staff management system"""
@@ -287,6 +288,7 @@ class StaffManagementWidget(QWidget):
             if 'staff' not in self.data or self.data['staff'].empty:
                 self.data['staff'] = pd.DataFrame(sample_staff)
                 self.data['staff'].to_csv('data/staff.csv', index=False)
+                table_saved('data/staff.csv')
 
             # Sample tasks with various scheduling patterns
             now = datetime.now()
@@ -371,6 +373,7 @@ class StaffManagementWidget(QWidget):
 
             # Save to CSV
             self.data['cleaning_maintenance'].to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
 
             # Refresh displays
             self.refresh_all_data()
@@ -538,6 +541,7 @@ class StaffManagementWidget(QWidget):
 
                         # Save to CSV
                         self.data['staff'].to_csv('data/staff.csv', index=False)
+                        table_saved('data/staff.csv')
 
                         # Refresh display
                         self.load_staff_data()
@@ -590,6 +594,7 @@ class StaffManagementWidget(QWidget):
 
             # Save to CSV
             tasks_df.to_csv('data/cleaning_maintenance.csv', index=False)
+            table_saved('data/cleaning_maintenance.csv')
 
             # Reload data and refresh displays
             self.load_task_assignments()
@@ -794,6 +799,7 @@ class StaffDialog(QDialog):
 
             # Save to CSV
             self.data['staff'].to_csv('data/staff.csv', index=False)
+            table_saved('data/staff.csv')
 
             super().accept()
 
@@ -1675,6 +1681,7 @@ class TaskAssignmentDialog(QDialog):
 
         # Save to CSV
         tasks_df.to_csv('data/cleaning_maintenance.csv', index=False)
+        table_saved('data/cleaning_maintenance.csv')
 
         # Update the data dictionary to ensure changes are reflected
         self.data['cleaning_maintenance'] = tasks_df
@@ -1754,6 +1761,7 @@ class TaskAssignmentDialog(QDialog):
 
         # Save to CSV
         tasks_df.to_csv('data/cleaning_maintenance.csv', index=False)
+        table_saved('data/cleaning_maintenance.csv')
 
         # Update the data dictionary to ensure changes are reflected
         self.data['cleaning_maintenance'] = tasks_df
@@ -2279,6 +2287,7 @@ class AutoSchedulingEngine:
             # Save to CSV
             assignments_file = 'data/generated_assignments.csv'
             assignments_df.to_csv(assignments_file, index=False)
+            table_saved(assignments_file)
 
             self.logger.info(f"Saved {len(assignments)} generated assignments to {assignments_file}")
 
@@ -2302,6 +2311,7 @@ class AutoSchedulingEngine:
 
             # Save filtered data
             filtered_df.to_csv(assignments_file, index=False)
+            table_saved(assignments_file)
 
             removed_count = len(assignments_df) - len(filtered_df)
             if removed_count > 0:
@@ -1,59 +1,16 @@
 """
 Kitchen Dashboard - Startup Loading Screen
-Professional loading screen with progress indicators during application initialization
+Professional loading screen that follows the real initialization phases and reports time-to-interactive
 """
 
 import sys
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QProgressBar, QApplication, QSplashScreen)
-from PySide6.QtCore import Qt, QTimer, Signal, QThread
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor, QLinearGradient, QBrush
-import time
 
-
-class LoadingWorker(QThread):
-    """Worker thread for handling loading operations with real initialization"""
-    progress_updated = Signal(int, str)
-    finished = Signal()
-    whatsapp_init_requested = Signal()  # Signal to request WhatsApp initialization
-
-    def __init__(self, main_app=None):
-        super().__init__()
-        self.main_app = main_app
-        self.loading_steps = [
-            (10, "Initializing application..."),
-            (20, "Loading configuration..."),
-            (30, "Setting up Firebase connection..."),
-            (40, "Initializing user interface..."),
-            (50, "Loading modules..."),
-            (60, "Setting up authentication..."),
-            (65, "Starting WhatsApp automation..."),
-            (70, "Connecting to WhatsApp Web..."),
-            (75, "Preparing data structures..."),
-            (80, "Finalizing setup..."),
-            (90, "Almost ready..."),
-            (100, "Application ready!")
-        ]
-
-    def run(self):
-        """Handle loading process with real initialization"""
-        for progress, message in self.loading_steps:
-            self.progress_updated.emit(progress, message)
-
-            # Handle specific initialization steps
-            if progress == 65 and message == "Starting WhatsApp automation...":
-                # Request WhatsApp initialization from main thread
-                self.whatsapp_init_requested.emit()
-                # Give more time for WhatsApp initialization
-                time.sleep(1.5)
-            elif progress == 70 and message == "Connecting to WhatsApp Web...":
-                # Additional time for WhatsApp connection
-                time.sleep(2.0)
-            else:
-                # Normal simulation timing
-                time.sleep(0.5)
-
-        self.finished.emit()
+# How long "Ready in X.Xs" stays up once the main window is interactive (milliseconds)
+READY_HOLD_MS = 600
 
 
 class StartupLoadingScreen(QSplashScreen):
@@ -75,13 +32,7 @@ class StartupLoadingScreen(QSplashScreen):
         # Initialize UI components
         self.setup_ui()
 
-        # Initialize worker thread
-        self.worker = LoadingWorker(main_app)
-        self.worker.progress_updated.connect(self.update_progress)
-        self.worker.finished.connect(self.on_loading_finished)
-        self.worker.whatsapp_init_requested.connect(self.handle_whatsapp_init)
-
-        # Start loading
+        # Show at once; the application reports progress through update_progress
         self.start_loading()
     
     def create_splash_pixmap(self):
@@ -164,37 +115,36 @@ class StartupLoadingScreen(QSplashScreen):
                         Qt.AlignRight | Qt.AlignVCenter, f"{self._progress_value}%")
     
     def start_loading(self):
-        """Start the loading process"""
+        """Show the splash screen before the main window is built"""
         self.show()
-        self.worker.start()
+        QApplication.processEvents()
     
     def update_progress(self, value, message):
         """Update progress bar and status message"""
         self.status_message = message
         self._progress_value = value
 
-        # Force repaint
+        # Initialization runs in the GUI thread, so paint now instead of waiting for the event loop
+        if not self.isVisible():
+            self.show()
         self.repaint()
-    
-    def handle_whatsapp_init(self):
-        """Handle WhatsApp initialization request from worker thread"""
-        try:
-            if self.main_app and hasattr(self.main_app, 'start_whatsapp_automation'):
-                # Start WhatsApp automation during loading
-                self.main_app.start_whatsapp_automation()
-        except Exception as e:
-            print(f"Error during WhatsApp initialization: {e}")
+        QApplication.processEvents()
 
-    def on_loading_finished(self):
-        """Handle loading completion"""
-        QTimer.singleShot(1000, self.finish_loading)  # Show "ready" for 1 second
+    def finish_loading(self, window=None, elapsed=None):
+        """Show how long startup took, then close over the main window and emit loading_finished"""
+        if elapsed is not None:
+            self.update_progress(100, f"Ready in {elapsed:.1f}s")
+        else:
+            self.update_progress(100, "Application ready!")
 
-    def finish_loading(self):
-        """Finish loading and emit signal"""
-        self.loading_finished.emit()
-        self.close()
-    
+        def close_screen():
+            if window is not None:
+                self.finish(window)
+            else:
+                self.close()
+            self.loading_finished.emit()
 
+        QTimer.singleShot(READY_HOLD_MS, close_screen)
 
 
 class SimpleLoadingDialog(QWidget):
@@ -266,25 +216,27 @@ class SimpleLoadingDialog(QWidget):
         """)
     
     def start_loading(self):
-        """Start loading simulation"""
-        self.worker = LoadingWorker()
-        self.worker.progress_updated.connect(self.update_progress)
-        self.worker.finished.connect(self.on_loading_finished)
-        self.worker.start()
+        """Show the dialog before the main window is built"""
+        self.show()
+        QApplication.processEvents()
     
     def update_progress(self, value, message):
         """Update progress"""
         self.progress_bar.setValue(value)
         self.status_label.setText(message)
+        if not self.isVisible():
+            self.show()
+        QApplication.processEvents()
     
-    def on_loading_finished(self):
-        """Handle loading completion"""
-        QTimer.singleShot(1000, self.finish_loading)
-    
-    def finish_loading(self):
-        """Finish loading"""
-        self.loading_finished.emit()
-        self.close()
+    def finish_loading(self, window=None, elapsed=None):
+        """Show how long startup took, then close"""
+        self.update_progress(100, f"Ready in {elapsed:.1f}s" if elapsed is not None else "Application ready!")
+
+        def close_dialog():
+            self.close()
+            self.loading_finished.emit()
+
+        QTimer.singleShot(READY_HOLD_MS, close_dialog)
 
 
 def show_startup_loading_screen(main_app=None):
@@ -306,5 +258,7 @@ if __name__ == "__main__":
     
     loading_screen = show_startup_loading_screen()
     loading_screen.loading_finished.connect(app.quit)
+    loading_screen.update_progress(50, "Loading modules...")
+    QTimer.singleShot(1000, lambda: loading_screen.finish_loading(elapsed=1.0))
     
     sys.exit(app.exec())
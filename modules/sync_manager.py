@@ -14,6 +14,30 @@ from PySide6.QtCore import QObject, Signal, QThread, QTimer
 from PySide6.QtWidgets import QApplication
 import logging
 
+from modules.cloud_delta_sync import (
+    WATERMARK_READS, WATERMARK_WRITES, publish_watermark, read_watermark, stable_record_ids, upload_delta,
+    watermark_ref
+)
+from modules.firestore_metering import QuotaPlanner, get_quota_meter
+from modules.firestore_serializer import METADATA_FIELDS, RECORD_HASH_FIELD, SYNC_TIMESTAMP_FIELD
+
+
+def server_time(value) -> Optional[datetime]:
+    """
+    A watermark time set by the Firestore server (datetime or ISO text).
+
+    None when missing or when it has no timezone: such values were taken
+    from an installation's own clock and cannot be compared across clients.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo is not None else None
+
 @dataclass
 class SyncMetadata:
     """Metadata for tracking sync state"""
@@ -22,6 +46,9 @@ class SyncMetadata:
     record_count: int
     file_size: int
     sync_direction: str  # 'upload', 'download', 'bidirectional'
+    file_mtime_ns: int = 0  # stat of the file the checksum was taken from
+    remote_version: int = 0  # watermark: last remote version seen by this installation
+    remote_updated_at: str = ''  # watermark: server time (ISO) that version was published
     
 @dataclass
 class ChangeDetectionResult:
@@ -71,11 +98,9 @@ class IntelligentSyncManager(QObject):
         self.active_operations: Dict[str, SyncOperation] = {}
         self.operation_history: List[SyncOperation] = []
         
-        # Firebase free tier limits
-        self.daily_read_limit = 50000
-        self.daily_write_limit = 20000
-        self.operation_counts = {'reads': 0, 'writes': 0}
-        self.last_reset_date = datetime.now().date()
+        # Firebase free tier: calls are metered on the Firestore client, syncs are planned against it
+        self.quota_meter = getattr(firebase_manager, 'quota_meter', None) or get_quota_meter(data_directory)
+        self.quota_planner = QuotaPlanner(self.quota_meter)
         
         # Load existing metadata
         self.load_sync_metadata()
@@ -94,10 +119,6 @@ class IntelligentSyncManager(QObject):
                     self.sync_metadata = {
                         k: SyncMetadata(**v) for k, v in data.get('metadata', {}).items()
                     }
-                    self.operation_counts = data.get('operation_counts', {'reads': 0, 'writes': 0})
-                    last_reset = data.get('last_reset_date')
-                    if last_reset:
-                        self.last_reset_date = datetime.fromisoformat(last_reset).date()
                         
                 self.logger.info(f"Loaded sync metadata for {len(self.sync_metadata)} data types")
             else:
@@ -113,48 +134,24 @@ class IntelligentSyncManager(QObject):
             os.makedirs(self.data_directory, exist_ok=True)
             
             data = {
-                'metadata': {k: asdict(v) for k, v in self.sync_metadata.items()},
-                'operation_counts': self.operation_counts,
-                'last_reset_date': self.last_reset_date.isoformat()
+                'metadata': {k: asdict(v) for k, v in self.sync_metadata.items()}
             }
             
             with open(self.metadata_file, 'w') as f:
                 json.dump(data, f, indent=2)
+            self.quota_meter.flush()
                 
         except Exception as e:
             self.logger.error(f"Error saving sync metadata: {e}")
     
-    def reset_daily_counts_if_needed(self):
-        """Reset daily operation counts if it's a new day"""
-        current_date = datetime.now().date()
-        if current_date > self.last_reset_date:
-            self.operation_counts = {'reads': 0, 'writes': 0}
-            self.last_reset_date = current_date
-            self.save_sync_metadata()
-            self.logger.info("Daily operation counts reset")
-    
     def check_daily_limits(self, operation_type: str, required_operations: int = 1) -> bool:
-        """Check if operation would exceed daily limits"""
-        self.reset_daily_counts_if_needed()
-        
-        if operation_type == 'read':
-            remaining = self.daily_read_limit - self.operation_counts['reads']
-            if required_operations > remaining:
-                self.daily_limit_warning.emit('read', self.operation_counts['reads'], self.daily_read_limit)
-                return False
-        elif operation_type == 'write':
-            remaining = self.daily_write_limit - self.operation_counts['writes']
-            if required_operations > remaining:
-                self.daily_limit_warning.emit('write', self.operation_counts['writes'], self.daily_write_limit)
-                return False
-        
+        """Check if operation would exceed what is left of today's quota"""
+        kind = operation_type + 's'
+        if not self.quota_planner.fits(**{kind: required_operations}):
+            self.daily_limit_warning.emit(operation_type, self.quota_meter.used(kind), self.quota_meter.limits[kind])
+            return False
         return True
     
-    def increment_operation_count(self, operation_type: str, count: int = 1):
-        """Increment operation count and save metadata"""
-        self.operation_counts[operation_type + 's'] += count
-        self.save_sync_metadata()
-    
     def calculate_data_checksum(self, data: pd.DataFrame) -> str:
         """Calculate checksum for data to detect changes"""
         try:
@@ -165,8 +162,22 @@ class IntelligentSyncManager(QObject):
             self.logger.error(f"Error calculating checksum: {e}")
             return ""
     
+    def calculate_file_checksum(self, file_path: str) -> Tuple[str, int]:
+        """md5 of a file's bytes and its number of data rows (lines after the header)"""
+        digest = hashlib.md5()
+        lines = 0
+        last_byte = b'\n'
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+                lines += chunk.count(b'\n')
+                last_byte = chunk[-1:]
+        if last_byte != b'\n':
+            lines += 1
+        return digest.hexdigest(), max(lines - 1, 0)
+
     def get_local_file_info(self, data_type: str) -> Optional[Dict[str, Any]]:
-        """Get local file information for change detection"""
+        """Get local file information for change detection (stat first, bytes hashed only when it changed)"""
         try:
             file_path = os.path.join(self.data_directory, f"{data_type}.csv")
             if not os.path.exists(file_path):
@@ -175,21 +186,42 @@ class IntelligentSyncManager(QObject):
             stat = os.stat(file_path)
             modified_time = datetime.fromtimestamp(stat.st_mtime)
             
-            # Read data and calculate checksum
-            df = pd.read_csv(file_path)
-            checksum = self.calculate_data_checksum(df)
+            stored = self.sync_metadata.get(data_type)
+            if stored and stored.file_mtime_ns == stat.st_mtime_ns and stored.file_size == stat.st_size:
+                checksum, record_count = stored.data_checksum, stored.record_count
+            else:
+                checksum, record_count = self.calculate_file_checksum(file_path)
             
             return {
                 'modified_time': modified_time.isoformat(),
                 'checksum': checksum,
-                'record_count': len(df),
-                'file_size': stat.st_size
+                'record_count': record_count,
+                'file_size': stat.st_size,
+                'file_mtime_ns': stat.st_mtime_ns
             }
             
         except Exception as e:
             self.logger.error(f"Error getting local file info for {data_type}: {e}")
             return None
     
+    def record_local_sync(self, data_type: str, direction: str, remote_version: int, remote_updated_at):
+        """Store the file checksum and remote watermark after a table was synced"""
+        if isinstance(remote_updated_at, datetime):
+            remote_updated_at = remote_updated_at.isoformat()
+        info = self.get_local_file_info(data_type) or {
+            'checksum': '', 'record_count': 0, 'file_size': 0, 'file_mtime_ns': 0
+        }
+        self.sync_metadata[data_type] = SyncMetadata(
+            last_sync_timestamp=datetime.now().isoformat(),
+            data_checksum=info['checksum'],
+            record_count=info['record_count'],
+            file_size=info['file_size'],
+            sync_direction=direction,
+            file_mtime_ns=info['file_mtime_ns'],
+            remote_version=remote_version,
+            remote_updated_at=remote_updated_at
+        )
+    
     def detect_local_changes(self, data_type: str) -> bool:
         """Detect if local data has changed since last sync"""
         try:
@@ -214,8 +246,31 @@ class IntelligentSyncManager(QObject):
             self.logger.error(f"Error detecting local changes for {data_type}: {e}")
             return False
     
+    def current_user_id(self) -> Optional[str]:
+        """User whose cloud collections are synced"""
+        user = self.firebase_manager.get_current_user() if self.firebase_manager else None
+        return user.get('user_id') if user else None
+    
+    def remote_watermark_ref(self, data_type: str):
+        """Firestore document holding a table's version, updated_at and recent deletes"""
+        return watermark_ref(self.firebase_manager.db, self.current_user_id(), data_type)
+    
+    def get_remote_watermark(self, data_type: str) -> Optional[Dict[str, Any]]:
+        """Read a table's watermark document (one read); None when the table was never uploaded"""
+        return read_watermark(self.firebase_manager.db, self.current_user_id(), data_type)
+    
+    def publish_remote_watermark(self, data_type: str, record_count: int,
+                                 deleted_ids: List[str]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Bump a table's remote version after an upload; returns the watermark
+        before the bump and the new one as stored (two reads, one write).
+        """
+        local = self.sync_metadata.get(data_type)
+        return publish_watermark(self.firebase_manager.db, self.current_user_id(), data_type, record_count,
+                                 deleted_ids, local.remote_version if local else 0)
+    
     def detect_remote_changes(self, data_type: str) -> Tuple[bool, Optional[str]]:
-        """Detect if remote data has changed since last sync"""
+        """Detect if remote data has changed since last sync (one read of the table's watermark)"""
         try:
             if not self.firebase_manager or not self.firebase_manager.is_authenticated():
                 return False, "Firebase not available"
@@ -224,11 +279,16 @@ class IntelligentSyncManager(QObject):
             if not self.check_daily_limits('read', 1):
                 return False, "Daily read limit reached"
             
-            # Get remote metadata (this would be a Firebase read operation)
-            # Implementation depends on your Firebase structure
-            # For now, return False to avoid Firebase calls during development
+            remote = self.get_remote_watermark(data_type)
+            if remote is None:
+                return False, None
             
-            self.increment_operation_count('read', 1)
+            local = self.sync_metadata.get(data_type)
+            seen_version = local.remote_version if local else 0
+            if int(remote.get('version', 0)) > seen_version:
+                self.logger.info(f"Remote changes detected for {data_type} "
+                                 f"(version {remote.get('version')} > {seen_version})")
+                return True, None
             return False, None
             
         except Exception as e:
@@ -253,16 +313,17 @@ class IntelligentSyncManager(QObject):
     
     def get_sync_status(self) -> Dict[str, Any]:
         """Get current sync status and statistics"""
-        self.reset_daily_counts_if_needed()
+        usage = self.quota_meter.usage()
         
         return {
             'firebase_available': self.firebase_manager is not None,
             'authenticated': self.firebase_manager.is_authenticated() if self.firebase_manager else False,
             'active_operations': len(self.active_operations),
-            'daily_reads': self.operation_counts['reads'],
-            'daily_writes': self.operation_counts['writes'],
-            'read_limit': self.daily_read_limit,
-            'write_limit': self.daily_write_limit,
+            'daily_reads': usage['reads'],
+            'daily_writes': usage['writes'],
+            'daily_deletes': usage['deletes'],
+            'read_limit': usage['limits']['reads'],
+            'write_limit': usage['limits']['writes'],
             'last_sync_times': {
                 data_type: metadata.last_sync_timestamp
                 for data_type, metadata in self.sync_metadata.items()
@@ -462,10 +523,6 @@ class SyncWorker(QThread):
             status = f"Uploading {data_type}..."
             self.progress_updated.emit(self.operation.operation_id, progress, status)
 
-            # Check daily limits
-            if not self.sync_manager.check_daily_limits('write', 10):  # Estimate 10 writes per data type
-                raise Exception("Daily write limit would be exceeded")
-
             # Load local data
             file_path = os.path.join(self.sync_manager.data_directory, f"{data_type}.csv")
             if not os.path.exists(file_path):
@@ -473,21 +530,9 @@ class SyncWorker(QThread):
 
             df = pd.read_csv(file_path)
 
-            # Upload to Firebase (simplified - actual implementation would use firebase_manager)
+            # Upload the changed rows and bump the table's remote watermark
             if self.sync_manager.firebase_manager:
-                # This would call the actual Firebase upload method
-                success = self._upload_data_to_firebase(data_type, df)
-                if success:
-                    # Update metadata
-                    checksum = self.sync_manager.calculate_data_checksum(df)
-                    self.sync_manager.sync_metadata[data_type] = SyncMetadata(
-                        last_sync_timestamp=datetime.now().isoformat(),
-                        data_checksum=checksum,
-                        record_count=len(df),
-                        file_size=os.path.getsize(file_path),
-                        sync_direction='upload'
-                    )
-                    self.sync_manager.increment_operation_count('write', 10)  # Estimate
+                self._upload_data_to_firebase(data_type, df)
 
             self.operation.completed_operations += 1
 
@@ -505,29 +550,18 @@ class SyncWorker(QThread):
             status = f"Downloading {data_type}..."
             self.progress_updated.emit(self.operation.operation_id, progress, status)
 
-            # Check daily limits
-            if not self.sync_manager.check_daily_limits('read', 5):  # Estimate 5 reads per data type
-                raise Exception("Daily read limit would be exceeded")
-
-            # Download from Firebase (simplified)
+            # Download documents newer than the local watermark
             if self.sync_manager.firebase_manager:
-                df = self._download_data_from_firebase(data_type)
+                df, watermark = self._download_data_from_firebase(data_type)
                 if df is not None:
                     # Save to local file
                     file_path = os.path.join(self.sync_manager.data_directory, f"{data_type}.csv")
                     os.makedirs(self.sync_manager.data_directory, exist_ok=True)
                     df.to_csv(file_path, index=False)
 
-                    # Update metadata
-                    checksum = self.sync_manager.calculate_data_checksum(df)
-                    self.sync_manager.sync_metadata[data_type] = SyncMetadata(
-                        last_sync_timestamp=datetime.now().isoformat(),
-                        data_checksum=checksum,
-                        record_count=len(df),
-                        file_size=os.path.getsize(file_path),
-                        sync_direction='download'
-                    )
-                    self.sync_manager.increment_operation_count('read', 5)  # Estimate
+                if watermark is not None:
+                    self.sync_manager.record_local_sync(data_type, 'download', int(watermark.get('version', 0)),
+                                                        watermark.get('updated_at', ''))
 
             self.operation.completed_operations += 1
 
@@ -536,30 +570,139 @@ class SyncWorker(QThread):
         self.sync_manager.save_sync_metadata()
 
     def _upload_data_to_firebase(self, data_type: str, df: pd.DataFrame) -> bool:
-        """Upload data to Firebase (placeholder implementation)"""
-        try:
-            # This would use the actual Firebase manager to upload data
-            # For now, just simulate the operation
-            QApplication.processEvents()  # Allow UI updates
-            self.msleep(100)  # Simulate network delay
+        """Upload rows changed since the last sync, then publish the table's new watermark"""
+        manager = self.sync_manager
+        firebase_manager = manager.firebase_manager
+        user_id = manager.current_user_id()
+
+        # Records are stamped with the server's commit time, not this machine's clock
+        delta = firebase_manager.upload_manifest.plan(user_id, data_type, df)
+        if delta.write_count == 0:
+            local = manager.sync_metadata.get(data_type)
+            manager.record_local_sync(data_type, 'upload', local.remote_version if local else 0,
+                                      local.remote_updated_at if local else '')
             return True
-        except Exception as e:
-            self.logger.error(f"Error uploading {data_type}: {e}")
-            return False
 
-    def _download_data_from_firebase(self, data_type: str) -> Optional[pd.DataFrame]:
-        """Download data from Firebase (placeholder implementation)"""
-        try:
-            # This would use the actual Firebase manager to download data
-            # For now, just simulate the operation
-            QApplication.processEvents()  # Allow UI updates
-            self.msleep(100)  # Simulate network delay
+        # Changed rows plus the watermark (two reads, one write), trimmed to today's quota
+        plan = manager.quota_planner.plan_upload([delta], reads_per_table=WATERMARK_READS,
+                                                 writes_per_table=WATERMARK_WRITES)
+        if not plan.deltas:
+            manager.check_daily_limits('write', delta.write_count + WATERMARK_WRITES)
+            raise Exception("Daily write limit would be exceeded")
+        delta = plan.deltas[0]
+
+        local = manager.sync_metadata.get(data_type)
+        seen_version = local.remote_version if local else 0
+        seen_updated_at = local.remote_updated_at if local else ''
+        with manager.quota_meter.operation('sync_upload'):
+            written = upload_delta(firebase_manager.db, user_id, delta, firebase_manager.upload_manifest,
+                                   firebase_manager.batch_size)
+            remote, watermark = manager.publish_remote_watermark(data_type, len(df), delta.deletes)
+        if int((remote or {}).get('version', 0)) <= seen_version:
+            manager.record_local_sync(data_type, 'upload', watermark['version'], watermark['updated_at'])
+        else:
+            # Another installation uploaded rows this one has not downloaded yet: keep the
+            # old watermark so the next check reports the change and fetches them
+            manager.record_local_sync(data_type, 'upload', seen_version, seen_updated_at)
+        if not plan.complete:
+            # Keep the table marked as changed so the deferred rows go up with the next sync
+            local = manager.sync_metadata[data_type]
+            local.data_checksum, local.file_mtime_ns = '', 0
+            self.logger.warning(f"Uploaded {data_type} partially: {plan.deferred[data_type]} operations "
+                                f"deferred by the daily quota")
+        self.logger.info(f"Uploaded {data_type}: {written} writes, remote version {watermark['version']}")
+        return True
 
-            # Return empty DataFrame as placeholder
-            return pd.DataFrame()
-        except Exception as e:
-            self.logger.error(f"Error downloading {data_type}: {e}")
-            return None
+    def _download_data_from_firebase(self, data_type: str) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """
+        Fetch documents newer than the local watermark and merge them into the local table.
+
+        Returns the merged table (None when nothing changed) and the remote watermark.
+        """
+        manager = self.sync_manager
+        firebase_manager = manager.firebase_manager
+        user_id = manager.current_user_id()
+
+        if not manager.check_daily_limits('read', 1):
+            raise Exception("Daily read limit would be exceeded")
+        with manager.quota_meter.operation('sync_download'):
+            remote = manager.get_remote_watermark(data_type)
+        if remote is None:
+            return None, None
+
+        local = manager.sync_metadata.get(data_type)
+        if local and int(remote.get('version', 0)) <= local.remote_version:
+            return None, remote
+
+        # Incremental unless this installation is older than the retained deletes.
+        # Both sides of the comparison are server times, so client clocks never matter.
+        file_path = os.path.join(manager.data_directory, f"{data_type}.csv")
+        since = server_time(local.remote_updated_at) if local else None
+        seen_version = local.remote_version if local else 0
+        tombstones_since = remote.get('tombstones_since', 0)
+        full = (since is None or not isinstance(tombstones_since, int) or seen_version < tombstones_since
+                or not os.path.exists(file_path))
+
+        collection = firebase_manager.db.collection('users').document(user_id).collection(data_type)
+        query = collection if full else collection.where(SYNC_TIMESTAMP_FIELD, '>', since)
+        if not manager.check_daily_limits('read', remote.get('record_count', 0) if full else 1):
+            raise Exception("Daily read limit would be exceeded")
+
+        doc_ids, records, hashes = [], [], {}
+        with manager.quota_meter.operation('sync_download'):
+            for doc in query.stream():
+                doc_data = doc.to_dict()
+                hashes[doc.id] = doc_data.get(RECORD_HASH_FIELD)
+                for field in METADATA_FIELDS:
+                    doc_data.pop(field, None)
+                doc_ids.append(doc.id)
+                records.append(doc_data)
+
+        changed = pd.DataFrame(records, index=pd.Index(doc_ids, dtype=object))
+        deleted = [] if full else [entry['id'] for entry in remote.get('deleted', [])
+                                   if entry.get('version', 0) > seen_version]
+        local_df = None if full else pd.read_csv(file_path)
+        merged = merge_remote_rows(local_df, changed, deleted)
+
+        # The downloaded rows are already in the cloud, so they must not be uploaded again
+        if full:
+            firebase_manager.upload_manifest.forget(user_id, [data_type])
+        firebase_manager.upload_manifest.record(user_id, data_type, hashes, deleted)
+
+        self.logger.info(f"Downloaded {data_type}: {len(records)} changed, {len(deleted)} deleted"
+                         f"{' (full download)' if full else ''}")
+        return merged, remote
+
+
+def merge_remote_rows(local_df: Optional[pd.DataFrame], changed: pd.DataFrame, deleted_ids: List[str]) -> pd.DataFrame:
+    """
+    Apply downloaded documents (indexed by document ID) and deletes to a local table.
+
+    Local rows are matched by their stable record IDs; changed rows are
+    replaced in place and new rows appended. Without a local table the
+    downloaded documents are the table.
+    """
+    if local_df is None:
+        return changed.reset_index(drop=True)
+
+    merged = local_df.astype(object).set_axis(stable_record_ids(local_df))
+    if deleted_ids:
+        merged = merged[~merged.index.isin(deleted_ids)]
+    if changed.empty:
+        return merged.reset_index(drop=True)
+
+    for column in changed.columns:
+        if column not in merged.columns:
+            merged[column] = None
+
+    existing = changed.index[changed.index.isin(merged.index)]
+    if len(existing):
+        merged.loc[existing, list(changed.columns)] = changed.loc[existing, list(changed.columns)].astype(object)
+
+    added = changed[~changed.index.isin(merged.index)]
+    if len(added):
+        merged = pd.concat([merged, added.reindex(columns=merged.columns)])
+    return merged.reset_index(drop=True)
 
 
 class ChangeCheckWorker(QThread):
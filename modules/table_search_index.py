@@ -0,0 +1,157 @@
+"""
+Table Search Index for Kitchen Dashboard
+Prebuilt text, date and category indexes that turn table filters into mask lookups
+"""
+
+import itertools
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from modules.shared_cache import get_cache
+
+# Column-name keywords that mark the filterable columns (same lists the table widget uses)
+DATE_KEYWORDS = ['date', 'time', 'created', 'updated', 'due', 'completed']
+CATEGORY_KEYWORDS = ['category', 'status', 'type', 'priority', 'level']
+
+# Separates cells and rows in the text buffer so a match never spans two cells
+# (the single-line search box cannot produce it)
+CELL_SEPARATOR = '\n'
+
+# Search masks of every table share one cache, bounded by memory
+SEARCH_CACHE_BYTES = 16 * 1024 * 1024
+
+# Each build gets a fresh generation so cached masks of replaced data are never reused
+_generations = itertools.count()
+
+
+class TableSearchIndex:
+    """
+    Filter index over one DataFrame, built once per data load.
+
+    Every cell is lowercased once and packed into a single UTF-8 byte buffer
+    with a separator between cells. A search finds the positions of the
+    query's rarest byte and narrows them by comparing the remaining bytes at
+    fixed offsets, so each keystroke is a handful of NumPy comparisons instead
+    of ``astype(str).str.lower().str.contains`` on every column. Date columns
+    are parsed and category columns factorized up front, so the date and
+    category filters are plain array comparisons. Filters return boolean masks
+    aligned with the DataFrame's rows; nothing is copied. Recent search masks
+    are kept in the shared ``table_search`` cache, so retyping or deleting
+    back to an earlier query is a lookup.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        self.logger = logging.getLogger(__name__)
+        self.row_count = 0
+        self._buffer = np.zeros(0, dtype=np.uint8)
+        self._row_starts = np.zeros(0, dtype=np.int64)
+        self._byte_counts = np.zeros(256, dtype=np.int64)
+        self._dates = None
+        self.date_column = None
+        self._categories: Dict[str, tuple] = {}
+        self._generation = next(_generations)
+        if df is not None:
+            self.build(df)
+
+    def build(self, df: pd.DataFrame):
+        """Index ``df`` (called whenever the table's data is loaded or replaced)"""
+        self.row_count = len(df)
+        self._generation = next(_generations)
+        self._build_text(df)
+        self._build_dates(df)
+        self._build_categories(df)
+
+    def _build_text(self, df: pd.DataFrame):
+        if self.row_count == 0 or len(df.columns) == 0:
+            self._buffer = np.zeros(0, dtype=np.uint8)
+            self._row_starts = np.zeros(self.row_count, dtype=np.int64)
+            self._byte_counts = np.zeros(256, dtype=np.int64)
+            return
+
+        # Cells are matched as their str() form, like the old per-column contains();
+        # missing cells (NaN, None, NaT) are blank so they never match 'nan' or 'none'
+        row_text = None
+        for column in df.columns:
+            values = df[column]
+            cells = values.astype(object).where(values.notna(), '').astype(str)
+            cells = cells.str.lower().str.replace(CELL_SEPARATOR, '', regex=False).to_numpy(dtype=object)
+            row_text = cells if row_text is None else row_text + CELL_SEPARATOR + cells
+        encoded = [(text + CELL_SEPARATOR).encode('utf-8') for text in row_text]
+
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        self._row_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        self._buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        self._byte_counts = np.bincount(self._buffer, minlength=256)
+
+    def _build_dates(self, df: pd.DataFrame):
+        self._dates = None
+        self.date_column = None
+        for column in df.columns:
+            if any(keyword in str(column).lower() for keyword in DATE_KEYWORDS):
+                dates = pd.to_datetime(df[column], errors='coerce')
+                if isinstance(dates.dtype, pd.DatetimeTZDtype):
+                    dates = dates.dt.tz_localize(None)
+                self._dates = dates.dt.normalize().to_numpy(dtype='datetime64[ns]')
+                self.date_column = column
+                break
+
+    def _build_categories(self, df: pd.DataFrame):
+        self._categories = {}
+        for column in df.columns:
+            if any(keyword in str(column).lower() for keyword in CATEGORY_KEYWORDS):
+                codes, uniques = pd.factorize(df[column].astype(str))
+                self._categories[column] = (codes, {value: code for code, value in enumerate(uniques)})
+
+    @property
+    def category_columns(self) -> Sequence[str]:
+        """Category columns in table order"""
+        return list(self._categories)
+
+    def search(self, text: str) -> np.ndarray:
+        """Rows with a cell containing ``text`` (case-insensitive, literal)"""
+        query = text.lower().replace(CELL_SEPARATOR, '')
+        if not query:
+            return np.ones(self.row_count, dtype=bool)
+
+        cache = get_cache('table_search', max_size=None, max_bytes=SEARCH_CACHE_BYTES)
+        key = (self._generation, query)
+        cached_mask = cache.get(key)
+        if cached_mask is not None:
+            return cached_mask.copy()
+
+        pattern = np.frombuffer(query.encode('utf-8'), dtype=np.uint8)
+        mask = np.zeros(self.row_count, dtype=bool)
+        last_start = len(self._buffer) - len(pattern)
+        if last_start >= 0:
+            # Anchor on the rarest byte of the query, then check the others at their offsets
+            anchor = int(np.argmin(self._byte_counts[pattern]))
+            positions = np.flatnonzero(self._buffer == pattern[anchor]) - anchor
+            positions = positions[(positions >= 0) & (positions <= last_start)]
+            for offset in np.argsort(self._byte_counts[pattern], kind='stable'):
+                if offset == anchor or len(positions) == 0:
+                    continue
+                positions = positions[self._buffer[positions + offset] == pattern[offset]]
+            if len(positions):
+                mask[np.searchsorted(self._row_starts, positions, side='right') - 1] = True
+
+        cache.put(key, mask)
+        return mask.copy()
+
+    def date_range(self, date_from, date_to) -> Optional[np.ndarray]:
+        """Rows whose date falls in [date_from, date_to] or is missing; None without a date column"""
+        if self._dates is None:
+            return None
+        start = np.datetime64(pd.Timestamp(date_from), 'ns')
+        end = np.datetime64(pd.Timestamp(date_to), 'ns')
+        return ((self._dates >= start) & (self._dates <= end)) | np.isnat(self._dates)
+
+    def category(self, column: str, value: str) -> np.ndarray:
+        """Rows where ``column`` (as text) equals ``value``"""
+        codes, lookup = self._categories[column]
+        code = lookup.get(value)
+        if code is None:
+            return np.zeros(self.row_count, dtype=bool)
+        return codes == code
@@ -0,0 +1,492 @@
+"""
+Table Store for Kitchen Dashboard
+Typed columnar cache behind the CSV data tables with column-selective reads
+"""
+
+import io
+import os
+import csv
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Any
+
+import pandas as pd
+
+# Parquet is optional - without pyarrow the store keeps dtypes with pickle files
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# High-frequency tables written with append() instead of full rewrites
+JOURNAL_TABLES = ('sales', 'sales_orders', 'waste', 'packing_materials_usage_history')
+
+# Columns parsed as datetimes whenever a table is read from its CSV file
+DATE_COLUMNS = {
+    'budget': ['date'],
+    'sales': ['date'],
+    'waste': ['date'],
+    'cleaning_maintenance': ['last_completed', 'next_due'],
+    'inventory': ['expiry_date'],
+}
+
+
+class TableStore:
+    """
+    Storage abstraction for the dashboard tables.
+
+    The CSV files in the data directory stay the source of truth (other
+    modules and users edit them directly), while a typed binary copy of every
+    table is kept in ``<data_dir>/.store``. A table is read from the binary
+    copy as long as its CSV has not changed since the copy was written, so
+    dtypes (including datetimes) survive and CSV parsing happens once per edit
+    instead of once per reload.
+
+    Rows added with ``append`` go to the end of the CSV file, which acts as an
+    append-only journal: a read replays just the rows after the last compacted
+    offset on top of the binary copy, and the copy is re-compacted once the
+    journal tail grows past ``COMPACT_THRESHOLD`` rows. Once the CSV bytes
+    before the offset were verified, the verification and the parsed tail
+    are remembered per CSV signature, and appends made through the store
+    carry the verification forward, so an append followed by a read does not
+    rehash the file.
+    """
+
+    STORE_DIRNAME = '.store'
+    MANIFEST_FILENAME = 'manifest.json'
+    COMPACT_THRESHOLD = 1000
+    DIGEST_CHUNK_BYTES = 1 << 20
+
+    def __init__(self, data_dir: str = 'data', backend: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.data_dir = data_dir
+        self.store_dir = os.path.join(data_dir, self.STORE_DIRNAME)
+        self.manifest_file = os.path.join(self.store_dir, self.MANIFEST_FILENAME)
+
+        if backend is None:
+            backend = 'parquet' if PYARROW_AVAILABLE else 'pickle'
+        if backend == 'parquet' and not PYARROW_AVAILABLE:
+            self.logger.warning("pyarrow not available - falling back to pickle table store")
+            backend = 'pickle'
+        self.backend = backend
+
+        self._lock = threading.RLock()
+        self._table_locks: Dict[str, threading.RLock] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+
+        # Per table: CSV signature whose bytes before the compacted offset were
+        # verified, with the parsed journal tail (None until parsed) and its row count
+        self._journal: Dict[str, Dict[str, Any]] = {}
+
+        # Callables notified with the table name after every write or append
+        self.write_listeners: List[Callable[[str], None]] = []
+
+        # Callables notified with the table name and the appended rows, while
+        # the table lock is still held
+        self.append_listeners: List[Callable[[str, pd.DataFrame], None]] = []
+
+    # ------------------------------------------------------------------
+    # Paths and signatures
+    # ------------------------------------------------------------------
+
+    def csv_path(self, table: str) -> str:
+        """Path of the CSV file for a table"""
+        return os.path.join(self.data_dir, f"{table}.csv")
+
+    def binary_path(self, table: str, backend: Optional[str] = None) -> str:
+        """Path of the binary copy of a table"""
+        extension = 'parquet' if (backend or self.backend) == 'parquet' else 'pkl'
+        return os.path.join(self.store_dir, f"{table}.{extension}")
+
+    def csv_signature(self, table: str) -> Optional[List[int]]:
+        """Cheap change signature of a table's CSV file: [mtime_ns, size]"""
+        try:
+            stat = os.stat(self.csv_path(table))
+            return [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            return None
+
+    def table_lock(self, table: str) -> threading.RLock:
+        """Lock held while a table's CSV file is rewritten or appended to"""
+        with self._lock:
+            return self._table_locks.setdefault(table, threading.RLock())
+
+    def exists(self, table: str) -> bool:
+        """Check whether a table has a CSV file"""
+        return os.path.exists(self.csv_path(table))
+
+    def is_fresh(self, table: str) -> bool:
+        """Check whether the binary copy of a table matches its CSV file"""
+        entry = self.manifest.get(table)
+        if not entry:
+            return False
+        signature = self.csv_signature(table)
+        if signature is None or entry.get('csv_signature') != signature:
+            return False
+        return os.path.exists(self.binary_path(table, entry.get('backend')))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def read(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a table, optionally limited to the given columns.
+
+        Uses the binary copy when it is fresh (Parquet files are memory-mapped
+        and only the requested columns are decoded). Rows appended to the CSV
+        since the copy was written are replayed on top of it; any other change
+        to the CSV means it is parsed again and the binary copy refreshed.
+        """
+        if self.is_fresh(table):
+            try:
+                return self._read_binary(table, columns)
+            except Exception as e:
+                self.logger.warning(f"Binary copy of {table} unreadable, re-parsing CSV: {e}")
+
+        df = self._replay_journal(table, columns)
+        if df is None:
+            signature = self.csv_signature(table)
+            df = self._read_csv(table)
+            self._write_binary(table, df, signature)
+
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        return df
+
+    def row_count(self, table: str) -> int:
+        """
+        Number of rows in a table.
+
+        Known without reading the table while its binary copy is fresh or its
+        journal tail was appended or replayed through the store.
+        """
+        entry = self.manifest.get(table)
+        signature = self.csv_signature(table)
+        if signature is None:
+            return 0
+        if entry and 'rows' in entry:
+            if entry['csv_signature'] == signature:
+                return entry['rows']
+            with self._lock:
+                state = self._journal.get(table)
+            if (state and state['base'] == entry['csv_signature'] and state['signature'] == signature
+                    and state['tail_rows'] is not None):
+                return entry['rows'] + state['tail_rows']
+
+        entry = self.manifest.get(table) or {}
+        return len(self.read(table, columns=entry.get('columns', [])[:1] or None))
+
+    def fingerprint(self, table: str) -> Optional[str]:
+        """Content fingerprint of the table as last read or written through the store"""
+        entry = self.manifest.get(table)
+        if entry and self.is_fresh(table):
+            return entry.get('fingerprint')
+        return None
+
+    @staticmethod
+    def compute_fingerprint(df: pd.DataFrame) -> str:
+        """Content fingerprint of a DataFrame (columns, dtypes and values)"""
+        digest = hashlib.md5()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+        if len(df) > 0:
+            digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    def _read_csv(self, table: str) -> pd.DataFrame:
+        """Parse a table's CSV file and coerce its date columns"""
+        return self._coerce_dates(table, pd.read_csv(self.csv_path(table), low_memory=False))
+
+    @staticmethod
+    def _coerce_dates(table: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert the known date columns of a table to datetimes"""
+        for column in DATE_COLUMNS.get(table, []):
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+        return df
+
+    def _replay_journal(self, table: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Rebuild a table from its binary copy plus the rows appended to the CSV
+        since. Returns None when the CSV changed in any other way.
+
+        Only ``columns`` are decoded from the binary copy, unless the tail is
+        long enough to be compacted into a new copy of the whole table.
+        """
+        entry = self.manifest.get(table)
+        signature = self.csv_signature(table)
+        if not entry or signature is None or not entry.get('prefix_digest'):
+            return None
+
+        offset = entry['csv_signature'][1]
+        if signature[1] <= offset:
+            return None
+
+        with self._lock:
+            state = self._journal.get(table)
+        if not state or state['base'] != entry['csv_signature'] or state['signature'] != signature:
+            # Everything up to the compacted offset must be byte-for-byte what was
+            # compacted; a rewrite of any earlier row means the CSV is parsed again
+            if self._prefix_digest(table, offset) != entry['prefix_digest']:
+                return None
+            state = {'base': entry['csv_signature'], 'signature': signature, 'tail': None, 'tail_rows': None}
+
+        try:
+            tail = state['tail']
+            if tail is None:
+                with open(self.csv_path(table), 'rb') as f:
+                    f.seek(offset)
+                    tail_bytes = f.read(signature[1] - offset)
+                tail = pd.read_csv(io.BytesIO(tail_bytes), header=None, names=entry['columns'], low_memory=False)
+                tail = self._coerce_dates(table, tail)
+                state = dict(state, tail=tail, tail_rows=len(tail))
+
+            if len(tail) >= self.COMPACT_THRESHOLD:
+                columns = None
+            base = self._read_binary(table, columns)
+        except Exception as e:
+            self.logger.debug(f"Journal replay failed for {table}, re-parsing CSV: {e}")
+            return None
+
+        with self._lock:
+            self._journal[table] = state
+        if columns is not None:
+            tail = tail[[col for col in columns if col in tail.columns]]
+        df = pd.concat([base, tail], ignore_index=True) if len(base) else tail.copy()
+        if columns is None and len(tail) >= self.COMPACT_THRESHOLD:
+            self._write_binary(table, df, signature)
+        return df
+
+    def _prefix_digest(self, table: str, offset: int) -> Optional[str]:
+        """Hash of the CSV bytes before an offset, used to detect rewrites"""
+        try:
+            digest = hashlib.md5()
+            last = b''
+            with open(self.csv_path(table), 'rb') as f:
+                remaining = offset
+                while remaining > 0:
+                    chunk = f.read(min(self.DIGEST_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        return None
+                    digest.update(chunk)
+                    last = chunk
+                    remaining -= len(chunk)
+            if last and not last.endswith(b'\n'):
+                return None
+            return digest.hexdigest()
+        except OSError:
+            return None
+
+    def _read_binary(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read the binary copy of a table"""
+        entry = self.manifest[table]
+        backend = entry.get('backend', self.backend)
+        path = self.binary_path(table, backend)
+
+        if columns is not None:
+            columns = [col for col in columns if col in entry.get('columns', [])]
+
+        if backend == 'parquet':
+            arrow_table = pq.read_table(path, columns=columns, memory_map=True)
+            return arrow_table.to_pandas()
+
+        with open(path, 'rb') as f:
+            df = pickle.load(f)
+        if columns is not None:
+            df = df[columns]
+        return df
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, table: str, df: pd.DataFrame, export_csv: bool = True):
+        """Write a table to its CSV file and refresh the binary copy"""
+        with self.table_lock(table):
+            if export_csv:
+                self.export_csv(table, df=df)
+            self._write_binary(table, df, self.csv_signature(table))
+        self._notify_written(table)
+
+    def append(self, table: str, rows: pd.DataFrame) -> bool:
+        """
+        Append rows to a table's CSV file without rewriting it.
+
+        Returns False when the rows cannot be appended (no CSV yet, or columns
+        the CSV header does not have); the caller should then rewrite the table.
+        """
+        with self.table_lock(table):
+            path = self.csv_path(table)
+            before = self.csv_signature(table)
+            try:
+                with open(path, 'r', encoding='utf-8', newline='') as f:
+                    header = next(csv.reader(f), None)
+                with open(path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    ends_with_newline = f.read(1) == b'\n'
+            except (OSError, ValueError):
+                return False
+
+            if not header or not ends_with_newline:
+                return False
+            extra = [col for col in rows.columns if col not in header and rows[col].notna().any()]
+            if extra:
+                return False
+
+            rows = rows.reindex(columns=header)
+            with open(path, 'a', encoding='utf-8', newline='') as f:
+                rows.to_csv(f, header=False, index=False)
+            self._extend_journal(table, before, len(rows))
+            self._notify_appended(table, rows)
+        self._notify_written(table)
+        return True
+
+    def _extend_journal(self, table: str, before: Optional[List[int]], appended: int):
+        """
+        Carry the verified state of a table's CSV over an append made by the
+        store, so the next read replays the tail without rehashing the file.
+        """
+        after = self.csv_signature(table)
+        with self._lock:
+            entry = self.manifest.get(table)
+            state = self._journal.pop(table, None)
+            if not entry or not entry.get('prefix_digest') or before is None or after is None:
+                return
+            if state and state['base'] == entry['csv_signature'] and state['signature'] == before:
+                tail_rows = state['tail_rows'] + appended if state['tail_rows'] is not None else None
+            elif entry['csv_signature'] == before:
+                tail_rows = appended
+            else:
+                return
+            self._journal[table] = {'base': entry['csv_signature'], 'signature': after,
+                                    'tail': None, 'tail_rows': tail_rows}
+
+    def compact(self, table: str):
+        """Fold the journal tail of a table into its binary copy"""
+        if self.exists(table) and not self.is_fresh(table):
+            signature = self.csv_signature(table)
+            df = self._replay_journal(table)
+            if df is None:
+                df = self._read_csv(table)
+            self._write_binary(table, df, signature)
+
+    def export_csv(self, table: str, path: Optional[str] = None, df: Optional[pd.DataFrame] = None) -> str:
+        """Export a table as CSV (to its own CSV file unless a path is given)"""
+        if df is None:
+            df = self.read(table)
+        path = path or self.csv_path(table)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        # Write next to the target and rename so readers never see a partial file
+        self._replace_file(path, lambda temp_path: df.to_csv(temp_path, index=False, encoding='utf-8'))
+        return path
+
+    def _write_binary(self, table: str, df: pd.DataFrame, signature: Optional[List[int]]):
+        """Write the binary copy of a table and record the CSV it mirrors"""
+        if signature is None:
+            return
+
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            backend = self.backend
+            if backend == 'parquet':
+                try:
+                    self._replace_file(self.binary_path(table, 'parquet'),
+                                       lambda temp_path: df.to_parquet(temp_path, index=False))
+                except Exception as e:
+                    # Mixed-type object columns cannot be expressed in Parquet
+                    self.logger.debug(f"Parquet write failed for {table}, using pickle: {e}")
+                    backend = 'pickle'
+            if backend == 'pickle':
+                def dump(temp_path):
+                    with open(temp_path, 'wb') as f:
+                        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+                self._replace_file(self.binary_path(table, 'pickle'), dump)
+
+            with self._lock:
+                self._journal.pop(table, None)
+                self.manifest[table] = {
+                    'csv_signature': signature,
+                    'prefix_digest': self._prefix_digest(table, signature[1]),
+                    'backend': backend,
+                    'columns': [str(col) for col in df.columns],
+                    'rows': len(df),
+                    'fingerprint': self.compute_fingerprint(df),
+                }
+                self._save_manifest()
+        except Exception as e:
+            self.logger.warning(f"Could not write binary copy of {table}: {e}")
+
+    @staticmethod
+    def _replace_file(path: str, writer):
+        """Run writer on a temporary file and atomically move it to path"""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            writer(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _notify_written(self, table: str):
+        """Tell the write listeners a table file was written by the store"""
+        for listener in list(self.write_listeners):
+            try:
+                listener(table)
+            except Exception as e:
+                self.logger.debug(f"Write listener failed for {table}: {e}")
+
+    def _notify_appended(self, table: str, rows: pd.DataFrame):
+        """Tell the append listeners which rows were appended to a table"""
+        for listener in list(self.append_listeners):
+            try:
+                listener(table, rows)
+            except Exception as e:
+                self.logger.debug(f"Append listener failed for {table}: {e}")
+
+    def invalidate(self, table: str):
+        """Drop the binary copy of a table so the next read parses its CSV"""
+        with self._lock:
+            self._journal.pop(table, None)
+            if self.manifest.pop(table, None) is not None:
+                self._save_manifest()
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest describing the binary copies"""
+        try:
+            if os.path.exists(self.manifest_file):
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Table store manifest unreadable, rebuilding: {e}")
+        return {}
+
+    def _save_manifest(self):
+        """Persist the manifest"""
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        def dump(temp_path):
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2)
+        self._replace_file(self.manifest_file, dump)
+
+
+# Global table store instances, one per data directory
+_table_stores: Dict[str, TableStore] = {}
+
+
+def get_table_store(data_dir: str = 'data') -> TableStore:
+    """Get the table store for a data directory"""
+    key = os.path.abspath(data_dir)
+    if key not in _table_stores:
+        _table_stores[key] = TableStore(data_dir)
+    return _table_stores[key]
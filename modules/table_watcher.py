@@ -0,0 +1,195 @@
+"""
+Table Watcher for Kitchen Dashboard
+Detects changes to the CSV data tables and reports them per table
+"""
+
+import os
+import weakref
+import logging
+import threading
+from typing import Dict, List, Optional, Iterable, Set, Tuple
+
+from PySide6.QtCore import QObject, Signal, QTimer, QThread, QFileSystemWatcher
+
+
+class TableWatcher(QObject):
+    """
+    Watches the CSV files of the data directory and tracks a version per table.
+
+    Changes are picked up by QFileSystemWatcher (inotify / ReadDirectoryChangesW)
+    when the platform supports it, with a periodic stat poll as fallback. Every
+    change bumps the table's version and emits ``table_changed``; tables that
+    changed in the same check are also reported together via ``tables_changed``
+    so listeners can reload them in one pass.
+
+    Pages still save with ``DataFrame.to_csv`` on their own and call
+    ``table_saved(path)`` right after: the new file state is acknowledged and
+    the table is reported via ``tables_saved`` instead of ``tables_changed``,
+    so nothing needs to be reloaded or rebuilt for the app's own saves.
+    """
+
+    table_changed = Signal(str, int)   # table name, new version
+    tables_changed = Signal(list)      # table names changed outside the app in one check
+    tables_saved = Signal(list)        # table names the app saved itself in one check
+
+    def __init__(self, data_dir: str = 'data', tables: Optional[Iterable[str]] = None,
+                 poll_interval: int = 10000, debounce_ms: int = 300,
+                 use_fs_watcher: bool = True, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.data_dir = data_dir
+        self.tables = list(tables) if tables is not None else None
+        self.poll_interval = poll_interval
+
+        # acknowledge() is also called from the table store's writer thread
+        self._lock = threading.Lock()
+        # Tables the app saved itself since the last check
+        self._saved: Set[str] = set()
+
+        self.versions: Dict[str, int] = {}
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        for table in self._watched_tables():
+            self.signatures[table] = self._signature(table)
+            self.versions[table] = 0
+
+        # Coalesce bursts of file system events (a single to_csv fires several)
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.check_now)
+
+        # Polling fallback for file systems without change notifications
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.check_now)
+
+        self.fs_watcher = None
+        if use_fs_watcher:
+            try:
+                self.fs_watcher = QFileSystemWatcher(self)
+                self.fs_watcher.directoryChanged.connect(self._on_fs_event)
+                self.fs_watcher.fileChanged.connect(self._on_fs_event)
+            except Exception as e:
+                self.logger.warning(f"File system watcher unavailable, polling only: {e}")
+                self.fs_watcher = None
+
+    def start(self):
+        """Start watching the data directory"""
+        if self.fs_watcher is not None and os.path.isdir(self.data_dir):
+            self.fs_watcher.addPath(self.data_dir)
+            self._watch_files()
+        self.poll_timer.start(self.poll_interval)
+        _watchers.add(self)
+        self.logger.info(f"Table watcher started for {len(self.signatures)} tables "
+                         f"({'file system events + ' if self.fs_watcher else ''}polling every {self.poll_interval / 1000:.0f}s)")
+
+    def stop(self):
+        """Stop watching the data directory"""
+        _watchers.discard(self)
+        self.poll_timer.stop()
+        self.debounce_timer.stop()
+        if self.fs_watcher is not None:
+            paths = self.fs_watcher.files() + self.fs_watcher.directories()
+            if paths:
+                self.fs_watcher.removePaths(paths)
+
+    def get_version(self, table: str) -> int:
+        """Get the current version of a table (bumped on every detected change)"""
+        return self.versions.get(table, 0)
+
+    def acknowledge(self, table: str):
+        """Record the current state of a table's file as known (used after our own writes)"""
+        signature = self._signature(table)
+        with self._lock:
+            self.signatures[table] = signature
+
+    def saved(self, table: str):
+        """Acknowledge a table file the app just saved and report it as saved on the next check"""
+        signature = self._signature(table)
+        with self._lock:
+            self.signatures[table] = signature
+            self._saved.add(table)
+        if QThread.currentThread() is self.thread():
+            self.debounce_timer.start()
+
+    def watches(self, path: str) -> Optional[str]:
+        """The table a file path belongs to, when it is one of the watched table files"""
+        directory, name = os.path.split(os.path.abspath(path))
+        if directory != os.path.abspath(self.data_dir) or not name.endswith('.csv'):
+            return None
+        table = name[:-4]
+        return table if self.tables is None or table in self.tables else None
+
+    def check_now(self) -> List[str]:
+        """Compare file signatures and report the tables changed outside the app"""
+        with self._lock:
+            saved, self._saved = sorted(self._saved), set()
+            for table in saved:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+        changed = []
+        for table in self._watched_tables():
+            signature = self._signature(table)
+            with self._lock:
+                if signature == self.signatures.get(table):
+                    continue
+                self.signatures[table] = signature
+                self.versions[table] = self.versions.get(table, 0) + 1
+            changed.append(table)
+
+        if self.fs_watcher is not None:
+            # Atomic replaces drop the old inode from the watch list
+            self._watch_files()
+
+        for table in saved + [table for table in changed if table not in saved]:
+            self.table_changed.emit(table, self.versions[table])
+        if saved:
+            self.logger.debug(f"Tables saved by the app: {', '.join(saved)}")
+            self.tables_saved.emit(saved)
+        if changed:
+            self.logger.info(f"Detected changes in tables: {', '.join(changed)}")
+            self.tables_changed.emit(changed)
+        return changed
+
+    def _on_fs_event(self, _path):
+        """Debounce file system notifications into a single check"""
+        self.debounce_timer.start()
+
+    def _watched_tables(self) -> List[str]:
+        """Tables being watched (every CSV in the data directory if not restricted)"""
+        if self.tables is not None:
+            return self.tables
+        try:
+            return sorted(name[:-4] for name in os.listdir(self.data_dir) if name.endswith('.csv'))
+        except OSError:
+            return []
+
+    def _watch_files(self):
+        """Make sure every existing table file is on the watch list"""
+        watched = set(self.fs_watcher.files())
+        for table in self._watched_tables():
+            path = self._path(table)
+            if path not in watched and os.path.exists(path):
+                self.fs_watcher.addPath(path)
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.data_dir, f"{table}.csv")
+
+    def _signature(self, table: str) -> Optional[Tuple[int, int]]:
+        """Cheap change signature of a table file: (mtime_ns, size)"""
+        try:
+            stat = os.stat(self._path(table))
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+
+# Running watchers, told about the app's own saves by table_saved()
+_watchers = weakref.WeakSet()
+
+
+def table_saved(path: str):
+    """Tell the running table watchers that the app itself just wrote a table file"""
+    for watcher in list(_watchers):
+        table = watcher.watches(path)
+        if table is not None:
+            watcher.saved(table)
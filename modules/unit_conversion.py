@@ -0,0 +1,148 @@
+"""
+Unit Conversion for Kitchen Dashboard
+Canonical unit registry shared by the pricing, costing and inventory modules
+"""
+
+import logging
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MASS = 'mass'        # base unit: grams
+VOLUME = 'volume'    # base unit: millilitres
+COUNT = 'count'      # base unit: pieces
+LEAF = 'leaf'        # base unit: leaves
+
+# canonical unit -> (dimension, size in the dimension's base unit, spellings seen in the data)
+UNIT_DEFINITIONS = {
+    'g': (MASS, 1.0, ['g', 'gm', 'gms', 'gram', 'grams']),
+    'kg': (MASS, 1000.0, ['kg', 'kgs', 'kilogram', 'kilograms']),
+    'ml': (VOLUME, 1.0, ['ml', 'milliliter', 'milliliters', 'millilitre', 'millilitres']),
+    'l': (VOLUME, 1000.0, ['l', 'ltr', 'liter', 'liters', 'litre', 'litres']),
+    'tsp': (VOLUME, 5.0, ['tsp', 'teaspoon', 'teaspoons']),
+    'tbsp': (VOLUME, 15.0, ['tbsp', 'tablespoon', 'tablespoons']),
+    'pcs': (COUNT, 1.0, ['pcs', 'pc', 'piece', 'pieces', 'unit', 'units', 'nos', 'each', 'ea']),
+    'leaves': (LEAF, 1.0, ['leaf', 'leaves']),
+}
+
+# Approximate grams per base unit, used only when converting across dimensions
+# (liquids at 1 g/ml, an average vegetable piece, a curry leaf)
+APPROXIMATE_GRAMS = {MASS: 1.0, VOLUME: 1.0, COUNT: 50.0, LEAF: 1.0}
+
+# Cross-dimension conversions recipes are costed with: liquids both ways at
+# 1 g/ml (so 1 l = 1 kg), and pieces and leaves into any weight unit
+# (1 pc = 50 g, 1 leaf = 1 g). Any other pair (pcs -> ml, leaves -> pcs,
+# g -> pcs, ...) has no sensible factor and stays 1:1 with a warning.
+APPROXIMATE_CONVERSIONS = {(VOLUME, MASS), (MASS, VOLUME), (COUNT, MASS), (LEAF, MASS)}
+
+UNIT_ALIASES = {
+    alias: canonical
+    for canonical, (_, _, aliases) in UNIT_DEFINITIONS.items()
+    for alias in aliases
+}
+
+
+def normalize_unit(unit) -> str:
+    """Canonical spelling of a unit ('Grams ' -> 'g'); unknown units are lowercased and stripped"""
+    if unit is None or (not isinstance(unit, str) and pd.isna(unit)):
+        return ''
+    clean = str(unit).strip().lower()
+    return UNIT_ALIASES.get(clean, clean)
+
+
+def unit_dimension(unit) -> Optional[str]:
+    """Dimension of a unit (mass, volume, count, leaf) or None when unknown"""
+    definition = UNIT_DEFINITIONS.get(normalize_unit(unit))
+    return definition[0] if definition else None
+
+
+def is_weight_unit(unit) -> bool:
+    """Check if unit is a weight unit"""
+    return unit_dimension(unit) == MASS
+
+
+def is_volume_unit(unit) -> bool:
+    """Check if unit is a volume unit"""
+    return unit_dimension(unit) == VOLUME
+
+
+@lru_cache(maxsize=1024)
+def conversion_factor(from_unit, to_unit, approximate: bool = True) -> Optional[float]:
+    """
+    Multiplier converting a quantity in ``from_unit`` into ``to_unit``.
+
+    Units of the same dimension convert exactly. Across dimensions the
+    factor goes through approximate grams when ``approximate`` is set and
+    the pair is one of ``APPROXIMATE_CONVERSIONS``. Returns None when there
+    is no sensible conversion.
+    """
+    from_canonical = normalize_unit(from_unit)
+    to_canonical = normalize_unit(to_unit)
+    if from_canonical == to_canonical:
+        return 1.0
+
+    from_definition = UNIT_DEFINITIONS.get(from_canonical)
+    to_definition = UNIT_DEFINITIONS.get(to_canonical)
+    if from_definition is None or to_definition is None:
+        return None
+
+    from_dimension, from_size, _ = from_definition
+    to_dimension, to_size, _ = to_definition
+    if from_dimension == to_dimension:
+        return from_size / to_size
+    if not approximate or (from_dimension, to_dimension) not in APPROXIMATE_CONVERSIONS:
+        return None
+    return (from_size * APPROXIMATE_GRAMS[from_dimension]) / (to_size * APPROXIMATE_GRAMS[to_dimension])
+
+
+def convert(quantity: float, from_unit, to_unit, approximate: bool = True) -> float:
+    """Convert one quantity, keeping it unchanged (1:1) when the units are incompatible"""
+    factor = conversion_factor(from_unit, to_unit, approximate)
+    if factor is None:
+        _warn_no_conversion(normalize_unit(from_unit), normalize_unit(to_unit))
+        return quantity
+    return quantity * factor
+
+
+@lru_cache(maxsize=256)
+def _warn_no_conversion(from_unit: str, to_unit: str):
+    """Warn once per unit pair instead of once per ingredient"""
+    logger.warning(f"No conversion found from {from_unit} to {to_unit}, using 1:1 ratio")
+
+
+def convert_series(quantities, from_units, to_units, approximate: bool = True) -> Union[pd.Series, np.ndarray]:
+    """
+    Convert whole columns of quantities in one NumPy multiply.
+
+    ``from_units`` / ``to_units`` may be sequences aligned with ``quantities``
+    or single unit strings. Each distinct unit pair is looked up once;
+    incompatible pairs keep their quantity (1:1). Returns a Series with the
+    input index when ``quantities`` is a Series, otherwise an ndarray.
+    """
+    values = np.asarray(pd.to_numeric(quantities, errors='coerce'), dtype='float64')
+    size = values.shape[0]
+
+    def _unit_array(units):
+        if isinstance(units, str) or units is None:
+            return np.full(size, units if units is not None else '', dtype=object)
+        # Missing units become '' so every row lands in a factorized pair
+        return pd.Series(np.asarray(units, dtype=object)).fillna('').astype(str).to_numpy()
+
+    pairs = pd.MultiIndex.from_arrays([_unit_array(from_units), _unit_array(to_units)])
+    codes, unique_pairs = pd.factorize(pairs)
+    factors = np.empty(len(unique_pairs), dtype='float64')
+    for position, (from_unit, to_unit) in enumerate(unique_pairs):
+        factor = conversion_factor(normalize_unit(from_unit), normalize_unit(to_unit), approximate)
+        if factor is None:
+            _warn_no_conversion(normalize_unit(from_unit), normalize_unit(to_unit))
+            factor = 1.0
+        factors[position] = factor
+
+    converted = values * factors[codes] if size else values
+    if isinstance(quantities, pd.Series):
+        return pd.Series(converted, index=quantities.index, name=quantities.name)
+    return converted
@@ -3,15 +3,19 @@ Universal Data Table Widget with Filtering and Sorting
 Provides consistent filtering and sorting functionality across all modules
 """
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                              QTableWidgetItem, QLineEdit, QPushButton, QComboBox,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                              QLineEdit, QPushButton, QComboBox,
                               QLabel, QHeaderView, QDateEdit, QCheckBox, QFrame)
 from PySide6.QtCore import Qt, Signal, QDate, QTimer
 from PySide6.QtGui import QFont, QIcon
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
 
+from modules.dataframe_table_model import DataFrameTableModel, DataFrameProxyModel, DataFrameTableView
+from modules.table_search_index import TableSearchIndex
+
 
 class UniversalTableWidget(QWidget):
     """Universal table widget with advanced filtering and sorting capabilities"""
@@ -34,7 +38,8 @@ class UniversalTableWidget(QWidget):
         if not self.original_data.empty:
             self.original_data = self.handle_duplicates_and_sort(self.original_data)
 
-        self.filtered_data = self.original_data.copy()
+        self._filtered_cache = None
+        self.search_index = TableSearchIndex(self.original_data)
         self.columns = columns if columns else []
         self.sort_column = None
         self.sort_order = Qt.AscendingOrder
@@ -157,11 +162,18 @@ class UniversalTableWidget(QWidget):
         
         layout.addWidget(filter_frame)
         
-        # Table widget
-        self.table = QTableWidget()
+        # Table view over a DataFrame model; rows are only formatted when visible
+        self.model = DataFrameTableModel(self.original_data, self.columns, self)
+        self.proxy_model = DataFrameProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+
+        self.table = DataFrameTableView()
+        self.table.setModel(self.proxy_model)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
+        # Start unsorted so the intelligent default order is kept
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.table.setSortingEnabled(True)
 
         # Enable column resizing
@@ -170,12 +182,12 @@ class UniversalTableWidget(QWidget):
         self.table.verticalHeader().setVisible(False)
         
         # Connect table signals
-        self.table.itemSelectionChanged.connect(self.on_row_selected)
-        self.table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
+        self.table.selectionModel().selectionChanged.connect(self.on_row_selected)
+        self.table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_changed)
         
         # Style the table
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #e9ecef;
                 background-color: white;
                 alternate-background-color: #f8f9fa;
@@ -184,7 +196,7 @@ class UniversalTableWidget(QWidget):
                 border: 1px solid #dee2e6;
                 border-radius: 6px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border: none;
             }
@@ -375,40 +387,29 @@ class UniversalTableWidget(QWidget):
         for value in sorted(unique_values):
             self.category_filter.addItem(value)
     
-    def populate_table(self):
-        """Populate the table with filtered data"""
-        if self.filtered_data.empty:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
-            self.update_filter_status(0)
-            return
-        
-        # Set up table dimensions
-        self.table.setRowCount(len(self.filtered_data))
-        self.table.setColumnCount(len(self.filtered_data.columns))
-        
-        # Set headers
-        if self.columns:
-            self.table.setHorizontalHeaderLabels(self.columns)
-        else:
-            self.table.setHorizontalHeaderLabels(list(self.filtered_data.columns))
-        
-        # Populate data
-        for row_idx, (_, row) in enumerate(self.filtered_data.iterrows()):
-            for col_idx, value in enumerate(row):
-                item = QTableWidgetItem(str(value) if pd.notna(value) else "")
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Make read-only
-                self.table.setItem(row_idx, col_idx, item)
-        
+    @property
+    def filtered_data(self):
+        """Visible rows in display order (materialized on first access after a change)"""
+        if self._filtered_cache is None:
+            rows = self.proxy_model.source_rows() if hasattr(self, 'proxy_model') else slice(None)
+            self._filtered_cache = self.original_data.iloc[rows]
+        return self._filtered_cache
+
+    def populate_table(self, rows=None):
+        """Show the given original_data row positions (all rows for None)"""
+        self.proxy_model.set_source_rows(rows)
+        self._filtered_cache = None
+        visible_count = self.proxy_model.rowCount()
+
         # Update status
-        self.update_filter_status(len(self.filtered_data))
+        self.update_filter_status(visible_count)
 
         # Set optimal column widths
         self.set_optimal_column_widths()
-        
+
         # Emit signal
-        self.data_filtered.emit(len(self.filtered_data))
-    
+        self.data_filtered.emit(visible_count)
+
     def update_filter_status(self, visible_count):
         """Update the filter status label"""
         total_count = len(self.original_data)
@@ -433,52 +434,40 @@ class UniversalTableWidget(QWidget):
     def apply_filters(self):
         """Apply all active filters to the data"""
         try:
-            self.filtered_data = self.original_data.copy()
-            
+            data = self.original_data
+            mask = np.ones(len(data), dtype=bool)
+
             # Apply search filter
             search_text = self.search_input.text().strip().lower()
             if search_text:
-                mask = pd.Series([False] * len(self.filtered_data))
-                for col in self.filtered_data.columns:
-                    mask |= self.filtered_data[col].astype(str).str.lower().str.contains(search_text, na=False)
-                self.filtered_data = self.filtered_data[mask]
-            
-            # Apply date filter
+                mask &= self.search_index.search(search_text)
+
+            # Apply date filter (to the first date column)
             if self.date_filter_enabled and hasattr(self, 'date_from'):
-                date_from = self.date_from.date().toPython()
-                date_to = self.date_to.date().toPython()
-                
-                # Find date columns and apply filter
-                for col in self.filtered_data.columns:
-                    if any(keyword in col.lower() for keyword in ['date', 'time', 'created', 'updated', 'due', 'completed']):
-                        try:
-                            date_series = pd.to_datetime(self.filtered_data[col], errors='coerce')
-                            # Include items with missing dates (NaT) in the filter
-                            mask = (date_series.dt.date >= date_from) & (date_series.dt.date <= date_to) | date_series.isna()
-                            self.filtered_data = self.filtered_data[mask]
-                            break  # Apply to first date column found
-                        except:
-                            continue
-            
+                date_from = pd.Timestamp(self.date_from.date().toPython())
+                date_to = pd.Timestamp(self.date_to.date().toPython())
+                # Items with missing dates (NaT) are included
+                date_mask = self.search_index.date_range(date_from, date_to)
+                if date_mask is not None:
+                    mask &= date_mask
+
             # Apply category filter
             if hasattr(self, 'category_filter') and self.category_filter.currentText() != "All Categories":
                 category_value = self.category_filter.currentText()
-                
-                # Find categorical columns and apply filter
-                categorical_keywords = ['category', 'status', 'type', 'priority', 'level']
-                for col in self.filtered_data.columns:
-                    if any(keyword in col.lower() for keyword in categorical_keywords):
-                        mask = self.filtered_data[col].astype(str) == category_value
-                        if mask.any():
-                            self.filtered_data = self.filtered_data[mask]
-                            break
-            
-            # Repopulate table
-            self.populate_table()
-            
+
+                # Use the first categorical column that has matching rows
+                for col in self.search_index.category_columns:
+                    category_mask = self.search_index.category(col, category_value)
+                    if (mask & category_mask).any():
+                        mask &= category_mask
+                        break
+
+            # Show the matching rows (no copy of the data is made)
+            self.populate_table(None if mask.all() else np.flatnonzero(mask))
+
         except Exception as e:
             self.logger.error(f"Error applying filters: {e}")
-    
+
     def clear_all_filters(self):
         """Clear all active filters"""
         self.search_input.clear()
@@ -502,38 +491,28 @@ class UniversalTableWidget(QWidget):
             # New column, default to ascending
             self.sort_column = logical_index
             self.sort_order = Qt.AscendingOrder
-        
+
         # Apply sorting
         self.sort_data()
-    
+
+    def on_sort_changed(self, logical_index, order):
+        """Keep the sort state in step with the header's sort indicator"""
+        self.sort_column = logical_index if logical_index >= 0 else None
+        self.sort_order = order
+        self._filtered_cache = None
+
     def sort_data(self):
-        """Sort the filtered data"""
-        if self.sort_column is None or self.filtered_data.empty:
+        """Sort the visible rows (done by the proxy model, no data is copied)"""
+        if self.sort_column is None:
             return
-        
+
         try:
-            col_name = self.filtered_data.columns[self.sort_column]
-            ascending = self.sort_order == Qt.AscendingOrder
-            
-            # Try numeric sort first, fall back to string sort
-            try:
-                self.filtered_data = self.filtered_data.sort_values(
-                    by=col_name, 
-                    ascending=ascending, 
-                    key=lambda x: pd.to_numeric(x, errors='coerce')
-                )
-            except:
-                self.filtered_data = self.filtered_data.sort_values(
-                    by=col_name, 
-                    ascending=ascending
-                )
-            
-            self.populate_table()
-            
+            self.table.sortByColumn(self.sort_column, self.sort_order)
+            self._filtered_cache = None
         except Exception as e:
             self.logger.error(f"Error sorting data: {e}")
-    
-    def on_row_selected(self):
+
+    def on_row_selected(self, *args):
         """Handle row selection"""
         current_row = self.table.currentRow()
         if current_row >= 0:
@@ -553,7 +532,8 @@ class UniversalTableWidget(QWidget):
         if not self.original_data.empty:
             self.original_data = self.handle_duplicates_and_sort(self.original_data)
 
-        self.filtered_data = self.original_data.copy()
+        self.model.set_dataframe(self.original_data, self.columns)
+        self.search_index.build(self.original_data)
 
         # Repopulate category filter if it exists
         if hasattr(self, 'category_filter'):
@@ -561,7 +541,7 @@ class UniversalTableWidget(QWidget):
             self.category_filter.addItem("All Categories")
             self.populate_category_filter()
 
-        self.populate_table()
+        self.apply_filters()
     
     def get_selected_row_data(self):
         """Get the data for the currently selected row"""
@@ -578,6 +558,10 @@ class UniversalTableWidget(QWidget):
         """Set optimal column widths based on content and column names"""
         if self.original_data is None or self.table.columnCount() == 0:
             return
+        headers = tuple(self.proxy_model.headerData(col_idx, Qt.Horizontal) for col_idx in range(self.table.columnCount()))
+        if getattr(self, '_column_widths_set_for', None) == headers:
+            # Keep widths the user may have adjusted while filtering
+            return
 
         # Define optimal widths for common column types
         column_width_map = {
@@ -622,9 +606,9 @@ class UniversalTableWidget(QWidget):
 
         # Set column widths
         for col_idx in range(self.table.columnCount()):
-            header_item = self.table.horizontalHeaderItem(col_idx)
-            if header_item:
-                column_name = header_item.text().lower().replace(' ', '_').replace('/', '_')
+            header_text = self.proxy_model.headerData(col_idx, Qt.Horizontal)
+            if header_text:
+                column_name = header_text.lower().replace(' ', '_').replace('/', '_')
 
                 # Try exact match first
                 if column_name in column_width_map:
@@ -639,4 +623,5 @@ class UniversalTableWidget(QWidget):
 
                 self.table.setColumnWidth(col_idx, width)
 
+        self._column_widths_set_for = headers
         print(f"✅ Column widths set for {self.table.columnCount()} columns")
@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 import calendar
 import os
 from utils.table_styling import apply_universal_column_resizing
+from modules.table_store import get_table_store
+from modules.daily_cube import invalidate_cube, record_rows
+from modules.table_watcher import table_saved
 
 class WasteWidget(QWidget):
     def __init__(self, data, parent=None):
@@ -412,9 +415,12 @@ class WasteWidget(QWidget):
         # Add to waste dataframe
         self.waste_df = pd.concat([self.waste_df, new_waste], ignore_index=True)
         self.data['waste'] = self.waste_df
+        record_rows('waste', new_waste, self.waste_df)
         
-        # Save to CSV
-        self.waste_df.to_csv('data/waste.csv', index=False)
+        # Append to the CSV journal (full rewrite only if the columns changed)
+        if not get_table_store('data').append('waste', new_waste):
+            self.waste_df.to_csv('data/waste.csv', index=False)
+            table_saved('data/waste.csv')
         
         # Show success message
         QMessageBox.information(self, "Success", "Waste record added successfully!")
@@ -656,6 +662,8 @@ class WasteWidget(QWidget):
 
                     # Save to CSV
                     self.waste_df.to_csv('data/waste.csv', index=False)
+                    table_saved('data/waste.csv')
+                    invalidate_cube('waste')
 
                     # Refresh the display
                     self.update_waste_log()
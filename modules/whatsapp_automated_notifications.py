@@ -27,6 +27,9 @@ except ImportError as e:
 class WhatsAppAutomatedNotifications:
     """Automated notification system for WhatsApp integration"""
     
+    # More due low-stock items than this are sent as one digest message
+    DIGEST_THRESHOLD = 2
+    
     def __init__(self, data=None, whatsapp_widget=None, main_app=None):
         self.data = data or {}
         self.whatsapp_widget = whatsapp_widget
@@ -157,9 +160,13 @@ class WhatsAppAutomatedNotifications:
                         'out_of_stock': True
                     })
             
-            # Send notifications for low stock items
-            for item in low_stock_items:
-                if self._should_send_notification(f"low_stock_{item['name']}"):
+            # One message per item when few are due, one digest for a burst
+            due_items = [item for item in low_stock_items
+                         if self._should_send_notification(f"low_stock_{item['name']}")]
+            if len(due_items) > self.DIGEST_THRESHOLD:
+                self._send_low_stock_digest(due_items)
+            else:
+                for item in due_items:
                     self._send_low_stock_notification(item)
                     
         except Exception as e:
@@ -190,10 +197,39 @@ class WhatsAppAutomatedNotifications:
         except:
             return True
     
-    def _record_notification_sent(self, notification_key):
-        """Record that a notification was sent"""
-        self.notification_settings['last_notification_times'][notification_key] = datetime.now().isoformat()
+    def _record_notification_sent(self, *notification_keys):
+        """Record that notifications were sent (one settings write for all keys)"""
+        sent_at = datetime.now().isoformat()
+        for notification_key in notification_keys:
+            self.notification_settings['last_notification_times'][notification_key] = sent_at
         self.save_settings()
+
+    def _send_low_stock_digest(self, items):
+        """Send one message listing every low and out of stock item"""
+        try:
+            out_of_stock = [item for item in items if item.get('out_of_stock')]
+            low_stock = [item for item in items if not item.get('out_of_stock')]
+
+            lines = [f"⚠️ STOCK ALERT: {len(items)} items need restocking ⚠️", ""]
+            if out_of_stock:
+                lines.append(f"🚨 Out of stock ({len(out_of_stock)}):")
+                lines.extend(f"• {item['name']}" for item in out_of_stock)
+                lines.append("")
+            if low_stock:
+                lines.append(f"📦 {len(low_stock)} items low on stock:")
+                lines.extend(f"• {item['name']}: {item['current_qty']} {item['unit']} "
+                             f"(reorder at {item['reorder_level']})" for item in low_stock)
+                lines.append("")
+            lines.append(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+            if self._send_whatsapp_message('\n'.join(lines)):
+                self._record_notification_sent(*(f"low_stock_{item['name']}" for item in items))
+                self.logger.info(f"Sent low stock digest for {len(items)} items")
+            else:
+                self.logger.warning(f"Failed to send low stock digest for {len(items)} items")
+
+        except Exception as e:
+            self.logger.error(f"Error sending low stock digest: {e}")
     
     def _send_low_stock_notification(self, item):
         """Send low stock notification to Abiram's Kitchen"""
@@ -0,0 +1,143 @@
+"""
+Write-Behind Queue for Kitchen Dashboard
+Saves changed tables on a background thread with coalescing and atomic writes
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from PySide6.QtCore import QObject, Signal
+
+from modules.table_store import TableStore
+
+
+class WriteBehindQueue(QObject):
+    """
+    Background writer for the dashboard tables.
+
+    ``submit`` takes a snapshot of a table and returns immediately; a worker
+    thread writes it through the table store (temp file + rename for both the
+    CSV and its binary copy). Submitting a table again before it was written
+    replaces the pending snapshot, so bursts of edits cost one write. Tables
+    submitted with ``skip_if_unchanged`` are compared against the fingerprint
+    of what is already on disk and skipped when identical.
+
+    Rows appended through the store while a snapshot is pending are added to
+    that snapshot, and a snapshot is only taken off the queue under the
+    store's lock for its table, so a write never drops an append.
+    """
+
+    table_written = Signal(str)        # table name
+    table_skipped = Signal(str)        # table name (content unchanged)
+    write_failed = Signal(str, str)    # table name, error message
+
+    def __init__(self, store: TableStore, coalesce_delay: float = 0.5, parent=None):
+        super().__init__(parent)
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.coalesce_delay = coalesce_delay
+
+        self._pending: Dict[str, Tuple[pd.DataFrame, bool]] = {}
+        self._in_progress: Optional[str] = None
+        self._condition = threading.Condition()
+        self._stopping = False
+        store.append_listeners.append(self._on_append)
+
+        self._thread = threading.Thread(target=self._run, name="table-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, table: str, df: pd.DataFrame, skip_if_unchanged: bool = False):
+        """Queue a snapshot of a table for writing"""
+        snapshot = df.copy()
+        with self._condition:
+            if table in self._pending:
+                # A forced write stays forced when a later snapshot replaces it
+                skip_if_unchanged = skip_if_unchanged and self._pending[table][1]
+            self._pending[table] = (snapshot, skip_if_unchanged)
+            self._condition.notify_all()
+
+    def _on_append(self, table: str, rows: pd.DataFrame):
+        """Carry rows appended to a table's CSV into its pending snapshot"""
+        with self._condition:
+            if table in self._pending:
+                snapshot, skip_if_unchanged = self._pending[table]
+                self._pending[table] = (pd.concat([snapshot, rows], ignore_index=True), skip_if_unchanged)
+
+    def pending_tables(self) -> List[str]:
+        """Tables waiting to be written (including the one being written)"""
+        with self._condition:
+            tables = list(self._pending)
+            if self._in_progress and self._in_progress not in tables:
+                tables.append(self._in_progress)
+            return tables
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued table is written; False if the timeout expired"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._pending or self._in_progress:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Write everything still queued and stop the worker thread"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self):
+        """Worker loop: wait for submissions, let bursts settle, write one table at a time"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if self._stopping and not self._pending:
+                    return
+
+            # Give closely spaced edits a chance to replace each other
+            if self.coalesce_delay and not self._stopping:
+                time.sleep(self.coalesce_delay)
+
+            with self._condition:
+                if not self._pending:
+                    continue
+                table = next(iter(self._pending))
+                self._in_progress = table
+
+            try:
+                # Appends wait for the write; the snapshot includes any that came first
+                with self.store.table_lock(table):
+                    with self._condition:
+                        df, skip_if_unchanged = self._pending.pop(table)
+                    self._write(table, df, skip_if_unchanged)
+            finally:
+                with self._condition:
+                    self._in_progress = None
+                    self._condition.notify_all()
+
+    def _write(self, table: str, df: pd.DataFrame, skip_if_unchanged: bool):
+        """Write one table snapshot"""
+        try:
+            if skip_if_unchanged:
+                stored = self.store.fingerprint(table)
+                if stored is not None and stored == TableStore.compute_fingerprint(df):
+                    self.table_skipped.emit(table)
+                    return
+
+            started = time.perf_counter()
+            self.store.write(table, df)
+            self.logger.debug(f"Wrote {table} ({len(df)} rows) in {time.perf_counter() - started:.3f}s")
+            self.table_written.emit(table)
+        except Exception as e:
+            self.logger.error(f"Error writing {table}: {e}")
+            self.write_failed.emit(table, str(e))
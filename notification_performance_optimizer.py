@@ -29,49 +29,13 @@ except ImportError:
     Signal = lambda: None
 
 from modules.enhanced_notification_system import get_notification_manager
+from modules.shared_cache import LRUCache
 
-class NotificationCache:
-    """High-performance notification cache with LRU eviction"""
+class NotificationCache(LRUCache):
+    """Notification cache: an O(1) LRU with optional TTL from the shared cache module"""
     
-    def __init__(self, max_size: int = 1000):
-        self.max_size = max_size
-        self.cache: Dict[str, Any] = {}
-        self.access_order: List[str] = []
-        self.lock = threading.RLock()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get item from cache"""
-        with self.lock:
-            if key in self.cache:
-                # Move to end (most recently used)
-                self.access_order.remove(key)
-                self.access_order.append(key)
-                return self.cache[key]
-            return None
-    
-    def put(self, key: str, value: Any) -> None:
-        """Put item in cache"""
-        with self.lock:
-            if key in self.cache:
-                # Update existing
-                self.access_order.remove(key)
-            elif len(self.cache) >= self.max_size:
-                # Evict least recently used
-                lru_key = self.access_order.pop(0)
-                del self.cache[lru_key]
-            
-            self.cache[key] = value
-            self.access_order.append(key)
-    
-    def clear(self) -> None:
-        """Clear cache"""
-        with self.lock:
-            self.cache.clear()
-            self.access_order.clear()
-    
-    def size(self) -> int:
-        """Get cache size"""
-        return len(self.cache)
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None, monitor=None):
+        super().__init__('notifications', max_size=max_size, ttl=ttl, monitor=monitor)
 
 class NotificationDatabase:
     """High-performance SQLite database for notification persistence"""
@@ -317,6 +281,7 @@ class PerformanceMonitor:
         self.processing_times = []
         self.cache_hits = 0
         self.cache_misses = 0
+        self.cache_evictions = 0
     
     def record_notification_sent(self):
         """Record notification sent"""
@@ -344,6 +309,10 @@ class PerformanceMonitor:
         self.cache_misses += 1
         self._update_cache_hit_rate()
     
+    def record_cache_eviction(self):
+        """Record an entry evicted from a full cache"""
+        self.cache_evictions += 1
+    
     def _update_cache_hit_rate(self):
         """Update cache hit rate"""
         total = self.cache_hits + self.cache_misses
@@ -362,6 +331,7 @@ class PerformanceMonitor:
             'average_processing_time_ms': self.metrics['average_processing_time'] * 1000,
             'cache_hit_rate_percent': self.metrics['cache_hit_rate'] * 100,
             'total_cache_operations': self.cache_hits + self.cache_misses,
+            'cache_evictions': self.cache_evictions,
             'performance_score': self._calculate_performance_score()
         }
     
@@ -386,11 +356,15 @@ class PerformanceMonitor:
 class OptimizedNotificationManager:
     """High-performance notification manager with optimizations"""
     
+    # Identical notifications within this many seconds are dropped as duplicates
+    DUPLICATE_WINDOW = 300
+    
     def __init__(self):
         self.base_manager = get_notification_manager()
         self.worker = NotificationWorker()
         self.monitor = PerformanceMonitor()
-        self.cache = NotificationCache(max_size=2000)
+        # Cache hits, misses and evictions are reported to the monitor by the cache itself
+        self.cache = NotificationCache(max_size=2000, ttl=self.DUPLICATE_WINDOW, monitor=self.monitor)
         
         # Start background worker
         self.worker.start()
@@ -419,18 +393,10 @@ class OptimizedNotificationManager:
                 'metadata': kwargs
             }
             
-            # Check cache for duplicate detection
+            # Skip duplicates within the last 5 minutes (cache entries expire after that)
             cache_key = f"{category}_{title}_{message}"
-            cached = self.cache.get(cache_key)
-            
-            if cached:
-                self.monitor.record_cache_hit()
-                # Skip if duplicate within last 5 minutes
-                cached_time = datetime.fromisoformat(cached['timestamp'])
-                if (datetime.now() - cached_time).total_seconds() < 300:
-                    return False
-            else:
-                self.monitor.record_cache_miss()
+            if self.cache.get(cache_key) is not None:
+                return False
             
             # Cache the notification
             self.cache.put(cache_key, notification)
@@ -474,10 +440,8 @@ class OptimizedNotificationManager:
             if cleaned > 0:
                 print(f"🧹 Cleaned up {cleaned} old notifications")
             
-            # Clear cache if it's getting too large
-            if self.cache.size() > 1500:
-                self.cache.clear()
-                print("🧹 Cleared notification cache")
+            # Drop expired duplicate-detection entries (the LRU bounds the cache size)
+            self.cache.purge_expired()
                 
         except Exception as e:
             print(f"❌ Error during cleanup: {e}")
@@ -49,6 +49,7 @@ class NotificationTemplate:
     requires_action: bool = False
     auto_dismiss: bool = False
     escalation_minutes: int = 0
+    digest_title: str = ""  # Title when a burst is merged into one digest; {count} is the burst size
 
 class NotificationTemplateManager:
     """Manages notification templates and generates notifications from them"""
@@ -112,7 +113,8 @@ class NotificationTemplateManager:
             default_source="Inventory System",
             icon="📦",
             color="#f59e0b",
-            requires_action=True
+            requires_action=True,
+            digest_title="📦 {count} items low on stock"
         ))
         
         self.add_template(NotificationTemplate(
@@ -126,7 +128,8 @@ class NotificationTemplateManager:
             icon="🚨",
             color="#ef4444",
             requires_action=True,
-            escalation_minutes=30
+            escalation_minutes=30,
+            digest_title="🚨 {count} items out of stock"
         ))
         
         self.add_template(NotificationTemplate(
@@ -282,6 +285,9 @@ class NotificationTemplateManager:
     def add_template(self, template: NotificationTemplate):
         """Add a template to the manager"""
         self.templates[template.template_id] = template
+        if template.digest_title:
+            # Bursts are coalesced by title, so the digest title is registered under it
+            self.notification_manager.pipeline.digest_titles[template.title_template] = template.digest_title
     
     def get_template(self, template_id: str) -> Optional[NotificationTemplate]:
         """Get a template by ID"""
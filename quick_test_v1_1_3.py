@@ -14,7 +14,7 @@ def test_imports():
         print(f"OK Version: {__version__.__version__}")
 
         # Test startup loading screen
-        from modules.startup_loading_screen import LoadingWorker, SimpleLoadingDialog
+        from modules.startup_loading_screen import StartupLoadingScreen, SimpleLoadingDialog
         print("OK Startup loading screen imports")
 
         # Test account settings
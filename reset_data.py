@@ -91,6 +91,17 @@ def reset_to_empty_csv():
         except Exception as e:
             print(f"❌ Failed to reset {filename}: {e}")
     
+    # Remove the notification history database
+    for filename in ('notifications.db', 'notifications.db-wal', 'notifications.db-shm'):
+        file_path = os.path.join('data', filename)
+        if os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+                print(f"✅ Removed: {filename}")
+                reset_count += 1
+            except Exception as e:
+                print(f"❌ Failed to remove {filename}: {e}")
+    
     # Remove daily activities directory
     daily_activities_dir = os.path.join('data', 'daily_activities')
     if os.path.exists(daily_activities_dir):
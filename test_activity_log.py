@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test the append-only daily activity log behind ActivityTracker
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.activity_log import ActivityLog
+
+
+def _record(timestamp, module='inventory', activity_type='user_action', level='info', execution_time=None):
+    return {'timestamp': timestamp, 'activity_type': activity_type, 'level': level, 'module': module,
+            'action': 'edit', 'description': f"{module} changed", 'user_id': 'anonymous',
+            'session_id': 'session_1', 'data_before': None, 'data_after': None,
+            'execution_time': execution_time, 'error_details': None, 'stack_trace': None, 'metadata': None}
+
+
+def test_flush_appends_to_daily_segments():
+    """Each flush writes only new records, into the segment of their day"""
+    print("🧪 Testing activity log segments...")
+    with tempfile.TemporaryDirectory() as log_dir:
+        log = ActivityLog(log_dir)
+        log.append(_record('2025-06-17T23:59:00'))
+        log.append(_record('2025-06-18T00:01:00'))
+        assert log.flush() == 2 and log.flush() == 0
+        assert log.segment_days() == ['2025-06-18', '2025-06-17']
+
+        for minute in range(10):
+            log.append(_record(f"2025-06-18T01:{minute:02d}:00", module='sales'))
+        assert log.flush() == 10
+        assert log._connection('2025-06-18').execute("SELECT COUNT(*) FROM activities").fetchone()[0] == 11
+        log.close()
+
+        reopened = ActivityLog(log_dir)
+        assert len(reopened.query()) == 12
+        assert reopened.query(limit=1)[0]['timestamp'] == '2025-06-18T01:09:00'
+    print("✅ Flushes append to daily segments")
+
+
+def test_queries_use_indexes_and_time_range():
+    """Time-bounded queries open only overlapping segments; filters are indexed SQL"""
+    print("🧪 Testing activity queries...")
+    with tempfile.TemporaryDirectory() as log_dir:
+        log = ActivityLog(log_dir, retention_days=30)
+        today = date(2025, 6, 20)
+        for days_ago in range(40):
+            day = (today - timedelta(days=days_ago)).isoformat()
+            log.append(_record(f"{day}T10:00:00", module='inventory'))
+            log.append(_record(f"{day}T11:00:00", module='sales', level='error', execution_time=0.5))
+        log.append(_record('2025-06-20T12:00:00', module='pricing', activity_type='performance', execution_time=1.5))
+        log.flush()
+
+        opened = []
+        original = log._connection
+        log._connection = lambda day: opened.append(day) or original(day)
+        summary = log.summary(start='2025-06-19T12:00:00')
+        assert set(opened) == {'2025-06-19', '2025-06-20'}
+        assert summary['total'] == 3 and summary['by_level'] == {'info': 2, 'error': 1}
+        assert summary['by_module'] == {'inventory': 1, 'sales': 1, 'pricing': 1}
+        assert summary['performance_avg'] == 1.0
+
+        opened.clear()
+        latest = log.query(level='error', limit=5)
+        assert len(latest) == 5 and len(set(opened)) == 5 and latest[0]['timestamp'] == '2025-06-20T11:00:00'
+        assert [r['module'] for r in log.query(module_contains='PRIC')] == ['pricing']
+        plan = ' '.join(row[3] for row in original('2025-06-20').execute(
+            "EXPLAIN QUERY PLAN SELECT record FROM activities WHERE module = 'sales' ORDER BY timestamp DESC"))
+        assert 'idx_activities_module' in plan, plan
+
+        log._connection = original
+        assert log.rotate(today) == 9 and len(log.segment_days()) == 31
+    print("✅ Queries touch only the needed segments")
+
+
+def test_tracker_imports_legacy_json_and_queries_log():
+    """ActivityTracker imports activities.json once and answers from the log"""
+    print("🧪 Testing ActivityTracker on the activity log...")
+    QApplication.instance() or QApplication(sys.argv)
+    from modules.activity_tracker import ActivityTracker, ActivityLevel, ActivityType
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        try:
+            os.makedirs('data/daily_activities')
+            earlier = (datetime.now() - timedelta(hours=12)).isoformat()
+            with open('data/activities.json', 'w') as f:
+                json.dump([_record(earlier, module='legacy')], f)
+            with open('data/daily_activities/activities_2025-06-07.json', 'w') as f:
+                json.dump([_record('2025-06-07T09:00:00', module='legacy')] * 3, f)
+
+            tracker = ActivityTracker()
+            tracker.track_user_action('inventory', 'add_item', 'Added rice')
+            tracker.track_error('sales', 'save', ValueError('bad amount'))
+            assert tracker.activity_log.pending_count == 3
+            tracker.save_activities()
+            assert tracker.activity_log.pending_count == 0
+
+            assert len(tracker.get_activities(module='legacy')) == 4
+            errors = tracker.get_activities(level=ActivityLevel.ERROR)
+            assert len(errors) == 1 and errors[0].error_details == 'bad amount'
+            assert tracker.get_activities(activity_type=ActivityType.USER_ACTION, limit=1)[0].action == 'add_item'
+
+            summary = tracker.get_activity_summary(hours=24)
+            assert summary['total_activities'] == 4 and summary['errors'] == 1
+
+            # A second start does not import the legacy files again
+            tracker.activity_log.close()
+            restarted = ActivityTracker()
+            assert len(restarted.get_activities(module='legacy')) == 4
+            restarted.clear_activities()
+            assert restarted.get_activities() == []
+            restarted.activity_log.close()
+        finally:
+            os.chdir(cwd)
+    print("✅ Tracker imports legacy history once and queries the log")
+
+
+def test_past_segments_are_closed_and_failed_writes_kept():
+    """Queries leave no past-day segment open; records of a segment that cannot be written stay pending"""
+    print("🧪 Testing segment connections and failed writes...")
+    with tempfile.TemporaryDirectory() as log_dir:
+        log = ActivityLog(log_dir)
+        today = date.today().isoformat()
+        for day in ('2025-06-16', '2025-06-17', today):
+            log.append(_record(f"{day}T10:00:00"))
+        log.flush()
+        assert len(log.query()) == 3 and log.summary()['total'] == 3
+        assert list(log._connections) == [today]
+
+        # A damaged segment: its records stay pending and the other days are still read
+        with open(log.segment_path('2025-06-18'), 'wb') as f:
+            f.write(b'not a database' * 100)
+        log.append(_record('2025-06-18T09:00:00', module='sales'))
+        log.append(_record('2025-06-19T09:00:00', module='sales'))
+        assert log.flush() == 1 and log.pending_count == 1
+        assert [r['timestamp'] for r in log.query(module='sales')] == ['2025-06-19T09:00:00']
+        assert log.summary()['total'] == 4 and log.pending_count == 1
+        assert list(log._connections) == [today]
+        log.close()
+    print("✅ Past segments are closed and failed writes kept")
+
+
+def main():
+    """Run all activity log tests"""
+    tests = [
+        test_flush_appends_to_daily_segments,
+        test_queries_use_indexes_and_time_range,
+        test_tracker_imports_legacy_json_and_queries_log,
+        test_past_segments_are_closed_and_failed_writes_kept,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
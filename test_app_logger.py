@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test the low-overhead AppLogger hot path (ring buffer, queued handlers, batched signals)
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import threading
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from utils.app_logger import AppLogger, get_logger
+
+
+def _process_until(app, condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_ring_buffer_and_caller_info():
+    """The buffer keeps the newest entries; caller info is only looked up for warnings and up"""
+    print("🧪 Testing log buffer...")
+    logger = get_logger()
+    buffer = AppLogger.get_log_buffer()
+    AppLogger.clear_log_buffer()
+    for n in range(AppLogger._max_buffer_size + 100):
+        logger.debug(f"row {n} loaded")
+    logger.warning("Stock below reorder level")
+
+    assert AppLogger.get_log_buffer() is buffer and len(buffer) == AppLogger._max_buffer_size
+    assert buffer[0][1] == "row 101 loaded" and buffer[-2][3] == ""
+    level, message, _, caller_info, stack_trace = buffer[-1]
+    assert level == 'WARNING' and stack_trace == ""
+    assert caller_info.startswith("test_app_logger.py:test_ring_buffer_and_caller_info:")
+    AppLogger.clear_log_buffer()
+    assert len(AppLogger.get_log_buffer()) == 0
+    print("✅ Ring buffer and lazy caller info work")
+
+
+def test_handlers_run_on_listener_thread():
+    """Records are formatted and written by the queue listener, not the logging thread"""
+    print("🧪 Testing queued handlers...")
+    logger = get_logger()
+    assert logger.logger.handlers == [logger.queue_handler]
+
+    class Recorder(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.threads = []
+
+        def emit(self, record):
+            self.threads.append(threading.current_thread())
+
+    recorder = Recorder()
+    logger.listener.handlers = logger.listener.handlers + (recorder,)
+    try:
+        logger.info("✅ Inventory saved for ₹1200")
+        deadline = time.time() + 5
+        while not recorder.threads and time.time() < deadline:
+            time.sleep(0.005)
+    finally:
+        logger.listener.handlers = tuple(h for h in logger.listener.handlers if h is not recorder)
+    assert recorder.threads and recorder.threads[0] is not threading.current_thread()
+
+    with open(logger.log_file, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if "Inventory saved" in line]
+    assert lines and "[SUCCESS] Inventory saved for Rs.1200" in lines[-1]
+    assert "test_handlers_run_on_listener_thread" in lines[-1]
+    print("✅ Handlers run on the listener thread")
+
+
+def test_signals_are_batched():
+    """A burst of log lines reaches the logs viewer as one batch"""
+    print("🧪 Testing batched log signals...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    from modules.logs_viewer import LogsViewerWidget
+
+    logger = get_logger()
+    AppLogger.clear_log_buffer()
+    logger.signal.flush()
+    viewer = LogsViewerWidget()
+    _process_until(app, lambda: False, timeout=0.3)
+    batches = []
+    logger.signal.new_logs.connect(batches.append)
+    rows = viewer.logs_table.rowCount()
+
+    for n in range(50):
+        logger.info(f"Processing table {n}")
+    assert batches == []
+    assert _process_until(app, lambda: sum(len(b) for b in batches) >= 50)
+    assert len(batches) == 1
+    assert viewer.logs_table.rowCount() == rows + 50
+    logger.signal.new_logs.disconnect(batches.append)
+    viewer.deleteLater()
+    print("✅ Log signals are batched")
+
+
+def test_shutdown_with_closed_console():
+    """Shutting down after stdout was closed still writes queued records to the files and raises nothing"""
+    print("🧪 Testing logger shutdown with a closed console...")
+    console = io.StringIO()
+    with mock.patch.object(sys, 'stdout', console), mock.patch('atexit.register'):
+        logger = AppLogger()
+    try:
+        logger.logger.info("Closing kitchen for the night")
+        console.close()
+        logger.shutdown()
+        logger.shutdown()
+        assert logger.listener is None and len(logger.handlers) == 2
+        with open(logger.log_file, 'r', encoding='utf-8') as f:
+            assert "Closing kitchen for the night" in f.read()
+    finally:
+        for handler in logger.handlers:
+            logger.logger.removeHandler(handler)
+            handler.close()
+        logger.logger.removeHandler(logger.queue_handler)
+    print("✅ Shutdown skips the closed console")
+
+
+def main():
+    """Run all app logger tests"""
+    tests = [
+        test_ring_buffer_and_caller_info,
+        test_handlers_run_on_listener_thread,
+        test_signals_are_batched,
+        test_shutdown_with_closed_console,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
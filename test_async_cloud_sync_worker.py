@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test and benchmark the concurrent collection pipeline in AsyncCloudSyncWorker
+against the in-memory Firestore client
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.async_cloud_sync_worker import AsyncCloudSyncWorker
+from modules.cloud_delta_sync import UploadManifest
+from modules.dataframe_merge import MergeBaseStore
+from modules.fake_firestore import FakeFirestoreClient
+
+COLLECTIONS = [f"table_{n:02d}" for n in range(17)]
+
+
+class _FakeFirebaseManager:
+    """The parts of OptimizedFirebaseManager the worker uses"""
+
+    def __init__(self, db, data_dir):
+        self.db = db
+        self.upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+    def is_database_available(self):
+        return True
+
+    def is_authenticated(self):
+        return True
+
+
+def _tables(rows=250):
+    return {
+        name: pd.DataFrame({
+            'item_id': np.arange(rows),
+            'item_name': [f"{name} item {n}" for n in range(rows)],
+            'quantity': np.arange(rows) * 1.5,
+        })
+        for name in COLLECTIONS
+    }
+
+
+def _records(db):
+    """Number of table documents (watermark documents excluded)"""
+    return sum(1 for path in db.docs if '/_sync_meta/' not in path)
+
+
+def _watermark_versions(db):
+    return sum(data['version'] for path, data in db.docs.items() if '/_sync_meta/' in path)
+
+
+def _worker(operation, db, data_dir, data=None):
+    QApplication.instance() or QApplication(sys.argv)
+    settings = {'user_id': 'user-1', 'sync_collections': COLLECTIONS}
+    worker = AsyncCloudSyncWorker(operation, _FakeFirebaseManager(db, data_dir), settings, data)
+    worker.merge_base = MergeBaseStore(data_dir)
+    results = {'progress': [], 'completed': [], 'errors': []}
+    worker.progress_updated.connect(results['progress'].append)
+    worker.operation_completed.connect(results['completed'].append)
+    worker.error_occurred.connect(results['errors'].append)
+    return worker, results
+
+
+def test_upload_runs_collections_concurrently():
+    """17 collections upload in parallel while in-flight commits stay bounded"""
+    print("🧪 Testing concurrent upload...")
+    db = FakeFirestoreClient(latency=0.02)
+    with tempfile.TemporaryDirectory() as data_dir:
+        worker, results = _worker('upload', db, data_dir, _tables())
+
+        started = time.perf_counter()
+        worker.perform_upload()
+        elapsed = time.perf_counter() - started
+
+        assert not results['errors'], results['errors']
+        assert results['completed'][-1]['success']
+        assert _records(db) == 17 * 250 and db.commits == 17 * 3
+        assert all(db.docs[f'users/user-1/_sync_meta/{name}']['version'] == 1 for name in COLLECTIONS)
+
+        # Each collection also reads, writes and re-reads its watermark
+        sequential = (db.commits + 3 * len(COLLECTIONS)) * db.latency
+        assert 1 < db.max_in_flight <= AsyncCloudSyncWorker.MAX_IN_FLIGHT_BATCHES
+        assert elapsed < sequential * 0.75, f"{elapsed:.2f}s vs {sequential:.2f}s sequential"
+
+        collections = {update['collection'] for update in results['progress'] if update['current_operation'].startswith('Uploaded')}
+        assert collections == set(COLLECTIONS)
+        assert results['progress'][-1]['progress'] == 100
+    print(f"✅ {db.commits} commits took {elapsed:.2f}s (sequential: {sequential:.2f}s)")
+
+
+def test_download_runs_collections_concurrently():
+    """Collections stream in parallel and come back as DataFrames"""
+    print("🧪 Testing concurrent download...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as data_dir:
+        uploader, _ = _worker('upload', db, data_dir, _tables(20))
+        uploader.perform_upload()
+
+        db.latency = 0.05
+        worker, results = _worker('download', db, data_dir)
+        started = time.perf_counter()
+        worker.perform_download()
+        elapsed = time.perf_counter() - started
+
+        downloaded = results['completed'][-1]['data']
+        assert set(downloaded) == set(COLLECTIONS)
+        assert len(downloaded['table_05']) == 20 and '_record_hash' not in downloaded['table_05'].columns
+        assert elapsed < len(COLLECTIONS) * db.latency * 0.75
+    print(f"✅ 17 collections downloaded in {elapsed:.2f}s")
+
+
+def test_cancel_stops_remaining_collections():
+    """Cancelling mid-upload stops further batches and collections"""
+    print("🧪 Testing cancellation...")
+    db = FakeFirestoreClient(latency=0.02)
+    with tempfile.TemporaryDirectory() as data_dir:
+        worker, results = _worker('upload', db, data_dir, _tables())
+        worker.progress_updated.connect(
+            lambda update: worker.cancel_operation() if update['current_operation'].startswith('Uploaded') else None)
+        worker.perform_upload()
+
+        assert not results['completed']
+        assert 0 < _records(db) < 17 * 250
+        uploaded = {name: len(worker.firebase_manager.upload_manifest.uploaded('user-1', name)) for name in COLLECTIONS}
+        assert sum(uploaded.values()) == _records(db)
+        # Every collection with committed rows has published a watermark
+        assert all(f'users/user-1/_sync_meta/{name}' in db.docs for name, count in uploaded.items() if count)
+    print(f"✅ Cancelled after {_records(db)} of {17 * 250} records")
+
+
+def test_failed_download_is_reported():
+    """A collection that cannot be streamed fails the download instead of coming back empty"""
+    print("🧪 Testing failed download...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as data_dir:
+        uploader, _ = _worker('upload', db, data_dir, _tables(20))
+        uploader.perform_upload()
+        base_files = sorted(os.listdir(data_dir))
+
+        db.offline = True
+        worker, results = _worker('download', db, data_dir)
+        worker.perform_download()
+
+        assert not results['completed']
+        assert len(results['errors']) == 1 and results['errors'][0]['operation_type'] == 'download'
+        assert 'unreachable' in results['errors'][0]['error']
+        assert sorted(os.listdir(data_dir)) == base_files
+    print("✅ Failed downloads are reported")
+
+
+def test_failed_commit_resumes_on_next_upload():
+    """A commit failing mid-upload reports an error; the next upload sends only what did not land"""
+    print("🧪 Testing failed upload...")
+    db = FakeFirestoreClient()
+    original_apply = db.apply
+    calls = {'count': 0}
+
+    def flaky_apply(operations):
+        calls['count'] += 1
+        if calls['count'] == 10:
+            raise ConnectionError("deadline exceeded")
+        original_apply(operations)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        db.apply = flaky_apply
+        worker, results = _worker('upload', db, data_dir, _tables())
+        worker.perform_upload()
+        db.apply = original_apply
+
+        assert not results['completed'] and 'deadline exceeded' in results['errors'][0]['error']
+        landed = _records(db)
+        assert 0 < landed < 17 * 250
+        assert worker.merge_base.load('table_00') is None
+
+        retry, retry_results = _worker('upload', db, data_dir, _tables())
+        writes, versions = db.writes, _watermark_versions(db)
+        retry.perform_upload()
+        assert retry_results['completed'][-1]['success']
+        watermark_writes = _watermark_versions(db) - versions
+        assert _records(db) == 17 * 250 and db.writes - writes == 17 * 250 - landed + watermark_writes
+    print(f"✅ Retry sent the {17 * 250 - landed} records that had not landed")
+
+
+def main():
+    """Run all async cloud sync worker tests"""
+    tests = [
+        test_upload_runs_collections_concurrently,
+        test_download_runs_collections_concurrently,
+        test_cancel_stops_remaining_collections,
+        test_failed_download_is_reported,
+        test_failed_commit_resumes_on_next_upload,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
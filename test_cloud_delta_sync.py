@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test delta uploads to Firestore with stable document IDs and the upload manifest
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.cloud_delta_sync import UploadManifest, find_id_column, stable_record_ids, upload_delta
+from modules.fake_firestore import FakeFirestoreClient, FakeWriteBatch
+
+
+def _inventory(rows=600):
+    return pd.DataFrame({
+        'item_id': np.arange(1, rows + 1, dtype=float),
+        'item_name': [f"Item {n}" for n in range(rows)],
+        'quantity': np.arange(rows) % 50,
+        'unit': ['kg'] * rows,
+    })
+
+
+def _sync(db, manifest, table, df):
+    delta = manifest.plan('user-1', table, df)
+    upload_delta(db, 'user-1', delta, manifest, batch_size=100)
+    return delta
+
+
+def test_stable_ids():
+    """Natural id columns give the document IDs, content hashes otherwise"""
+    print("🧪 Testing stable record IDs...")
+    df = _inventory(3)
+    assert find_id_column(df) == 'item_id'
+    assert stable_record_ids(df).tolist() == ['1', '2', '3']
+
+    no_ids = pd.DataFrame({'recipe_name': ['Idli', 'Idli', 'Vada'], 'appliance_name': ['Steamer', 'Steamer', 'Fryer']})
+    ids = stable_record_ids(no_ids)
+    assert ids[0].startswith('h') and ids[1] == f"{ids[0]}-1" and ids[2] != ids[0]
+    assert stable_record_ids(no_ids.iloc[::-1]).tolist()[1] == ids[0]
+
+    duplicate_ids = pd.DataFrame({'recipe_id': [1, 1], 'item_name': ['Rice', 'Dal']})
+    assert find_id_column(duplicate_ids) is None
+    print("✅ Stable record IDs work")
+
+
+def test_one_edit_costs_one_write():
+    """After the first upload only changed, added and removed rows are written"""
+    print("🧪 Testing delta uploads...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = UploadManifest(os.path.join(temp_dir, '.cloud_manifest.json'))
+        df = _inventory()
+
+        assert _sync(db, manifest, 'inventory', df).write_count == 600
+        assert len(db.docs) == 600 and db.writes == 600
+
+        # Re-syncing unchanged data writes nothing, even with ints re-read as floats
+        assert _sync(db, manifest, 'inventory', df.astype({'quantity': float})).write_count == 0
+
+        edited = df.copy()
+        edited.loc[10, 'quantity'] = 999
+        delta = _sync(db, manifest, 'inventory', edited)
+        assert delta.write_count == 1 and delta.doc_ids == ['11'] and delta.unchanged == 599
+        assert db.docs['users/user-1/inventory/11']['quantity'] == 999.0
+
+        trimmed = edited.drop(index=[0]).copy()
+        delta = _sync(db, manifest, 'inventory', trimmed)
+        assert delta.deletes == ['1'] and delta.write_count == 1
+        assert 'users/user-1/inventory/1' not in db.docs and len(db.docs) == 599
+
+        # The manifest survives a restart
+        reloaded = UploadManifest(manifest.path)
+        assert reloaded.plan('user-1', 'inventory', trimmed).write_count == 0
+        assert reloaded.plan('user-1', 'inventory', trimmed, full=True).write_count == 599
+    print("✅ Delta uploads work")
+
+
+def test_column_order_and_renames():
+    """Reordered columns plan no writes and keep content-hash IDs; a renamed column rewrites every row"""
+    print("🧪 Testing column changes...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = UploadManifest(os.path.join(temp_dir, '.cloud_manifest.json'))
+        df = _inventory(50)
+        _sync(db, manifest, 'inventory', df)
+        assert _sync(db, manifest, 'inventory', df[list(df.columns)[::-1]]).write_count == 0
+
+        renamed = _sync(db, manifest, 'inventory', df.rename(columns={'unit': 'uom'}))
+        assert len(renamed.records) == 50 and not renamed.deletes
+        assert 'uom' in db.docs['users/user-1/inventory/1']
+
+        notes = pd.DataFrame({'note': ['Clean fridge', 'Order gas'], 'author': ['Ravi', 'Meena']})
+        _sync(db, manifest, 'notes', notes)
+        assert _sync(db, manifest, 'notes', notes[['author', 'note']]).write_count == 0
+    print("✅ Column changes are handled")
+
+
+def test_failed_batch_is_retried():
+    """Only committed batches are recorded, so a failed sync resumes where it stopped"""
+    print("🧪 Testing interrupted upload...")
+    db = FakeFirestoreClient()
+    original_commit = FakeWriteBatch.commit
+    commits = {'count': 0}
+
+    def flaky_commit(batch):
+        commits['count'] += 1
+        if commits['count'] == 3:
+            raise ConnectionError("network down")
+        original_commit(batch)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = UploadManifest(os.path.join(temp_dir, '.cloud_manifest.json'))
+        FakeWriteBatch.commit = flaky_commit
+        try:
+            _sync(db, manifest, 'inventory', _inventory())
+            assert False, "upload should have failed"
+        except ConnectionError:
+            pass
+        finally:
+            FakeWriteBatch.commit = original_commit
+
+        assert len(manifest.uploaded('user-1', 'inventory')) == 200
+        assert _sync(db, manifest, 'inventory', _inventory()).write_count == 400
+        assert len(db.docs) == 600
+    print("✅ Interrupted upload resumes")
+
+
+def test_unreadable_manifest_and_cancelled_upload():
+    """A corrupt manifest means a full re-upload; a cancelled upload records only what landed"""
+    print("🧪 Testing manifest corruption and cancellation...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, '.cloud_manifest.json')
+        manifest = UploadManifest(path)
+        _sync(db, manifest, 'inventory', _inventory())
+
+        with open(path, 'w') as f:
+            f.write('{"users": {"user-1": ')
+        corrupt = UploadManifest(path)
+        assert corrupt.uploaded('user-1', 'inventory') == {}
+        assert corrupt.plan('user-1', 'inventory', _inventory()).write_count == 600
+
+        # Cancelled after two batches: the rest is planned again next time
+        batches = []
+        delta = corrupt.plan('user-1', 'inventory', _inventory())
+        written = upload_delta(db, 'user-1', delta, corrupt, batch_size=100,
+                               on_batch=batches.append, is_cancelled=lambda: len(batches) >= 2)
+        assert written == 200 and batches == [100, 100]
+        assert UploadManifest(path).plan('user-1', 'inventory', _inventory()).write_count == 400
+
+    # A manifest that cannot be saved keeps working in memory
+    unwritable = UploadManifest(os.path.join(os.devnull, 'manifest.json'))
+    unwritable.record('user-1', 'inventory', {'1': 'abc'})
+    assert unwritable.uploaded('user-1', 'inventory') == {'1': 'abc'}
+    print("✅ Manifest errors are recovered from")
+
+
+def main():
+    """Run all delta sync tests"""
+    tests = [
+        test_stable_ids,
+        test_one_edit_costs_one_write,
+        test_column_order_and_renames,
+        test_failed_batch_is_retried,
+        test_unreadable_manifest_and_cancelled_upload,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Test the durable cloud outbox and its background drainer
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.async_cloud_sync_worker import AsyncCloudSyncWorker
+from modules.cloud_delta_sync import UploadManifest
+from modules.cloud_outbox import CloudOutbox, OutboxDrainer
+from modules.fake_firestore import FakeFirestoreClient
+from modules.sync_manager import IntelligentSyncManager, SyncOperation, SyncWorker
+from modules.table_store import TableStore
+
+
+class _FakeFirebaseManager:
+    """The parts of OptimizedFirebaseManager the drainer uses"""
+
+    def __init__(self, db, data_dir, batch_size=100):
+        self.db = db
+        self.batch_size = batch_size
+        self.upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+    def is_authenticated(self):
+        return True
+
+    def is_database_available(self):
+        return True
+
+    def get_current_user(self):
+        return {'user_id': 'user-1'}
+
+
+def _inventory(rows):
+    return pd.DataFrame({
+        'item_id': np.arange(rows),
+        'item_name': [f"Item {n}" for n in range(rows)],
+        'quantity': np.arange(rows) * 1.5,
+    })
+
+
+def _drain(drainer):
+    """Drain until nothing is ready; returns the number of entries cleared"""
+    total = 0
+    while True:
+        cleared = drainer.drain_once()
+        if not cleared:
+            return total
+        total += cleared
+
+
+def test_outbox_coalesces_and_survives_restart():
+    """Repeated edits of a row leave one entry; the queue is still there after reopening"""
+    print("🧪 Testing outbox capture...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, '.cloud_outbox.db')
+        manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+        outbox = CloudOutbox(path)
+
+        df = _inventory(10)
+        outbox.mark_changed('inventory')
+        marked_at = outbox.changed_tables()['inventory']
+        assert outbox.capture('user-1', 'inventory', df, manifest, marked_at) == 10
+        assert outbox.changed_tables() == {}
+
+        for quantity in (5.0, 6.0, 7.0):
+            df.loc[3, 'quantity'] = quantity
+            outbox.capture('user-1', 'inventory', df, manifest)
+        assert len(outbox) == 10
+        entry = next(e for e in outbox.ready('user-1', 100) if e.doc_id == '3')
+        assert entry.record['quantity'] == 7.0 and entry.revision == 3
+
+        # Rows removed before they were ever uploaded need no delete
+        outbox.capture('user-1', 'inventory', df.iloc[:8], manifest)
+        assert len(outbox) == 8
+        outbox.close()
+
+        reopened = CloudOutbox(path)
+        assert len(reopened) == 8 and reopened.stats()['tables'] == {'inventory': {'pending': 8, 'failing': 0}}
+    print("✅ Outbox coalesces edits and is durable")
+
+
+def test_drainer_batches_and_backs_off():
+    """The drainer commits in batch_size chunks and retries failed batches with backoff"""
+    print("🧪 Testing outbox draining...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        db = FakeFirestoreClient()
+        manager = _FakeFirebaseManager(db, data_dir, batch_size=40)
+        store = TableStore(data_dir)
+        drainer = OutboxDrainer(CloudOutbox(os.path.join(data_dir, '.cloud_outbox.db')), store, manager,
+                                start=False)
+        store.write_listeners.append(drainer.table_changed)
+        failures = []
+        drainer.drain_failed.connect(failures.append)
+
+        store.write('inventory', _inventory(100))
+        db.offline = True
+        assert drainer.drain_once() == 0 and failures
+        entries = drainer.outbox.ready('user-1', 100, now=time.time() + 3600)
+        assert len(entries) == 100 and {e.attempts for e in entries[:40]} == {1}
+        assert [e.attempts for e in drainer.outbox.ready('user-1', 100)] == [0] * 60
+        assert 1.5 < drainer.outbox.retry_delay(1) < 2.5 and drainer.outbox.retry_delay(4) > 12
+        assert drainer.outbox.retry_delay(50) <= CloudOutbox.MAX_RETRY_DELAY * 1.2
+
+        # Back online: the 60 untouched entries go first, the failed batch after its delay
+        db.offline = False
+        assert _drain(drainer) == 60
+        drainer.outbox._conn.execute("UPDATE outbox SET next_attempt = 0")
+        assert _drain(drainer) == 40
+        assert db.commits == 3 and len(db.documents('users/user-1/inventory')) == 100
+        assert len(drainer.outbox) == 0
+
+        # A later edit sends only the changed and removed rows
+        df = _inventory(100)
+        df.loc[7, 'quantity'] = 99.0
+        store.write('inventory', df.iloc[:95])
+        assert _drain(drainer) == 6
+        assert db.documents('users/user-1/inventory')['7']['quantity'] == 99.0
+        assert len(db.documents('users/user-1/inventory')) == 95
+    print("✅ Drainer batches writes and backs off after failures")
+
+
+def test_restart_does_not_resend_committed_rows():
+    """Entries committed before a crash are cleared from the manifest, not uploaded again"""
+    print("🧪 Testing resume after crash...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        db = FakeFirestoreClient()
+        store = TableStore(data_dir)
+        outbox_path = os.path.join(data_dir, '.cloud_outbox.db')
+        manager = _FakeFirebaseManager(db, data_dir)
+        drainer = OutboxDrainer(CloudOutbox(outbox_path), store, manager, start=False)
+        store.write_listeners.append(drainer.table_changed)
+        store.write('inventory', _inventory(30))
+        drainer.capture_changed_tables('user-1')
+
+        # Crash after the batch reached Firestore and the manifest, before the outbox was updated
+        entries = drainer.outbox.ready('user-1', 100)
+        batch = db.batch()
+        for entry in entries:
+            batch.set(db.collection('users').document('user-1').collection('inventory').document(entry.doc_id),
+                      entry.record)
+        batch.commit()
+        drainer._record_committed(entries)
+        drainer.outbox.close()
+
+        # A table written while the app was down is only marked, and picked up after the restart
+        store.write_listeners.clear()
+        restarted = OutboxDrainer(CloudOutbox(outbox_path), store,
+                                  _FakeFirebaseManager(db, data_dir), start=False)
+        restarted.outbox.mark_changed('waste')
+        store.write('waste', pd.DataFrame({'waste_id': [1, 2], 'item_name': ['Rice', 'Dal']}))
+        commits = db.commits
+        assert _drain(restarted) == 32
+        assert db.commits == commits + 1
+        assert len(db.documents('users/user-1/waste')) == 2 and len(restarted.outbox) == 0
+
+        # The drainer thread picks up writes on its own
+        restarted.start()
+        store.write_listeners.append(restarted.table_changed)
+        store.write('waste', pd.DataFrame({'waste_id': [1, 2, 3], 'item_name': ['Rice', 'Dal', 'Oil']}))
+        deadline = time.time() + 10
+        while len(db.documents('users/user-1/waste')) < 3 and time.time() < deadline:
+            time.sleep(0.05)
+        restarted.stop(5)
+        assert len(db.documents('users/user-1/waste')) == 3
+    print("✅ Restart resumes without re-uploading committed rows")
+
+
+def test_downloaded_rows_are_not_uploaded_back():
+    """Saving a table just downloaded from the cloud queues nothing; later edits still do"""
+    print("🧪 Testing download followed by capture...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+        db = FakeFirestoreClient()
+        store = TableStore(first_dir)
+        drainer = OutboxDrainer(CloudOutbox(os.path.join(first_dir, '.cloud_outbox.db')), store,
+                                _FakeFirebaseManager(db, first_dir), start=False)
+        store.write_listeners.append(drainer.table_changed)
+        store.write('inventory', _inventory(20))
+        store.write('notes', pd.DataFrame({'note': ['Clean fridge', 'Order gas', 'Clean fridge']}))
+        assert _drain(drainer) == 23
+
+        # Another installation downloads both collections and saves them as CSV
+        manager = _FakeFirebaseManager(db, second_dir)
+        worker = AsyncCloudSyncWorker('download', manager, {'user_id': 'user-1'})
+        outbox = CloudOutbox(os.path.join(second_dir, '.cloud_outbox.db'))
+        for table in ('inventory', 'notes'):
+            path = os.path.join(second_dir, f"{table}.csv")
+            worker.download_collection(table, 'user-1').to_csv(path, index=False)
+            assert outbox.capture('user-1', table, pd.read_csv(path), manager.upload_manifest) == 0
+        assert len(outbox) == 0
+
+        inventory = pd.read_csv(os.path.join(second_dir, 'inventory.csv'))
+        inventory.loc[inventory['item_id'] == 4, 'quantity'] = 99.0
+        assert outbox.capture('user-1', 'inventory', inventory, manager.upload_manifest) == 1
+        assert [entry.doc_id for entry in outbox.ready('user-1', 100)] == ['4']
+
+        # An emptied collection leaves nothing in the manifest to delete
+        for doc_id in list(db.documents('users/user-1/notes')):
+            db.collection('users').document('user-1').collection('notes').document(doc_id).delete()
+        assert worker.download_collection('notes', 'user-1').empty
+        assert manager.upload_manifest.uploaded('user-1', 'notes') == {}
+        outbox.close()
+        drainer.outbox.close()
+    print("✅ Downloaded rows are not uploaded back")
+
+
+def test_drained_changes_reach_other_installations():
+    """A drained batch bumps the table's watermark and publishes its deletes as tombstones"""
+    print("🧪 Testing watermarks published by the drainer...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+        db = FakeFirestoreClient()
+        store = TableStore(first_dir)
+        drainer = OutboxDrainer(CloudOutbox(os.path.join(first_dir, '.cloud_outbox.db')), store,
+                                _FakeFirebaseManager(db, first_dir), start=False)
+        store.write_listeners.append(drainer.table_changed)
+        store.write('inventory', _inventory(10))
+        assert _drain(drainer) == 10
+        assert db.docs['users/user-1/_sync_meta/inventory']['version'] == 1
+
+        # The second installation downloads the table and is then up to date
+        second = IntelligentSyncManager(_FakeFirebaseManager(db, second_dir), second_dir)
+        worker = SyncWorker(SyncOperation('op', 'download', ['inventory'], ''), second)
+        worker._perform_download()
+        assert not second.detect_remote_changes('inventory')[0]
+
+        # Rows edited and removed on the first installation go out through the outbox only
+        df = _inventory(10)
+        df.loc[2, 'quantity'] = 42.0
+        store.write('inventory', df.iloc[:8])
+        assert _drain(drainer) == 3
+        watermark = db.docs['users/user-1/_sync_meta/inventory']
+        assert watermark['version'] == 2 and watermark['record_count'] == 8
+        assert sorted(entry['id'] for entry in watermark['deleted']) == ['8', '9']
+        assert drainer.outbox.watermarks_due('user-1') == {}
+
+        assert second.detect_remote_changes('inventory')[0]
+        worker._perform_download()
+        local = pd.read_csv(os.path.join(second_dir, 'inventory.csv'))
+        assert sorted(local['item_id']) == list(range(8))
+        assert local.loc[local['item_id'] == 2, 'quantity'].iloc[0] == 42.0
+        assert not second.detect_remote_changes('inventory')[0]
+        second.change_detection_timer.stop()
+        drainer.outbox.close()
+    print("✅ Drained changes reach other installations")
+
+
+def test_failed_watermark_is_published_later():
+    """A watermark that could not be written after a commit stays due across restarts"""
+    print("🧪 Testing deferred watermark publishing...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        db = FakeFirestoreClient()
+        store = TableStore(data_dir)
+        outbox_path = os.path.join(data_dir, '.cloud_outbox.db')
+        drainer = OutboxDrainer(CloudOutbox(outbox_path), store, _FakeFirebaseManager(db, data_dir), start=False)
+        store.write_listeners.append(drainer.table_changed)
+        store.write('inventory', _inventory(5))
+        drainer.capture_changed_tables('user-1')
+
+        # Commit the batch, then lose the connection before the watermark is written
+        entries = drainer.outbox.ready('user-1', 100)
+        batch = db.batch()
+        for entry in entries:
+            batch.set(db.collection('users').document('user-1').collection('inventory').document(entry.doc_id),
+                      entry.record)
+        batch.commit()
+        drainer._record_committed(entries)
+        drainer.outbox.complete(entries)
+        db.offline = True
+        assert drainer.publish_watermarks('user-1') == 0
+        drainer.outbox.close()
+
+        db.offline = False
+        restarted = OutboxDrainer(CloudOutbox(outbox_path), store, _FakeFirebaseManager(db, data_dir), start=False)
+        assert restarted.outbox.watermarks_due('user-1') == {'inventory': []}
+        assert _drain(restarted) == 0
+        assert db.docs['users/user-1/_sync_meta/inventory']['version'] == 1
+        assert restarted.outbox.watermarks_due('user-1') == {}
+        restarted.outbox.close()
+    print("✅ Deferred watermarks are published later")
+
+
+def main():
+    """Run all cloud outbox tests"""
+    tests = [
+        test_outbox_coalesces_and_survives_restart,
+        test_drainer_batches_and_backs_off,
+        test_restart_does_not_resend_committed_rows,
+        test_downloaded_rows_are_not_uploaded_back,
+        test_drained_changes_reach_other_installations,
+        test_failed_watermark_is_published_later,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test the daily aggregate cube behind the sales, platform and waste reports
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from modules.daily_cube import (SALES_CUBE, DailyCube, get_daily_cube, invalidate_cube, period_range,
+                               record_rows)
+
+
+def _sales(rows, start=date(2026, 1, 1), seed=7):
+    random = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'date': [(start + timedelta(days=int(d))).isoformat() for d in random.randint(0, 90, rows)],
+        'recipe_name': random.choice(['Dosa', 'Idli', 'Vada', 'Upma'], rows),
+        'platform': random.choice(['Zomato', 'Swiggy', None], rows),
+        'payment_method': random.choice(['Cash', 'UPI', 'Card'], rows),
+        'quantity': random.randint(1, 5, rows),
+        'price': random.choice([30.0, 50.0, 80.0], rows),
+        'total_amount': random.choice([np.nan, 100.0, 240.0], rows),
+        'commission': random.choice([0.0, 12.5], rows),
+    })
+
+
+def test_cube_matches_raw_rows():
+    """Totals and breakdowns read from the cells equal the same sums over the rows"""
+    print("🧪 Testing cube totals...")
+    sales = _sales(2000)
+    cube = DailyCube('sales', SALES_CUBE)
+    revenue = sales['total_amount'].fillna(sales['price'] * sales['quantity'])
+    days = pd.to_datetime(sales['date'])
+
+    start, end = date(2026, 2, 1), date(2026, 2, 28)
+    in_feb = (days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))
+    totals = cube.totals(sales, start, end)
+    assert totals['count'] == in_feb.sum()
+    assert np.isclose(totals['revenue'], revenue[in_feb].sum())
+    assert np.isclose(totals['quantity'], sales.loc[in_feb, 'quantity'].sum())
+    assert np.isclose(totals['commission'], sales.loc[in_feb, 'commission'].sum())
+
+    by_recipe = cube.by(sales, 'recipe')
+    assert np.allclose(by_recipe['revenue'], revenue.groupby(sales['recipe_name']).sum().sort_index())
+    assert np.isclose(cube.totals(sales, platform='Zomato')['revenue'], revenue[sales['platform'] == 'Zomato'].sum())
+    assert cube.by(sales, 'platform').index.tolist() == ['', 'Swiggy', 'Zomato']
+    assert len(cube.sync(sales)) < len(sales) and cube.rebuilds == 1
+    assert not pd.api.types.is_datetime64_any_dtype(sales['date'])
+    print("✅ Cube totals match the rows")
+
+
+def test_new_rows_are_folded_in():
+    """Recorded rows update the cells without a rebuild; replaced or edited tables are rebuilt"""
+    print("🧪 Testing incremental updates...")
+    sales = _sales(500)
+    cube = get_daily_cube('sales')
+    cube.invalidate()
+    before = cube.totals(sales)
+    rebuilds = cube.rebuilds
+
+    new_sale = pd.DataFrame({'date': ['2026-04-02'], 'recipe_name': ['Dosa'], 'quantity': [2],
+                             'total_amount': [160.0], 'payment_method': ['UPI']})
+    sales = pd.concat([sales, new_sale], ignore_index=True)
+    record_rows('sales', new_sale, sales)
+    after = cube.totals(sales)
+    assert cube.rebuilds == rebuilds
+    assert after['count'] == before['count'] + 1 and np.isclose(after['revenue'], before['revenue'] + 160.0)
+    assert cube.totals(sales, date(2026, 4, 2), date(2026, 4, 2), recipe='Dosa', payment_method='UPI')['quantity'] >= 2
+    assert len(cube.rows(sales, date(2026, 4, 2), date(2026, 4, 2))) >= 1
+
+    # A sale added behind the cube's back (two rows at once) is caught on the next read
+    record_rows('sales', new_sale, pd.concat([sales, new_sale, new_sale], ignore_index=True))
+    sales = pd.concat([sales, new_sale, new_sale], ignore_index=True)
+    assert cube.totals(sales)['count'] == before['count'] + 3 and cube.rebuilds == rebuilds + 1
+
+    # Edited in place: the cube only notices when told
+    sales.loc[0, 'total_amount'] = 1000.0
+    cube.invalidate()
+    assert cube.by(sales, 'date')['revenue'].sum() == cube.totals(sales)['revenue']
+    assert cube.rebuilds == rebuilds + 2
+    print("✅ New rows are folded in")
+
+
+def test_period_selectors_and_platform_reports():
+    """Period choices map to day ranges; listed rows and platform totals come from the cubes"""
+    print("🧪 Testing period selectors...")
+    today = date(2026, 10, 16)
+    assert period_range("Today", today) == (today, today)
+    assert period_range("This Week", today) == (date(2026, 10, 12), None)
+    assert period_range("This Month", date(2026, 12, 5)) == (date(2026, 12, 1), date(2026, 12, 31))
+    assert period_range("This Year", today) == (date(2026, 1, 1), date(2026, 12, 31))
+    assert period_range("Last 7 Days", today) == (date(2026, 10, 10), today)
+    assert period_range("All Time", today) == (None, None)
+
+    zomato = pd.DataFrame({
+        'date': ['2026-10-16', '2026-10-01', 'not a date'],
+        'order_id': ['ZOM-1', 'ZOM-2', 'ZOM-3'],
+        'subtotal': [500.0, 450.0, 300.0],
+        'commission': [90.0, 81.0, 54.0],
+        'net_amount': [410.0, 369.0, 246.0],
+    })
+    cube = get_daily_cube('zomato')
+    assert cube.totals(zomato) == {'revenue': 1025.0, 'subtotal': 1250.0, 'commission': 225.0,
+                                   'delivery_fee': 0.0, 'count': 3.0}
+    assert cube.rows(zomato, today, today)['order_id'].tolist() == ['ZOM-1']
+    assert cube.rows(zomato, *period_range("This Month", today))['order_id'].tolist() == ['ZOM-1', 'ZOM-2']
+    assert cube.rows(zomato) is zomato
+    print("✅ Period selectors read from the cubes")
+
+
+def test_in_place_edits_bump_the_version():
+    """Same-length edits are rebuilt once the version is bumped; appends to a stale cube are not folded in"""
+    print("🧪 Testing cube versions...")
+    sales = _sales(300, seed=11)
+    cube = get_daily_cube('sales')
+    before = cube.totals(sales)['revenue']
+    rebuilds = cube.rebuilds
+
+    # Edited in place at the same length: same id, same length, only the version changes
+    sales.loc[sales.index[0], ['total_amount', 'quantity']] = [5000.0, 1]
+    version = cube.version
+    invalidate_cube('sales')
+    assert cube.version == version + 1 and cube.rebuilds == rebuilds
+    after = cube.totals(sales)['revenue']
+    assert cube.rebuilds == rebuilds + 1 and after != before
+    assert np.isclose(after, sales['total_amount'].fillna(sales['price'] * sales['quantity']).sum())
+
+    # Rows recorded while the cube is stale are picked up by the rebuild, not added twice
+    invalidate_cube('sales')
+    new_sale = pd.DataFrame({'date': ['2026-03-01'], 'recipe_name': ['Idli'], 'quantity': [1],
+                             'total_amount': [40.0]})
+    sales = pd.concat([sales, new_sale], ignore_index=True)
+    record_rows('sales', new_sale, sales)
+    assert np.isclose(cube.totals(sales)['revenue'], after + 40.0) and cube.rebuilds == rebuilds + 2
+
+    # Rows that cannot be folded in invalidate the cube instead of leaving it half updated
+    version = cube.version
+    more = pd.concat([sales, new_sale], ignore_index=True)
+    with mock.patch.object(cube, '_aggregate', side_effect=ValueError("bad row")):
+        record_rows('sales', new_sale, more)
+    assert cube.version == version + 1
+    assert np.isclose(cube.totals(more)['revenue'], after + 80.0) and cube.rebuilds == rebuilds + 3
+    print("✅ In-place edits bump the cube version")
+
+
+def test_sales_report_totals_cover_platform_rows():
+    """Sales report cards and the daily summary sum the platform rows' totals, as before the cube"""
+    print("🧪 Testing sales report totals...")
+    from types import SimpleNamespace
+    from modules.sales_reports import SalesReportsWidget, platform_totals
+
+    sales = pd.DataFrame({
+        'date': ['2026-10-16', '2026-10-16', '2026-10-15', '2026-10-16'],
+        'platform': ['Zomato', 'Swiggy', 'Zomato', None],
+        'total': [300.0, 200.0, 150.0, np.nan],
+        'total_amount': [320.0, np.nan, np.nan, 90.0],
+        'commission': [30.0, 20.0, 15.0, 0.0],
+    })
+    invalidate_cube('sales')
+    start = end = date(2026, 10, 16)
+    by_platform = platform_totals(sales, start, end)
+    platform_rows = sales[sales['platform'].notna() & (pd.to_datetime(sales['date']) == pd.Timestamp(start))]
+    assert by_platform.index.tolist() == ['Swiggy', 'Zomato']
+    assert by_platform['total'].sum() == platform_rows['total'].sum() == 500.0
+    assert by_platform['count'].sum() == len(platform_rows) == 2
+    assert by_platform['total'].get('Zomato') == 300.0
+
+    report = SalesReportsWidget.generate_daily_summary(SimpleNamespace(data={'sales': sales}), start, end)
+    assert "Total Orders: 2" in report and "Total Revenue: ₹500.00" in report
+    assert "Net Revenue: ₹450.00" in report and "Direct" not in report
+    print("✅ Sales report totals cover the platform rows")
+
+
+def main():
+    """Run all daily cube tests"""
+    tests = [
+        test_cube_matches_raw_rows,
+        test_new_rows_are_folded_in,
+        test_period_selectors_and_platform_reports,
+        test_in_place_edits_bump_the_version,
+        test_sales_report_totals_cover_platform_rows,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Test the key-based three-way merge used by smart sync
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.async_cloud_sync_worker import AsyncCloudSyncWorker
+from modules.cloud_delta_sync import UploadManifest
+from modules.cloud_sync_manager import ConflictResolution
+from modules.dataframe_merge import MergeBaseStore, three_way_merge
+from modules.fake_firestore import FakeFirestoreClient
+
+
+def _inventory():
+    return pd.DataFrame({
+        'item_id': [1, 2, 3, 4, 5],
+        'item_name': ['Rice', 'Dal', 'Salt', 'Ghee', 'Oil'],
+        'quantity': [10.0, 5.0, 1.0, 2.0, 3.0],
+    })
+
+
+def test_one_sided_changes_apply():
+    """Edits, inserts and deletes from either side apply once, without duplicate rows"""
+    print("🧪 Testing one-sided changes...")
+    base = _inventory()
+
+    local = base.copy()
+    local.loc[0, 'quantity'] = 12.0                      # local edit
+    local = local[local['item_name'] != 'Ghee']          # local delete
+    local = pd.concat([local, pd.DataFrame({'item_id': [6], 'item_name': ['Jaggery'], 'quantity': [1.0]})],
+                      ignore_index=True)
+
+    cloud = base.copy()
+    cloud.loc[1, 'quantity'] = 7.0                       # remote edit
+    cloud = cloud[cloud['item_name'] != 'Oil']           # remote delete
+    cloud['item_id'] = cloud['item_id'].astype(float)    # downloaded ids come back as floats
+
+    result = three_way_merge(local, cloud, base, 'inventory')
+    merged = result.merged
+    assert merged['item_name'].tolist() == ['Rice', 'Dal', 'Salt', 'Jaggery']
+    assert merged['quantity'].tolist() == [12.0, 7.0, 1.0, 1.0]
+    assert merged['item_id'].is_unique
+    assert (result.inserted, result.updated, result.deleted, result.conflicts) == (1, 2, 2, [])
+
+    # The old concat + drop_duplicates kept both versions of every edited row
+    assert len(pd.concat([local, cloud]).drop_duplicates()) > len(merged)
+    print(f"✅ {result.summary}")
+
+
+def test_conflict_policies():
+    """Rows edited on both sides follow the configured ConflictResolution policy"""
+    print("🧪 Testing conflict policies...")
+    base = _inventory()
+    local = base.copy()
+    local.loc[0, 'quantity'] = 12.0
+    local.loc[2, 'item_name'] = 'Rock Salt'
+    cloud = base.copy()
+    cloud.loc[0, 'item_name'] = 'Basmati Rice'
+    cloud.loc[2, 'item_name'] = 'Sea Salt'
+    cloud = cloud[cloud['item_name'] != 'Oil']
+    local.loc[4, 'quantity'] = 9.0                       # edited locally, deleted remotely
+
+    expected = {
+        ConflictResolution.LOCAL_WINS: [('Rice', 12.0), ('Rock Salt', 1.0), ('Oil', 9.0)],
+        ConflictResolution.REMOTE_WINS: [('Basmati Rice', 10.0), ('Sea Salt', 1.0), None],
+        ConflictResolution.MERGE: [('Basmati Rice', 12.0), ('Rock Salt', 1.0), ('Oil', 9.0)],
+        ConflictResolution.ASK_USER: [('Rice', 12.0), ('Rock Salt', 1.0), ('Oil', 9.0)],
+    }
+    for policy, rows in expected.items():
+        result = three_way_merge(local, cloud, base, 'inventory', policy)
+        assert result.conflicts == ['1', '3', '5'], result.conflicts
+        merged = result.merged.set_index('item_id')
+        for item_id, row in zip([1, 3, 5], rows):
+            if row is None:
+                assert item_id not in merged.index
+            else:
+                assert tuple(merged.loc[item_id, ['item_name', 'quantity']]) == row, (policy, merged.loc[item_id])
+
+    # Without a base snapshot edits cannot be attributed, so differing rows are conflicts
+    assert three_way_merge(local, cloud, None, 'inventory').conflicts == ['1', '3']
+
+    # Linear time: a 200k-row merge takes well under a second
+    n = 200000
+    big = pd.DataFrame({'item_id': np.arange(n), 'item_name': [f"Item {i}" for i in range(n)],
+                        'quantity': np.arange(n, dtype=float)})
+    local, cloud = big.copy(), big.copy()
+    local.loc[::100, 'quantity'] += 1
+    cloud.loc[50::100, 'item_name'] = 'Renamed'
+    started = time.perf_counter()
+    result = three_way_merge(local, cloud, big, 'inventory')
+    elapsed = time.perf_counter() - started
+    assert len(result.merged) == n and result.updated == 4000
+    print(f"✅ Conflict policies work ({n} rows merged in {elapsed:.2f}s)")
+
+
+def test_duplicate_keys_on_one_side():
+    """Rows repeating a key on only one side still match the other side's rows"""
+    print("🧪 Testing duplicate keys on one side...")
+
+    def ingredients(rows):
+        return pd.DataFrame(rows, columns=['recipe_id', 'item_name', 'quantity'])
+
+    a1, b2, c3 = (1, 'Rice', 100.0), (2, 'Dal', 50.0), (3, 'Salt', 5.0)
+
+    # No base: the repeated local row is kept, nothing else is duplicated
+    result = three_way_merge(ingredients([a1, a1, c3]), ingredients([a1, c3]), None, 'recipe_ingredients')
+    assert result.merged.values.tolist() == [list(a1), list(a1), list(c3)]
+
+    # A row repeated locally since the last sync is one insert
+    base = ingredients([a1, b2])
+    result = three_way_merge(ingredients([a1, b2, b2]), base, base, 'recipe_ingredients')
+    assert result.merged.values.tolist() == [list(a1), list(b2), list(b2)]
+    assert (result.inserted, result.updated, result.deleted) == (1, 0, 0), result.summary
+
+    # ... and removing the repeat again on the other side is one delete
+    base = ingredients([a1, b2, b2])
+    result = three_way_merge(base, ingredients([a1, b2]), base, 'recipe_ingredients')
+    assert result.merged.values.tolist() == [list(a1), list(b2)]
+    assert (result.inserted, result.updated, result.deleted) == (0, 0, 1), result.summary
+    print("✅ One-sided duplicate keys merge cleanly")
+
+
+class _FirebaseManager:
+    def __init__(self, db, data_dir):
+        self.db = db
+        self.upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+    def is_database_available(self):
+        return True
+
+    def is_authenticated(self):
+        return True
+
+
+def _sync_worker(db, operation, data_dir, data=None):
+    QApplication.instance() or QApplication(sys.argv)
+    settings = {'user_id': 'user-1', 'sync_collections': ['inventory'], 'conflict_resolution': 'merge'}
+    worker = AsyncCloudSyncWorker(operation, _FirebaseManager(db, data_dir), settings, data)
+    worker.merge_base = MergeBaseStore(data_dir)
+    results = {'completed': [], 'errors': []}
+    worker.operation_completed.connect(results['completed'].append)
+    worker.error_occurred.connect(results['errors'].append)
+    return worker, results
+
+
+def test_smart_sync_merges_two_installations():
+    """Two installations editing different rows both keep each other's edits"""
+    print("🧪 Testing smart sync between installations...")
+    db = FakeFirestoreClient()
+
+    def sync(operation, data_dir, data=None):
+        worker, results = _sync_worker(db, operation, data_dir, data)
+        {'upload': worker.perform_upload, 'download': worker.perform_download,
+         'smart_sync': worker.perform_smart_sync}[operation]()
+        return results['completed'][-1]['data']
+
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        sync('upload', dir_a, {'inventory': _inventory()})
+        local_b = sync('download', dir_b)['inventory']
+
+        local_a = _inventory()
+        local_a.loc[0, 'quantity'] = 20.0
+        sync('smart_sync', dir_a, {'inventory': local_a})
+
+        local_b = local_b.sort_values('item_id').reset_index(drop=True)
+        local_b.loc[1, 'quantity'] = 50.0
+        merged = sync('smart_sync', dir_b, {'inventory': local_b})['inventory']
+
+        assert len(merged) == 5 and merged['item_id'].is_unique
+        quantities = dict(zip(merged['item_name'], merged['quantity']))
+        assert quantities['Rice'] == 20.0 and quantities['Dal'] == 50.0
+        assert len(db.documents('users/user-1/inventory')) == 5
+    print("✅ Smart sync keeps both installations' edits")
+
+
+def test_smart_sync_stops_when_the_cloud_fails():
+    """An unreadable cloud copy or a failed upload ends smart sync with an error, not a merge"""
+    print("🧪 Testing smart sync failures...")
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        uploader, _ = _sync_worker(db, 'upload', dir_a, {'inventory': _inventory()})
+        uploader.perform_upload()
+        edited = _inventory()
+        edited.loc[0, 'quantity'] = 99.0
+
+        # The cloud cannot be read: nothing is merged against an empty copy or uploaded
+        db.offline = True
+        worker, results = _sync_worker(db, 'smart_sync', dir_b, {'inventory': edited})
+        worker.perform_smart_sync()
+        assert results['completed'] == []
+        assert results['errors'][0]['operation_type'] == 'smart_sync'
+        db.offline = False
+        assert db.documents('users/user-1/inventory')['1']['quantity'] == 10.0
+
+        # The cloud is read but the upload fails: no "completed" and no new merge base
+        original_apply = db.apply
+
+        def failing_apply(operations):
+            raise ConnectionError("quota exceeded")
+
+        worker, results = _sync_worker(db, 'smart_sync', dir_a, {'inventory': edited})
+        db.apply = failing_apply
+        try:
+            worker.perform_smart_sync()
+        finally:
+            db.apply = original_apply
+        assert results['completed'] == [] and 'quota exceeded' in results['errors'][0]['error']
+        assert worker.merge_base.load('inventory')['quantity'].tolist()[0] == 10.0
+
+        # An unreadable merge base is ignored rather than failing the merge
+        with open(worker.merge_base.path('inventory'), 'wb') as f:
+            f.write(b'not a pickle')
+        assert worker.merge_base.load('inventory') is None
+        worker, results = _sync_worker(db, 'smart_sync', dir_a, {'inventory': edited})
+        worker.perform_smart_sync()
+        assert results['completed'][-1]['success'] and results['errors'] == []
+        assert db.documents('users/user-1/inventory')['1']['quantity'] == 99.0
+    print("✅ Smart sync failures are reported")
+
+
+def main():
+    """Run all merge tests"""
+    tests = [
+        test_one_sided_changes_apply,
+        test_conflict_policies,
+        test_duplicate_keys_on_one_side,
+        test_smart_sync_merges_two_installations,
+        test_smart_sync_stops_when_the_cloud_fails,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test the virtualized DataFrame model/view behind UniversalTableWidget
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from modules.dataframe_table_model import DataFrameTableModel, DataFrameProxyModel
+from modules.universal_table_widget import UniversalTableWidget
+
+
+def _app():
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def _sales(rows):
+    return pd.DataFrame({
+        'sale_id': np.arange(rows),
+        'item_name': np.where(np.arange(rows) % 3 == 0, 'Masala Dosa', 'Idli'),
+        'quantity': np.arange(rows) % 7,
+        'total_amount': np.round(np.arange(rows) * 1.5, 2),
+        'date': pd.date_range('2025-01-01', periods=rows, freq='min'),
+    })
+
+
+def test_model_formats_cells_lazily():
+    """Cells are formatted on request and missing values are blank"""
+    print("🧪 Testing DataFrame model cells...")
+    _app()
+    df = pd.DataFrame({'item_name': ['Rice', None], 'price': [12.5, np.nan],
+                       'date': pd.to_datetime(['2025-06-01', None])})
+    model = DataFrameTableModel(df, ['Item', 'Price', 'Date'])
+
+    assert model.rowCount() == 2 and model.columnCount() == 3
+    assert model.data(model.index(0, 0)) == 'Rice'
+    assert model.data(model.index(0, 1)) == '12.5'
+    assert model.data(model.index(0, 2)) == '2025-06-01 00:00:00'
+    assert model.data(model.index(1, 0)) == '' and model.data(model.index(1, 2)) == ''
+    assert model.headerData(1, Qt.Horizontal) == 'Price'
+    print("✅ DataFrame model cells work")
+
+
+def test_proxy_filters_and_sorts_with_masks():
+    """The proxy shows masked rows and sorts numerically with blanks last"""
+    print("🧪 Testing proxy filtering and sorting...")
+    _app()
+    df = pd.DataFrame({'name': ['b', 'a', 'c', 'd'], 'amount': [10, None, 2, 30]})
+    proxy = DataFrameProxyModel()
+    proxy.setSourceModel(DataFrameTableModel(df))
+
+    proxy.sort(1, Qt.AscendingOrder)
+    assert proxy.source_rows().tolist() == [2, 0, 3, 1]
+    proxy.sort(1, Qt.DescendingOrder)
+    assert proxy.source_rows().tolist() == [3, 0, 2, 1]
+
+    proxy.set_filter_mask(np.array([True, True, False, True]))
+    assert proxy.source_rows().tolist() == [3, 0, 1]
+    assert proxy.data(proxy.index(0, 0)) == 'd'
+
+    proxy.sort(0, Qt.AscendingOrder)
+    assert [proxy.data(proxy.index(row, 0)) for row in range(proxy.rowCount())] == ['a', 'b', 'd']
+    print("✅ Proxy filtering and sorting work")
+
+
+def test_widget_api_is_unchanged():
+    """update_data, get_filtered_data and data_filtered behave as before"""
+    print("🧪 Testing UniversalTableWidget API...")
+    _app()
+    widget = UniversalTableWidget(data=_sales(30), is_history_table=True)
+    counts = []
+    widget.data_filtered.connect(counts.append)
+
+    widget.search_input.setText('masala')
+    widget.apply_filters()
+    assert counts[-1] == 10
+    assert len(widget.get_filtered_data()) == 10
+    assert (widget.get_filtered_data()['item_name'] == 'Masala Dosa').all()
+
+    widget.table.sortByColumn(3, Qt.DescendingOrder)
+    assert widget.get_filtered_data()['total_amount'].is_monotonic_decreasing
+    widget.table.selectRow(0)
+    assert widget.get_selected_row_data()['total_amount'] == widget.get_filtered_data()['total_amount'].max()
+
+    widget.update_data(_sales(5))
+    assert counts[-1] == 2
+    widget.clear_all_filters()
+    assert counts[-1] == 5 and len(widget.filtered_data) == 5
+    print("✅ UniversalTableWidget API works")
+
+
+def test_large_tables_are_not_materialized():
+    """Loading and filtering 50k rows does not create per-cell items"""
+    print("🧪 Testing large table performance...")
+    _app()
+    data = _sales(50000)
+
+    started = time.perf_counter()
+    widget = UniversalTableWidget(data=data, is_history_table=True)
+    widget.search_input.setText('dosa')
+    widget.apply_filters()
+    elapsed = time.perf_counter() - started
+
+    assert widget.proxy_model.rowCount() == len(data[data['item_name'] == 'Masala Dosa'])
+    assert elapsed < 5, f"took {elapsed:.2f}s"
+    print(f"✅ 50k rows loaded and filtered in {elapsed:.2f}s")
+
+
+def main():
+    """Run all DataFrame model tests"""
+    tests = [
+        test_model_formats_cells_lazily,
+        test_proxy_filters_and_sorts_with_masks,
+        test_widget_api_is_unchanged,
+        test_large_tables_are_not_materialized,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
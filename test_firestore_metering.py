@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test Firestore usage metering and quota-aware sync planning
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.cloud_delta_sync import UploadManifest, upload_delta
+from modules.fake_firestore import FakeFirestoreClient
+import modules.firestore_metering as firestore_metering
+from modules.firestore_metering import MeteredFirestoreClient, QuotaMeter, QuotaPlanner, get_quota_meter
+from modules.sync_manager import IntelligentSyncManager, SyncOperation, SyncWorker
+
+
+def _inventory(rows):
+    return pd.DataFrame({
+        'item_id': np.arange(rows),
+        'item_name': [f"Item {n}" for n in range(rows)],
+        'quantity': np.arange(rows) * 1.5,
+    })
+
+
+def test_meter_counts_real_calls():
+    """Reads, writes and deletes are counted per collection and operation, and survive a restart"""
+    print("🧪 Testing usage metering...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, '.firestore_usage.json')
+        meter = QuotaMeter(path)
+        db = MeteredFirestoreClient(FakeFirestoreClient(), meter)
+        inventory = db.collection('users').document('user-1').collection('inventory')
+
+        with meter.operation('sync_upload'):
+            batch = db.batch()
+            for n in range(3):
+                batch.set(inventory.document(str(n)), {'item_id': n})
+            assert meter.used('writes') == 0          # nothing is billed before the commit
+            batch.commit()
+            inventory.document('2').delete()
+
+        with meter.operation('sync_download'):
+            assert len(list(inventory.stream())) == 2
+            list(inventory.where('item_id', '>', 5).stream())   # an empty query still costs one read
+            inventory.document('0').get()
+
+        usage = meter.usage()
+        assert (usage['reads'], usage['writes'], usage['deletes']) == (4, 3, 1)
+        assert usage['collections']['inventory'] == {'reads': 4, 'writes': 3, 'deletes': 1}
+        assert usage['operations']['sync_upload'] == {'reads': 0, 'writes': 3, 'deletes': 1}
+        assert usage['operations']['sync_download']['reads'] == 4
+        assert usage['remaining']['writes'] == 20000 - 3
+
+        meter.flush()
+        reloaded = QuotaMeter(path).usage()
+        assert reloaded['collections'] == usage['collections'] and reloaded['date'] == usage['date']
+    print("✅ Metering counts real calls")
+
+
+def test_planner_defers_what_does_not_fit():
+    """A delta larger than the remaining quota is split; the rest goes up on a later plan"""
+    print("🧪 Testing quota planning...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        meter = QuotaMeter(os.path.join(data_dir, '.firestore_usage.json'), limits={'writes': 300})
+        planner = QuotaPlanner(meter)
+        db = MeteredFirestoreClient(FakeFirestoreClient(), meter)
+        manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+        df = _inventory(500)
+
+        # 5% of the limit is held back: 285 writes are available to syncs
+        plan = planner.plan_upload([manifest.plan('user-1', 'inventory', df)])
+        assert not plan.complete and plan.writes == 285 and plan.deferred == {'inventory': 215}
+        upload_delta(db, 'user-1', plan.deltas[0], manifest)
+        assert meter.used('writes') == 285
+        assert not planner.fits(writes=1)
+
+        # A new quota day: the deferred rows (and only those) are planned again
+        meter.limits['writes'] = 20000
+        delta = manifest.plan('user-1', 'inventory', df)
+        assert delta.write_count == 215 and delta.unchanged == 285
+        plan = planner.plan_upload([delta])
+        assert plan.complete and plan.writes == 215
+    print("✅ Quota planner defers the overflow")
+
+
+def test_sync_worker_respects_quota():
+    """IntelligentSyncManager uploads what fits and keeps the table marked as changed"""
+    print("🧪 Testing quota-aware SyncWorker...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        meter = QuotaMeter(os.path.join(data_dir, '.firestore_usage.json'), limits={'writes': 200})
+        fake = FakeFirestoreClient()
+
+        class FirebaseManager:
+            db = MeteredFirestoreClient(fake, meter)
+            batch_size = 100
+            quota_meter = meter
+            upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+            def is_authenticated(self):
+                return True
+
+            def get_current_user(self):
+                return {'user_id': 'user-1'}
+
+        _inventory(300).to_csv(os.path.join(data_dir, 'inventory.csv'), index=False)
+        manager = IntelligentSyncManager(FirebaseManager(), data_dir)
+        worker = SyncWorker(SyncOperation('op', 'upload', ['inventory'], ''), manager)
+        worker._perform_upload()
+
+        # 190 writes are available: 189 rows plus the watermark document
+        assert len(fake.documents('users/user-1/inventory')) == 189
+        assert meter.used('writes') == 190
+        assert meter.usage()['operations']['sync_upload']['writes'] == 190
+        assert manager.detect_local_changes('inventory')
+        assert manager.get_sync_status()['daily_writes'] == 190
+    print("✅ SyncWorker stays within the quota")
+
+
+def test_exhausted_quota_blocks_uploads():
+    """With the day's writes used up nothing is sent; the next quota day starts from zero"""
+    print("🧪 Testing exhausted quota...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        usage_path = os.path.join(data_dir, '.firestore_usage.json')
+        meter = QuotaMeter(usage_path, limits={'writes': 200})
+        meter.record('writes', 195)
+        fake = FakeFirestoreClient()
+
+        class FirebaseManager:
+            db = MeteredFirestoreClient(fake, meter)
+            batch_size = 100
+            quota_meter = meter
+            upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+            def is_authenticated(self):
+                return True
+
+            def get_current_user(self):
+                return {'user_id': 'user-1'}
+
+        _inventory(10).to_csv(os.path.join(data_dir, 'inventory.csv'), index=False)
+        manager = IntelligentSyncManager(FirebaseManager(), data_dir)
+        worker = SyncWorker(SyncOperation('op', 'upload', ['inventory'], ''), manager)
+        try:
+            worker._perform_upload()
+            assert False, "upload should have been refused"
+        except Exception as e:
+            assert 'write limit' in str(e)
+        assert fake.writes == 0 and meter.used('writes') == 195
+        assert manager.detect_local_changes('inventory')
+
+        # A new quota day rolls the usage into history
+        original = firestore_metering.quota_date
+        firestore_metering.quota_date = lambda: '2099-01-01'
+        try:
+            assert meter.remaining('writes') == 200 and sum(meter.history[next(iter(meter.history))].values()) == 195
+            worker._perform_upload()
+        finally:
+            firestore_metering.quota_date = original
+        assert len(fake.documents('users/user-1/inventory')) == 10
+
+    # An unreadable usage file starts the day from zero instead of failing
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, '.firestore_usage.json'), 'w') as f:
+            f.write('{"date": ')
+        assert QuotaMeter(os.path.join(data_dir, '.firestore_usage.json')).used('reads') == 0
+    print("✅ Exhausted quota blocks uploads")
+
+
+def test_quota_meter_per_data_directory():
+    """Each data directory has its own meter and usage file"""
+    print("🧪 Testing per-directory meters...")
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        meter = get_quota_meter(first)
+        assert get_quota_meter(first) is meter
+        assert get_quota_meter(os.path.join(first, '.')) is meter
+        other = get_quota_meter(second)
+        assert other is not meter and other.path == os.path.join(os.path.abspath(second), '.firestore_usage.json')
+        meter.record('reads', 3)
+        assert other.used('reads') == 0
+    print("✅ Meters are kept per data directory")
+
+
+def main():
+    """Run all Firestore metering tests"""
+    tests = [
+        test_meter_counts_real_calls,
+        test_planner_defers_what_does_not_fit,
+        test_sync_worker_respects_quota,
+        test_exhausted_quota_blocks_uploads,
+        test_quota_meter_per_data_directory,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
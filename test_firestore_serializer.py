@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the column-wise Firestore serializer used by the cloud sync uploads
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.firestore_serializer import serialize_dataframe, record_hashes
+
+
+def _inventory(rows):
+    return pd.DataFrame({
+        'item_id': np.arange(rows),
+        'item_name': np.where(np.arange(rows) % 2 == 0, 'Rice', 'Toor Dal'),
+        'quantity': np.arange(rows) * 0.5,
+        'unit': ['kg'] * rows,
+        'expiry_date': pd.date_range('2025-01-01', periods=rows, freq='min'),
+    })
+
+
+def test_cells_are_coerced_by_column_dtype():
+    """Numbers become floats, text stays text, missing values become None"""
+    print("🧪 Testing column coercion...")
+    df = pd.DataFrame({
+        'qty': [1, 2, 3],
+        'price': [1.5, np.nan, 3.0],
+        'name': ['Rice', None, 'Salt'],
+        'active': [True, False, True],
+        'date': pd.to_datetime(['2025-01-01 00:00', None, '2025-03-01 10:30']),
+        'mixed': [1, 'two', None],
+    })
+    records = serialize_dataframe(df, sync_timestamp='2025-06-01T00:00:00')
+
+    assert records[0]['qty'] == 1.0 and isinstance(records[0]['qty'], float)
+    assert records[1]['price'] is None
+    assert records[1]['name'] is None and records[2]['name'] == 'Salt'
+    assert records[0]['active'] is True
+    assert records[0]['date'] == '2025-01-01 00:00:00' and records[1]['date'] is None
+    assert records[2]['date'] == '2025-03-01 10:30:00'
+    assert [record['mixed'] for record in records] == [1.0, 'two', None]
+    assert {record['_sync_timestamp'] for record in records} == {'2025-06-01T00:00:00'}
+    assert serialize_dataframe(pd.DataFrame()) == []
+    print("✅ Column coercion works")
+
+
+def test_record_hashes_follow_content():
+    """Hashes change with the row content and ignore dtype noise and row position"""
+    print("🧪 Testing record hashes...")
+    df = _inventory(5)
+    hashes = record_hashes(df)
+    assert len(set(hashes)) == 5 and all(len(value) == 16 for value in hashes)
+
+    # Integers re-read from CSV as floats hash the same
+    assert (record_hashes(df.astype({'item_id': 'float64'})) == hashes).all()
+    # Moving rows moves their hashes with them
+    assert (record_hashes(df.iloc[::-1]) == hashes[::-1]).all()
+
+    edited = df.copy()
+    edited.loc[2, 'quantity'] = 99
+    changed = record_hashes(edited) != hashes
+    assert changed.tolist() == [False, False, True, False, False]
+
+    first = serialize_dataframe(df)[0]['_record_hash']
+    assert first == serialize_dataframe(df, sync_timestamp='later')[0]['_record_hash']
+    print("✅ Record hashes work")
+
+
+def test_record_hashes_follow_field_names():
+    """Hashes ignore column order and change when a column is renamed"""
+    print("🧪 Testing record hashes across column changes...")
+    df = _inventory(5)
+    hashes = record_hashes(df)
+
+    # A frame rebuilt from downloaded documents lists its fields in another order
+    assert (record_hashes(df[list(df.columns)[::-1]]) == hashes).all()
+    renamed = df.rename(columns={'quantity': 'stock'})
+    assert (record_hashes(renamed) != hashes).all()
+    # Values moved between columns are a different row
+    swapped = df.rename(columns={'item_name': 'unit', 'unit': 'item_name'})
+    assert (record_hashes(swapped) != hashes).all()
+    print("✅ Record hashes follow field names")
+
+
+def test_large_table_serializes_quickly():
+    """A 100k-row table is serialized without per-cell Python work"""
+    print("🧪 Testing serializer throughput...")
+    df = _inventory(100000)
+
+    started = time.perf_counter()
+    records = serialize_dataframe(df)
+    elapsed = time.perf_counter() - started
+
+    assert len(records) == 100000
+    assert records[-1]['item_id'] == 99999.0
+    assert elapsed < 5, f"took {elapsed:.2f}s"
+    print(f"✅ 100k rows serialized in {elapsed:.2f}s")
+
+
+def test_awkward_columns_and_cells():
+    """Odd column names, nested cells, nullable dtypes and infinities still give valid records"""
+    print("🧪 Testing awkward input...")
+    df = pd.DataFrame({
+        'qty': pd.array([1, None, 3], dtype='Int64'),
+        'ratio': [np.inf, 1.0, -np.inf],
+        'extras': [[1, 2], {'spice': 'mild'}, None],
+        'when': pd.to_datetime(['2025-01-01', None, '2025-01-02']).tz_localize('UTC'),
+        'note': pd.array(['x', None, 'z'], dtype='string'),
+        2025: [1, 2, 3],
+    })
+    records = serialize_dataframe(df, sync_timestamp='t')
+
+    assert all(isinstance(key, str) for record in records for key in record)
+    assert records[1]['qty'] is None and records[2]['qty'] == 3.0
+    assert records[0]['ratio'] == np.inf
+    assert records[0]['extras'] == '[1, 2]' and records[2]['extras'] is None
+    assert records[0]['when'] == '2025-01-01 00:00:00' and records[1]['when'] is None
+    assert records[1]['note'] is None and records[0]['2025'] == 1.0
+
+    # Duplicate column names used to crash the whole upload
+    duplicated = pd.DataFrame([[1, 'a'], [2, 'b']], columns=['item', 'item'])
+    assert [record['item'] for record in serialize_dataframe(duplicated)] == ['a', 'b']
+    assert len(record_hashes(duplicated)) == 2
+    print("✅ Awkward input is serialized")
+
+
+def main():
+    """Run all Firestore serializer tests"""
+    tests = [
+        test_cells_are_coerced_by_column_dtype,
+        test_record_hashes_follow_content,
+        test_record_hashes_follow_field_names,
+        test_large_table_serializes_quickly,
+        test_awkward_columns_and_cells,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test home page metrics, data versions and background chart rendering
+"""
+
+import os
+import sys
+import time
+import importlib.util
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from PySide6.QtWidgets import QApplication
+
+from modules.home_charts import (HomeChartService, compute_home_metrics, data_version,
+                                 inventory_value_by_category, waste_cost_by_reason)
+
+
+def _process_until(app, condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def _sample_data():
+    return {
+        'inventory': pd.DataFrame({
+            'category': ['Dairy', 'Dairy', 'Spices', 'Grains'],
+            'qty_purchased': [10, None, 5, 2],
+            'qty_used': [4, None, 5, 0],
+            'qty_left': [None, 3, None, None],
+            'quantity': [6, 3, 0, 2],
+            'reorder_level': [2, None, 1, 5],
+            'avg_price': [50.0, None, 20.0, None],
+            'price': [None, 40.0, None, 10.0],
+            'price_per_unit': [50.0, 40.0, 20.0, 10.0],
+        }),
+        'sales': pd.DataFrame({'price_per_unit': [100.0, 50.0], 'quantity': [2, 3]}),
+        'budget': pd.DataFrame({'amount': [1000.0, 500.0]}),
+        'waste': pd.DataFrame({'reason': ['Expired', 'Spoiled', 'Expired'], 'cost': [30.0, 5.0, 20.0]}),
+        'expenses_list': pd.DataFrame({'status': ['Pending', 'Purchased', 'Pending'],
+                                       'estimated_cost': [10.0, 20.0, 30.0]}),
+    }
+
+
+def test_metrics_do_not_modify_tables():
+    """Metric cards and chart aggregates are computed without adding columns to the data"""
+    print("🧪 Testing home metrics...")
+    data = _sample_data()
+    columns = {name: list(df.columns) for name, df in data.items()}
+    metrics = compute_home_metrics(data)
+
+    assert metrics['total_inventory_value'] == 6 * 50 + 3 * 40 + 0 * 20 + 2 * 10
+    assert metrics['low_stock_count'] == 2  # Spices (0 <= 1) and Grains (2 <= 5)
+    assert metrics['total_sales'] == 350.0 and metrics['total_budget'] == 1500.0
+    assert metrics['waste_cost'] == 55.0
+    assert metrics['items_to_buy'] == 2 and metrics['estimated_cost'] == 60.0
+
+    by_category = inventory_value_by_category(data)
+    assert dict(zip(by_category['category'], by_category['total_value'])) == {
+        'Dairy': 6 * 50 + 3 * 40, 'Grains': 20.0, 'Spices': 0.0}
+    by_reason = waste_cost_by_reason(data)
+    assert list(by_reason['reason']) == ['Spoiled', 'Expired'] and list(by_reason['cost']) == [5.0, 50.0]
+    assert waste_cost_by_reason({'waste': pd.DataFrame(columns=['reason', 'cost'])}) is None
+    assert {name: list(df.columns) for name, df in data.items()} == columns
+    print("✅ Metrics leave the tables untouched")
+
+
+def test_data_version_follows_changes():
+    """A table's version changes when it is marked changed or replaced, not otherwise"""
+    print("🧪 Testing data versions...")
+    data = _sample_data()
+    versions = {}
+    before = data_version(data, versions, ('inventory', 'waste'))
+    assert data_version(data, versions, ('inventory', 'waste')) == before
+
+    versions['sales'] = 1
+    assert data_version(data, versions, ('inventory', 'waste')) == before
+    versions['waste'] = 1
+    assert data_version(data, versions, ('inventory', 'waste')) != before
+
+    current = data_version(data, versions, ('inventory',))
+    data['inventory'] = data['inventory'].copy()
+    assert data_version(data, versions, ('inventory',)) != current
+    print("✅ Data versions follow table changes")
+
+
+def test_service_caches_per_version():
+    """Metrics are reused until a table changes; charts render off the UI thread once per key"""
+    print("🧪 Testing home chart service...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    data = _sample_data()
+    versions = {}
+    service = HomeChartService()
+
+    metrics = service.metrics(data, versions)
+    assert service.metrics(data, versions) is metrics
+    versions['sales'] = 1
+    assert service.metrics(data, versions) is not metrics
+
+    ready = []
+    service.chart_ready.connect(lambda chart, key, pixmap: ready.append((chart, key, pixmap)))
+    key, pixmap = service.request('waste_by_reason', data, versions, '₹')
+    assert pixmap is None and key in service._pending
+    assert service.request('waste_by_reason', data, versions, '₹') == (key, None)
+    assert _process_until(app, lambda: key not in service._pending)
+
+    if importlib.util.find_spec('matplotlib') is None:
+        # Without matplotlib the render fails, is logged and nothing is cached
+        assert ready == [] and service._pixmaps.get(key) is None
+    else:
+        assert len(ready) == 1 and ready[0][0] == 'waste_by_reason' and ready[0][1] == key
+        assert not ready[0][2].isNull()
+        # Compare cache keys: PySide may hand back a new wrapper for the same pixmap
+        cached_key, cached = service.request('waste_by_reason', data, versions, '₹')
+        assert cached_key == key and cached.cacheKey() == ready[0][2].cacheKey()
+        versions['waste'] = 1
+        assert service.request('waste_by_reason', data, versions, '₹')[0] != key
+    service.shutdown()
+    print("✅ Home chart service caches per data version")
+
+
+def test_in_place_edits_need_a_version_bump():
+    """A same-length edit is served from the cache until the table's version is bumped; failed renders retry"""
+    print("🧪 Testing in-place edits...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    data = _sample_data()
+    versions = {}
+    service = HomeChartService()
+
+    metrics = service.metrics(data, versions)
+    data['waste'].loc[0, 'cost'] = 130.0
+    assert service.metrics(data, versions) is metrics
+    versions['waste'] = versions.get('waste', 0) + 1
+    assert service.metrics(data, versions)['waste_cost'] == 155.0
+
+    # A render that fails is not cached: the next request queues it again
+    failure = RuntimeError("figure backend unavailable")
+    with mock.patch('modules.home_charts.render_chart', side_effect=failure) as render:
+        try:
+            key, pixmap = service.request('waste_by_reason', data, versions, '₹')
+            assert pixmap is None and _process_until(app, lambda: key not in service._pending)
+            assert service.request('waste_by_reason', data, versions, '₹') == (key, None)
+            assert _process_until(app, lambda: key not in service._pending) and render.call_count == 2
+        finally:
+            service.shutdown()
+    print("✅ In-place edits are seen after a version bump")
+
+
+def main():
+    """Run all home chart tests"""
+    tests = [
+        test_metrics_do_not_modify_tables,
+        test_data_version_follows_changes,
+        test_service_caches_per_version,
+        test_in_place_edits_need_a_version_bump,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
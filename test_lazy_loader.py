@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test lazy subsystem loading and the startup loading screen
+"""
+
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication, QMainWindow
+
+from modules.lazy_loader import LazyService, ServiceRegistry, lazy_import
+
+
+def _process_until(app, condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_services_build_on_first_use():
+    """Factories run once, on first get; a failing factory leaves the service as None"""
+    print("🧪 Testing service registry...")
+    built = []
+    registry = ServiceRegistry()
+    registry.register('templates', lambda: built.append('templates') or object())
+    registry.register('broken', lambda: lazy_import('no_such_notification_module', 'Missing')())
+    assert built == [] and not registry.is_loaded('templates')
+
+    templates = registry.get('templates')
+    assert registry.get('templates') is templates and built == ['templates']
+    assert registry.get('broken') is None and registry.is_loaded('broken')
+    assert registry.get('unknown') is None
+    assert set(registry.load_times) == {'templates', 'broken'}
+
+    registry.set('templates', 'replacement')
+    assert registry.get('templates') == 'replacement' and built == ['templates']
+    print("✅ Services are built on first use")
+
+
+def test_warm_up_runs_one_service_per_turn():
+    """warm_up builds the marked services on later event-loop turns, then calls on_done"""
+    print("🧪 Testing warm-up...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    turns = []
+    registry = ServiceRegistry()
+    for name in ('templates', 'performance', 'ai'):
+        registry.register(name, lambda name=name: turns.append(name) or name, warm_up=name != 'ai')
+    assert registry.pending_warm_up() == ['templates', 'performance']
+
+    done = []
+    registry.warm_up(on_done=lambda: done.append(list(turns)))
+    assert turns == []
+    app.processEvents()
+    assert len(turns) <= 1
+    assert _process_until(app, lambda: done)
+    assert done == [['templates', 'performance']] and not registry.is_loaded('ai')
+    print("✅ Warm-up runs in idle turns")
+
+
+def test_lazy_attributes_and_loading_screen():
+    """LazyService attributes read through the registry; the loading screen follows real progress"""
+    print("🧪 Testing lazy attributes and loading screen...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    from modules.startup_loading_screen import show_startup_loading_screen
+
+    class Window(QMainWindow):
+        notification_ai = LazyService()
+
+        def __init__(self):
+            super().__init__()
+            self.services = ServiceRegistry()
+            self.services.register('notification_ai', lambda: 'ai engine')
+
+    window = Window()
+    assert not window.services.is_loaded('notification_ai')
+    assert window.notification_ai == 'ai engine'
+    window.notification_ai = None
+    assert window.notification_ai is None and Window.notification_ai.name == 'notification_ai'
+
+    start = time.perf_counter()
+    loading_screen = show_startup_loading_screen()
+    finished = []
+    loading_screen.loading_finished.connect(lambda: finished.append(True))
+    loading_screen.update_progress(30, "Loading kitchen data...")
+    assert loading_screen._progress_value == 30 and loading_screen.isVisible()
+    window.show()
+    loading_screen.finish_loading(window, 1.234)
+    assert loading_screen.status_message == "Ready in 1.2s"
+    assert _process_until(app, lambda: finished)
+    assert not loading_screen.isVisible() and time.perf_counter() - start < 3
+    window.close()
+    print("✅ Lazy attributes and loading screen work")
+
+
+def test_failures_do_not_stop_warm_up():
+    """A failing service is tried once, warm-up carries on past it; concurrent first uses build once"""
+    print("🧪 Testing failing services...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    attempts = []
+
+    def broken():
+        attempts.append('broken')
+        raise RuntimeError("database locked")
+
+    registry = ServiceRegistry()
+    registry.register('broken', broken, warm_up=True)
+    registry.register('templates', lambda: attempts.append('templates') or 'templates', warm_up=True)
+    done = []
+    registry.warm_up(on_done=lambda: done.append(True))
+    assert _process_until(app, lambda: done)
+    assert attempts == ['broken', 'templates'] and registry.get('broken') is None
+    assert registry.pending_warm_up() == [] and attempts == ['broken', 'templates']
+
+    # Nothing left to build: on_done still runs
+    registry.warm_up(on_done=lambda: done.append(True))
+    assert _process_until(app, lambda: len(done) == 2)
+
+    # Two threads asking for the same slow service get one instance
+    builds = []
+    registry.register('slow', lambda: builds.append(1) or time.sleep(0.05) or object())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('slow'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert builds == [1] and len({id(result) for result in results}) == 1
+
+    class Owner:
+        service = LazyService()
+
+    assert Owner().service is None
+    print("✅ Failing services do not stop warm-up")
+
+
+def main():
+    """Run all lazy loader tests"""
+    tests = [
+        test_services_build_on_first_use,
+        test_warm_up_runs_one_service_per_turn,
+        test_lazy_attributes_and_loading_screen,
+        test_failures_do_not_stop_warm_up,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
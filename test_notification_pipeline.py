@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test the coalescing, rate-limited notification pipeline
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.notification_pipeline import NotificationPipeline
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _notification(title, message, category='inventory', source='Inventory System', priority=8):
+    return {'title': title, 'message': message, 'category': category, 'source': source, 'priority': priority}
+
+
+def test_bursts_become_digests():
+    """A burst of low-stock alerts becomes one digest; emergencies are not held"""
+    print("🧪 Testing coalescing...")
+    clock = _Clock()
+    delivered = []
+    pipeline = NotificationPipeline(lambda n, *options: delivered.append(n), window=2, clock=clock)
+    pipeline.digest_titles['📦 Low Stock Alert'] = "📦 {count} items low on stock"
+
+    for n in range(14):
+        assert pipeline.submit(_notification('📦 Low Stock Alert', f"Item {n} is running low"))
+    assert pipeline.submit(_notification('Recipe saved', 'Dosa batter saved', 'recipe', 'Recipes'))
+    assert not pipeline.submit(_notification('Gas leak', 'Check the kitchen', 'emergency'))
+    assert [n['title'] for n in delivered] == ['Gas leak']
+
+    assert pipeline.flush() == 0 and pipeline.next_due() == 2
+    clock.now += 2
+    assert pipeline.flush() == 2 and pipeline.pending_count == 0
+    digest = next(n for n in delivered if n.get('digest_count'))
+    assert digest['title'] == "📦 14 items low on stock" and digest['digest_count'] == 14
+    assert digest['message'].endswith("…and 11 more")
+    assert any(n['title'] == 'Recipe saved' and 'digest_count' not in n for n in delivered)
+    assert pipeline.submitted == 16 and pipeline.delivered == 3
+    print("✅ Bursts are delivered as one digest")
+
+
+def test_rate_limit_per_category():
+    """Over the limit, groups stay open and absorb more notifications until budget frees up"""
+    print("🧪 Testing rate limiting...")
+    clock = _Clock()
+    delivered = []
+    pipeline = NotificationPipeline(lambda n, *options: delivered.append(n), window=1, rate_limit=3,
+                                    rate_period=60, clock=clock)
+    for n in range(5):
+        pipeline.submit(_notification(f"Budget alert {n}", 'Over budget', 'budget', 'Budget'))
+    pipeline.submit(_notification('Fridge offline', 'Sensor lost', 'critical', 'Sensors'))
+    clock.now += 1
+    assert pipeline.flush() == 4
+    assert sum(n['category'] == 'budget' for n in delivered) == 3
+
+    # The held groups keep collecting while the category is over its budget
+    pipeline.submit(_notification('Budget alert 4', 'Still over budget', 'budget', 'Budget'))
+    clock.now += 30
+    assert pipeline.flush() == 0 and 29 < pipeline.next_due() <= 30
+    clock.now += 30
+    assert pipeline.flush() == 2
+    assert 'Budget alert 4 (2)' in [n['title'] for n in delivered[-2:]]
+    assert pipeline.next_due() is None
+    print("✅ Categories are rate limited")
+
+
+def test_bell_and_whatsapp_receive_digests():
+    """notify_low_stock bursts reach the bell as one digest; WhatsApp sends one message"""
+    print("🧪 Testing digest delivery...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    from modules.enhanced_notification_system import CentralizedNotificationManager, NotificationBellWidget
+    from modules.notification_store import NotificationStore
+    import modules.enhanced_notification_system as notification_system
+    from notification_templates import notify_low_stock
+    from modules.whatsapp_automated_notifications import WhatsAppAutomatedNotifications
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = CentralizedNotificationManager()
+        manager.pipeline.window = 0.05
+        notification_system._centralized_manager = manager
+        bell = NotificationBellWidget(store=NotificationStore(os.path.join(data_dir, 'notifications.db')))
+        manager.register_bell_widget(bell)
+        for n in range(14):
+            notify_low_stock(f"Item {n}", 2, 10, "kg")
+        assert bell.unread_count == 0 and manager.pipeline.pending_count == 14
+
+        deadline = time.time() + 5
+        while manager.pipeline.pending_count and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        assert bell.unread_count == 1
+        assert bell.store.page()[0]['title'] == "📦 14 items low on stock"
+        notification_system._centralized_manager = None
+
+        class _Driver:
+            is_connected = True
+
+            def __init__(self):
+                self.messages = []
+
+            def send_message_to_abirams_kitchen(self, message):
+                self.messages.append(message)
+                return True
+
+        class _Widget:
+            whatsapp_driver = _Driver()
+
+        cwd = os.getcwd()
+        os.chdir(data_dir)
+        try:
+            inventory = pd.DataFrame({'item_name': [f"Item {n}" for n in range(14)],
+                                      'quantity': [0.0, 0.0] + [2.0] * 12, 'reorder_level': [10] * 14,
+                                      'unit': ['kg'] * 14})
+            whatsapp = WhatsAppAutomatedNotifications({'inventory': inventory}, _Widget())
+            whatsapp.check_low_stock_notifications()
+            whatsapp.check_low_stock_notifications()
+        finally:
+            os.chdir(cwd)
+        messages = _Widget.whatsapp_driver.messages
+        assert len(messages) == 1 and '14 items need restocking' in messages[0]
+        assert '12 items low on stock' in messages[0]
+    print("✅ Bell and WhatsApp receive one digest per burst")
+
+
+def test_failed_deliveries_do_not_block_the_rest():
+    """A delivery that raises is logged and dropped; other groups and forced flushes still go out"""
+    print("🧪 Testing failed deliveries...")
+    clock = _Clock()
+    delivered = []
+
+    def deliver(notification, *options):
+        if notification['category'] == 'budget':
+            raise RuntimeError("bell widget deleted")
+        delivered.append(notification)
+
+    pipeline = NotificationPipeline(deliver, window=1, rate_limit=1, rate_period=60, clock=clock)
+    pipeline.submit(_notification('Budget alert', 'Over budget', 'budget', 'Budget'))
+    pipeline.submit(_notification('📦 Low Stock Alert', 'Rice is running low'))
+    pipeline.submit({'title': '📦 Low Stock Alert', 'category': 'inventory', 'source': 'Inventory System'})
+    clock.now += 1
+    assert pipeline.flush() == 2 and pipeline.pending_count == 0
+    assert [n['title'] for n in delivered] == ['📦 Low Stock Alert (2)']
+    assert delivered[0]['message'] == "Rice is running low\n" and delivered[0]['priority'] == 8
+
+    # Over the limit: held until budget frees up, unless the app is closing and forces a flush
+    pipeline.submit(_notification('Stock report', 'Weekly stock report'))
+    clock.now += 1
+    assert pipeline.flush() == 0 and pipeline.pending_count == 1
+    assert pipeline.flush(force=True) == 1 and pipeline.next_due() is None
+    assert delivered[-1]['title'] == 'Stock report' and pipeline.delivered == 3
+    print("✅ Failed deliveries do not block the rest")
+
+
+def test_failed_whatsapp_digest_is_retried():
+    """A digest WhatsApp could not send is not marked sent, so the next check sends it"""
+    print("🧪 Testing failed WhatsApp digest...")
+    from modules.whatsapp_automated_notifications import WhatsAppAutomatedNotifications
+
+    class _Driver:
+        is_connected = True
+
+        def __init__(self):
+            self.attempts = []
+
+        def send_message_to_abirams_kitchen(self, message):
+            self.attempts.append(message)
+            return len(self.attempts) > 1
+
+    class _Widget:
+        whatsapp_driver = _Driver()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        cwd = os.getcwd()
+        os.chdir(data_dir)
+        try:
+            inventory = pd.DataFrame({'item_name': [f"Item {n}" for n in range(8)], 'quantity': [1.0] * 8,
+                                      'reorder_level': [10] * 8, 'unit': ['kg'] * 8})
+            whatsapp = WhatsAppAutomatedNotifications({'inventory': inventory}, _Widget())
+            for _ in range(3):
+                whatsapp.check_low_stock_notifications()
+        finally:
+            os.chdir(cwd)
+    attempts = _Widget.whatsapp_driver.attempts
+    assert len(attempts) == 2 and all('8 items need restocking' in message for message in attempts)
+    print("✅ Failed WhatsApp digest is retried")
+
+
+def main():
+    """Run all notification pipeline tests"""
+    tests = [
+        test_bursts_become_digests,
+        test_rate_limit_per_category,
+        test_bell_and_whatsapp_receive_digests,
+        test_failed_deliveries_do_not_block_the_rest,
+        test_failed_whatsapp_digest_is_retried,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite notification store behind the notification bell
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.notification_store import NotificationStore, filter_categories
+
+
+def _notification(store, category='inventory', priority=8, read=False, title='Low stock'):
+    return {'id': store.next_id(), 'title': title, 'message': 'Rice is running low', 'type': 'info',
+            'category': category, 'priority': priority, 'source': 'Inventory',
+            'timestamp': '2025-06-01T10:00:00', 'read': read}
+
+
+def test_store_batches_and_trims():
+    """A burst is written in one flush and the oldest read notifications are trimmed first"""
+    print("🧪 Testing notification store...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = NotificationStore(os.path.join(data_dir, 'notifications.db'))
+        first = [_notification(store, read=True) for _ in range(10)]
+        for notification in first:
+            store.add(notification)
+        for _ in range(190):
+            store.add(_notification(store))
+        assert store.total_count == 200 and store.unread_count == 190
+        assert store.flush() == 200 and store.flush() == 0
+
+        # Ids stay unique within a burst (millisecond timestamps alone collide)
+        assert store.count() == 200
+
+        newest_read = _notification(store, read=True)
+        store.add(newest_read)
+        store.add(_notification(store, category='critical', priority=1, title='Fridge offline'))
+        store.flush()
+        ids = {n['id'] for n in store.page(limit=500)}
+        assert store.total_count == 200 and first[0]['id'] not in ids and first[1]['id'] not in ids
+        assert newest_read['id'] in ids and first[2]['id'] in ids
+
+        assert store.page(limit=1)[0]['title'] == 'Fridge offline'
+        assert store.top_unread_category() == 'critical'
+        assert store.count(filter_categories('critical')) == 1
+        assert store.mark_read(store.page(limit=1)[0]['id']) and store.unread_count == 190
+        assert store.top_unread_category() == 'inventory'
+
+        plan = ' '.join(row[3] for row in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM notifications WHERE category IN ('error', 'failure') "
+            "ORDER BY priority, id LIMIT 25"))
+        assert 'idx_notifications_category' in plan, plan
+    print("✅ Store batches inserts and trims oldest read first")
+
+
+def test_legacy_json_is_imported_once():
+    """The old notifications.json history is imported the first time the store opens"""
+    print("🧪 Testing notifications.json import...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        legacy = os.path.join(data_dir, 'notifications.json')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({'notifications': [
+                {'id': 1, 'title': 'Saved', 'message': 'Recipe saved', 'category': 'success', 'priority': 11,
+                 'timestamp': '2025-06-01T09:00:00', 'read': True},
+                {'id': 2, 'title': 'Error', 'message': 'Sync failed', 'category': 'error', 'priority': 3,
+                 'timestamp': '2025-06-01T09:05:00', 'read': False},
+                # Raised in the same millisecond as the next two: every entry is kept
+                {'id': 3, 'title': 'Low stock', 'message': 'Rice', 'category': 'inventory', 'priority': 8,
+                 'timestamp': '2025-06-01T09:06:00', 'read': False},
+                {'id': 3, 'title': 'Low stock', 'message': 'Dal', 'category': 'inventory', 'priority': 8,
+                 'timestamp': '2025-06-01T09:06:00', 'read': False},
+                {'id': 4, 'title': 'Low stock', 'message': 'Oil', 'category': 'inventory', 'priority': 8,
+                 'timestamp': '2025-06-01T09:06:00', 'read': False},
+            ]}, f)
+
+        path = os.path.join(data_dir, 'notifications.db')
+        store = NotificationStore(path, legacy)
+        assert (store.total_count, store.unread_count) == (5, 4)
+        assert [n['title'] for n in store.page()] == ['Error', 'Low stock', 'Low stock', 'Low stock', 'Saved']
+        assert [n['message'] for n in store.page(['inventory'])] == ['Rice', 'Dal', 'Oil']
+        store.clear()
+        store.close()
+
+        # Cleared history is not re-imported on the next start
+        assert NotificationStore(path, legacy).total_count == 0
+    print("✅ Legacy notifications imported once")
+
+
+def test_bell_saves_bursts_and_pages_panel():
+    """The bell buffers a burst, saves it once and the panel loads pages lazily"""
+    print("🧪 Testing notification bell...")
+    app = QApplication.instance() or QApplication(sys.argv)
+    from modules.enhanced_notification_system import NotificationBellWidget, NotificationPanel
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = NotificationStore(os.path.join(data_dir, 'notifications.db'))
+        bell = NotificationBellWidget(store=store)
+        for n in range(120):
+            bell.add_notification(f"Low stock {n}", "Item is running low", "inventory", "inventory")
+        bell.add_notification("Sync failed", "Upload failed", "error", "error")
+
+        assert bell.unread_count == 121 and bell.get_highest_priority_category() == 'error'
+        assert len(store._pending) == 121 and bell.flush_timer.isActive()
+        bell.save_notifications()
+        assert not store._pending and store.count() == 121
+
+        panel = NotificationPanel(store)
+        assert panel.loaded_count == NotificationPanel.PAGE_SIZE and panel.has_more
+        panel.load_more()
+        assert panel.loaded_count == 2 * NotificationPanel.PAGE_SIZE
+        panel.set_filter('error')
+        assert panel.loaded_count == 1 and not panel.has_more
+
+        bell.mark_notification_read(store.page(filter_categories('error'))[0]['id'])
+        assert bell.unread_count == 120 and bell.get_highest_priority_category() == 'inventory'
+        bell.clear_all_notifications()
+        assert bell.unread_count == 0 and bell.get_highest_priority_category() is None
+        app.processEvents()
+    print("✅ Bell saves bursts together and pages the panel")
+
+
+def test_manager_exposes_the_bell_store():
+    """Panels opened from the centralized manager page the same store as the bell"""
+    print("🧪 Testing the manager's notification store...")
+    QApplication.instance() or QApplication(sys.argv)
+    import modules.notification_store as notification_store
+    from modules.enhanced_notification_system import (CentralizedNotificationManager, NotificationBellWidget,
+                                                      NotificationPanel)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        shared = NotificationStore(os.path.join(data_dir, 'notifications.db'))
+        previous, notification_store._notification_store = notification_store._notification_store, shared
+        try:
+            manager = CentralizedNotificationManager()
+            assert manager.store is shared
+
+            bell = NotificationBellWidget(store=NotificationStore(os.path.join(data_dir, 'bell.db')))
+            manager.register_bell_widget(bell)
+            bell.add_notification("Low stock", "Rice is running low", "inventory", "inventory")
+            assert manager.store is bell.store
+            assert NotificationPanel(manager.store).loaded_count == 1
+        finally:
+            notification_store._notification_store = previous
+    print("✅ The manager exposes the bell's store")
+
+
+def main():
+    """Run all notification store tests"""
+    tests = [
+        test_store_batches_and_trims,
+        test_legacy_json_is_imported_once,
+        test_bell_saves_bursts_and_pages_panel,
+        test_manager_exposes_the_bell_store,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -423,8 +423,7 @@ class NotificationTestingInterface(QMainWindow):
         # Show the notification panel and refresh it
         self.show_notification_panel()
         if self.notification_panel:
-            notifications = self.notification_manager.get_notifications()
-            self.notification_panel.refresh_notifications(notifications)
+            self.notification_panel.refresh_notifications()
 
     def send_custom_notification(self):
         """Send a custom notification"""
@@ -443,8 +442,7 @@ class NotificationTestingInterface(QMainWindow):
         # Show the notification panel and refresh it
         self.show_notification_panel()
         if self.notification_panel:
-            notifications = self.notification_manager.get_notifications()
-            self.notification_panel.refresh_notifications(notifications)
+            self.notification_panel.refresh_notifications()
 
     def toggle_auto_demo(self):
         """Toggle auto demo mode"""
@@ -474,15 +472,12 @@ class NotificationTestingInterface(QMainWindow):
 
         # Refresh the notification panel if it's open
         if self.notification_panel and self.notification_panel.isVisible():
-            notifications = self.notification_manager.get_notifications()
-            self.notification_panel.refresh_notifications(notifications)
+            self.notification_panel.refresh_notifications()
 
     def show_notification_panel(self):
         """Show the notification panel"""
-        notifications = self.notification_manager.get_notifications()
-
         if self.notification_panel is None or not self.notification_panel.isVisible():
-            self.notification_panel = NotificationPanel(notifications)
+            self.notification_panel = NotificationPanel(self.notification_manager.store)
             self.notification_panel.show()
 
             # Position it next to the main window
@@ -491,14 +486,14 @@ class NotificationTestingInterface(QMainWindow):
             self.notification_panel.move(main_pos.x() + main_size.width() + 20, main_pos.y())
         else:
             # Panel is already open, just refresh it
-            self.notification_panel.refresh_notifications(notifications)
+            self.notification_panel.refresh_notifications()
             self.notification_panel.raise_()  # Bring to front
 
     def clear_all_notifications(self):
         """Clear all notifications"""
         self.notification_manager.clear_all()
         if self.notification_panel:
-            self.notification_panel.refresh_notifications([])
+            self.notification_panel.refresh_notifications()
 
     def update_statistics(self):
         """Update notification statistics"""
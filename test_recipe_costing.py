@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized recipe costing engine used by the pricing page
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.recipe_costing import RecipeCostingEngine
+
+
+def _sample_data():
+    inventory = pd.DataFrame({
+        'item_name': ['Rice', 'Toor Dal', 'Ghee Special', 'Salt', 'Saffron'],
+        'unit': ['grams', 'kg', 'grams', 'grams', 'grams'],
+        'quantity': [1000, 5, 500, 1000, 2],
+        'avg_price': [0.06, None, None, None, 5000.0],
+        'price_per_unit': [None, 120.0, 0.9, None, None],
+    })
+    shopping_list = pd.DataFrame({
+        'item_name': ['Salt', 'Jaggery'],
+        'avg_price': [None, None],
+        'current_price': [0.02, None],
+        'last_price': [None, 60.0],
+        'quantity': [1, 1000],
+    })
+    recipe_ingredients = pd.DataFrame({
+        'recipe_id': [1, 1, 2, 2, 3, 4],
+        'item_name': ['Rice ', 'toor dal', 'Ghee', 'Jaggery', 'Pepper', 'Saffron'],
+        'quantity': [200, 500, 10, 50, 5, 1],
+        'unit': ['grams', 'grams', 'grams', 'grams', 'grams', 'grams'],
+    })
+    return {'inventory': inventory, 'shopping_list': shopping_list, 'recipe_ingredients': recipe_ingredients}
+
+
+def test_price_resolution_order():
+    """Static prices win, then inventory (exact, then partial), then the shopping list"""
+    print("🧪 Testing ingredient price resolution...")
+    engine = RecipeCostingEngine(_sample_data(), {'Rice': 0.05})
+
+    assert engine.resolve('Rice')['unit_price'] == 0.05
+    assert engine.resolve('Rice')['source'] == 'static'
+    # price_per_unit above 100 with quantity > 1 is treated as a total
+    assert engine.resolve('toor dal')['unit_price'] == 24.0
+    assert engine.resolve('Ghee') == {'unit_price': 0.9, 'source': 'inventory', 'price_unit': 'grams'}
+    assert engine.resolve('Jaggery')['unit_price'] == 0.06
+    assert engine.resolve('Saffron')['unit_price'] == RecipeCostingEngine.MAX_UNIT_PRICE
+    assert engine.resolve('Pepper')['unit_price'] == 0.0
+    print("✅ Ingredient price resolution works")
+
+
+def test_recipe_costs_in_one_pass():
+    """Recipe totals come from one groupby; missing prices make the recipe incomplete"""
+    print("🧪 Testing recipe costs...")
+    engine = RecipeCostingEngine(_sample_data())
+
+    # Toor dal is priced per kg in inventory, the recipe uses grams
+    assert engine.cost_for(1) == round(200 * 0.06 + 0.5 * 24.0, 2)
+    assert engine.cost_for(2.0) == round(10 * 0.9 + 50 * 0.06, 2)
+    assert engine.cost_for(3) is None
+    assert engine.cost_for(99) == 0.0
+    assert engine.missing_ingredients() == ['Pepper']
+    assert engine.missing_ingredients(recipe_id=1) == []
+    print("✅ Recipe costs work")
+
+
+def test_engine_scales_to_many_recipes():
+    """Thousands of recipes are costed without per-ingredient lookups"""
+    print("🧪 Testing costing at scale...")
+    data = _sample_data()
+    base = data['recipe_ingredients']
+    data['recipe_ingredients'] = pd.concat(
+        [base.assign(recipe_id=base['recipe_id'] + offset * 10) for offset in range(2000)],
+        ignore_index=True
+    )
+    engine = RecipeCostingEngine(data)
+
+    costs = engine.recipe_costs()
+    assert len(costs) == 8000
+    assert costs[float(10 * 1999 + 1)] == engine.cost_for(1)
+    assert len(engine._resolved) == 6
+    print("✅ Costing scales to many recipes")
+
+
+def test_price_change_recosts_only_affected_recipes():
+    """Editing one inventory price recosts just the recipes using that item"""
+    print("🧪 Testing incremental recost...")
+    data = _sample_data()
+    engine = RecipeCostingEngine(data)
+    before = dict(engine.recipe_costs())
+
+    assert engine.recipes_using_item('Ghee Special') == {2.0}
+    assert engine.recipes_using_item('Toor Dal') == {1.0}
+
+    inventory = data['inventory'].copy()
+    inventory.loc[inventory['item_name'] == 'Ghee Special', 'price_per_unit'] = 1.5
+    inventory.loc[inventory['item_name'] == 'Rice', 'quantity'] = 10  # not a price change
+    changes = engine.refresh_prices(dict(data, inventory=inventory))
+
+    assert changes == {2.0: (before[2.0], round(10 * 1.5 + 50 * 0.06, 2))}
+    assert engine.cost_for(2) == changes[2.0][1]
+    assert engine.cost_for(1) == before[1.0]
+    assert engine.recipe_costs() == RecipeCostingEngine(dict(data, inventory=inventory)).recipe_costs()
+    print("✅ Incremental recost works")
+
+
+def test_new_price_completes_recipe():
+    """Adding a price for a missing ingredient completes the recipes using it"""
+    print("🧪 Testing missing price becoming available...")
+    data = _sample_data()
+    engine = RecipeCostingEngine(data)
+    assert engine.cost_for(3) is None
+
+    inventory = pd.concat([data['inventory'], pd.DataFrame({
+        'item_name': ['Black Pepper'], 'unit': ['grams'], 'quantity': [100], 'avg_price': [1.2]
+    })], ignore_index=True)
+    changes = engine.refresh_prices(dict(data, inventory=inventory))
+
+    assert changes == {3.0: (None, 6.0)}
+    assert engine.missing_ingredients() == []
+    print("✅ Missing price becoming available works")
+
+
+def test_packing_changes_map_to_recipes():
+    """Packing material edits report the recipes whose packaging changed"""
+    print("🧪 Testing packing material dependencies...")
+    data = _sample_data()
+    data['packing_materials'] = pd.DataFrame({
+        'material_id': [1.0, 2.0], 'material_name': ['Small box', 'Big box'], 'cost_per_unit': [3.5, 5.8]
+    })
+    data['recipe_packing_materials'] = pd.DataFrame({
+        'recipe_id': [1.0, 2.0, 3.0], 'recipe_name': ['Rice Bath', 'Payasam', 'Rasam'],
+        'material_id': [1.0, 2.0, 2.0], 'material_name': ['Small box', 'Big box', 'Big box'],
+        'quantity_needed': [1.0, 1.0, 2.0], 'cost_per_recipe': [3.5, 5.8, 11.6]
+    })
+    engine = RecipeCostingEngine(data)
+    assert engine.recipes_using_material('big box') == {'Payasam', 'Rasam'}
+
+    materials = data['packing_materials'].copy()
+    materials.loc[1, 'cost_per_unit'] = 6.0
+    assert engine.refresh_packing(dict(data, packing_materials=materials)) == {'Payasam', 'Rasam'}
+    assert engine.refresh_packing(dict(data, packing_materials=materials)) == set()
+    print("✅ Packing material dependencies work")
+
+
+def main():
+    """Run all recipe costing tests"""
+    tests = [
+        test_price_resolution_order,
+        test_recipe_costs_in_one_pass,
+        test_engine_scales_to_many_recipes,
+        test_price_change_recosts_only_affected_recipes,
+        test_new_price_completes_recipe,
+        test_packing_changes_map_to_recipes,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
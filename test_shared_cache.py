@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test the shared LRU/TTL cache and the modules that use it
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.shared_cache import LRUCache, cache_statistics, clear_all_caches, get_cache
+
+
+def test_lru_order_and_limits():
+    """Least recently used entries are evicted first, by count and by bytes"""
+    print("🧪 Testing LRU eviction...")
+    cache = LRUCache('test', max_size=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D')
+    assert 'b' not in cache and 'a' in cache and len(cache) == 3
+    assert cache.evictions == 1 and cache.hits == 1
+
+    # None is a valid cached value for get_or_compute
+    calls = []
+    assert cache.get_or_compute('missing', lambda: calls.append(1)) is None
+    assert cache.get_or_compute('missing', lambda: calls.append(1)) is None and len(calls) == 1
+
+    masks = LRUCache('masks', max_size=None, max_bytes=3000)
+    for n in range(5):
+        masks.put(n, np.zeros(1000, dtype=bool))
+    assert len(masks) == 3 and masks.bytes == 3000 and 0 not in masks
+    masks.put('huge', np.zeros(5000, dtype=bool))
+    assert 'huge' not in masks and len(masks) == 3
+
+    # A large cache stays constant-time per operation
+    big = LRUCache('big', max_size=50000)
+    start = time.perf_counter()
+    for n in range(200000):
+        big.put(n, n)
+        big.get(n // 2)
+    elapsed = time.perf_counter() - start
+    assert len(big) == 50000 and elapsed < 5, elapsed
+    print(f"✅ LRU eviction correct (400k operations in {elapsed:.2f}s)")
+
+
+def test_ttl_and_monitor_counters():
+    """Expired entries miss, and hits/misses/evictions reach the PerformanceMonitor"""
+    print("🧪 Testing TTL expiry and monitoring...")
+    from notification_performance_optimizer import NotificationCache, PerformanceMonitor
+
+    monitor = PerformanceMonitor()
+    cache = NotificationCache(max_size=2, ttl=0.05, monitor=monitor)
+    cache.put('rice', 1)
+    cache.put('dal', 2, ttl=60)
+    assert cache.get('rice') == 1
+    time.sleep(0.1)
+    assert cache.get('rice') is None and cache.get('dal') == 2
+    cache.put('oil', 3)
+    cache.put('salt', 4)
+    assert cache.expirations == 1 and cache.evictions == 1
+
+    report = monitor.get_performance_report()
+    assert (monitor.cache_hits, monitor.cache_misses, monitor.cache_evictions) == (2, 1, 1)
+    assert report['cache_evictions'] == 1
+    time.sleep(0.1)
+    assert cache.purge_expired() == 2 and len(cache) == 0
+    print("✅ TTL expiry and counters work")
+
+
+def test_table_search_and_pricing_share_caches():
+    """Search masks and price lookups are served from the shared caches"""
+    print("🧪 Testing shared cache users...")
+    from modules.table_search_index import TableSearchIndex
+    from PySide6.QtWidgets import QApplication
+    from modules.pricing_management import PricingManagementWidget
+
+    clear_all_caches()
+    df = pd.DataFrame({'item_name': ['Masala Dosa', 'Idli', 'Pongal'] * 100, 'status': ['Pending'] * 300})
+    index = TableSearchIndex(df)
+    first = index.search('dosa')
+    first[:] = False
+    assert index.search('dosa').sum() == 100
+    assert cache_statistics()['table_search']['hits'] == 1
+
+    # Rebuilding with new data never reuses masks of the old data
+    index.build(df.iloc[:30])
+    assert len(index.search('dosa')) == 30
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    data = {
+        'inventory': pd.DataFrame({'item_name': ['Rice', 'Dal'], 'avg_price': [60.0, 120.0],
+                                   'quantity': [10.0, 5.0]}),
+        'shopping_list': pd.DataFrame({'item_name': ['Oil'], 'avg_price': [150.0], 'quantity': [1.0]}),
+    }
+    widget = PricingManagementWidget(data)
+    lookups = get_cache('pricing_lookups')
+    lookups.reset_stats()
+    assert widget.get_ingredient_price_from_inventory_only('rice') == 60.0
+    assert widget.get_ingredient_price_from_inventory_only('Rice') == 60.0
+    assert widget.get_ingredient_price_from_shopping_list('Saffron') is None
+    assert widget.get_ingredient_price_from_shopping_list('Saffron') is None
+    assert (lookups.hits, lookups.misses) == (2, 2)
+
+    data['inventory'].loc[0, 'avg_price'] = 65.0
+    widget.on_price_data_changed(tables=['inventory'])
+    assert widget.get_ingredient_price_from_inventory_only('rice') == 65.0
+    app.processEvents()
+    print("✅ Table search and pricing use the shared caches")
+
+
+def test_edits_outside_the_pricing_page_reach_cached_prices():
+    """A table version bump (an edit saved by another page) drops cached prices; failed lookups are not cached"""
+    print("🧪 Testing cached prices after outside edits...")
+    from PySide6.QtWidgets import QApplication
+    from modules.pricing_management import PricingManagementWidget
+    clear_all_caches()
+    app = QApplication.instance() or QApplication(sys.argv)
+    data = {
+        'inventory': pd.DataFrame({'item_name': ['Rice', 'Dal'], 'avg_price': [60.0, 120.0],
+                                   'quantity': [10.0, 5.0]}),
+    }
+    versions = {}
+    widget = PricingManagementWidget(data, table_versions=versions)
+    assert widget.get_ingredient_price_from_inventory_only('rice') == 60.0
+    engine = widget.get_costing_engine()
+
+    # Same table, same length, edited in place: only the version says it changed
+    data['inventory'].loc[0, 'avg_price'] = 70.0
+    assert widget.get_ingredient_price_from_inventory_only('rice') == 60.0
+    versions['inventory'] = 1
+    assert widget.get_ingredient_price_from_inventory_only('rice') == 70.0
+    assert widget.get_costing_engine() is not engine
+
+    lookups = get_cache('pricing_lookups')
+    calls = []
+
+    def failing_lookup(item_name):
+        calls.append(item_name)
+        raise ValueError("price table unreadable")
+
+    for _ in range(2):
+        try:
+            widget._cached_price_lookup('inventory', 'Oil', failing_lookup)
+        except ValueError:
+            pass
+    assert calls == ['Oil', 'Oil'] and len(lookups) == 2
+    app.processEvents()
+    print("✅ Outside edits reach cached prices")
+
+
+def main():
+    """Run all shared cache tests"""
+    tests = [
+        test_lru_order_and_limits,
+        test_ttl_and_monitor_counters,
+        test_table_search_and_pricing_share_caches,
+        test_edits_outside_the_pricing_page_reach_cached_prices,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
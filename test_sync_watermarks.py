@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test watermark-based change detection and incremental downloads in IntelligentSyncManager
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+import modules.sync_manager as sync_manager_module
+from modules.cloud_delta_sync import UploadManifest
+from modules.fake_firestore import FakeFirestoreClient
+from modules.sync_manager import IntelligentSyncManager, SyncOperation, SyncWorker
+
+
+class _FakeFirebaseManager:
+    """The parts of OptimizedFirebaseManager the sync manager uses"""
+
+    def __init__(self, db, data_dir):
+        self.db = db
+        self.batch_size = 100
+        self.upload_manifest = UploadManifest(os.path.join(data_dir, '.cloud_manifest.json'))
+
+    def is_authenticated(self):
+        return True
+
+    def get_current_user(self):
+        return {'user_id': 'user-1'}
+
+
+def _installation(db, data_dir):
+    return IntelligentSyncManager(_FakeFirebaseManager(db, data_dir), data_dir)
+
+
+def _run(manager, operation_type, data_types):
+    worker = SyncWorker(SyncOperation('op', operation_type, data_types, ''), manager)
+    if operation_type == 'upload':
+        worker._perform_upload()
+    else:
+        worker._perform_download()
+
+
+def _inventory():
+    return pd.DataFrame({
+        'item_id': [1, 2, 3, 4],
+        'item_name': ['Rice', 'Dal', 'Salt', 'Ghee'],
+        'quantity': [10.0, 5.0, 1.0, 2.0],
+    })
+
+
+def test_local_checksum_uses_file_stat():
+    """Unchanged files are not re-read; edited files are detected from their bytes"""
+    print("🧪 Testing local change detection...")
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = _installation(FakeFirestoreClient(), data_dir)
+        path = os.path.join(data_dir, 'inventory.csv')
+        _inventory().to_csv(path, index=False)
+
+        info = manager.get_local_file_info('inventory')
+        assert info['record_count'] == 4
+        assert manager.detect_local_changes('inventory')
+
+        manager.record_local_sync('inventory', 'upload', 0, '')
+        assert not manager.detect_local_changes('inventory')
+
+        with open(path, 'a') as f:
+            f.write("5,Oil,3.0\n")
+        assert manager.detect_local_changes('inventory')
+        assert manager.get_local_file_info('inventory')['record_count'] == 5
+    print("✅ Local change detection works")
+
+
+def test_remote_changes_cost_one_read():
+    """A change check reads one watermark document per table"""
+    print("🧪 Testing remote change detection...")
+    QApplication.instance() or QApplication(sys.argv)
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        _inventory().to_csv(os.path.join(dir_a, 'inventory.csv'), index=False)
+        first, second = _installation(db, dir_a), _installation(db, dir_b)
+
+        _run(first, 'upload', ['inventory'])
+        assert db.docs['users/user-1/_sync_meta/inventory']['version'] == 1
+        assert not first.detect_remote_changes('inventory')[0]
+
+        reads = db.reads
+        assert second.detect_remote_changes('inventory')[0]
+        assert db.reads == reads + 1
+    print("✅ Remote change detection works")
+
+
+def test_download_fetches_only_newer_documents():
+    """Downloads read documents newer than the watermark and apply remote deletes"""
+    print("🧪 Testing incremental download...")
+    QApplication.instance() or QApplication(sys.argv)
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        path_a = os.path.join(dir_a, 'inventory.csv')
+        path_b = os.path.join(dir_b, 'inventory.csv')
+        _inventory().to_csv(path_a, index=False)
+        first, second = _installation(db, dir_a), _installation(db, dir_b)
+
+        _run(first, 'upload', ['inventory'])
+        _run(second, 'download', ['inventory'])
+        assert pd.read_csv(path_b)['item_name'].tolist() == ['Rice', 'Dal', 'Salt', 'Ghee']
+
+        # Edit one row and delete another on the first installation
+        edited = _inventory()
+        edited.loc[1, 'quantity'] = 50.0
+        edited = edited[edited['item_name'] != 'Salt']
+        edited.to_csv(path_a, index=False)
+        writes = db.writes
+        _run(first, 'upload', ['inventory'])
+        assert db.writes == writes + 3  # one set, one delete, one watermark
+
+        reads = db.reads
+        _run(second, 'download', ['inventory'])
+        assert db.reads == reads + 2  # the watermark and the one changed document
+        downloaded = pd.read_csv(path_b)
+        assert downloaded['item_name'].tolist() == ['Rice', 'Dal', 'Ghee']
+        assert downloaded.loc[1, 'quantity'] == 50.0
+
+        # Nothing new: only the watermark is read, and nothing is re-uploaded
+        reads = db.reads
+        _run(second, 'download', ['inventory'])
+        assert db.reads == reads + 1
+        assert not second.detect_local_changes('inventory')
+        assert second.firebase_manager.upload_manifest.plan('user-1', 'inventory', downloaded).write_count == 0
+    print("✅ Incremental download works")
+
+
+class _LaggingClock(datetime):
+    """A machine whose clock is a day behind"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) - timedelta(days=1)
+
+
+def test_clock_skewed_installation_is_downloaded():
+    """Rows uploaded from a machine with a lagging clock still reach the others"""
+    print("🧪 Testing clock-skewed uploads...")
+    QApplication.instance() or QApplication(sys.argv)
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b, \
+            tempfile.TemporaryDirectory() as dir_c:
+        _inventory().to_csv(os.path.join(dir_a, 'inventory.csv'), index=False)
+        first, second = _installation(db, dir_a), _installation(db, dir_b)
+        _run(first, 'upload', ['inventory'])
+        _run(second, 'download', ['inventory'])
+
+        # A third machine, a day behind, edits a row and uploads it
+        lagging = _inventory()
+        lagging.loc[0, 'quantity'] = 99.0
+        lagging.to_csv(os.path.join(dir_c, 'inventory.csv'), index=False)
+        third = _installation(db, dir_c)
+        original = sync_manager_module.datetime
+        sync_manager_module.datetime = _LaggingClock
+        try:
+            _run(third, 'upload', ['inventory'])
+        finally:
+            sync_manager_module.datetime = original
+
+        stamped = db.docs['users/user-1/inventory/1']['_sync_timestamp']
+        assert isinstance(stamped, datetime) and stamped.tzinfo is not None
+        assert db.docs['users/user-1/_sync_meta/inventory']['version'] == 2
+
+        # The third machine had not seen version 1, so it still reports the remote as changed
+        assert third.sync_metadata['inventory'].remote_version == 0
+        assert third.detect_remote_changes('inventory')[0]
+
+        assert second.detect_remote_changes('inventory')[0]
+        _run(second, 'download', ['inventory'])
+        assert pd.read_csv(os.path.join(dir_b, 'inventory.csv')).loc[0, 'quantity'] == 99.0
+    print("✅ Clock-skewed uploads are downloaded")
+
+
+def test_client_clock_watermark_forces_full_download():
+    """A watermark saved from a client clock (no timezone) is not trusted for incremental queries"""
+    print("🧪 Testing legacy watermarks...")
+    QApplication.instance() or QApplication(sys.argv)
+    db = FakeFirestoreClient()
+    with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+        _inventory().to_csv(os.path.join(dir_a, 'inventory.csv'), index=False)
+        first, second = _installation(db, dir_a), _installation(db, dir_b)
+        _run(first, 'upload', ['inventory'])
+        _run(second, 'download', ['inventory'])
+
+        edited = _inventory()
+        edited.loc[2, 'quantity'] = 7.0
+        edited.to_csv(os.path.join(dir_a, 'inventory.csv'), index=False)
+        _run(first, 'upload', ['inventory'])
+
+        second.sync_metadata['inventory'].remote_updated_at = datetime.now().isoformat()
+        reads = db.reads
+        _run(second, 'download', ['inventory'])
+        assert db.reads == reads + 1 + 4  # the watermark and every document
+        assert pd.read_csv(os.path.join(dir_b, 'inventory.csv')).loc[2, 'quantity'] == 7.0
+        assert sync_manager_module.server_time(second.sync_metadata['inventory'].remote_updated_at) is not None
+        assert sync_manager_module.server_time('not a time') is None
+    print("✅ Legacy watermarks fall back to a full download")
+
+
+def main():
+    """Run all sync watermark tests"""
+    tests = [
+        test_local_checksum_uses_file_stat,
+        test_remote_changes_cost_one_read,
+        test_download_fetches_only_newer_documents,
+        test_clock_skewed_installation_is_downloaded,
+        test_client_clock_watermark_forces_full_download,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
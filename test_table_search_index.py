@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the prebuilt search index used by UniversalTableWidget filters
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.table_search_index import TableSearchIndex
+
+
+def _orders(rows):
+    items = np.array(['Masala Dosa', 'Idli', 'Pongal', 'Café Latte', 'Kesari Bath'])
+    return pd.DataFrame({
+        'order_id': np.arange(rows),
+        'item_name': items[np.arange(rows) % len(items)],
+        'status': np.where(np.arange(rows) % 4 == 0, 'Pending', 'Delivered'),
+        'amount': np.round(np.arange(rows) * 0.75, 2),
+        'order_date': pd.date_range('2025-01-01', periods=rows, freq='min').astype(str),
+        'notes': np.where(np.arange(rows) % 10 == 0, None, 'extra chutney'),
+    })
+
+
+def _contains_everywhere(df, text):
+    """The filter the index replaces: str.contains on every column"""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        mask |= df[col].astype(str).str.lower().str.contains(text, na=False, regex=False).to_numpy()
+    return mask
+
+
+def test_search_matches_column_contains():
+    """Index search gives the same rows as the per-column contains() scan"""
+    print("🧪 Testing index search results...")
+    df = _orders(2000)
+    index = TableSearchIndex(df)
+
+    for text in ['dosa', 'DOSA', 'a', 'café', 'pending', '1999', '7.5', 'none', 'chutney', 'zzz', 'dosaidli', '2025-01-01 0']:
+        expected = _contains_everywhere(df, text.lower())
+        assert (index.search(text) == expected).all(), text
+
+    # A match never spans two cells
+    assert not index.search('dosapending').any()
+    assert index.search('').all()
+    print("✅ Index search results match")
+
+
+def test_date_and_category_masks():
+    """Dates are parsed once and categories factorized once"""
+    print("🧪 Testing date and category masks...")
+    df = pd.DataFrame({
+        'status': ['Open', 'Closed', 'Open', None],
+        'due_date': ['2025-03-01', 'not a date', '2025-05-10 14:00', '2025-04-01'],
+    })
+    index = TableSearchIndex(df)
+
+    assert index.date_column == 'due_date'
+    mask = index.date_range(pd.Timestamp('2025-04-01'), pd.Timestamp('2025-05-10'))
+    assert mask.tolist() == [False, True, True, True]
+
+    assert index.category_columns == ['status']
+    assert index.category('status', 'Open').tolist() == [True, False, True, False]
+    assert not index.category('status', 'Archived').any()
+
+    assert TableSearchIndex(pd.DataFrame({'name': ['a']})).date_range('2025-01-01', '2025-12-31') is None
+    assert TableSearchIndex(pd.DataFrame()).search('x').tolist() == []
+
+    # Missing cells are blank, whatever the column's dtype
+    missing = TableSearchIndex(pd.DataFrame({
+        'notes': [None, 'nandini ghee', np.nan],
+        'amount': [1.5, np.nan, 2.0],
+        'due': pd.to_datetime(['2025-01-01', None, '2025-01-02']),
+    }))
+    assert missing.search('nan').tolist() == [False, True, False]
+    assert not missing.search('none').any() and not missing.search('nat').any()
+    print("✅ Date and category masks work")
+
+
+def test_search_is_fast_on_large_tables():
+    """A keystroke on a 100k-row table stays within a frame"""
+    print("🧪 Testing search latency...")
+    df = _orders(100000)
+
+    started = time.perf_counter()
+    index = TableSearchIndex(df)
+    build_time = time.perf_counter() - started
+
+    timings = []
+    for text in ['m', 'ma', 'mas', 'masa', 'masal', 'masala', 'pending', '9999']:
+        started = time.perf_counter()
+        index.search(text)
+        timings.append(time.perf_counter() - started)
+
+    assert index.search('masala').sum() == 20000
+    assert max(timings) < 0.05, f"slowest search took {max(timings) * 1000:.1f}ms"
+    print(f"✅ Index built in {build_time:.2f}s, slowest search {max(timings) * 1000:.1f}ms")
+
+
+def main():
+    """Run all search index tests"""
+    tests = [
+        test_search_matches_column_contains,
+        test_date_and_category_masks,
+        test_search_is_fast_on_large_tables,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
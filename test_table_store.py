@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Test the typed table store behind the CSV data files
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.table_store import TableStore
+
+
+def _write_sales_csv(data_dir):
+    df = pd.DataFrame({
+        'sale_id': [1, 2, 3],
+        'item_name': ['Dosa', 'Idli', 'Vada'],
+        'quantity': [2, 4, 1],
+        'total_amount': [120.0, 80.0, 35.5],
+        'date': ['2025-06-01', '2025-06-02', 'not a date'],
+    })
+    df.to_csv(os.path.join(data_dir, 'sales.csv'), index=False)
+    return df
+
+
+def test_read_parses_dates_and_caches():
+    """CSV is parsed once, later reads come from the binary copy with dtypes intact"""
+    print("🧪 Testing table store read and cache...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+
+        assert not store.is_fresh('sales')
+        first = store.read('sales')
+        assert pd.api.types.is_datetime64_any_dtype(first['date'])
+        assert first['date'].isna().sum() == 1
+        assert store.is_fresh('sales')
+
+        second = TableStore(data_dir).read('sales')
+        assert pd.api.types.is_datetime64_any_dtype(second['date'])
+        assert second['total_amount'].tolist() == [120.0, 80.0, 35.5]
+    print("✅ Table store read and cache work")
+
+
+def test_column_selective_read():
+    """Only the requested columns are returned"""
+    print("🧪 Testing column-selective reads...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        subset = store.read('sales', columns=['item_name', 'quantity', 'missing'])
+        assert list(subset.columns) == ['item_name', 'quantity']
+        assert subset['quantity'].tolist() == [2, 4, 1]
+    print("✅ Column-selective reads work")
+
+
+def test_external_csv_edit_invalidates_copy():
+    """Editing the CSV outside the store makes the next read re-parse it"""
+    print("🧪 Testing CSV edits invalidate the binary copy...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        df = _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        time.sleep(0.01)
+        df = pd.concat([df, df.head(1)], ignore_index=True)
+        df.to_csv(os.path.join(data_dir, 'sales.csv'), index=False)
+
+        assert not store.is_fresh('sales')
+        assert len(store.read('sales')) == 4
+    print("✅ CSV edits invalidate the binary copy")
+
+
+def test_write_exports_csv():
+    """Writes keep the CSV file in sync with the binary copy"""
+    print("🧪 Testing writes export CSV...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = TableStore(data_dir)
+        df = pd.DataFrame({'waste_id': [1], 'item_name': ['Rice'], 'date': pd.to_datetime(['2025-06-03'])})
+        store.write('waste', df)
+
+        assert store.is_fresh('waste')
+        csv_df = pd.read_csv(os.path.join(data_dir, 'waste.csv'))
+        assert csv_df['item_name'].tolist() == ['Rice']
+        assert pd.api.types.is_datetime64_any_dtype(store.read('waste')['date'])
+    print("✅ Writes export CSV")
+
+
+def test_pickle_backend_keeps_mixed_columns():
+    """The pickle backend stores tables Parquet cannot express"""
+    print("🧪 Testing pickle backend...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = TableStore(data_dir, backend='pickle')
+        df = pd.DataFrame({'notes': ['a', 1, None]}, dtype=object)
+        store.write('staff', df)
+
+        result = TableStore(data_dir, backend='pickle').read('staff')
+        assert len(result) == 3
+    print("✅ Pickle backend works")
+
+
+def test_append_is_replayed_from_journal_tail():
+    """Appended rows are read back from the CSV tail on top of the binary copy"""
+    print("🧪 Testing journal appends...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        new_rows = pd.DataFrame({'sale_id': [4, 5], 'item_name': ['Poori', 'Upma'], 'date': ['2025-06-04', '2025-06-05']})
+        assert store.append('sales', new_rows)
+        assert store.append('sales', new_rows.tail(1).assign(sale_id=6))
+
+        assert store._replay_journal('sales') is not None
+        df = TableStore(data_dir).read('sales')
+        assert df['sale_id'].tolist() == [1, 2, 3, 4, 5, 6]
+        assert pd.isna(df.loc[3, 'total_amount'])
+        assert pd.api.types.is_datetime64_any_dtype(df['date'])
+
+        store.compact('sales')
+        assert store.is_fresh('sales')
+        assert len(store.read('sales')) == 6
+    print("✅ Journal appends are replayed")
+
+
+def test_appends_are_not_rehashed():
+    """Reads after appends neither rehash the CSV prefix nor decode unrequested columns"""
+    print("🧪 Testing cheap reads between appends...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+        digests = []
+        prefix_digest = store._prefix_digest
+        store._prefix_digest = lambda table, offset: digests.append(offset) or prefix_digest(table, offset)
+
+        for sale_id in range(4, 54):
+            assert store.append('sales', pd.DataFrame({'sale_id': [sale_id], 'item_name': ['Poori']}))
+            assert store.row_count('sales') == sale_id
+        assert digests == []
+
+        ids = store.read('sales', columns=['sale_id'])
+        assert list(ids.columns) == ['sale_id'] and ids['sale_id'].tolist() == list(range(1, 54))
+        assert store.read('sales')['item_name'].tolist()[-1] == 'Poori'
+        assert digests == []
+
+        # Another process appending to the file is verified once, then remembered
+        other = TableStore(data_dir)
+        other._prefix_digest = store._prefix_digest
+        assert other.row_count('sales') == 53 and len(digests) == 1
+        assert len(other.read('sales')) == 53 and len(digests) == 1
+
+        # An external rewrite after the appends is still caught
+        df = store.read('sales')
+        df.loc[0, 'item_name'] = 'Masala Dosa'
+        df.to_csv(os.path.join(data_dir, 'sales.csv'), index=False)
+        assert store.read('sales')['item_name'].tolist()[0] == 'Masala Dosa'
+    print("✅ Appends are not rehashed")
+
+
+def test_rewrite_after_append_is_not_replayed_twice():
+    """A full rewrite of the CSV invalidates the journal tail"""
+    print("🧪 Testing rewrites after appends...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        df = _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        store.append('sales', df.head(1).assign(sale_id=4))
+        df.drop(index=0).to_csv(os.path.join(data_dir, 'sales.csv'), index=False)
+
+        assert store._replay_journal('sales') is None
+        assert store.read('sales')['sale_id'].tolist() == [2, 3]
+    print("✅ Rewrites invalidate the journal")
+
+
+def test_append_rejects_unknown_columns():
+    """Rows with columns the CSV header lacks need a full rewrite"""
+    print("🧪 Testing appends with new columns...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+
+        assert not store.append('sales', pd.DataFrame({'sale_id': [4], 'platform': ['Swiggy']}))
+        assert not store.append('waste', pd.DataFrame({'waste_id': [1]}))
+        assert len(store.read('sales')) == 3
+    print("✅ Appends with new columns are rejected")
+
+
+def test_earlier_row_rewritten_in_place_is_not_replayed():
+    """An external same-length edit far before the journal offset forces a full CSV read"""
+    print("🧪 Testing in-place rewrites of early rows...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, 'sales.csv')
+        df = pd.DataFrame({'sale_id': range(2000), 'item_name': 'Dosa', 'quantity': 5})
+        df.to_csv(path, index=False)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        edited = df.copy()
+        edited.loc[0, 'quantity'] = 6
+        edited = pd.concat([edited, pd.DataFrame({'sale_id': [2000], 'item_name': ['Idli'], 'quantity': [1]})],
+                           ignore_index=True)
+        edited.to_csv(path, index=False)
+        assert os.path.getsize(path) > store.manifest['sales']['csv_signature'][1]
+
+        assert store._replay_journal('sales') is None
+        result = store.read('sales')
+        assert len(result) == 2001
+        assert result.loc[0, 'quantity'] == 6
+    print("✅ Early rewrites are caught")
+
+
+def test_corrupt_journal_falls_back_to_csv():
+    """A broken or lost binary copy under the journal means the CSV is parsed again"""
+    print("🧪 Testing journal corruption fallback...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        _write_sales_csv(data_dir)
+        store = TableStore(data_dir)
+        store.read('sales')
+
+        # The binary copy is truncated by a crash mid-write
+        store.append('sales', pd.DataFrame({'sale_id': [4], 'item_name': ['Poori']}))
+        with open(store.binary_path('sales', store.manifest['sales']['backend']), 'wb') as f:
+            f.write(b'PAR1')
+        assert store._replay_journal('sales') is None
+        assert store.read('sales')['sale_id'].tolist() == [1, 2, 3, 4]
+
+        # The binary copy disappears behind the manifest's back
+        store.append('sales', pd.DataFrame({'sale_id': [5], 'item_name': ['Upma']}))
+        entry = store.manifest['sales']
+        os.remove(store.binary_path('sales', entry['backend']))
+        assert store._replay_journal('sales') is None
+        assert store.read('sales')['sale_id'].tolist()[-1] == 5
+
+        # A manifest from before full prefix digests is never replayed
+        store.append('sales', pd.DataFrame({'sale_id': [6], 'item_name': ['Vada']}))
+        store.manifest['sales'].pop('prefix_digest')
+        assert store._replay_journal('sales') is None
+        assert len(store.read('sales')) == 6
+    print("✅ Corrupt journals fall back to the CSV")
+
+
+def main():
+    """Run all table store tests"""
+    tests = [
+        test_read_parses_dates_and_caches,
+        test_column_selective_read,
+        test_external_csv_edit_invalidates_copy,
+        test_write_exports_csv,
+        test_pickle_backend_keeps_mixed_columns,
+        test_append_is_replayed_from_journal_tail,
+        test_appends_are_not_rehashed,
+        test_rewrite_after_append_is_not_replayed_twice,
+        test_append_rejects_unknown_columns,
+        test_earlier_row_rewritten_in_place_is_not_replayed,
+        test_corrupt_journal_falls_back_to_csv,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
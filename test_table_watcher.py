@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test per-table change detection for the data directory
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+import pandas as pd
+
+from modules.table_watcher import TableWatcher, table_saved
+
+
+def _app():
+    return QApplication.instance() or QApplication(sys.argv)
+
+
+def _touch(data_dir, table, content):
+    with open(os.path.join(data_dir, f"{table}.csv"), 'w') as f:
+        f.write(content)
+
+
+def test_only_changed_tables_are_reported():
+    """A write to waste.csv reports waste only and bumps its version"""
+    print("🧪 Testing per-table change detection...")
+    _app()
+    with tempfile.TemporaryDirectory() as data_dir:
+        _touch(data_dir, 'waste', "waste_id,item_name\n")
+        _touch(data_dir, 'recipe_ingredients', "recipe_id,item_name\n")
+
+        watcher = TableWatcher(data_dir, tables=['waste', 'recipe_ingredients'], use_fs_watcher=False)
+        events = []
+        watcher.table_changed.connect(lambda table, version: events.append((table, version)))
+
+        assert watcher.check_now() == []
+
+        time.sleep(0.01)
+        _touch(data_dir, 'waste', "waste_id,item_name\n1,Rice\n")
+
+        assert watcher.check_now() == ['waste']
+        assert events == [('waste', 1)]
+        assert watcher.get_version('recipe_ingredients') == 0
+    print("✅ Only changed tables are reported")
+
+
+def test_acknowledged_writes_are_ignored():
+    """Writes acknowledged by the app do not come back as changes"""
+    print("🧪 Testing acknowledged writes...")
+    _app()
+    with tempfile.TemporaryDirectory() as data_dir:
+        _touch(data_dir, 'sales', "sale_id\n")
+        watcher = TableWatcher(data_dir, tables=['sales'], use_fs_watcher=False)
+
+        time.sleep(0.01)
+        _touch(data_dir, 'sales', "sale_id\n1\n")
+        watcher.acknowledge('sales')
+
+        assert watcher.check_now() == []
+        assert watcher.get_version('sales') == 0
+    print("✅ Acknowledged writes are ignored")
+
+
+def test_unrestricted_watcher_finds_new_tables():
+    """Without a table list every CSV in the directory is watched"""
+    print("🧪 Testing unrestricted watching...")
+    _app()
+    with tempfile.TemporaryDirectory() as data_dir:
+        watcher = TableWatcher(data_dir, use_fs_watcher=False)
+        _touch(data_dir, 'staff', "staff_id\n")
+
+        assert watcher.check_now() == ['staff']
+    print("✅ New tables are picked up")
+
+
+def test_pages_own_saves_do_not_rebuild():
+    """A page's own to_csv save is reported as saved; an external edit still as changed"""
+    print("🧪 Testing the app's own saves...")
+    _app()
+    with tempfile.TemporaryDirectory() as data_dir:
+        inventory = pd.DataFrame({'item_id': [1, 2], 'item_name': ['Rice', 'Dal'], 'quantity': [5.0, 2.5]})
+        path = os.path.join(data_dir, 'inventory.csv')
+        inventory.to_csv(path, index=False)
+        watcher = TableWatcher(data_dir, tables=['inventory'], use_fs_watcher=False)
+        watcher.start()
+        changed, saved = [], []
+        watcher.tables_changed.connect(changed.append)
+        watcher.tables_saved.connect(saved.append)
+
+        # The page edits its frame in memory and saves a transformed copy itself
+        time.sleep(0.01)
+        inventory.loc[0, 'quantity'] = 4.0
+        inventory.assign(quantity=inventory['quantity'].map('{:.3f}'.format)).to_csv(path, index=False)
+        table_saved(path)
+        assert watcher.check_now() == []
+        assert saved == [['inventory']] and changed == []
+        assert watcher.get_version('inventory') == 1
+
+        # Someone else rewrites the file: the page has to reload
+        time.sleep(0.01)
+        with open(path, 'a') as f:
+            f.write("3,Salt,1.0\n")
+        assert watcher.check_now() == ['inventory']
+        assert changed == [['inventory']] and saved == [['inventory']]
+
+        # Saves outside the watched tables, and saves after stopping, are ignored
+        table_saved(os.path.join(data_dir, 'exports', 'inventory.csv'))
+        table_saved(os.path.join(data_dir, 'staff.csv'))
+        watcher.stop()
+        time.sleep(0.01)
+        inventory.to_csv(path, index=False)
+        table_saved(path)
+        assert watcher.check_now() == ['inventory'] and saved == [['inventory']]
+    print("✅ Own saves leave the page alone")
+
+
+def test_acknowledge_from_writer_thread():
+    """Acknowledging from another thread while checking neither raises nor loses a change"""
+    print("🧪 Testing acknowledge from the writer thread...")
+    _app()
+    with tempfile.TemporaryDirectory() as data_dir:
+        tables = [f"table_{i}" for i in range(20)]
+        for table in tables:
+            _touch(data_dir, table, "id\n")
+        watcher = TableWatcher(data_dir, tables=tables, use_fs_watcher=False)
+
+        errors = []
+
+        def acknowledge_all():
+            try:
+                for _ in range(50):
+                    for table in tables:
+                        watcher.acknowledge(table)
+            except Exception as e:
+                errors.append(e)
+
+        writer = threading.Thread(target=acknowledge_all)
+        writer.start()
+        for _ in range(50):
+            watcher.check_now()
+        writer.join()
+        assert errors == []
+
+        time.sleep(0.01)
+        _touch(data_dir, 'table_3', "id\n1\n")
+        assert watcher.check_now() == ['table_3']
+    print("✅ Acknowledge is safe from other threads")
+
+
+def main():
+    """Run all table watcher tests"""
+    tests = [
+        test_only_changed_tables_are_reported,
+        test_acknowledged_writes_are_ignored,
+        test_unrestricted_watcher_finds_new_tables,
+        test_pages_own_saves_do_not_rebuild,
+        test_acknowledge_from_writer_thread,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
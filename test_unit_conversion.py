@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the shared unit conversion registry
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.unit_conversion import (normalize_unit, conversion_factor, convert, convert_series,
+                                     is_volume_unit, is_weight_unit)
+
+
+def test_unit_aliases():
+    """Spellings from the data map to one canonical unit"""
+    print("🧪 Testing unit aliases...")
+    assert normalize_unit(' Grams ') == 'g'
+    assert normalize_unit('KGS') == 'kg'
+    assert normalize_unit('Litres') == 'l'
+    assert normalize_unit('pieces') == 'pcs'
+    assert normalize_unit('bunch') == 'bunch'
+    assert normalize_unit(None) == ''
+    assert is_weight_unit('gram') and is_volume_unit('ml')
+    assert not is_weight_unit('ml') and not is_volume_unit('pcs')
+    print("✅ Unit aliases work")
+
+
+def test_scalar_conversions():
+    """Exact conversions within a dimension, approximations across dimensions"""
+    print("🧪 Testing scalar conversions...")
+    assert convert(500, 'grams', 'kg') == 0.5
+    assert convert(2, 'l', 'ml') == 2000
+    assert convert(1, 'tbsp', 'grams') == 15
+    assert convert(2, 'pcs', 'g') == 100
+    assert convert(250, 'ml', 'kg') == 0.25
+    assert conversion_factor('ml', 'g', approximate=False) is None
+    assert conversion_factor('ml', 'bunch') is None
+    assert convert(3, 'ml', 'bunch') == 3
+    print("✅ Scalar conversions work")
+
+
+def test_convert_series():
+    """Whole columns convert with one multiply and keep their index"""
+    print("🧪 Testing series conversion...")
+    quantities = pd.Series([500, 2, 1, 3, 7], index=[10, 11, 12, 13, 14])
+    from_units = ['g', 'L', 'tsp', None, 'kg']
+    to_units = ['kg', 'ml', 'g', 'g', 'kg']
+
+    converted = convert_series(quantities, from_units, to_units)
+    assert list(converted.index) == [10, 11, 12, 13, 14]
+    assert converted.tolist() == [0.5, 2000.0, 5.0, 3.0, 7.0]
+
+    array = convert_series(np.array([1.0, 2.0]), ['kg', 'kg'], 'g')
+    assert isinstance(array, np.ndarray) and array.tolist() == [1000.0, 2000.0]
+    assert len(convert_series(pd.Series([], dtype=float), [], [])) == 0
+    print("✅ Series conversion works")
+
+
+def test_cross_dimension_conversions():
+    """Only liquids <-> weight and pieces/leaves -> weight are approximated; other pairs stay 1:1"""
+    print("🧪 Testing cross-dimension conversions...")
+    assert conversion_factor('l', 'kg') == 1.0 and conversion_factor('g', 'ml') == 1.0
+    assert conversion_factor('pieces', 'kg') == 0.05
+    assert conversion_factor('leaves', 'g') == 1.0
+
+    for from_unit, to_unit in [('pcs', 'ml'), ('leaves', 'pcs'), ('g', 'pcs'), ('kg', 'leaves'), ('ml', 'pcs')]:
+        assert conversion_factor(from_unit, to_unit) is None, (from_unit, to_unit)
+    assert convert(4, 'pcs', 'ml') == 4
+    assert convert_series(pd.Series([3.0, 200.0]), ['leaves', 'g'], ['pcs', 'pcs']).tolist() == [3.0, 200.0]
+    print("✅ Cross-dimension conversions are limited")
+
+
+def main():
+    """Run all unit conversion tests"""
+    tests = [
+        test_unit_aliases,
+        test_scalar_conversions,
+        test_convert_series,
+        test_cross_dimension_conversions,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test the background write-behind queue used by auto-save
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+
+from modules.table_store import TableStore
+from modules.write_behind import WriteBehindQueue
+
+
+def _flush(queue):
+    """Wait for the writer and deliver its signals (queued to this thread)"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    flushed = queue.flush(timeout=10)
+    app.processEvents()
+    return flushed
+
+
+def test_submitted_tables_are_written():
+    """Submitted snapshots reach the CSV file and leave no temp files behind"""
+    print("🧪 Testing write-behind writes...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        queue = WriteBehindQueue(TableStore(data_dir), coalesce_delay=0)
+        written = []
+        queue.table_written.connect(written.append)
+
+        df = pd.DataFrame({'waste_id': [1, 2], 'item_name': ['Rice', 'Dal']})
+        queue.submit('waste', df)
+        df.loc[0, 'item_name'] = 'Changed after submit'
+
+        assert _flush(queue)
+        assert written == ['waste']
+        saved = pd.read_csv(os.path.join(data_dir, 'waste.csv'))
+        assert saved['item_name'].tolist() == ['Rice', 'Dal']
+        assert not [name for name in os.listdir(data_dir) if name.endswith('.tmp')]
+        queue.stop(timeout=5)
+    print("✅ Write-behind writes work")
+
+
+def test_bursts_are_coalesced():
+    """Several submissions of one table before it is written cost one write"""
+    print("🧪 Testing write coalescing...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        queue = WriteBehindQueue(TableStore(data_dir), coalesce_delay=0.3)
+        written = []
+        queue.table_written.connect(written.append)
+
+        for count in range(1, 6):
+            queue.submit('sales', pd.DataFrame({'sale_id': range(count)}))
+
+        assert _flush(queue)
+        assert written == ['sales']
+        assert len(pd.read_csv(os.path.join(data_dir, 'sales.csv'))) == 5
+        queue.stop(timeout=5)
+    print("✅ Bursts are coalesced")
+
+
+def test_unchanged_tables_are_skipped():
+    """Tables whose content matches the stored copy are not rewritten"""
+    print("🧪 Testing unchanged tables are skipped...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = TableStore(data_dir)
+        df = pd.DataFrame({'staff_id': [1], 'staff_name': ['Anu']})
+        store.write('staff', df)
+        mtime = os.stat(store.csv_path('staff')).st_mtime_ns
+
+        queue = WriteBehindQueue(store, coalesce_delay=0)
+        skipped, written = [], []
+        queue.table_skipped.connect(skipped.append)
+        queue.table_written.connect(written.append)
+
+        queue.submit('staff', store.read('staff'), skip_if_unchanged=True)
+        assert _flush(queue)
+        assert skipped == ['staff'] and written == []
+        assert os.stat(store.csv_path('staff')).st_mtime_ns == mtime
+
+        queue.submit('staff', pd.DataFrame({'staff_id': [1], 'staff_name': ['Anu R']}), skip_if_unchanged=True)
+        assert _flush(queue)
+        assert written == ['staff']
+        queue.stop(timeout=5)
+    print("✅ Unchanged tables are skipped")
+
+
+def test_appends_survive_pending_writes():
+    """Rows appended while a snapshot is queued or being taken off the queue are kept"""
+    print("🧪 Testing appends during pending writes...")
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = TableStore(data_dir)
+        table = 'packing_materials_usage_history'
+        store.write(table, pd.DataFrame({'usage_id': [1, 2], 'material_name': ['Box', 'Bag']}))
+
+        # Appended while the snapshot waits out the coalescing delay
+        queue = WriteBehindQueue(store, coalesce_delay=0.3)
+        queue.submit(table, store.read(table))
+        assert store.append(table, pd.DataFrame({'usage_id': [3], 'material_name': ['Tape']}))
+        assert _flush(queue)
+        assert pd.read_csv(store.csv_path(table))['usage_id'].tolist() == [1, 2, 3]
+        queue.stop(timeout=5)
+
+        # Appended after the writer picked the table but before it took the snapshot
+        queue = WriteBehindQueue(store, coalesce_delay=0)
+        with store.table_lock(table):
+            queue.submit(table, store.read(table))
+            deadline = time.monotonic() + 5
+            while queue._in_progress != table and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert queue._in_progress == table
+            assert store.append(table, pd.DataFrame({'usage_id': [4], 'material_name': ['Wrap']}))
+        assert _flush(queue)
+        assert pd.read_csv(store.csv_path(table))['usage_id'].tolist() == [1, 2, 3, 4]
+        assert store.read(table)['usage_id'].tolist() == [1, 2, 3, 4]
+        queue.stop(timeout=5)
+    print("✅ Appends survive pending writes")
+
+
+def main():
+    """Run all write-behind tests"""
+    tests = [
+        test_submitted_tables_are_written,
+        test_bursts_are_coalesced,
+        test_unchanged_tables_are_skipped,
+        test_appends_survive_pending_writes,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+
+    print(f"\n🎯 Overall: {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
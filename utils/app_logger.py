@@ -1,46 +1,67 @@
 import os
 import sys
 import time
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
 import traceback
-import inspect
+from collections import deque
 from datetime import datetime
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, Slot
+
+from utils.startup_profiler import get_startup_profiler
+
+# Caller file/function/line is looked up only for records at or above this level
+CALLER_INFO_LEVEL = logging.WARNING
+
+# Log entries reach the logs viewer in batches, at most this often (milliseconds)
+SIGNAL_BATCH_MS = 100
+
+# Set to 1 to write log files and console output on the calling thread (e.g. to debug a crash)
+SYNC_LOGGING_ENV = 'KITCHEN_SYNC_LOGGING'
+
+# ASCII stand-ins for the emoji and currency symbols used in log messages
+EMOJI_REPLACEMENTS = {
+    '✅': '[SUCCESS]', '❌': '[ERROR]', '⚠️': '[WARNING]',
+    '🔄': '[REFRESH]', '📋': '[LIST]', '📱': '[MOBILE]',
+    '🔍': '[SEARCH]', '💾': '[SAVE]', '🎯': '[TARGET]',
+    '🚀': '[START]', '🔧': '[DEBUG]', '📊': '[DATA]',
+    '🎉': '[CELEBRATION]', '💡': '[IDEA]', '🔔': '[NOTIFICATION]',
+    '📤': '[UPLOAD]', '📥': '[DOWNLOAD]', '🌐': '[NETWORK]',
+    '🔒': '[SECURE]', '📈': '[CHART]', '📉': '[DECLINE]',
+    '🚨': '[ALERT]', '🔴': '[RED]', '🟢': '[GREEN]',
+    '🟡': '[YELLOW]', '🔵': '[BLUE]', '⭐': '[STAR]',
+    '💰': '[MONEY]', '📝': '[NOTE]', '📅': '[CALENDAR]',
+    '⏰': '[CLOCK]', '🔑': '[KEY]', '🎨': '[DESIGN]',
+    '📸': '[PHOTO]', '🎵': '[MUSIC]', '🔊': '[SOUND]',
+    '📡': '[SIGNAL]', '🌟': '[FEATURE]', '🏆': '[TROPHY]',
+    'ℹ️': '[INFO]', '📄': '[FILE]', '🖥️': '[SYSTEM]',
+    '📁': '[FOLDER]', '🖱️': '[UI]', '🍳': '[KITCHEN]',
+    '🔥': '[FIREBASE]', '📦': '[PACKAGE]', '🔓': '[UNLOCK]',
+    '🧪': '[TEST]', '🔬': '[ANALYZE]', '💻': '[COMPUTER]',
+    '🖨️': '[PRINT]', '🔇': '[MUTE]'
+}
+CURRENCY_REPLACEMENTS = {'₹': 'Rs.', '€': 'EUR', '£': 'GBP', '¥': 'JPY'}
+
+
+def to_safe_ascii(text):
+    """Text with emoji and currency symbols spelled out and any other non-ASCII replaced"""
+    if text.isascii():
+        return text
+    for emoji, replacement in EMOJI_REPLACEMENTS.items():
+        text = text.replace(emoji, replacement)
+    for symbol, replacement in CURRENCY_REPLACEMENTS.items():
+        text = text.replace(symbol, replacement)
+    return text.encode('ascii', errors='replace').decode('ascii')
+
 
 class SafeUnicodeFormatter(logging.Formatter):
     """Custom formatter that safely handles Unicode characters"""
 
     def format(self, record):
-        # Get the formatted message
-        formatted = super().format(record)
-
-        # Replace emoji characters that cause encoding issues
-        emoji_replacements = {
-            '✅': '[SUCCESS]', '❌': '[ERROR]', '⚠️': '[WARNING]',
-            '🔄': '[REFRESH]', '📋': '[LIST]', '📱': '[MOBILE]',
-            '🔍': '[SEARCH]', '💾': '[SAVE]', '🎯': '[TARGET]',
-            '🚀': '[START]', '🔧': '[DEBUG]', '📊': '[DATA]',
-            '🎉': '[CELEBRATION]', '💡': '[IDEA]', '🔔': '[NOTIFICATION]',
-            '📤': '[UPLOAD]', '📥': '[DOWNLOAD]', '🌐': '[NETWORK]',
-            '🔒': '[SECURE]', '📈': '[CHART]', '📉': '[DECLINE]',
-            '🚨': '[ALERT]', '🔴': '[RED]', '🟢': '[GREEN]',
-            '🟡': '[YELLOW]', '🔵': '[BLUE]', '⭐': '[STAR]',
-            '💰': '[MONEY]', '📝': '[NOTE]', '📅': '[CALENDAR]',
-            '⏰': '[CLOCK]', '🔑': '[KEY]', '🎨': '[DESIGN]',
-            '📸': '[PHOTO]', '🎵': '[MUSIC]', '🔊': '[SOUND]',
-            '📡': '[SIGNAL]', '🌟': '[FEATURE]', '🏆': '[TROPHY]',
-            'ℹ️': '[INFO]', '🔥': '[FIREBASE]', '💻': '[COMPUTER]'
-        }
-
-        for emoji, replacement in emoji_replacements.items():
-            formatted = formatted.replace(emoji, replacement)
-
-        # Final fallback: encode to ASCII with replacement for any remaining Unicode
-        try:
-            formatted.encode('ascii')
-            return formatted
-        except UnicodeEncodeError:
-            return formatted.encode('ascii', errors='replace').decode('ascii')
+        return to_safe_ascii(super().format(record))
 
     def formatException(self, ei):
         """Format exception with safe Unicode handling"""
@@ -52,14 +73,65 @@ class SafeUnicodeFormatter(logging.Formatter):
             return result.encode('ascii', errors='replace').decode('ascii')
 
 class LogSignal(QObject):
-    """Signal emitter for logs to enable communication with UI"""
-    new_log = Signal(str, str, str, str, str)  # level, message, timestamp, caller_info, stack_trace
+    """
+    Signal emitter for logs to enable communication with UI.
+
+    Entries posted from any thread are collected and emitted together as
+    one ``new_logs`` list at most every SIGNAL_BATCH_MS, so a burst of log
+    lines costs the viewer one update instead of one per line.
+    """
+    new_logs = Signal(list)  # [(level, message, timestamp, caller_info, stack_trace), ...]
+    _flush_requested = Signal()
+
+    def __init__(self, max_pending=1000):
+        super().__init__()
+        self._pending = deque(maxlen=max_pending)
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SIGNAL_BATCH_MS)
+        self._timer.timeout.connect(self.flush)
+        self._flush_requested.connect(self._arm, Qt.QueuedConnection)
+
+    def post(self, entry):
+        """Queue an entry for the next batch"""
+        self._pending.append(entry)
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._flush_requested.emit()
+
+    @Slot()
+    def _arm(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @Slot()
+    def flush(self):
+        """Emit everything posted since the last batch"""
+        with self._lock:
+            self._scheduled = False
+        batch = []
+        while self._pending:
+            batch.append(self._pending.popleft())
+        if batch:
+            self.new_logs.emit(batch)
 
 class AppLogger:
-    """Application logger with UI signal support"""
+    """
+    Application logger with UI signal support.
+
+    The logging calls stay cheap on the UI thread: records go onto a queue
+    and a QueueListener thread formats them and writes the log files and the
+    console. Caller info is looked up only for warnings and errors, the
+    in-memory buffer is a fixed-size ring, and the logs viewer is updated in
+    batches.
+    """
     _instance = None
-    _log_buffer = []  # Buffer to store logs before UI initialization
     _max_buffer_size = 1000  # Maximum number of logs to keep in memory
+    _log_buffer = deque(maxlen=_max_buffer_size)  # Buffer to store logs before UI initialization
     
     def __init__(self):
         self.logger = logging.getLogger('KitchenDashboard')
@@ -150,7 +222,9 @@ class AppLogger:
                     else:
                         self._safe_write(f"[{self.message_count:03d}] {record.levelname}: {msg}\n")
 
-                    self.flush()
+                    # stdout is flushed for problems right away, otherwise by its own buffering
+                    if record.levelno >= logging.WARNING:
+                        self.flush()
                 except Exception:
                     self.handleError(record)
 
@@ -274,11 +348,22 @@ class AppLogger:
         error_handler.setFormatter(error_formatter)
         console_handler.setFormatter(console_formatter)
 
-        # Add handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(error_handler)
+        # File and console output happen on a listener thread; the logger only enqueues records
+        self.handlers = [file_handler, error_handler]
         if not getattr(sys, 'frozen', False):  # Only add console in development
-            self.logger.addHandler(console_handler)
+            self.handlers.append(console_handler)
+        self.listener = None
+        self.queue_handler = None
+        if os.environ.get(SYNC_LOGGING_ENV) == '1':
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
+        else:
+            log_queue = queue.SimpleQueue()
+            self.queue_handler = logging.handlers.QueueHandler(log_queue)
+            self.listener = logging.handlers.QueueListener(log_queue, *self.handlers, respect_handler_level=True)
+            self.logger.addHandler(self.queue_handler)
+            self.listener.start()
+            atexit.register(self.shutdown)
 
         # Log startup information
         self.logger.info("="*80)
@@ -290,7 +375,10 @@ class AppLogger:
         self.logger.info("="*80)
         
         # Create signal emitter for UI updates
-        self.signal = LogSignal()
+        self.signal = LogSignal(self._max_buffer_size)
+
+        # Start times of open log sections, for the duration logged by log_section_footer
+        self._section_starts = {}
     
     @classmethod
     def get_instance(cls):
@@ -299,34 +387,42 @@ class AppLogger:
             cls._instance = AppLogger()
         return cls._instance
     
+    def shutdown(self):
+        """Write out queued records and log synchronously from now on"""
+        if self.listener is None:
+            return
+        # At exit stdout may already be closed (e.g. by a test runner); drop handlers writing to it
+        self.handlers = [handler for handler in self.handlers
+                         if not getattr(getattr(handler, 'stream', None), 'closed', False)]
+        self.listener.handlers = tuple(self.handlers)
+        self.listener.stop()
+        self.listener = None
+        self.logger.removeHandler(self.queue_handler)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+            try:
+                handler.flush()
+            except ValueError:
+                # Closed while the queue was drained
+                pass
+
     @classmethod
     def _add_to_buffer(cls, level, message, caller_info="", stack_trace=""):
-        """Add log to buffer and trim if necessary"""
+        """Add log to the ring buffer (the oldest entry drops out when it is full)"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        cls._log_buffer.append((level, message, timestamp, caller_info, stack_trace))
-
-        # Trim buffer if it exceeds max size
-        if len(cls._log_buffer) > cls._max_buffer_size:
-            cls._log_buffer = cls._log_buffer[-cls._max_buffer_size:]
+        entry = (level, message, timestamp, caller_info, stack_trace)
+        cls._log_buffer.append(entry)
+        return entry
 
-    def _get_caller_info(self):
+    def _get_caller_info(self, depth=3):
         """Get information about the calling function"""
         try:
-            # Get the current frame and go up the stack
-            frame = inspect.currentframe()
-            # Go up 3 levels: _get_caller_info -> log_method -> actual_caller
-            for _ in range(3):
-                frame = frame.f_back
-                if frame is None:
-                    break
-
-            if frame:
-                filename = os.path.basename(frame.f_code.co_filename)
-                function_name = frame.f_code.co_name
-                line_number = frame.f_lineno
-                return f"{filename}:{function_name}:{line_number}"
-            else:
-                return "unknown:unknown:0"
+            # Skip _get_caller_info -> _log -> log method to reach the actual caller
+            frame = sys._getframe(depth)
+            filename = os.path.basename(frame.f_code.co_filename)
+            return f"{filename}:{frame.f_code.co_name}:{frame.f_lineno}"
+        except ValueError:
+            return "unknown:unknown:0"
         except Exception:
             return "error:error:0"
 
@@ -344,49 +440,8 @@ class AppLogger:
 
     def _safe_encode_for_logging(self, message):
         """Safely encode message for logging to prevent Unicode errors"""
-        if not isinstance(message, str):
-            message = str(message)
+        return to_safe_ascii(message if isinstance(message, str) else str(message))
 
-        # Replace common emoji with ASCII equivalents
-        emoji_replacements = {
-            '✅': '[SUCCESS]', '❌': '[ERROR]', '⚠️': '[WARNING]',
-            '🔄': '[REFRESH]', '📋': '[LIST]', '📱': '[MOBILE]',
-            '🔍': '[SEARCH]', '💾': '[SAVE]', '🎯': '[TARGET]',
-            '🚀': '[START]', '🔧': '[DEBUG]', '📊': '[DATA]',
-            '🎉': '[CELEBRATION]', '💡': '[IDEA]', '🔔': '[NOTIFICATION]',
-            '📤': '[UPLOAD]', '📥': '[DOWNLOAD]', '🌐': '[NETWORK]',
-            '🔒': '[SECURE]', '📈': '[CHART]', '📉': '[DECLINE]',
-            '🚨': '[ALERT]', '🔴': '[RED]', '🟢': '[GREEN]',
-            '🟡': '[YELLOW]', '🔵': '[BLUE]', '⭐': '[STAR]',
-            '💰': '[MONEY]', '📝': '[NOTE]', '📅': '[CALENDAR]',
-            '⏰': '[CLOCK]', '🔑': '[KEY]', '🎨': '[DESIGN]',
-            '📸': '[PHOTO]', '🎵': '[MUSIC]', '🔊': '[SOUND]',
-            '📡': '[SIGNAL]', '🌟': '[FEATURE]', '🏆': '[TROPHY]',
-            'ℹ️': '[INFO]', '📄': '[FILE]', '🖥️': '[SYSTEM]',
-            '📁': '[FOLDER]', '🖱️': '[UI]', '🍳': '[KITCHEN]',
-            '🔥': '[FIREBASE]', '📦': '[PACKAGE]', '🔓': '[UNLOCK]',
-            '🧪': '[TEST]', '🔬': '[ANALYZE]', '💻': '[COMPUTER]',
-            '🖨️': '[PRINT]', '🔇': '[MUTE]'
-        }
-
-        for emoji, replacement in emoji_replacements.items():
-            message = message.replace(emoji, replacement)
-
-        # Replace currency symbols
-        message = message.replace('₹', 'Rs.')
-        message = message.replace('€', 'EUR')
-        message = message.replace('£', 'GBP')
-        message = message.replace('¥', 'JPY')
-
-        # Final fallback: encode to ASCII with replacement for any remaining Unicode
-        try:
-            # Test if the message can be encoded
-            message.encode('ascii')
-            return message
-        except UnicodeEncodeError:
-            # If it can't be encoded, replace problematic characters
-            return message.encode('ascii', errors='replace').decode('ascii')
-    
     @classmethod
     def get_log_buffer(cls):
         """Get current log buffer"""
@@ -395,72 +450,38 @@ class AppLogger:
     @classmethod
     def clear_log_buffer(cls):
         """Clear log buffer"""
-        cls._log_buffer = []
+        cls._log_buffer.clear()
     
-    def debug(self, message, include_stack=False):
-        """Log debug message"""
-        caller_info = self._get_caller_info()
+    def _log(self, level, message, include_stack):
+        """Enqueue a record for the handlers, keep it in the buffer and post it to the viewer"""
+        if not isinstance(message, str):
+            message = str(message)
+        caller_info = self._get_caller_info() if level >= CALLER_INFO_LEVEL else ""
         stack_trace = "\n".join(self._get_stack_trace(include_stack)) if include_stack else ""
 
-        # Apply safe encoding to message before logging
-        safe_message = self._safe_encode_for_logging(message)
+        # Formatters replace emoji and non-ASCII text on the listener thread
+        self.logger.log(level, message, stacklevel=3)
+        self.signal.post(self._add_to_buffer(logging.getLevelName(level), message, caller_info, stack_trace))
 
-        self.logger.debug(safe_message)
-        self._add_to_buffer('DEBUG', message, caller_info, stack_trace)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.signal.new_log.emit('DEBUG', message, timestamp, caller_info, stack_trace)
+    def debug(self, message, include_stack=False):
+        """Log debug message"""
+        self._log(logging.DEBUG, message, include_stack)
 
     def info(self, message, include_stack=False):
         """Log info message"""
-        caller_info = self._get_caller_info()
-        stack_trace = "\n".join(self._get_stack_trace(include_stack)) if include_stack else ""
-
-        # Apply safe encoding to message before logging
-        safe_message = self._safe_encode_for_logging(message)
-
-        self.logger.info(safe_message)
-        self._add_to_buffer('INFO', message, caller_info, stack_trace)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.signal.new_log.emit('INFO', message, timestamp, caller_info, stack_trace)
+        self._log(logging.INFO, message, include_stack)
 
     def warning(self, message, include_stack=False):
         """Log warning message"""
-        caller_info = self._get_caller_info()
-        stack_trace = "\n".join(self._get_stack_trace(include_stack)) if include_stack else ""
-
-        # Apply safe encoding to message before logging
-        safe_message = self._safe_encode_for_logging(message)
-
-        self.logger.warning(safe_message)
-        self._add_to_buffer('WARNING', message, caller_info, stack_trace)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.signal.new_log.emit('WARNING', message, timestamp, caller_info, stack_trace)
+        self._log(logging.WARNING, message, include_stack)
 
     def error(self, message, include_stack=True):
         """Log error message"""
-        caller_info = self._get_caller_info()
-        stack_trace = "\n".join(self._get_stack_trace(include_stack)) if include_stack else ""
-
-        # Apply safe encoding to message before logging
-        safe_message = self._safe_encode_for_logging(message)
-
-        self.logger.error(safe_message)
-        self._add_to_buffer('ERROR', message, caller_info, stack_trace)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.signal.new_log.emit('ERROR', message, timestamp, caller_info, stack_trace)
+        self._log(logging.ERROR, message, include_stack)
 
     def critical(self, message, include_stack=True):
         """Log critical message"""
-        caller_info = self._get_caller_info()
-        stack_trace = "\n".join(self._get_stack_trace(include_stack)) if include_stack else ""
-
-        # Apply safe encoding to message before logging
-        safe_message = self._safe_encode_for_logging(message)
-
-        self.logger.critical(safe_message)
-        self._add_to_buffer('CRITICAL', message, caller_info, stack_trace)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.signal.new_log.emit('CRITICAL', message, timestamp, caller_info, stack_trace)
+        self._log(logging.CRITICAL, message, include_stack)
 
     def log_exception(self, exception, context=""):
         """Log exception with full traceback and context"""
@@ -489,15 +510,21 @@ class AppLogger:
         """Log application shutdown information"""
         self.info("Application shutdown initiated")
         self.info("All systems terminated successfully")
+        self.shutdown()
 
     def log_section_header(self, section_name):
         """Log a section header for better organization"""
+        self._section_starts[section_name] = time.perf_counter()
+        get_startup_profiler().start_phase(section_name)
         self.info(f"Starting {section_name}")
 
     def log_section_footer(self, section_name, success=True, details=None):
-        """Log a section completion"""
+        """Log a section completion with how long it took since its header"""
+        get_startup_profiler().end_phase(section_name)
         status = "completed successfully" if success else "completed with issues"
-        self.info(f"{section_name} {status}")
+        started = self._section_starts.pop(section_name, None)
+        duration = f" in {time.perf_counter() - started:.2f}s" if started is not None else ""
+        self.info(f"{section_name} {status}{duration}")
         if details:
             self.info(f"Details: {details}")
 
@@ -0,0 +1,285 @@
+"""
+Startup Profiler for Kitchen Dashboard
+Wall-clock and CPU time per startup phase, optional per-module import costs, and one JSON report per launch
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import builtins
+import platform
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Set to 1 to time every module imported during startup (like ``python -X importtime``)
+PROFILE_IMPORTS_ENV = 'KITCHEN_PROFILE_IMPORTS'
+
+# Startup reports are written to this folder of the logs directory
+REPORT_DIRNAME = 'startup'
+
+# Startup reports kept on disk, oldest deleted first
+MAX_REPORTS = 30
+
+# Imports listed in a report, slowest cumulative first
+TOP_IMPORTS = 40
+
+# Phases recorded before the profiler stops listening (sections also run after startup)
+MAX_PHASES = 500
+
+
+class ImportTimer:
+    """
+    Self and cumulative time of each module imported while active.
+
+    Wraps ``builtins.__import__`` in the thread that started it, so the
+    numbers match ``-X importtime``: cumulative includes the modules a module
+    imports, self time does not. Modules already imported and relative
+    imports are passed straight through.
+    """
+
+    def __init__(self):
+        self.modules: Dict[str, Dict[str, float]] = {}
+        self._stack: List[List[float]] = []
+        self._original = None
+        self._thread = None
+
+    @property
+    def active(self) -> bool:
+        return self._original is not None
+
+    def start(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            self._thread = threading.get_ident()
+            builtins.__import__ = self._import
+
+    def stop(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original or builtins.__import__
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return original(name, globals, locals, fromlist, level)
+
+        # [children cumulative time] for the self-time of the enclosing import
+        self._stack.append([0.0])
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._stack.pop()[0]
+            if self._stack:
+                self._stack[-1][0] += cumulative
+            self.modules[name] = {'self': cumulative - children, 'cumulative': cumulative}
+
+    def slowest(self, limit: int = TOP_IMPORTS) -> List[Dict[str, Any]]:
+        ranked = sorted(self.modules.items(), key=lambda item: item[1]['cumulative'], reverse=True)
+        return [{'module': name, 'self': round(t['self'], 6), 'cumulative': round(t['cumulative'], 6)}
+                for name, t in ranked[:limit]]
+
+
+class StartupProfiler:
+    """
+    Timeline of the application's startup phases.
+
+    Phases nest: one started while another is open becomes its child, so
+    "Data Loading" can hold a phase per table. Each phase records its start
+    offset, wall-clock and CPU seconds. Phases marked ``waiting`` (the login
+    dialog) are subtracted from the active startup time, so a slow sign-in
+    does not look like a cold-start regression; phases run while waiting
+    are not nested under the wait and still count as active. ``finish`` closes the
+    timeline and ``write_report`` saves it as JSON next to the logs.
+    """
+
+    def __init__(self, started: Optional[float] = None, profile_imports: Optional[bool] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.phases: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self.finished = False
+        self._open: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+
+        if profile_imports is None:
+            profile_imports = os.environ.get(PROFILE_IMPORTS_ENV) == '1'
+        self.import_timer = ImportTimer()
+        if profile_imports:
+            self.import_timer.start()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def start_phase(self, name: str, waiting: bool = False):
+        with self._lock:
+            if self.finished or len(self.phases) >= MAX_PHASES:
+                return
+            # Work started inside a wait (the UI built from the sign-in callback) is startup work:
+            # it is listed beside the wait rather than under it, and not subtracted with it
+            active_parents = [phase for phase in self._open if not phase['waiting']]
+            phase = {
+                'name': name,
+                'parent': active_parents[-1]['name'] if active_parents else None,
+                'start': round(self.elapsed(), 6),
+                'wall': None,
+                'cpu': None,
+                'waiting': waiting,
+                '_cpu_start': time.process_time(),
+            }
+            if self._open and self._open[-1]['waiting'] and not waiting:
+                phase['_within'] = self._open[-1]
+            self.phases.append(phase)
+            self._open.append(phase)
+
+    def end_phase(self, name: str):
+        """Close the innermost open phase called ``name`` (and any left open inside it)"""
+        with self._lock:
+            if not any(phase['name'] == name for phase in self._open):
+                return
+            while self._open:
+                phase = self._open.pop()
+                self._close(phase)
+                if phase['name'] == name:
+                    break
+
+    def _close(self, phase: Dict[str, Any]):
+        phase['wall'] = round(self.elapsed() - phase['start'], 6)
+        phase['cpu'] = round(time.process_time() - phase.pop('_cpu_start'), 6)
+        within = phase.pop('_within', None)
+        if within is not None:
+            within['active'] = round(within.get('active', 0.0) + phase['wall'], 6)
+
+    @contextmanager
+    def phase(self, name: str, waiting: bool = False):
+        self.start_phase(name, waiting)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    def record(self, name: str, wall: float, cpu: Optional[float] = None, parent: Optional[str] = None):
+        """Add a phase timed elsewhere (e.g. a service built after the first paint)"""
+        with self._lock:
+            if len(self.phases) >= MAX_PHASES:
+                return
+            self.phases.append({
+                'name': name, 'parent': parent, 'start': round(self.elapsed() - wall, 6),
+                'wall': round(wall, 6), 'cpu': None if cpu is None else round(cpu, 6), 'waiting': False,
+            })
+
+    def mark(self, name: str) -> float:
+        """Record a milestone (seconds since start), e.g. 'interactive'"""
+        self.marks[name] = round(self.elapsed(), 6)
+        return self.marks[name]
+
+    def finish(self):
+        """Close any open phases and stop timing imports; later phases are ignored"""
+        with self._lock:
+            while self._open:
+                self._close(self._open.pop())
+            self.import_timer.stop()
+            self.finished = True
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = [{k: v for k, v in phase.items() if not k.startswith('_')} for phase in self.phases]
+        total = self.marks.get('interactive', self.elapsed())
+        waiting = sum((p['wall'] or 0) - p.get('active', 0.0) for p in phases if p['waiting'] and p['start'] < total)
+        try:
+            from __version__ import __version__ as version
+        except Exception:
+            version = None
+        return {
+            'started_at': self.started_at,
+            'version': version,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'time_to_interactive': round(total, 6),
+            'active_time': round(total - waiting, 6),
+            'cpu_time': round(time.process_time(), 6),
+            'marks': dict(self.marks),
+            'phases': phases,
+            'imports': self.import_timer.slowest(),
+        }
+
+    def write_report(self, directory: str) -> Optional[str]:
+        """Save this launch's report as startup_<timestamp>.json and prune old ones"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            path = os.path.join(directory, f"startup_{stamp}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2)
+            for old in list_reports(directory)[MAX_REPORTS:]:
+                os.remove(old)
+            return path
+        except Exception as e:
+            print(f"Could not write startup report: {e}")
+            return None
+
+
+def list_reports(directory: str) -> List[str]:
+    """Startup report paths, newest first"""
+    return sorted(glob.glob(os.path.join(directory, 'startup_*.json')), reverse=True)
+
+
+def load_reports(directory: str, limit: int = 2) -> List[Dict[str, Any]]:
+    """The newest ``limit`` startup reports"""
+    reports = []
+    for path in list_reports(directory)[:limit]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                reports.append(json.load(f))
+        except Exception:
+            continue
+    return reports
+
+
+def phase_totals(report: Dict[str, Any]) -> Dict[str, float]:
+    """Wall seconds of each top-level phase, summed by name"""
+    totals: Dict[str, float] = {}
+    for phase in report.get('phases', []):
+        if phase.get('parent') is None and phase.get('wall') is not None:
+            totals[phase['name']] = totals.get(phase['name'], 0.0) + phase['wall']
+    return totals
+
+
+def format_breakdown(report: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Lines describing a startup report, with the change since ``previous`` when given"""
+    def delta(current, before):
+        if before is None:
+            return ""
+        change = current - before
+        return f" ({'+' if change >= 0 else ''}{change:.2f}s)"
+
+    previous = previous or {}
+    before = phase_totals(previous)
+    lines = [
+        f"Interactive after {report['time_to_interactive']:.2f}s"
+        f"{delta(report['time_to_interactive'], previous.get('time_to_interactive'))}, "
+        f"{report['active_time']:.2f}s excluding sign-in"
+        f"{delta(report['active_time'], previous.get('active_time'))}"
+    ]
+    for name, wall in sorted(phase_totals(report).items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"  {name}: {wall:.2f}s{delta(wall, before.get(name))}")
+    for entry in report.get('imports', [])[:5]:
+        lines.append(f"  import {entry['module']}: {entry['cumulative']:.3f}s")
+    return lines
+
+
+_startup_profiler = None
+
+
+def get_startup_profiler(started: Optional[float] = None) -> StartupProfiler:
+    """The process-wide startup profiler; ``started`` sets its origin on first call"""
+    global _startup_profiler
+    if _startup_profiler is None:
+        _startup_profiler = StartupProfiler(started)
+    return _startup_profiler